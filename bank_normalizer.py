@@ -0,0 +1,209 @@
+"""
+Normalisasi Nama Bank: string mentah dari tab Rekening -> kode bank (sandi BI) + nama kanonik
+Lookup memakai automaton Aho-Corasick atas tabel alias (satu pass per string) dan cache per
+string mentah, sehingga satu dataset penuh selesai dalam hitungan milidetik.
+"""
+
+import re
+import sys
+import csv
+import time
+import logging
+from collections import Counter, deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACCOUNT_LENGTH = (8, 18)
+
+
+class BankInfo(NamedTuple):
+    code: str                       # sandi bank 3 digit
+    name: str                       # nama kanonik
+    account_length: Tuple[int, int] = DEFAULT_ACCOUNT_LENGTH  # (min, max) digit nomor rekening
+
+
+# code, nama kanonik, panjang rekening, alias (selain nama kanonik)
+BANKS = [
+    ("002", "BANK RAKYAT INDONESIA", (15, 15), ["BRI", "BANK BRI", "BANK RAKYAT INDONESIA PERSERO", "RAKYAT INDONESIA"]),
+    ("008", "BANK MANDIRI", (13, 13), ["MANDIRI", "BANK MANDIRI PERSERO"]),
+    ("009", "BANK NEGARA INDONESIA", (10, 10), ["BNI", "BANK BNI", "BNI 46", "NEGARA INDONESIA"]),
+    ("014", "BANK CENTRAL ASIA", (10, 10), ["BCA", "BANK BCA", "CENTRAL ASIA"]),
+    ("200", "BANK TABUNGAN NEGARA", (16, 16), ["BTN", "BANK BTN", "TABUNGAN NEGARA"]),
+    ("451", "BANK SYARIAH INDONESIA", (10, 10), ["BSI", "BANK BSI", "SYARIAH INDONESIA", "BRI SYARIAH", "BRIS",
+                                                 "BNI SYARIAH", "MANDIRI SYARIAH", "BSM", "BANK SYARIAH MANDIRI"]),
+    ("022", "BANK CIMB NIAGA", (13, 14), ["CIMB", "CIMB NIAGA", "NIAGA"]),
+    ("011", "BANK DANAMON", DEFAULT_ACCOUNT_LENGTH, ["DANAMON"]),
+    ("013", "BANK PERMATA", DEFAULT_ACCOUNT_LENGTH, ["PERMATA", "PERMATABANK"]),
+    ("016", "BANK MAYBANK INDONESIA", DEFAULT_ACCOUNT_LENGTH, ["MAYBANK", "BII", "BANK INTERNASIONAL INDONESIA"]),
+    ("019", "BANK PANIN", DEFAULT_ACCOUNT_LENGTH, ["PANIN", "PANIN BANK"]),
+    ("028", "BANK OCBC NISP", DEFAULT_ACCOUNT_LENGTH, ["OCBC", "OCBC NISP", "NISP"]),
+    ("147", "BANK MUAMALAT", DEFAULT_ACCOUNT_LENGTH, ["MUAMALAT"]),
+    ("153", "BANK SINARMAS", DEFAULT_ACCOUNT_LENGTH, ["SINARMAS"]),
+    ("213", "BANK BTPN", DEFAULT_ACCOUNT_LENGTH, ["BTPN", "JENIUS", "SMBC INDONESIA"]),
+    ("426", "BANK MEGA", DEFAULT_ACCOUNT_LENGTH, ["MEGA"]),
+    ("441", "BANK KB BUKOPIN", DEFAULT_ACCOUNT_LENGTH, ["BUKOPIN", "KB BUKOPIN"]),
+    ("535", "SEABANK INDONESIA", DEFAULT_ACCOUNT_LENGTH, ["SEABANK", "BANK KESEJAHTERAAN EKONOMI"]),
+    ("542", "BANK JAGO", DEFAULT_ACCOUNT_LENGTH, ["JAGO", "BANK ARTOS"]),
+    # Bank Pembangunan Daerah
+    ("110", "BANK BJB", DEFAULT_ACCOUNT_LENGTH, ["BJB", "BPD JAWA BARAT", "BANK JABAR", "JAWA BARAT DAN BANTEN"]),
+    ("111", "BANK DKI", DEFAULT_ACCOUNT_LENGTH, ["DKI", "BPD DKI"]),
+    ("112", "BANK BPD DIY", DEFAULT_ACCOUNT_LENGTH, ["BPD DIY", "BPD YOGYAKARTA", "DAERAH ISTIMEWA YOGYAKARTA"]),
+    ("113", "BANK JATENG", DEFAULT_ACCOUNT_LENGTH, ["JATENG", "BPD JAWA TENGAH", "BANK JAWA TENGAH"]),
+    ("114", "BANK JATIM", DEFAULT_ACCOUNT_LENGTH, ["JATIM", "BPD JAWA TIMUR", "BANK JAWA TIMUR"]),
+    ("115", "BANK JAMBI", DEFAULT_ACCOUNT_LENGTH, ["BPD JAMBI", "BANK 9 JAMBI"]),
+    ("116", "BANK ACEH SYARIAH", DEFAULT_ACCOUNT_LENGTH, ["BANK ACEH", "BPD ACEH"]),
+    ("117", "BANK SUMUT", DEFAULT_ACCOUNT_LENGTH, ["SUMUT", "BPD SUMATERA UTARA", "BANK SUMATERA UTARA"]),
+    ("118", "BANK NAGARI", DEFAULT_ACCOUNT_LENGTH, ["NAGARI", "BPD SUMATERA BARAT", "BANK SUMBAR"]),
+    ("119", "BANK RIAU KEPRI", DEFAULT_ACCOUNT_LENGTH, ["RIAU KEPRI", "BPD RIAU", "BRK SYARIAH"]),
+    ("120", "BANK SUMSEL BABEL", DEFAULT_ACCOUNT_LENGTH, ["SUMSEL BABEL", "BPD SUMSEL", "BANK SUMSEL"]),
+    ("121", "BANK LAMPUNG", DEFAULT_ACCOUNT_LENGTH, ["BPD LAMPUNG"]),
+    ("122", "BANK KALSEL", DEFAULT_ACCOUNT_LENGTH, ["KALSEL", "BPD KALIMANTAN SELATAN"]),
+    ("123", "BANK KALBAR", DEFAULT_ACCOUNT_LENGTH, ["KALBAR", "BPD KALIMANTAN BARAT"]),
+    ("124", "BANK KALTIMTARA", DEFAULT_ACCOUNT_LENGTH, ["KALTIMTARA", "BANKALTIMTARA", "BPD KALTIM", "BANK KALTIM"]),
+    ("125", "BANK KALTENG", DEFAULT_ACCOUNT_LENGTH, ["KALTENG", "BPD KALIMANTAN TENGAH"]),
+    ("126", "BANK SULSELBAR", DEFAULT_ACCOUNT_LENGTH, ["SULSELBAR", "BPD SULSEL", "BANK SULSEL"]),
+    ("127", "BANK SULUTGO", DEFAULT_ACCOUNT_LENGTH, ["SULUTGO", "BPD SULUT", "BANK SULUT"]),
+    ("128", "BANK NTB SYARIAH", DEFAULT_ACCOUNT_LENGTH, ["NTB SYARIAH", "BPD NTB", "BANK NTB"]),
+    ("129", "BANK BPD BALI", DEFAULT_ACCOUNT_LENGTH, ["BPD BALI", "BANK BALI"]),
+    ("130", "BANK NTT", DEFAULT_ACCOUNT_LENGTH, ["BPD NTT", "NUSA TENGGARA TIMUR"]),
+    ("131", "BANK MALUKU MALUT", DEFAULT_ACCOUNT_LENGTH, ["BPD MALUKU", "BANK MALUKU"]),
+    ("132", "BANK PAPUA", DEFAULT_ACCOUNT_LENGTH, ["BPD PAPUA"]),
+    ("133", "BANK BENGKULU", DEFAULT_ACCOUNT_LENGTH, ["BPD BENGKULU"]),
+    ("134", "BANK SULTENG", DEFAULT_ACCOUNT_LENGTH, ["SULTENG", "BPD SULAWESI TENGAH"]),
+    ("135", "BANK SULTRA", DEFAULT_ACCOUNT_LENGTH, ["SULTRA", "BPD SULAWESI TENGGARA"]),
+]
+
+CODE_IN_PARENS_RE = re.compile(r"\(\s*(\d{3})\s*\)")
+LEADING_CODE_RE = re.compile(r"^(\d{3})\b")
+CLEAN_RE = re.compile(r"[^A-Z0-9]+")
+# Kata yang tidak membedakan bank satu dengan lainnya
+NOISE_WORDS = {"PT", "TBK", "PERSERO", "PERSEROAN", "TERBATAS"}
+
+
+def _clean(text: str) -> str:
+    words = CLEAN_RE.sub(" ", text.upper()).split()
+    return " " + " ".join(word for word in words if word not in NOISE_WORDS) + " "
+
+
+class _AhoCorasick:
+    """Automaton Aho-Corasick sederhana; pattern dicocokkan per kata (dibungkus spasi)"""
+
+    def __init__(self, patterns: Dict[str, object]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, object]]] = [[]]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append((len(pattern), value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.output[nxt].extend(self.output[self.fail[nxt]])
+
+    def longest_match(self, text: str):
+        """Value dari pattern terpanjang yang muncul di text (pattern paling spesifik)"""
+        state = 0
+        best = (0, None)
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                if length > best[0]:
+                    best = (length, value)
+        return best[1]
+
+
+BANKS_BY_CODE: Dict[str, BankInfo] = {}
+_aliases: Dict[str, BankInfo] = {}
+for _code, _name, _length, _alias_list in BANKS:
+    BANKS_BY_CODE[_code] = BankInfo(_code, _name, _length)
+    for _alias in [_name] + _alias_list:
+        _aliases[_clean(_alias)] = BANKS_BY_CODE[_code]
+_MATCHER = _AhoCorasick(_aliases)
+_cache: Dict[str, Optional[BankInfo]] = {}
+
+
+def normalize_bank(raw: Optional[str]) -> Optional[BankInfo]:
+    """Kode + nama kanonik untuk Nama Bank mentah; None kalau tidak dikenali"""
+    if not raw:
+        return None
+    raw = str(raw)
+    if raw in _cache:
+        return _cache[raw]
+
+    # Kode dalam kurung ("(002) BANK BRI") atau di depan ("014 - BCA") paling bisa dipercaya
+    code_match = CODE_IN_PARENS_RE.search(raw) or LEADING_CODE_RE.match(raw.strip())
+    info = BANKS_BY_CODE.get(code_match.group(1)) if code_match else None
+    if info is None:
+        info = _MATCHER.longest_match(_clean(raw))
+
+    _cache[raw] = info
+    return info
+
+
+def account_length_range(raw_bank: Optional[str]) -> Tuple[int, int]:
+    info = normalize_bank(raw_bank)
+    return info.account_length if info else DEFAULT_ACCOUNT_LENGTH
+
+
+def looks_like_bank(text: str) -> bool:
+    """Dipakai extract_bank_info: apakah baris teks kemungkinan nama bank"""
+    return "BANK" in text.upper() or text.startswith("(") or normalize_bank(text) is not None
+
+
+def apply_bank_normalization(rows: List[dict]) -> Counter:
+    """Isi kolom Kode Bank / Bank Normalisasi di setiap row; return jumlah row per bank kanonik"""
+    breakdown = Counter()
+    for row in rows:
+        raw = row.get("Nama Bank")
+        if raw in (None, "", "N/A"):
+            row["Kode Bank"], row["Bank Normalisasi"] = "N/A", "N/A"
+            continue
+        info = normalize_bank(raw)
+        if info:
+            row["Kode Bank"], row["Bank Normalisasi"] = info.code, info.name
+            breakdown[info.name] += 1
+        else:
+            row["Kode Bank"], row["Bank Normalisasi"] = "N/A", "Tidak Dikenali"
+            breakdown["Tidak Dikenali"] += 1
+    return breakdown
+
+
+if __name__ == "__main__":
+    # Breakdown bank output lama: python bank_normalizer.py output_xxx/mitra_data.csv
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python bank_normalizer.py <mitra_data.csv>")
+        sys.exit(1)
+
+    with open(sys.argv[1], newline='', encoding='utf-8') as f:
+        dataset = list(csv.DictReader(f))
+
+    start = time.perf_counter()
+    counts = apply_bank_normalization(dataset)
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Rows: {len(dataset)} in {elapsed * 1000:.1f} ms")
+    for bank, count in counts.most_common():
+        logger.info(f"  {count:6d}  {bank}")
+    unknown = sorted({row.get("Nama Bank") for row in dataset if row.get("Bank Normalisasi") == "Tidak Dikenali"})
+    for raw in unknown:
+        logger.info(f"  tidak dikenali: {raw}")
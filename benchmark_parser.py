@@ -0,0 +1,179 @@
+"""
+Benchmark IjazahParser terhadap mock_openai.py (tanpa API key asli, tanpa biaya)
+Jalur yang diukur:
+- sync     : parse_ijazah satu per satu (seperti process_row di scraper)
+- threaded : thread pool seperti reparse_ijazah.py / reenrich_outputs.py (--workers)
+- cached   : IjazahTriage di depan parser, run kedua atas file yang sama (hit cache ijazah_cache.json)
+Laporan per jalur: calls/detik, latency p50/p95/p99/max, hasil kosong, request ke server, 429, 500
+dan jumlah retry client OpenAI (request server - panggilan API).
+    python benchmark_parser.py --calls 100 --workers 8 --latency 0.5 --rate-limit-rate 0.05
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from openai import OpenAI
+
+from fixture_site import document_image, synthetic_mitra
+from ijazah_parser import PROMPT_VERSION, IjazahParser
+from image_triage import IjazahTriage
+from mock_openai import MockBehavior, MockOpenAI
+
+logger = logging.getLogger(__name__)
+
+PATHS = ("sync", "threaded", "cached")
+
+
+def make_images(folder: str, count: int) -> List[Tuple[str, str]]:
+    """[(NIK, path)] ijazah sintetis (PNG scan dari fixture_site), satu folder per NIK"""
+    jobs = []
+    for row in synthetic_mitra(count):
+        path = os.path.join(folder, row["nik"], "ijazah.png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(document_image("ijazah", row["nik"]))
+        jobs.append((row["nik"], path))
+    return jobs
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+def measure(parser: IjazahParser, mock: MockOpenAI, jobs: List[Tuple[str, str]],
+            call: Callable, workers: int = 1) -> dict:
+    """Jalankan call(nik, path) untuk setiap job (sekuensial atau thread pool) dan ringkas hasilnya"""
+    before = dict(mock.counts)
+    api_before = parser.counts["api"]
+    latencies = []
+
+    def timed(job):
+        start = time.perf_counter()
+        result = call(*job)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(timed, jobs))
+    else:
+        results = [timed(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    server = {key: mock.counts[key] - before[key] for key in mock.counts}
+    api_calls = parser.counts["api"] - api_before
+    return {
+        "calls": len(jobs),
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "calls_per_second": round(len(jobs) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        "empty_results": sum(1 for result in results if not result or not result.get("nama")),
+        "api_calls": api_calls,
+        "server_requests": server["requests"],
+        "rate_limited": server["rate_limited"],
+        "server_errors": server["errors"],
+        "retries": server["requests"] - api_calls,
+    }
+
+
+def run_benchmark(calls: int = 50, workers: int = 8, behavior: MockBehavior = MockBehavior(),
+                  max_retries: int = 2, paths=PATHS) -> dict:
+    mock = MockOpenAI(behavior)
+    mock.start()
+    # Client di-inject: timeout pendek, retry/backoff bawaan SDK tetap sama seperti produksi
+    client = OpenAI(api_key="mock", base_url=mock.base_url, max_retries=max_retries, timeout=30)
+    parser = IjazahParser(client=client, local_ocr=False)
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {"calls": calls, "workers": workers, "max_retries": max_retries,
+                   "behavior": behavior._asdict(), "prompt_version": PROMPT_VERSION},
+        "paths": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="ijazah-bench-") as folder:
+            jobs = make_images(folder, calls)
+
+            if "sync" in paths:
+                report["paths"]["sync"] = measure(parser, mock, jobs, lambda nik, path: parser.parse_ijazah(path))
+            if "threaded" in paths:
+                report["paths"]["threaded"] = measure(parser, mock, jobs, lambda nik, path: parser.parse_ijazah(path),
+                                                      workers)
+            if "cached" in paths:
+                triage = IjazahTriage(os.path.join(folder, "ijazah_cache.json"), version=PROMPT_VERSION)
+                hits = []
+
+                def triaged(nik, path):
+                    decision = triage.classify(path, nik)
+                    if decision.route == "cache":
+                        hits.append(nik)
+                        return decision.result
+                    result = parser.parse_ijazah(path)
+                    triage.remember(path, result)
+                    return result
+
+                # Run pertama mengisi cache (diukur sebagai cold), run kedua = file yang sama dari run lalu
+                report["paths"]["cached_cold"] = measure(parser, mock, jobs, triaged, workers)
+                hits.clear()
+                report["paths"]["cached"] = measure(parser, mock, jobs, triaged, workers)
+                report["paths"]["cached"]["cache_hits"] = len(hits)
+    finally:
+        mock.stop()
+    return report
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 96)
+    print("BENCHMARK PARSER (mock OpenAI)")
+    print("=" * 96)
+    columns = {"calls_per_second": "calls/s", "p50_ms": "p50 ms", "p95_ms": "p95 ms", "p99_ms": "p99 ms",
+               "max_ms": "max ms", "empty_results": "empty", "server_requests": "requests",
+               "rate_limited": "429", "server_errors": "500", "retries": "retries"}
+    print(f"{'path':<13}" + "".join(f"{label:>9}" for label in columns.values()))
+    for name, values in report["paths"].items():
+        print(f"{name:<13}" + "".join(f"{values[key]:>9}" for key in columns))
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    defaults = MockBehavior()
+    arg_parser = argparse.ArgumentParser(description="Benchmark IjazahParser terhadap server OpenAI tiruan")
+    arg_parser.add_argument("--calls", type=int, default=50, help="Jumlah ijazah per jalur (default: 50)")
+    arg_parser.add_argument("--workers", type=int, default=8, help="Thread untuk jalur threaded/cached (default: 8)")
+    arg_parser.add_argument("--paths", default=",".join(PATHS), help=f"Jalur yang diukur (default: {','.join(PATHS)})")
+    arg_parser.add_argument("--latency", type=float, default=defaults.latency)
+    arg_parser.add_argument("--tail-rate", type=float, default=defaults.tail_rate)
+    arg_parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate)
+    arg_parser.add_argument("--retry-after-ms", type=int, default=defaults.retry_after_ms)
+    arg_parser.add_argument("--max-retries", type=int, default=2, help="max_retries client OpenAI (default SDK: 2)")
+    arg_parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    arg_parser.add_argument("--verbose", action="store_true", help="Tampilkan log parser per ijazah")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    # Error 500/429 yang disengaja tidak perlu stack trace di output benchmark
+    if not args.verbose:
+        logging.getLogger("ijazah_parser").setLevel(logging.CRITICAL)
+
+    report = run_benchmark(args.calls, args.workers,
+                           MockBehavior(latency=args.latency, tail_rate=args.tail_rate, error_rate=args.error_rate,
+                                        rate_limit_rate=args.rate_limit_rate, retry_after_ms=args.retry_after_ms),
+                           args.max_retries, [path.strip() for path in args.paths.split(",")])
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
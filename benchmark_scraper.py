@@ -0,0 +1,249 @@
+"""
+Benchmark MitraScraper terhadap situs tiruan (fixture_site.py) tanpa akses ke website BPS
+Menjalankan Chromium bawaan Playwright dengan remote debugging (seperti start_chrome.bat), lalu
+scraper.run() terhubung lewat CDP dan meng-crawl semua halaman fixture.
+Laporan: rows/detik, waktu per stage (klik tab, download, ekstraksi rekening, tutup modal, pindah
+halaman, save), memori proses Python, Chrome dan JS heap tab. Disimpan ke <output>/benchmark.json.
+    python benchmark_scraper.py --rows 200 --per-page 20 --detail-latency 0.2 [--block-resources]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from datetime import datetime
+from statistics import mean
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: memori proses tidak dilaporkan
+    resource = None
+
+from playwright.sync_api import sync_playwright
+
+from fixture_site import FixtureSite, Latency
+from selector_cache import SelectorRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Bungkus method scraper dan catat durasi setiap panggilan per stage"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, obj, method: str, stage):
+        """stage: nama tetap, atau fungsi (args) -> nama stage"""
+        original = getattr(obj, method)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.add(stage(*args) if callable(stage) else stage, time.perf_counter() - start)
+
+        setattr(obj, method, timed)
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for stage, values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            result[stage] = {
+                "count": len(values),
+                "total_s": round(sum(values), 3),
+                "mean_ms": round(mean(values) * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            }
+        return result
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def launch_chrome(url: str, port: int, profile_dir: str, headed: bool = False,
+                  executable: Optional[str] = None) -> subprocess.Popen:
+    """Chrome dengan --remote-debugging-port (default Chromium Playwright); tunggu sampai endpoint CDP siap"""
+    if not executable:
+        with sync_playwright() as p:
+            executable = p.chromium.executable_path
+    if not os.path.exists(executable):
+        raise FileNotFoundError(f"Chrome tidak ditemukan: {executable} "
+                                f"(jalankan 'playwright install chromium' atau pakai --chrome)")
+    args = [executable, f"--remote-debugging-port={port}", f"--user-data-dir={profile_dir}",
+            "--no-first-run", "--no-default-browser-check", "--disable-gpu", url]
+    if not headed:
+        args.insert(1, "--headless=new")
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        args.insert(1, "--no-sandbox")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError(f"Chrome berhenti saat start (exit code {process.returncode}): {executable}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Chrome tidak membuka remote debugging di port {port}")
+
+
+def _rss_mb(usage_who) -> Optional[float]:
+    """Peak RSS (MB) dari getrusage; ru_maxrss dalam KB di Linux, byte di macOS"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(usage_who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_benchmark(rows: int = 100, per_page: int = 10, latency: Latency = Latency(), output_folder: str = None,
+                  block_resources: bool = False, tab_recycle: bool = True, capture_only: bool = False,
+                  parse: bool = False, headed: bool = False, verbose: bool = False,
+                  chrome_path: Optional[str] = None) -> dict:
+    # Import di sini: scrape_mitra membuat file log saat di-import
+    from scrape_mitra import MitraScraper
+    if not verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    output_folder = output_folder or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    site = FixtureSite(rows, per_page, latency)
+    url = site.start()
+    port = _free_port()
+    profile = tempfile.TemporaryDirectory(prefix="chrome-bench-")
+    try:
+        chrome = launch_chrome(url, port, profile.name, headed, chrome_path)
+    except Exception:
+        site.stop()
+        profile.cleanup()
+        raise
+
+    timer = StageTimer()
+    heap_samples = []
+    try:
+        scraper = MitraScraper(block_resources=block_resources, tab_recycle=tab_recycle, output_folder=output_folder,
+                               triage=False, capture_only=capture_only, cdp_url=f"http://127.0.0.1:{port}")
+        # Statistik selector fixture jangan tercampur dengan statistik website asli
+        scraper.selector_registry = SelectorRegistry(os.path.join(output_folder, "selector_stats.json"))
+        if not parse:
+            scraper.ijazah_parser = None
+        elif scraper.ijazah_parser:
+            timer.wrap(scraper.ijazah_parser, "parse_ijazah", "parse_ijazah")
+
+        timer.wrap(scraper, "_wait_for_table", "initial_load")
+        timer.wrap(scraper, "_click_tab", lambda page, tab_name, *args: "tab_" + tab_name.lower().replace(" ", "_"))
+        timer.wrap(scraper, "_download_document", lambda page, selector, href, folder, filename, *args:
+                   "download_" + filename.split(".")[0])
+        timer.wrap(scraper, "extract_bank_info", "bank_info")
+        timer.wrap(scraper, "_close_modal", "close_modal")
+        timer.wrap(scraper, "_go_to_next_page", "next_page")
+        timer.wrap(scraper, "_save_results", "save")
+        timer.wrap(scraper, "capture_row" if capture_only else "process_row", "row")
+
+        if scraper.tab_monitor:
+            original_after_row = scraper._after_row
+
+            def after_row(page, row_start, current_page):
+                heap = scraper.tab_monitor.heap_mb()
+                if heap is not None:
+                    heap_samples.append(heap)
+                return original_after_row(page, row_start, current_page)
+
+            scraper._after_row = after_row
+
+        start = time.perf_counter()
+        scraper.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        chrome.terminate()
+        try:
+            chrome.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            chrome.kill()
+            chrome.wait()
+        site.stop()
+        profile.cleanup()
+
+    processed = len(timer.samples.get("row", []))
+    stages = timer.summary()
+    # Waktu row di luar stage yang diukur: tunggu popup, jeda tetap (wait_for_timeout), validasi
+    measured = sum(stages[name]["total_s"] for name in stages
+                   if name.startswith(("tab_", "download_")) or name in ("bank_info", "close_modal", "parse_ijazah"))
+    if "row" in stages:
+        stages["row_other"] = {"total_s": round(stages["row"]["total_s"] - measured, 3)}
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {"rows": rows, "per_page": per_page, "latency": latency._asdict(),
+                   "block_resources": block_resources, "tab_recycle": tab_recycle,
+                   "capture_only": capture_only, "parse": parse},
+        "rows_processed": processed,
+        "success": scraper.stats["success"],
+        "failed": scraper.stats["failed"],
+        "elapsed_s": round(elapsed, 2),
+        "rows_per_second": round(processed / elapsed, 3) if elapsed else None,
+        "stages": stages,
+        "memory": {
+            "python_peak_rss_mb": _rss_mb(resource.RUSAGE_SELF) if resource else None,
+            "chrome_peak_rss_mb": _rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+            "js_heap_peak_mb": round(max(heap_samples), 1) if heap_samples else None,
+        },
+        "requests": dict(site.requests),
+    }
+    with open(os.path.join(output_folder, "benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 60)
+    print("BENCHMARK SCRAPER (fixture)")
+    print("=" * 60)
+    print(f"Rows        : {report['rows_processed']} ({report['success']} success, {report['failed']} failed)")
+    print(f"Elapsed     : {report['elapsed_s']}s")
+    print(f"Throughput  : {report['rows_per_second']} rows/s")
+    for name, value in report["memory"].items():
+        print(f"{name:<20}: {value if value is not None else '-'}")
+    print(f"\n{'Stage':<22}{'count':>7}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for stage, values in report["stages"].items():
+        print(f"{stage:<22}{values.get('count', ''):>7}{values['total_s']:>10}"
+              f"{values.get('mean_ms', ''):>10}{values.get('p95_ms', ''):>10}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark scraper terhadap situs Seleksi Mitra tiruan")
+    arg_parser.add_argument("--rows", type=int, default=100, help="Jumlah mitra sintetis, 10 - 50000 (default: 100)")
+    arg_parser.add_argument("--per-page", type=int, default=10, help="Baris per halaman tabel (default: 10)")
+    arg_parser.add_argument("--table-latency", type=float, default=Latency().table)
+    arg_parser.add_argument("--detail-latency", type=float, default=Latency().detail)
+    arg_parser.add_argument("--image-latency", type=float, default=Latency().image)
+    arg_parser.add_argument("--output", help="Folder output (default: benchmark_<timestamp>)")
+    arg_parser.add_argument("--block-resources", action="store_true")
+    arg_parser.add_argument("--no-tab-recycle", action="store_true")
+    arg_parser.add_argument("--capture-only", action="store_true")
+    arg_parser.add_argument("--parse", action="store_true", help="Ikutkan parse ijazah (butuh OPENAI_API_KEY)")
+    arg_parser.add_argument("--chrome", help="Path executable Chrome/Chromium (default: Chromium Playwright)")
+    arg_parser.add_argument("--headed", action="store_true", help="Tampilkan jendela Chrome")
+    arg_parser.add_argument("--verbose", action="store_true", help="Tampilkan log scraper per row")
+    args = arg_parser.parse_args()
+
+    report = run_benchmark(args.rows, args.per_page,
+                           Latency(args.table_latency, args.detail_latency, args.image_latency),
+                           args.output, args.block_resources, not args.no_tab_recycle, args.capture_only,
+                           args.parse, args.headed, args.verbose, args.chrome)
+    print_report(report)
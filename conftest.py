@@ -0,0 +1,16 @@
+"""
+Fixture bersama untuk test yang butuh MitraScraper
+scrape_mitra membuat scraper_<timestamp>.log (dan output_<timestamp>/) di folder kerja,
+jadi modul di-import dan scraper dibuat di dalam tmp_path
+"""
+
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def scrape_mitra(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)    # IjazahParser tidak aktif
+    return importlib.import_module("scrape_mitra")
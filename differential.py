@@ -0,0 +1,62 @@
+"""
+Differential scraping: fingerprint setiap baris tabel dan bandingkan dengan run sebelumnya
+supaya modal detail hanya dibuka untuk mitra yang baru atau berubah
+"""
+
+import os
+import csv
+import json
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FILE = "fingerprints.json"
+
+
+def fingerprint_row(nik: str, cell_texts: List[str]) -> str:
+    """Hash dari NIK + teks semua kolom yang terlihat di tabel"""
+    normalized = "|".join(" ".join(text.split()) for text in cell_texts)
+    return hashlib.sha1(f"{nik}|{normalized}".encode("utf-8")).hexdigest()
+
+
+def save_fingerprints(output_folder: str, fingerprints: Dict[str, str]):
+    path = os.path.join(output_folder, FINGERPRINT_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fingerprints, f, indent=0)
+    logger.info(f"✓ Row fingerprints saved: {path}")
+
+
+def load_dataset_csv(csv_path: str) -> Dict[str, dict]:
+    """Baca mitra_data.csv menjadi {NIK: row_data} dengan format yang sama seperti data_list"""
+    rows = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            nik = (row.get("NIK") or "").strip()
+            if not nik or nik == "Unknown":
+                continue
+            mismatch = (row.pop("Mismatch", "") or "").strip().upper() == "TRUE"
+            row["_has_mismatch"] = mismatch
+            rows[nik] = row
+    return rows
+
+
+def load_previous_run(folder: str) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """Return (rows_by_nik, fingerprints) dari folder output run sebelumnya"""
+    csv_path = os.path.join(folder, "mitra_data.csv")
+    fp_path = os.path.join(folder, FINGERPRINT_FILE)
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"mitra_data.csv tidak ditemukan di {folder}")
+
+    rows = load_dataset_csv(csv_path)
+    fingerprints = {}
+    if os.path.exists(fp_path):
+        with open(fp_path, encoding="utf-8") as f:
+            fingerprints = json.load(f)
+    else:
+        logger.warning(f"⚠ {FINGERPRINT_FILE} tidak ada di {folder} - semua baris akan diproses ulang")
+
+    logger.info(f"✓ Previous run loaded: {len(rows)} rows, {len(fingerprints)} fingerprints ({folder})")
+    return rows, fingerprints
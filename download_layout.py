@@ -0,0 +1,205 @@
+"""
+Layout folder download per NIK
+- flat   : downloads/<NIK>/                  (format lama)
+- prefix : downloads/74/10/<NIK>/            (kode provinsi/kabupaten dari NIK)
+- hash   : downloads/3f/a2/<NIK>/            (sha1 NIK, sebaran merata)
+Setiap file yang tersimpan dicatat di downloads/manifest.csv (NIK, Dokumen, Path relatif, ukuran,
+SHA-256, dimensi, URL sumber) supaya tool lain (reparse, reenrich) mencari file lewat manifest, bukan
+os.walk ribuan folder, dan integrity.py bisa memverifikasi isi folder.
+Folder lama tanpa manifest tetap terbaca (cek path langsung / walk sebagai fallback).
+"""
+
+import os
+import csv
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from image_hashing import file_sha256
+from image_validation import ImageCheck
+
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ("flat", "prefix", "hash")
+MANIFEST_FILE = "manifest.csv"
+MANIFEST_FIELDS = ["NIK", "Dokumen", "Path", "Size", "SHA256", "Width", "Height", "URL"]
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+# Nama file per jenis dokumen (scraper menyimpan .jpg; .jpeg/.png dari run/manual lama)
+DOCUMENT_FILES = {
+    "ktp": ("ktp.jpg", "ktp.jpeg", "ktp.png"),
+    "ijazah": ("ijazah.jpg", "ijazah.jpeg", "ijazah.png"),
+}
+
+
+def shard_parts(nik: str, scheme: str) -> list:
+    """Subfolder di atas folder NIK untuk satu skema"""
+    if scheme == "flat":
+        return []
+    key = hashlib.sha1(nik.encode("utf-8")).hexdigest() if scheme == "hash" else nik
+    return [key[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] or "_" for i in range(SHARD_DEPTH)]
+
+
+def downloads_root(folder: str) -> str:
+    """Folder downloads dari folder output run (atau folder itu sendiri kalau sudah folder downloads)"""
+    nested = os.path.join(folder, "downloads")
+    return nested if os.path.isdir(nested) else folder
+
+
+class DownloadLayout:
+    """Folder per NIK sesuai skema + manifest yang ditulis append (aman kalau run terhenti)"""
+
+    def __init__(self, root: str, scheme: str = "flat"):
+        if scheme not in LAYOUTS:
+            raise ValueError(f"Layout download tidak dikenal: {scheme} (pilih {', '.join(LAYOUTS)})")
+        self.root = root
+        self.scheme = scheme
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+        if os.path.isdir(root) and not os.path.exists(self.manifest_path):
+            index_existing(root)
+
+    def nik_dir(self, nik: str, create: bool = True) -> str:
+        path = os.path.join(self.root, *shard_parts(nik, self.scheme), nik)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def record(self, nik: str, document: str, path: str, url: Optional[str] = None,
+               check: Optional[ImageCheck] = None):
+        """Catat satu file (plus checksum) di manifest; entri terakhir per NIK+dokumen yang berlaku"""
+        entry = manifest_entry(self.root, nik, document, path, url)
+        entry.update({"Size": os.path.getsize(path), "SHA256": file_sha256(path)})
+        if check is not None:
+            entry.update({"Width": check.width or "", "Height": check.height or ""})
+        append_manifest(self.root, [entry])
+
+
+def manifest_entry(root: str, nik: str, document: str, path: str, url: Optional[str] = None) -> dict:
+    """Baris manifest tanpa checksum (diisi record() atau integrity.py)"""
+    entry = dict.fromkeys(MANIFEST_FIELDS, "")
+    entry.update({"NIK": nik, "Dokumen": document,
+                  "Path": os.path.relpath(path, root).replace(os.sep, "/"), "URL": url or ""})
+    return entry
+
+
+def append_manifest(root: str, entries: Iterable[dict]):
+    path = os.path.join(root, MANIFEST_FILE)
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(entries)
+
+
+def write_manifest(root: str, entries: Iterable[dict]):
+    """Tulis ulang manifest (tmp + replace), mis. setelah checksum dilengkapi"""
+    path = os.path.join(root, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        writer.writerows(entries)
+    os.replace(tmp_path, path)
+
+
+_manifest_cache: Dict[str, tuple] = {}   # path manifest -> ((mtime, size), entries)
+
+
+def read_manifest(root: str) -> Optional[List[dict]]:
+    """Baris manifest (satu per NIK+dokumen, entri terakhir), None kalau belum ada manifest"""
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    entries = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            entries[(row["NIK"], row["Dokumen"])] = row
+    return list(entries.values())
+
+
+def load_manifest(root: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """{NIK: {dokumen: path absolut}} dari manifest, None kalau folder belum punya manifest.
+    Dibaca ulang hanya kalau file manifest berubah (lookup per NIK tetap murah)"""
+    path = os.path.join(root, MANIFEST_FILE)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    entries: Dict[str, Dict[str, str]] = {}
+    for row in read_manifest(root) or []:
+        entries.setdefault(row["NIK"], {})[row["Dokumen"]] = manifest_path(root, row)
+    _manifest_cache[path] = ((stat.st_mtime_ns, stat.st_size), entries)
+    return entries
+
+
+def manifest_path(root: str, row: dict) -> str:
+    return os.path.join(root, *row["Path"].split("/"))
+
+
+def _walk_documents(root: str, filenames: Iterable[str]) -> Dict[str, str]:
+    """Fallback folder lama tanpa manifest: NIK = nama folder induk file"""
+    filenames = set(filenames)
+    files = {}
+    for folder, dirs, names in os.walk(root):
+        for name in names:
+            if name.lower() in filenames:
+                files.setdefault(os.path.basename(folder), os.path.join(folder, name))
+    return files
+
+
+def index_existing(root: str) -> int:
+    """Tulis manifest untuk folder downloads lama (satu kali walk, checksum diisi lewat
+    `python integrity.py manifest`); return jumlah file tercatat"""
+    entries = [manifest_entry(root, nik, document, path) for document, filenames in DOCUMENT_FILES.items()
+               for nik, path in sorted(_walk_documents(root, filenames).items())]
+    if entries:
+        append_manifest(root, entries)
+        logger.info(f"✓ Indexed {len(entries)} existing downloads into {os.path.join(root, MANIFEST_FILE)}")
+    return len(entries)
+
+
+def find_documents(folder: str, document: str = "ijazah") -> Dict[str, str]:
+    """{NIK: path} satu jenis dokumen di folder output/downloads (manifest dulu, walk kalau tidak ada)"""
+    root = downloads_root(folder)
+    manifest = load_manifest(root)
+    if manifest is None:
+        return _walk_documents(root, DOCUMENT_FILES[document])
+    files = {nik: docs[document] for nik, docs in manifest.items()
+             if document in docs and os.path.isfile(docs[document])}
+    if len(files) < sum(1 for docs in manifest.values() if document in docs):
+        logger.warning(f"⚠ Beberapa file di {os.path.join(root, MANIFEST_FILE)} sudah tidak ada")
+    return files
+
+
+def find_document(folder: str, nik: str, document: str = "ijazah") -> Optional[str]:
+    """Path satu dokumen NIK: manifest, lalu path langsung untuk setiap skema (tanpa walk)"""
+    root = downloads_root(folder)
+    manifest = load_manifest(root)
+    path = (manifest or {}).get(nik, {}).get(document)
+    if path and os.path.isfile(path):
+        return path
+    for scheme in LAYOUTS:
+        nik_dir = os.path.join(root, *shard_parts(nik, scheme), nik)
+        for filename in DOCUMENT_FILES[document]:
+            candidate = os.path.join(nik_dir, filename)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python download_layout.py <folder output/downloads lama>")
+        sys.exit(1)
+    root = downloads_root(sys.argv[1])
+    if os.path.exists(os.path.join(root, MANIFEST_FILE)):
+        print(f"Manifest sudah ada: {os.path.join(root, MANIFEST_FILE)}")
+    else:
+        index_existing(root)
@@ -0,0 +1,190 @@
+"""
+Deteksi duplikat setelah scraping: nomor rekening yang dipakai beberapa NIK dan
+file KTP/ijazah yang sama (identik atau mirip) yang diupload untuk NIK berbeda.
+- Rekening dan SHA-256 memakai hash index (dict), O(n)
+- Gambar mirip memakai dHash 64-bit + BK-tree (query radius Hamming), tanpa perbandingan O(n^2);
+  setiap anggota harus dekat dengan satu gambar representatif (tanpa rantai A~B~C) dan aHash juga
+  harus cocok. Template ijazah/KTP yang sama tetap bisa lolos, jadi "mirip" hanya daftar untuk dicek.
+dHash butuh Pillow (opsional: pip install Pillow); tanpa Pillow hanya file identik yang dideteksi.
+"""
+
+import os
+import re
+import sys
+import csv
+import time
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from image_hashing import BKTree, Image, file_sha256, hamming, image_ahash, image_dhash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DISTANCE = 3   # bit berbeda dari 64 (dHash dan aHash) yang masih dianggap gambar yang sama
+IMAGE_COLUMNS = (("ktp", "Path KTP"), ("ijazah", "Path Ijazah"))
+NO_FILE_VALUES = ("", "N/A", "Not Downloaded", "Failed")
+NON_DIGIT_RE = re.compile(r"\D")
+
+
+class DuplicateCluster(NamedTuple):
+    kind: str                  # rekening | ktp_identik | ktp_mirip | ijazah_identik | ijazah_mirip
+    key: str                   # nomor rekening / sha256 / dhash
+    members: List[Tuple[str, str]]  # [(NIK, path atau nama pemilik)]
+    max_distance: int = 0      # jarak Hamming dHash terjauh dari representatif cluster
+
+
+class ImageHashes(NamedTuple):
+    sha256: Optional[str]
+    dhash: Optional[int]
+    ahash: Optional[int] = None
+
+
+def normalize_rekening(value) -> Optional[str]:
+    """Nomor rekening hanya angka; None kalau kosong/tidak masuk akal"""
+    digits = NON_DIGIT_RE.sub("", str(value or ""))
+    return digits if len(digits) >= 6 else None
+
+
+def hash_image(path: str) -> ImageHashes:
+    try:
+        sha = file_sha256(path)
+    except OSError as e:
+        logger.debug(f"SHA-256 gagal untuk {path}: {e}")
+        return ImageHashes(None, None)
+    return ImageHashes(sha, image_dhash(path), image_ahash(path))
+
+
+def find_shared_accounts(rows: List[dict]) -> List[DuplicateCluster]:
+    """Nomor rekening (dinormalisasi) yang muncul di lebih dari satu NIK"""
+    by_account = defaultdict(dict)
+    for row in rows:
+        account = normalize_rekening(row.get("Nomor Rekening"))
+        nik = str(row.get("NIK", ""))
+        if account and nik and nik != "Unknown":
+            by_account[account].setdefault(nik, row.get("Nama Pemilik", ""))
+
+    return [DuplicateCluster("rekening", account, sorted(niks.items()))
+            for account, niks in sorted(by_account.items()) if len(niks) > 1]
+
+
+def _cluster_images(kind: str, entries: List[Tuple[str, str, ImageHashes]],
+                    max_distance: int) -> List[DuplicateCluster]:
+    # entries: [(NIK, path, hashes)] untuk satu jenis dokumen
+    clusters = []
+
+    # File identik (hash index)
+    by_sha = defaultdict(list)
+    for position, (_, _, hashes) in enumerate(entries):
+        by_sha[hashes.sha256].append(position)
+    for sha, positions in sorted(by_sha.items()):
+        if len({entries[p][0] for p in positions}) > 1:
+            members = sorted((entries[p][0], entries[p][1]) for p in positions)
+            clusters.append(DuplicateCluster(f"{kind}_identik", sha, members))
+
+    if max_distance <= 0:
+        return clusters
+
+    # Gambar mirip: cluster bintang di sekitar satu representatif, tidak transitif (A~B dan B~C
+    # tidak membuat A dan C satu cluster). dHash paling sering diproses dulu sebagai representatif.
+    by_dhash = defaultdict(list)
+    for position, (_, _, hashes) in enumerate(entries):
+        if hashes.dhash is not None:
+            by_dhash[hashes.dhash].append(position)
+    tree = BKTree()
+    for value in by_dhash:
+        tree.add(value)
+
+    assigned = set()
+    for value in sorted(by_dhash, key=lambda item: (-len(by_dhash[item]), item)):
+        representative = by_dhash[value][0]
+        if representative in assigned:
+            continue
+        rep_ahash = entries[representative][2].ahash
+        members = {}
+        for match, distance in tree.search(value, max_distance):
+            for position in by_dhash[match]:
+                ahash = entries[position][2].ahash
+                # Sinyal kedua: aHash juga harus dekat (kalau tersedia)
+                if position in assigned or (rep_ahash is not None and ahash is not None
+                                            and hamming(rep_ahash, ahash) > max_distance):
+                    continue
+                members[position] = distance
+
+        niks = {entries[p][0] for p in members}
+        shas = {entries[p][2].sha256 for p in members}
+        # Cluster yang semuanya file identik sudah dilaporkan sebagai _identik
+        if len(niks) < 2 or len(shas) < 2:
+            continue
+        assigned.update(members)
+        clusters.append(DuplicateCluster(f"{kind}_mirip", f"{value:016x}",
+                                         sorted((entries[p][0], entries[p][1]) for p in members),
+                                         max(members.values())))
+    return clusters
+
+
+class DuplicateReport(NamedTuple):
+    clusters: List[DuplicateCluster]
+    images_hashed: int
+    perceptual: bool           # False kalau Pillow tidak tersedia
+    elapsed: float
+
+    def count(self, prefix: str) -> int:
+        return sum(1 for cluster in self.clusters if cluster.kind.startswith(prefix))
+
+    @property
+    def exact(self) -> List[DuplicateCluster]:
+        """Rekening sama dan file identik (pasti duplikat)"""
+        return [cluster for cluster in self.clusters if not cluster.kind.endswith("_mirip")]
+
+    @property
+    def similar(self) -> List[DuplicateCluster]:
+        """Gambar mirip (perlu dicek manual)"""
+        return [cluster for cluster in self.clusters if cluster.kind.endswith("_mirip")]
+
+
+def find_duplicates(rows: List[dict], max_distance: int = DEFAULT_MAX_DISTANCE,
+                    workers: int = 8) -> DuplicateReport:
+    """Jalankan semua deteksi duplikat atas dataset hasil scraping"""
+    start = time.perf_counter()
+    clusters = find_shared_accounts(rows)
+
+    # Kumpulkan file gambar unik; hashing (I/O + decode) paralel di thread pool
+    jobs: Dict[str, List[Tuple[str, str]]] = {kind: [] for kind, _ in IMAGE_COLUMNS}
+    paths = set()
+    for row in rows:
+        nik = str(row.get("NIK", ""))
+        for kind, column in IMAGE_COLUMNS:
+            path = str(row.get(column) or "")
+            if path not in NO_FILE_VALUES and os.path.isfile(path):
+                jobs[kind].append((nik, path))
+                paths.add(path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashes = dict(zip(paths, pool.map(hash_image, paths)))
+
+    for kind, _ in IMAGE_COLUMNS:
+        entries = [(nik, path, hashes[path]) for nik, path in jobs[kind] if hashes[path].sha256]
+        clusters.extend(_cluster_images(kind, entries, max_distance if Image is not None else 0))
+
+    return DuplicateReport(clusters, len(paths), Image is not None, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    # Cek duplikat output lama: python duplicate_detector.py output_xxx/mitra_data.csv
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python duplicate_detector.py <mitra_data.csv> [max_distance]")
+        sys.exit(1)
+
+    with open(sys.argv[1], newline='', encoding='utf-8') as f:
+        dataset = list(csv.DictReader(f))
+
+    report = find_duplicates(dataset, int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MAX_DISTANCE)
+    logger.info(f"Rows: {len(dataset)}, images hashed: {report.images_hashed} in {report.elapsed:.1f}s"
+                f"{'' if report.perceptual else ' (Pillow tidak ada - hanya file identik)'}")
+    for cluster in report.clusters:
+        logger.info(f"[{cluster.kind}] {cluster.key}")
+        for nik, detail in cluster.members:
+            logger.info(f"    {nik}  {detail}")
@@ -0,0 +1,356 @@
+"""
+Situs tiruan Seleksi Mitra untuk benchmark offline (stdlib http.server, tanpa akses ke website BPS)
+Meniru struktur yang dipakai scraper:
+- tabel vue-good-table (table#vgt-table, span[title="Lihat Detail Mitra"], kotak pencarian)
+- overlay .velmld-overlay selama data dimuat, footer "Sebelumnya"/"Selanjutnya" + input halaman
+- modal .v--modal-box "Detail Informasi Mitra" dengan tab File Administrasi dan Rekening
+  (label + div.form-control-plaintext), link fs-storage foto_ktp/ dan ijazah/
+Data N mitra sintetis dibuat deterministik dari seed; latency tabel, detail dan gambar bisa diatur.
+    python fixture_site.py --rows 1000 --port 8765 --table-latency 0.3 --detail-latency 0.2
+"""
+
+import re
+import json
+import time
+import zlib
+import random
+import struct
+import logging
+import argparse
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = ("Andi", "Budi", "Citra", "Dewi", "Eka", "Fajar", "Gita", "Hasan", "Indah", "Joko", "Kartika",
+               "Lestari", "Muhammad", "Nur", "Putri", "Rahmat", "Sari", "Taufik", "Wahyuni", "Yusuf")
+LAST_NAMES = ("Saputra", "Wijaya", "Hidayat", "Rahman", "Pratama", "Lestari", "Kurniawan", "Nugroho", "Sulastri",
+              "Ramadhan", "Syahputra", "Anggraini", "La Ode", "Wa Ode", "Hamzah", "Tamrin")
+KECAMATAN = ("Mandonga", "Kadia", "Wua-Wua", "Poasia", "Abeli", "Kambu", "Baruga", "Puuwatu", "Kendari Barat")
+PENDIDIKAN = ("SMA/Sederajat", "D3", "S1", "S1", "S1", "S2")
+BANKS = ("BANK RAKYAT INDONESIA (BRI)", "BANK NEGARA INDONESIA (BNI)", "BANK MANDIRI",
+         "BANK SYARIAH INDONESIA (BSI)", "BANK SULTRA", "BANK CENTRAL ASIA (BCA)")
+STATUSES = ("Diterima", "Menunggu Verifikasi", "Diterima", "Ditolak")
+
+IJAZAH_SIZE = (1240, 877)      # A4 landscape 150 dpi
+KTP_SIZE = (856, 540)
+
+
+class Latency(NamedTuple):
+    table: float = 0.3         # detik per request halaman tabel / pencarian
+    detail: float = 0.2        # detik per request detail modal (file administrasi, rekening)
+    image: float = 0.05        # detik per request gambar fs-storage
+    jitter: float = 0.2        # variasi acak +- (proporsi dari latency)
+
+
+def synthetic_mitra(count: int, seed: int = 1) -> List[Dict[str, str]]:
+    """N mitra deterministik; NIK unik 16 digit (kode 74 10 = Sulawesi Tenggara/Kendari)"""
+    rows = []
+    for i in range(count):
+        rnd = random.Random(seed * 1_000_003 + i)
+        female = rnd.random() < 0.5
+        day = rnd.randint(1, 28) + (40 if female else 0)
+        nik = f"7410{1 + i // 10000:02d}{day:02d}{rnd.randint(1, 12):02d}{rnd.randint(70, 99):02d}{i % 10000 + 1:04d}"
+        name = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}"
+        rows.append({
+            "nik": nik,
+            "nama": name,
+            "kecamatan": rnd.choice(KECAMATAN),
+            "pendidikan": rnd.choice(PENDIDIKAN),
+            "status": rnd.choice(STATUSES),
+            "bank": rnd.choice(BANKS),
+            "rekening": "".join(str(rnd.randint(0, 9)) for _ in range(rnd.choice((10, 13, 15)))),
+            "pemilik": name.upper(),
+        })
+    return rows
+
+
+def _png(width: int, height: int, key: str) -> bytes:
+    """PNG grayscale mirip hasil scan: latar kertas ber-noise + baris 'teks' gelap (tanpa Pillow)"""
+    rnd = random.Random(key)
+    noise = rnd.randbytes(width * height)
+    lines = {y for top in range(height // 6, height - 40, height // 14)
+             for y in range(top, top + rnd.randint(6, 12))}
+    paper = bytes(228 + (value & 15) for value in range(256))
+    ink = bytes(60 + (value & 15) for value in range(256))
+    raw = bytearray()
+    for y in range(height):
+        raw.append(0)     # filter type None
+        raw += noise[y * width:(y + 1) * width].translate(ink if y in lines else paper)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(bytes(raw), 1)) + chunk(b"IEND", b""))
+
+
+@lru_cache(maxsize=256)
+def document_image(kind: str, nik: str) -> bytes:
+    return _png(*(KTP_SIZE if kind == "foto_ktp" else IJAZAH_SIZE), f"{kind}/{nik}")
+
+
+def placeholder_image(key: str, size: int = 32) -> bytes:
+    """PNG kecil pengganti gambar lain (logo, ikon, foto profil) di rekaman HAR"""
+    return _png(size, size, key)
+
+
+PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Seleksi Mitra - Fixture</title>
+<style>
+body { font-family: sans-serif; }
+.velmld-overlay { position: fixed; inset: 0; background: rgba(255,255,255,.6); display: none; z-index: 50; }
+.v--modal-overlay { position: fixed; inset: 0; background: rgba(0,0,0,.4); z-index: 100; }
+.v--modal-box { background: #fff; margin: 40px auto; width: 760px; padding: 16px; }
+.nav-tabs { list-style: none; display: flex; gap: 12px; padding: 0; }
+.nav-link.active { font-weight: bold; }
+.tab-pane { display: none; } .tab-pane.active { display: block; }
+.footer__navigation__page-btn.disabled { opacity: .4; }
+span[title] { color: #06c; cursor: pointer; }
+</style></head>
+<body>
+<h3>Seleksi Mitra</h3>
+<div class="vgt-global-search__input"><input class="vgt-input" type="text" placeholder="Cari NIK / Nama"></div>
+<table id="vgt-table" class="vgt-table">
+<thead><tr><th>NIK</th><th>Nama</th><th>Kecamatan</th><th>Pendidikan</th><th>Status</th></tr></thead>
+<tbody></tbody></table>
+<div class="vgt-wrap__footer"><div class="footer__navigation">
+<button type="button" class="footer__navigation__page-btn" id="prev">Sebelumnya</button>
+<span class="footer__navigation__page-info">Halaman <input class="footer__navigation__page-info__current-entry" type="text" value="1"><span>dari 1</span></span>
+<button type="button" class="footer__navigation__page-btn" id="next">Selanjutnya</button>
+</div></div>
+<div class="velmld-overlay"></div>
+<script>
+var PER_PAGE = __PER_PAGE__;
+var state = {page: 1, pages: 1, q: ""};
+var overlay = document.querySelector(".velmld-overlay");
+var modalToken = 0;
+
+function esc(s) { return String(s).replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; }); }
+
+function getJSON(url, done) {
+  var xhr = new XMLHttpRequest();
+  xhr.open("GET", url);
+  xhr.onload = function () { done(JSON.parse(xhr.responseText)); };
+  xhr.send();
+}
+
+function load(page) {
+  overlay.style.display = "block";
+  getJSON("/api/mitra?page=" + page + "&per_page=" + PER_PAGE + "&q=" + encodeURIComponent(state.q), function (data) {
+    state.page = data.page; state.pages = data.pages;
+    var html = "";
+    data.rows.forEach(function (r) {
+      html += "<tr><td><span title=\\"Lihat Detail Mitra\\">" + esc(r.nik) + "</span></td><td>" + esc(r.nama) +
+              "</td><td>" + esc(r.kecamatan) + "</td><td>" + esc(r.pendidikan) + "</td><td>" + esc(r.status) + "</td></tr>";
+    });
+    document.querySelector("#vgt-table tbody").innerHTML = html;
+    document.querySelector(".footer__navigation__page-info__current-entry").value = state.page;
+    document.querySelector(".footer__navigation__page-info__current-entry + span").textContent = "dari " + state.pages;
+    document.getElementById("prev").classList.toggle("disabled", state.page <= 1);
+    document.getElementById("next").classList.toggle("disabled", state.page >= state.pages);
+    overlay.style.display = "none";
+  });
+}
+
+function closeModal() {
+  modalToken++;
+  var m = document.querySelector(".v--modal-overlay");
+  if (m) m.parentNode.removeChild(m);
+}
+
+function showTab(box, name) {
+  box.querySelectorAll(".nav-link").forEach(function (a) { a.classList.toggle("active", a.textContent === name); });
+  box.querySelectorAll(".tab-pane").forEach(function (p) { p.classList.toggle("active", p.dataset.tab === name); });
+}
+
+function field(label, value) {
+  return "<div class=\\"form-group row\\"><label class=\\"col-form-label\\">" + esc(label) +
+         "</label><div class=\\"form-control-plaintext\\">" + esc(value) + "</div></div>";
+}
+
+function openDetail(nik) {
+  closeModal();
+  var token = ++modalToken;
+  var wrap = document.createElement("div");
+  wrap.className = "v--modal-overlay";
+  wrap.innerHTML = "<div class=\\"v--modal-background-click\\"><div class=\\"v--modal-box v--modal\\">" +
+    "<button type=\\"button\\" class=\\"close\\" aria-label=\\"Close\\">&times;</button>" +
+    "<h4>Detail Informasi Mitra</h4><ul class=\\"nav nav-tabs\\" role=\\"tablist\\">" +
+    "<li class=\\"nav-item\\"><a class=\\"nav-link active\\" role=\\"tab\\" href=\\"#\\">File Administrasi</a></li>" +
+    "<li class=\\"nav-item\\"><a class=\\"nav-link\\" role=\\"tab\\" href=\\"#\\">Rekening</a></li></ul>" +
+    "<div class=\\"tab-pane active\\" data-tab=\\"File Administrasi\\">Memuat...</div>" +
+    "<div class=\\"tab-pane\\" data-tab=\\"Rekening\\"></div></div></div>";
+  document.body.appendChild(wrap);
+  var box = wrap.querySelector(".v--modal-box");
+  wrap.querySelector("button.close").onclick = closeModal;
+  var links = box.querySelectorAll(".nav-link");
+  links[0].onclick = function (e) { e.preventDefault(); showTab(box, "File Administrasi"); };
+  links[1].onclick = function (e) {
+    e.preventDefault();
+    showTab(box, "Rekening");
+    var pane = box.querySelector("[data-tab=Rekening]");
+    if (pane.dataset.loaded) return;
+    pane.dataset.loaded = "1";
+    pane.innerHTML = "Memuat...";
+    getJSON("/api/mitra/" + nik + "/rekening", function (r) {
+      if (token !== modalToken) return;
+      pane.innerHTML = field("Nama Bank", r.bank) + field("Nomor Rekening", r.rekening) +
+                       field("Nama Pemilik Rekening", r.pemilik);
+    });
+  };
+  getJSON("/api/mitra/" + nik, function (d) {
+    if (token !== modalToken) return;
+    box.querySelector("[data-tab='File Administrasi']").innerHTML =
+      "<div class=\\"form-group\\"><label>Nama</label><div>" + esc(d.nama) + "</div></div>" +
+      "<div class=\\"form-group\\"><label>Foto KTP</label><div><a target=\\"_blank\\" href=\\"" + d.ktp_url + "\\">Lihat KTP</a></div></div>" +
+      "<div class=\\"form-group\\"><label>Ijazah</label><div><a target=\\"_blank\\" href=\\"" + d.ijazah_url + "\\">Lihat Ijazah</a></div></div>";
+  });
+}
+
+document.querySelector("#vgt-table tbody").addEventListener("click", function (e) {
+  if (e.target.matches("span[title='Lihat Detail Mitra']")) openDetail(e.target.textContent.trim());
+});
+document.addEventListener("keydown", function (e) { if (e.key === "Escape") closeModal(); });
+document.getElementById("next").onclick = function () { if (state.page < state.pages) load(state.page + 1); };
+document.getElementById("prev").onclick = function () { if (state.page > 1) load(state.page - 1); };
+document.querySelector(".footer__navigation__page-info__current-entry").addEventListener("keydown", function (e) {
+  if (e.key === "Enter") load(parseInt(this.value, 10) || 1);
+});
+document.querySelector(".vgt-global-search__input input").addEventListener("keydown", function (e) {
+  if (e.key === "Enter") { state.q = this.value.trim(); load(1); }
+});
+load(1);
+</script>
+</body></html>
+"""
+
+DETAIL_PATH = re.compile(r"^/api/mitra/(\d{16})(/rekening)?$")
+IMAGE_PATH = re.compile(r"^/fs-storage/(foto_ktp|ijazah)/(\d{16})\.png$")
+
+
+class FixtureSite:
+    """Server HTTP di thread terpisah; url dipakai sebagai halaman awal Chrome"""
+
+    def __init__(self, rows: int = 100, per_page: int = 10, latency: Latency = Latency(), seed: int = 1):
+        self.mitra = synthetic_mitra(rows, seed)
+        self.by_nik = {row["nik"]: row for row in self.mitra}
+        self.per_page = per_page
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"✓ Fixture site: {self.url} ({len(self.mitra)} mitra, {self.per_page}/halaman)")
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def wait(self, kind: str):
+        """Simulasi latency server untuk satu jenis request"""
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+        seconds = getattr(self.latency, kind)
+        if seconds > 0:
+            time.sleep(max(0.0, seconds * random.uniform(1 - self.latency.jitter, 1 + self.latency.jitter)))
+
+    def table_page(self, page: int, per_page: int, query: str) -> dict:
+        rows = self.mitra
+        if query:
+            query = query.lower()
+            rows = [row for row in rows if query in row["nik"] or query in row["nama"].lower()]
+        pages = max(1, -(-len(rows) // per_page))
+        page = min(max(page, 1), pages)
+        fields = ("nik", "nama", "kecamatan", "pendidikan", "status")
+        return {"page": page, "pages": pages, "total": len(rows),
+                "rows": [{key: row[key] for key in fields} for row in rows[(page - 1) * per_page:page * per_page]]}
+
+
+def _handler(site: FixtureSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug("fixture: " + format % args)
+
+        def _send(self, body: bytes, content_type: str, status: int = 200):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, payload: dict):
+            self._send(json.dumps(payload).encode("utf-8"), "application/json")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/":
+                html = PAGE_HTML.replace("__PER_PAGE__", str(site.per_page))
+                return self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+
+            if url.path == "/api/mitra":
+                query = parse_qs(url.query)
+                site.wait("table")
+                return self._json(site.table_page(int(query.get("page", ["1"])[0]),
+                                                  int(query.get("per_page", [str(site.per_page)])[0]),
+                                                  query.get("q", [""])[0]))
+
+            match = DETAIL_PATH.match(url.path)
+            if match and match.group(1) in site.by_nik:
+                row = site.by_nik[match.group(1)]
+                site.wait("detail")
+                if match.group(2):
+                    return self._json({key: row[key] for key in ("bank", "rekening", "pemilik")})
+                base = f"http://{self.headers.get('Host')}/fs-storage"
+                return self._json({"nik": row["nik"], "nama": row["nama"],
+                                   "ktp_url": f"{base}/foto_ktp/{row['nik']}.png",
+                                   "ijazah_url": f"{base}/ijazah/{row['nik']}.png"})
+
+            match = IMAGE_PATH.match(url.path)
+            if match and match.group(2) in site.by_nik:
+                site.wait("image")
+                return self._send(document_image(match.group(1), match.group(2)), "image/png")
+
+            self._send(b"Not Found", "text/plain", 404)
+
+    return Handler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    arg_parser = argparse.ArgumentParser(description="Situs tiruan Seleksi Mitra untuk benchmark offline")
+    arg_parser.add_argument("--rows", type=int, default=100, help="Jumlah mitra sintetis (default: 100)")
+    arg_parser.add_argument("--per-page", type=int, default=10, help="Baris per halaman tabel (default: 10)")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--table-latency", type=float, default=Latency().table)
+    arg_parser.add_argument("--detail-latency", type=float, default=Latency().detail)
+    arg_parser.add_argument("--image-latency", type=float, default=Latency().image)
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    fixture = FixtureSite(args.rows, args.per_page,
+                          Latency(args.table_latency, args.detail_latency, args.image_latency), args.seed)
+    fixture.start(port=args.port)
+    print("Buka URL di atas di Chrome (start_chrome.bat) lalu jalankan scrape_mitra.py; Ctrl+C untuk berhenti")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fixture.stop()
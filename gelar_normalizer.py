@@ -0,0 +1,290 @@
+"""
+Normalisasi gelar akademik setelah parsing LLM (deterministik, tanpa API call)
+- "S.Sos", "S. Sos", "SSOS" -> "S.Sos." ; "AMd." -> "A.Md."
+- jenjang pendidikan (D3/S1/S2/...) dan jenis_ijazah diturunkan dari gelar
+- nama_gelar dibangun ulang dari nama + gelar kanonik
+- gelar yang tertulis di teks nama ("BUDI, S.Kom" / "BUDI (S.Kom)" / "BUDI SE") dipakai tanpa parse ulang
+- "dr." (dokter, profesi) dibedakan dari "Dr." (doktor, S3); jenjang tertulis ("D-III", "S1") dikenali
+"""
+
+import re
+import sys
+import csv
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JENIS_PT = "Perguruan Tinggi"
+JENIS_SMA = "SMA/SMK"
+
+# Urutan jenjang (yang lebih tinggi menang kalau ada beberapa gelar)
+LEVEL_ORDER = ["D1", "D2", "D3", "D4", "S1", "Profesi", "S2", "S3"]
+
+# Gelar kanonik -> jenjang
+DEGREES = {
+    # Diploma
+    "A.P.": "D1", "A.Ma.": "D2",
+    "A.Md.": "D3", "A.Md.Stat.": "D3", "A.Md.Kom.": "D3", "A.Md.Kep.": "D3", "A.Md.Keb.": "D3",
+    "A.Md.Ak.": "D3", "A.Md.T.": "D3", "A.Md.Par.": "D3", "A.Md.Farm.": "D3", "A.Md.Gz.": "D3",
+    "A.Md.Kes.": "D3", "A.Md.Pust.": "D3", "A.Md.A.B.": "D3", "A.Md.Tra.": "D3", "A.Md.Ak.Kes.": "D3",
+    "A.Md.KL.": "D3", "A.Md.RMIK.": "D3", "A.Md.P.": "D3", "A.Md.Si.": "D3", "A.Ma.Pd.": "D2",
+    "A.Md.Kom.Stat.": "D3", "Amk.": "D3",
+    "S.Tr.Stat.": "D4", "S.Tr.Kom.": "D4", "S.Tr.Keb.": "D4", "S.Tr.Kes.": "D4", "S.Tr.Kep.": "D4",
+    "S.Tr.T.": "D4", "S.Tr.Ak.": "D4", "S.Tr.Par.": "D4", "S.Tr.Sos.": "D4", "S.Tr.I.P.": "D4",
+    "S.ST.": "D4", "S.Tr.": "D4", "S.STP.": "D4",
+    # Sarjana
+    "S.Sos.": "S1", "S.Kom.": "S1", "S.T.": "S1", "S.E.": "S1", "S.Pd.": "S1", "S.Pd.I.": "S1",
+    "S.Pd.SD.": "S1", "S.H.": "S1", "S.Si.": "S1", "S.Stat.": "S1", "S.Ak.": "S1", "S.IP.": "S1",
+    "S.I.Kom.": "S1", "S.Kep.": "S1", "S.K.M.": "S1", "S.Farm.": "S1", "S.Psi.": "S1",
+    "S.Ag.": "S1", "S.H.I.": "S1", "S.E.I.": "S1", "S.Ked.": "S1", "S.Gz.": "S1", "S.Hum.": "S1",
+    "S.P.": "S1", "S.Pt.": "S1", "S.Hut.": "S1", "S.Pi.": "S1", "S.S.": "S1", "S.Sn.": "S1",
+    "S.Ds.": "S1", "S.Th.": "S1", "S.TP.": "S1", "S.Sy.": "S1", "S.Kel.": "S1", "S.Mat.": "S1",
+    "S.Tan.": "S1", "S.Fil.": "S1", "S.Kes.": "S1", "S.Keb.": "S1", "S.Ars.": "S1", "S.PWK.": "S1",
+    "S.Sos.I.": "S1", "S.Kom.I.": "S1", "S.Pd.Gr.": "Profesi", "S.A.P.": "S1", "S.M.": "S1",
+    "S.Ab.": "S1", "S.Li.": "S1", "S.Akt.": "S1", "S.Ked.Hewan.": "S1",
+    "Drs.": "S1", "Dra.": "S1",  # doktorandus/doktoranda (sarjana sistem lama)
+    # Profesi
+    "Ns.": "Profesi", "Apt.": "Profesi", "Gr.": "Profesi", "Ak.": "Profesi", "Psikolog": "Profesi",
+    "dr.": "Profesi", "drg.": "Profesi", "drh.": "Profesi",
+    # Magister
+    "M.Si.": "S2", "M.M.": "S2", "M.E.": "S2", "M.Pd.": "S2", "M.H.": "S2", "M.T.": "S2",
+    "M.Kom.": "S2", "M.Ak.": "S2", "M.Sc.": "S2", "M.A.": "S2", "M.B.A.": "S2", "M.Stat.": "S2",
+    "M.Kes.": "S2", "M.AP.": "S2", "M.P.": "S2", "M.Eng.": "S2", "M.E.I.": "S2", "M.Pd.I.": "S2",
+    "M.Hum.": "S2", "M.Psi.": "S2", "M.Kn.": "S2", "M.Sos.": "S2", "M.Ag.": "S2", "M.I.Kom.": "S2",
+    "M.Kep.": "S2", "M.Farm.": "S2", "M.Ds.": "S2", "M.Acc.": "S2", "M.IP.": "S2", "M.Han.": "S2",
+    # Doktor
+    "Dr.": "S3", "Ph.D.": "S3", "D.Sc.": "S3",
+}
+
+# Ejaan yang sering muncul di output model tapi tidak cocok secara kompak
+EXTRA_ALIASES = {
+    "AMD": "A.Md.", "AMDSTAT": "A.Md.Stat.", "AMDKOM": "A.Md.Kom.", "AMA": "A.Ma.",
+    "SSTAT": "S.Stat.", "SST": "S.ST.", "STRSTAT": "S.Tr.Stat.", "DSTAT": "S.Tr.Stat.",
+    "SKEP": "S.Kep.", "SKM": "S.K.M.", "SIP": "S.IP.", "SIKOM": "S.I.Kom.", "SSI": "S.Si.",
+    "PHD": "Ph.D.", "MBA": "M.B.A.", "MSC": "M.Sc.", "AMKEB": "A.Md.Keb.", "AMDKEB": "A.Md.Keb.",
+    "SPD": "S.Pd.", "SPDI": "S.Pd.I.", "SE": "S.E.", "ST": "S.T.", "SH": "S.H.",
+    # Gelar yang ditulis lengkap
+    "AHLIMADYA": "A.Md.", "AHLIMADYASTATISTIKA": "A.Md.Stat.", "AHLIMADYAKOMPUTER": "A.Md.Kom.",
+    "SARJANATERAPANSTATISTIKA": "S.Tr.Stat.", "SARJANASAINSTERAPAN": "S.ST.",
+    "SARJANAEKONOMI": "S.E.", "SARJANAHUKUM": "S.H.", "SARJANATEKNIK": "S.T.", "SARJANAPENDIDIKAN": "S.Pd.",
+    "SARJANAKOMPUTER": "S.Kom.", "SARJANASAINS": "S.Si.", "SARJANASOSIAL": "S.Sos.", "SARJANAPERTANIAN": "S.P.",
+    "SARJANASTATISTIKA": "S.Stat.", "SARJANAAKUNTANSI": "S.Ak.", "SARJANAAGAMA": "S.Ag.", "SARJANASASTRA": "S.S.",
+    "SARJANAKESEHATANMASYARAKAT": "S.K.M.", "SARJANAKEPERAWATAN": "S.Kep.", "SARJANAFARMASI": "S.Farm.",
+    "SARJANAPSIKOLOGI": "S.Psi.", "SARJANAILMUPOLITIK": "S.IP.", "SARJANAMANAJEMEN": "S.M.",
+    "MAGISTERMANAJEMEN": "M.M.", "MAGISTERSAINS": "M.Si.", "MAGISTERPENDIDIKAN": "M.Pd.", "MAGISTERHUKUM": "M.H.",
+    "MAGISTERTEKNIK": "M.T.", "MAGISTERKOMPUTER": "M.Kom.", "MAGISTEREKONOMI": "M.E.",
+}
+
+# Gelar yang hanya bisa dibedakan dari huruf besar/kecil: "dr." (dokter) vs "Dr." (doktor)
+CASE_SENSITIVE = {"dr": "dr."}
+
+# Gelar belakang yang sering ditulis tanpa titik ("AHMAD SE"); gelar depan (Dr., Ns., Drs.) tidak termasuk
+TRAILING_LEVELS = ("D3", "D4", "S1", "S2")
+NAME_LIKE_TOKENS = {"MA", "AMA", "SIP"}  # bisa jadi bagian nama, hanya dipakai kalau ada titik/koma
+
+COMPACT_RE = re.compile(r"[^A-Z]")
+LETTERS_RE = re.compile(r"[^A-Za-z]")
+# Jenjang yang ditulis langsung: "D3", "D-III", "D.IV", "S1", "Strata 1", "Diploma III"
+JENJANG_RE = re.compile(r"(D|DIPLOMA|S|STRATA)(IV|III|II|I|[1-4])")
+ROMAN = {"I": "1", "II": "2", "III": "3", "IV": "4"}
+SPLIT_RE = re.compile(r"[,;/&]|\s+")
+PAREN_RE = re.compile(r"\(([^)]*)\)")
+NULL_VALUES = ("", "N/A", "NONE", "NULL", "-", "TIDAK ADA", "TIDAK DITEMUKAN")
+
+
+def _compact(text: str) -> str:
+    return COMPACT_RE.sub("", text.upper())
+
+
+# Key kompak (huruf besar tanpa titik/spasi) -> gelar kanonik
+DEGREE_KEYS: Dict[str, str] = {_compact(degree): degree for degree in DEGREES
+                                if degree not in CASE_SENSITIVE.values()}
+DEGREE_KEYS.update(EXTRA_ALIASES)
+_MAX_PARTS = 4  # "S. Tr. Stat." bisa terpecah jadi beberapa potongan
+
+
+class GelarInfo(NamedTuple):
+    gelar: Optional[str]        # gelar kanonik, dipisah ", " kalau lebih dari satu
+    jenjang: Optional[str]      # jenjang tertinggi (D3, S1, S2, ...)
+    unresolved: List[str]       # potongan teks yang tidak dikenali
+
+
+def _is_null(value) -> bool:
+    return value is None or str(value).strip().upper() in NULL_VALUES
+
+
+def _lookup(text: str) -> Optional[str]:
+    """Gelar kanonik untuk potongan teks (case-insensitive kecuali "dr." vs "Dr.")"""
+    letters = LETTERS_RE.sub("", text)
+    return CASE_SENSITIVE.get(letters) or DEGREE_KEYS.get(letters.upper())
+
+
+def _jenjang_form(text: str) -> Optional[str]:
+    """Jenjang yang ditulis tanpa gelar ("D-III" -> "D3", "Strata 1" -> "S1")"""
+    match = JENJANG_RE.fullmatch(re.sub(r"[^A-Z0-9]", "", text.upper()))
+    if not match:
+        return None
+    level = match.group(1)[0] + ROMAN.get(match.group(2), match.group(2))
+    return level if level in LEVEL_ORDER else None
+
+
+def _is_trailing_degree(word: str) -> bool:
+    """Token di akhir nama yang merupakan gelar ("S.Kom", atau tanpa titik "SE"/"SPd")"""
+    degree = _lookup(word)
+    if not degree:
+        return False
+    if "." in word:
+        return True
+    return (len(word) >= 2 and word.upper() not in NAME_LIKE_TOKENS
+            and DEGREES.get(degree) in TRAILING_LEVELS)
+
+
+def normalize_gelar(raw) -> GelarInfo:
+    """Kanonikalisasi string gelar mentah (boleh berisi beberapa gelar)"""
+    if _is_null(raw):
+        return GelarInfo(None, None, [])
+
+    parts = [part for part in SPLIT_RE.split(str(raw).strip("() ")) if part.strip(".")]
+    found, written_levels, unresolved = [], [], []
+    i = 0
+    while i < len(parts):
+        # Gabungkan potongan berurutan sepanjang mungkin yang membentuk gelar/jenjang yang dikenal
+        for j in range(min(len(parts), i + _MAX_PARTS), i, -1):
+            text = "".join(parts[i:j])
+            degree = _lookup(text)
+            if degree:
+                if degree not in found:
+                    found.append(degree)
+                i = j
+                break
+            level = _jenjang_form(text)
+            if level:
+                written_levels.append(level)
+                i = j
+                break
+        else:
+            unresolved.append(parts[i])
+            i += 1
+
+    # Jenjang tertulis hanya mengisi jenjang, bukan gelar
+    levels = [DEGREES[degree] for degree in found] + written_levels
+    jenjang = max(levels, key=LEVEL_ORDER.index) if levels else None
+    return GelarInfo(", ".join(found) or None, jenjang, unresolved)
+
+
+def split_name_gelar(text) -> Tuple[Optional[str], GelarInfo]:
+    """Pisahkan nama dan gelar dari teks nama ("BUDI SANTOSO, S.Kom." / "BUDI (S.Sos.)")"""
+    if _is_null(text):
+        return None, GelarInfo(None, None, [])
+    text = str(text).strip()
+
+    candidates = PAREN_RE.findall(text)
+    name = PAREN_RE.sub(" ", text)
+    if "," in name:
+        name, tail = name.split(",", 1)
+        candidates.append(tail)
+
+    # Gelar di akhir tanpa koma ("BUDI SANTOSO S.Kom", "AHMAD SE")
+    words = name.split()
+    while len(words) > 1 and _is_trailing_degree(words[-1]):
+        candidates.insert(0, words.pop())
+    # Gelar di depan nama ("Dr. BUDI", "dr. SITI", "Drs. AHMAD")
+    while len(words) > 1 and _lookup(words[0]) and words[0].endswith("."):
+        candidates.insert(0, words.pop(0))
+
+    info = normalize_gelar(" ".join(candidates)) if candidates else GelarInfo(None, None, [])
+    return " ".join(words) or None, info
+
+
+def normalize_ijazah_result(result: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """Rapikan hasil parse_ijazah: gelar kanonik, jenjang, jenis_ijazah dan nama_gelar"""
+    result = dict(result)
+    info = normalize_gelar(result.get("gelar"))
+
+    # Nama yang masih mengandung gelar: pisahkan; gelar dari nama dipakai kalau model tidak mengisi
+    name, name_info = split_name_gelar(result.get("nama"))
+    if not _is_null(result.get("nama")):
+        result["nama"] = name
+    if info.gelar is None:
+        _, from_full = split_name_gelar(result.get("nama_gelar"))
+        resolved = name_info if name_info.gelar else from_full
+        if resolved.gelar:
+            info = resolved
+            logger.info(f"✓ Gelar resolved from name text: {info.gelar}")
+
+    if info.unresolved:
+        logger.debug(f"Gelar tidak dikenali: {info.unresolved} (raw: {result.get('gelar')})")
+
+    if info.gelar:
+        result["gelar"] = info.gelar
+        result["jenis_ijazah"] = JENIS_PT
+    elif info.jenjang:
+        # Model mengisi jenjang ("D-III") di kolom gelar: jenjang dipakai, gelar dikosongkan
+        result["gelar"] = None
+        result["jenis_ijazah"] = JENIS_PT
+    elif _is_null(result.get("gelar")):
+        result["gelar"] = None
+        if _is_null(result.get("jenis_ijazah")):
+            result["jenis_ijazah"] = JENIS_SMA
+    result["jenjang"] = info.jenjang or ("SMA" if result.get("jenis_ijazah") == JENIS_SMA else None)
+
+    if not _is_null(result.get("nama")):
+        result["nama_gelar"] = f"{result['nama']}, {result['gelar']}" if result.get("gelar") else result["nama"]
+    return result
+
+
+def needs_reparse(row: dict) -> bool:
+    """Row output yang masih butuh parse ulang ke LLM (gelar belum bisa ditentukan dari teks)"""
+    if _is_null(row.get("Ijazah_Nama")):
+        return True
+    if normalize_gelar(row.get("Ijazah_Gelar")).gelar:
+        return False
+    _, info = split_name_gelar(row.get("Ijazah_Nama_Gelar"))
+    if info.gelar:
+        return False
+    # Ijazah PT tanpa gelar yang dikenali: hasil model kemungkinan salah
+    return str(row.get("Ijazah_Jenis", "")).strip() == JENIS_PT
+
+
+def normalize_rows(rows: List[dict]) -> int:
+    """Terapkan normalisasi gelar ke row output (kolom Ijazah_*); return jumlah row yang berubah"""
+    changed = 0
+    for row in rows:
+        if _is_null(row.get("Ijazah_Nama")) and _is_null(row.get("Ijazah_Gelar")):
+            row.setdefault("Ijazah_Jenjang", "N/A")
+            continue
+        before = (row.get("Ijazah_Gelar"), row.get("Ijazah_Jenis"), row.get("Ijazah_Nama_Gelar"))
+        result = normalize_ijazah_result({
+            "jenis_ijazah": row.get("Ijazah_Jenis"),
+            "nama": row.get("Ijazah_Nama"),
+            "gelar": row.get("Ijazah_Gelar"),
+            "nama_gelar": row.get("Ijazah_Nama_Gelar"),
+        })
+        row["Ijazah_Nama"] = result.get("nama") or "N/A"
+        row["Ijazah_Gelar"] = result.get("gelar") or "N/A"
+        row["Ijazah_Jenis"] = result.get("jenis_ijazah") or "N/A"
+        row["Ijazah_Nama_Gelar"] = result.get("nama_gelar") or "N/A"
+        row["Ijazah_Jenjang"] = result.get("jenjang") or "N/A"
+        if before != (row["Ijazah_Gelar"], row["Ijazah_Jenis"], row["Ijazah_Nama_Gelar"]):
+            changed += 1
+    return changed
+
+
+if __name__ == "__main__":
+    # Cek normalisasi output lama: python gelar_normalizer.py output_xxx/mitra_data.csv
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python gelar_normalizer.py <mitra_data.csv>")
+        sys.exit(1)
+
+    with open(sys.argv[1], newline='', encoding='utf-8') as f:
+        dataset = list(csv.DictReader(f))
+    originals = [row.get("Ijazah_Gelar") for row in dataset]
+
+    changed = normalize_rows(dataset)
+    logger.info(f"Rows: {len(dataset)}, changed: {changed}, "
+                f"still need re-parse: {sum(1 for row in dataset if needs_reparse(row))}")
+    for original, row in zip(originals, dataset):
+        if original != row["Ijazah_Gelar"]:
+            logger.info(f"  {row['NIK']}: {original!r} -> {row['Ijazah_Gelar']!r} ({row['Ijazah_Jenjang']})")
@@ -0,0 +1,454 @@
+"""
+Rekam dan putar ulang sesi scraping sebagai HAR untuk benchmark regresi terhadap struktur halaman asli
+- record : semua response tab Seleksi Mitra (dokumen, bundle JS, XHR tabel/detail, gambar) plus download
+           dokumen lewat requests dicatat ke HAR. Sebelum ditulis ke disk semuanya di-scrub: NIK, nomor
+           rekening dan nama diganti nilai palsu yang konsisten, cookie/token dibuang. Body gambar asli
+           tidak pernah disimpan, bahkan di memori: scan KTP/ijazah diganti scan sintetis per NIK palsu,
+           gambar lain diganti PNG kecil. Body lain ditahan di memori sampai save() dan dibatasi
+           MAX_RECORDED_BYTES; setelah batas itu request berikutnya tidak direkam.
+           Data hasil run (sudah di-scrub) disimpan sebagai <har>.expected.json.
+- replay : Chromium baru tanpa jaringan, semua request dilayani dari HAR (route_from_har, request lain
+           di-abort); hasil ekstraksi dibandingkan dengan expected -> har_regression.csv
+    python scrape_mitra.py --record-har sessions/mitra.har      (Chrome login seperti biasa)
+    python scrape_mitra.py --replay-har sessions/mitra.har      (tanpa Chrome/login/jaringan)
+    python har_session.py sessions/mitra.har                    (ringkasan isi rekaman)
+"""
+
+import os
+import re
+import csv
+import hmac
+import json
+import base64
+import hashlib
+import logging
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from fixture_site import document_image, placeholder_image
+
+logger = logging.getLogger(__name__)
+
+HAR_VERSION = "1.2"
+EXPECTED_COLUMNS = ("NIK", "Nama Bank", "Nomor Rekening", "Nama Pemilik", "Status")
+NAME_COLUMNS = ("Nama Pemilik", "Ijazah_Nama")
+# Header sesi/login tidak boleh ikut tersimpan; panjang/encoding tidak berlaku lagi setelah body di-scrub
+DROP_HEADERS = {"cookie", "set-cookie", "authorization", "x-csrf-token", "x-xsrf-token",
+                "content-length", "content-encoding", "transfer-encoding"}
+TEXT_TYPES = ("json", "html", "text/plain", "xml")
+DOCUMENT_URL = re.compile(r"(foto_ktp|ijazah)/")
+DIGITS = re.compile(r"(?<!\d)\d{6,}(?!\d)")
+REKENING_SEPARATOR = r"[-. ]?"   # nomor rekening sering ditulis 0123-01-045678-50-1 / 0123.01.045678
+NIK_LENGTH = 16
+MIN_NAME_LENGTH = 4        # nama pendek ("Andi") terlalu mudah salah ganti di teks lain
+# Body non-gambar (HTML, JS, XHR) ditahan di memori sampai save() karena scrubbing butuh semua nama/rekening
+# dulu; satu sesi benchmark biasanya beberapa puluh MB
+MAX_RECORDED_BYTES = 256 * 1024 * 1024
+
+
+class RegressionDiff(NamedTuple):
+    nik: str
+    column: str
+    expected: str
+    actual: str
+
+
+def _is_name_key(key: str) -> bool:
+    key = key.lower()
+    return ("nama" in key or "name" in key or "pemilik" in key) and "bank" not in key
+
+
+def _is_rekening_key(key: str) -> bool:
+    key = key.lower()
+    return "rek" in key or "account" in key
+
+
+def _match_case(original: str, fake: str) -> str:
+    if original.isupper():
+        return fake.upper()
+    if original.islower():
+        return fake.lower()
+    return fake
+
+
+class Scrubber:
+    """Ganti NIK, rekening dan nama dengan nilai palsu yang konsisten di URL, body dan data expected
+
+    Salt acak per rekaman dan tidak disimpan, jadi NIK asli tidak bisa ditebak dari NIK palsu
+    (ruang NIK kecil, hash tanpa salt mudah di-brute force).
+    """
+
+    def __init__(self, salt: Optional[bytes] = None):
+        self.salt = salt or os.urandom(16)
+        self.niks: Dict[str, str] = {}
+        self.rekening: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}      # nama (lowercase) -> nama palsu
+        self._name_pattern = None
+        self._digit_pattern = None
+
+    def _digits(self, value: str, length: int) -> str:
+        digest = hmac.new(self.salt, value.encode(), hashlib.sha256).hexdigest()
+        return str(int(digest, 16))[:length].rjust(length, "0")
+
+    def fake_nik(self, nik: str) -> str:
+        """4 digit kode wilayah dipertahankan (realistis untuk sharding/validasi), sisanya palsu"""
+        if nik not in self.niks:
+            fake, attempt = None, 0
+            used = set(self.niks.values())
+            while fake is None or fake in used:
+                fake = nik[:4] + self._digits(f"{nik}:{attempt}", NIK_LENGTH - 4)
+                attempt += 1
+            self.niks[nik] = fake
+        return self.niks[nik]
+
+    def learn_rekening(self, value) -> None:
+        digits = re.sub(r"\D", "", str(value or ""))
+        if len(digits) >= 6 and digits not in self.rekening and len(digits) != NIK_LENGTH:
+            self.rekening[digits] = self._digits("rek:" + digits, len(digits))
+            self._digit_pattern = None
+
+    def learn_name(self, value) -> None:
+        name = " ".join(str(value or "").split())
+        if len(name) >= MIN_NAME_LENGTH and name.upper() != "N/A" and not name.isdigit() \
+                and name.lower() not in self.names:
+            self.names[name.lower()] = f"Mitra {len(self.names) + 1:05d}"
+            self._name_pattern = None
+
+    def learn_rows(self, rows: List[dict]) -> None:
+        for row in rows:
+            self.learn_rekening(row.get("Nomor Rekening"))
+            for column in NAME_COLUMNS:
+                self.learn_name(row.get(column))
+
+    def learn_json(self, value) -> None:
+        """Kumpulkan nama/rekening dari body XHR berdasarkan nama key (nama_lengkap, no_rekening, ...)
+
+        Nama hanya dari object yang memang data mitra (punya NIK atau rekening), supaya label menu
+        seperti {"name": "Rekening"} tidak ikut diganti dan selector scraper tetap cocok.
+        """
+        if isinstance(value, dict):
+            scalars = {key: item for key, item in value.items()
+                       if isinstance(item, (str, int)) and not isinstance(item, bool)}
+            personal = any(_is_rekening_key(key) or re.fullmatch(r"\d{16}", str(item))
+                           for key, item in scalars.items())
+            for key, item in value.items():
+                if key in scalars:
+                    if _is_rekening_key(key):
+                        self.learn_rekening(item)
+                    elif personal and _is_name_key(key) and isinstance(item, str):
+                        self.learn_name(item)
+                else:
+                    self.learn_json(item)
+        elif isinstance(value, list):
+            for item in value:
+                self.learn_json(item)
+
+    def _replace_digits(self, match) -> str:
+        if match.group("rek"):
+            # Ganti digit satu per satu supaya format pemisah (dash/titik/spasi) tetap sama
+            fake = iter(self.rekening[re.sub(r"\D", "", match.group(0))])
+            return re.sub(r"\d", lambda _: next(fake), match.group(0))
+        digits = match.group(0)
+        if len(digits) == NIK_LENGTH:
+            return self.fake_nik(digits)
+        return digits
+
+    def text(self, text: str) -> str:
+        """Satu pass untuk angka (rekening dulu, lalu semua angka 16 digit = NIK), satu pass untuk nama"""
+        if not text:
+            return text
+        if self._digit_pattern is None:
+            # Rekening yang dikenal boleh ditulis dengan pemisah; sisanya angka polos 6+ digit
+            rekening = sorted(self.rekening, key=len, reverse=True)
+            self._digit_pattern = re.compile(
+                r"(?<!\d)(?:(?P<rek>" + ("|".join(REKENING_SEPARATOR.join(digits) for digits in rekening) or "(?!)")
+                + r")|\d{6,})(?!\d)")
+        text = self._digit_pattern.sub(self._replace_digits, text)
+        if self.names:
+            if self._name_pattern is None:
+                names = sorted(self.names, key=len, reverse=True)
+                self._name_pattern = re.compile(
+                    r"(?<!\w)(" + "|".join(r"\s+".join(map(re.escape, name.split())) for name in names) + r")(?!\w)",
+                    re.IGNORECASE)
+            text = self._name_pattern.sub(
+                lambda m: _match_case(m.group(0), self.names[" ".join(m.group(0).split()).lower()]), text)
+        return text
+
+    def row(self, row: dict) -> dict:
+        return {column: self.text(str(row.get(column, ""))) for column in EXPECTED_COLUMNS}
+
+
+def _mime(headers: Dict[str, str]) -> str:
+    for key, value in headers.items():
+        if key.lower() == "content-type":
+            return value
+    return ""
+
+
+def _is_image(url: str, mime: str) -> bool:
+    """Scan dokumen (apa pun content-type-nya) dan semua response image/*"""
+    return bool(DOCUMENT_URL.search(url)) or mime.lower().startswith("image/")
+
+
+def _header_list(headers: Dict[str, str]) -> List[dict]:
+    return [{"name": key, "value": value} for key, value in headers.items()]
+
+
+def _entry(method: str, url: str, request_headers: Dict[str, str], status: int, status_text: str,
+           response_headers: Dict[str, str], body: bytes, post_data: Optional[str] = None,
+           resource_type: str = "other") -> dict:
+    """Entry HAR mentah (body belum di-scrub, hanya hidup di memori sampai save)"""
+    return {
+        "startedDateTime": datetime.now(timezone.utc).isoformat(),
+        "time": 0,
+        "_resourceType": resource_type,
+        "request": {"method": method, "url": url, "httpVersion": "HTTP/1.1", "headers": _header_list(request_headers),
+                    "queryString": [], "cookies": [], "headersSize": -1,
+                    "bodySize": len(post_data or ""),
+                    **({"postData": {"mimeType": _mime(request_headers), "text": post_data}} if post_data else {})},
+        "response": {"status": status, "statusText": status_text, "httpVersion": "HTTP/1.1",
+                     "headers": _header_list(response_headers), "cookies": [], "redirectURL": "",
+                     "headersSize": -1, "bodySize": len(body),
+                     "content": {"size": len(body), "mimeType": _mime(response_headers), "_body": body}},
+        "cache": {},
+        "timings": {"send": 0, "wait": 0, "receive": 0},
+    }
+
+
+class HarRecorder:
+    """Kumpulkan response tab (CDP) dan download requests; scrub + tulis HAR saat save()"""
+
+    def __init__(self, path: str, max_bytes: int = MAX_RECORDED_BYTES):
+        self.path = path
+        self.start_url = None
+        self.entries: List[dict] = []
+        self.max_bytes = max_bytes
+        self.body_bytes = 0          # body yang ditahan di memori
+        self.dropped = 0             # request yang tidak direkam karena max_bytes
+        self._pending = []
+
+    def attach(self, page):
+        """Dengar semua response di context tab, lalu reload supaya dokumen + bundle JS ikut terekam"""
+        self.start_url = page.url
+        page.context.on("response", self._pending.append)
+        page.reload(wait_until="domcontentloaded")
+        logger.info(f"✓ Recording HAR -> {self.path}")
+
+    def flush(self):
+        """Ambil body response yang tertunda (tidak bisa dipanggil di dalam event handler sync API)"""
+        pending, self._pending = self._pending, []
+        for response in pending:
+            if not response.url.startswith("http"):
+                continue
+            request = response.request
+            try:
+                body = response.body()
+            except Exception:
+                body = b""          # redirect / body sudah dibuang Chrome
+            self._add(_entry(request.method, response.url, request.headers, response.status,
+                             response.status_text, response.headers, body, request.post_data,
+                             request.resource_type))
+
+    def get(self, url, timeout=None):
+        """Pengganti requests.get untuk download dokumen: download seperti biasa, lalu catat"""
+        response = requests.get(url, timeout=timeout)
+        self._add(_entry("GET", url, dict(response.request.headers), response.status_code,
+                         response.reason or "", dict(response.headers), response.content, resource_type="image"))
+        return response
+
+    def _add(self, entry: dict):
+        """Simpan entry; body gambar langsung dibuang (diganti gambar sintetis saat save)"""
+        if self.dropped:
+            self.dropped += 1
+            return
+        content = entry["response"]["content"]
+        if _is_image(entry["request"]["url"], content["mimeType"]) and content["_body"]:
+            content["_body"] = b""
+            content["_synthetic"] = True
+        size = len(content["_body"])
+        if self.body_bytes + size > self.max_bytes:
+            self.dropped = 1
+            logger.warning(f"⚠ HAR: batas {self.max_bytes / 2 ** 20:.0f} MB body tercapai, "
+                           f"request berikutnya tidak direkam ({entry['request']['url'][:80]})")
+            return
+        self.body_bytes += size
+        self.entries.append(entry)
+
+    def _scrub_entry(self, entry: dict, scrubber: Scrubber) -> dict:
+        request, response = entry["request"], entry["response"]
+        content = response["content"]
+        body = content.pop("_body")
+        mime = content["mimeType"].lower()
+        url = scrubber.text(request["url"])
+
+        for part in (request, response):
+            part["headers"] = [{"name": h["name"], "value": scrubber.text(h["value"])}
+                               for h in part["headers"] if h["name"].lower() not in DROP_HEADERS]
+        if "postData" in request:
+            request["postData"]["text"] = scrubber.text(request["postData"]["text"])
+        request["url"] = url
+
+        if content.pop("_synthetic", False) or (_is_image(url, mime) and body):
+            # Gambar asli tidak pernah ditulis: scan KTP/ijazah sintetis per NIK palsu, gambar lain PNG kecil
+            if DOCUMENT_URL.search(url):
+                match = DIGITS.search(url)
+                body = document_image("foto_ktp" if "foto_ktp/" in url else "ijazah",
+                                      match.group(0) if match else url)
+            else:
+                body = placeholder_image(url)
+            mime = content["mimeType"] = "image/png"
+            response["headers"] = [h for h in response["headers"] if h["name"].lower() != "content-type"]
+            response["headers"].append({"name": "Content-Type", "value": "image/png"})
+        elif any(kind in mime for kind in TEXT_TYPES):
+            body = scrubber.text(body.decode("utf-8", errors="replace")).encode("utf-8")
+
+        if any(kind in mime for kind in TEXT_TYPES) or "javascript" in mime or "css" in mime:
+            content["text"] = body.decode("utf-8", errors="replace")
+        else:
+            content["text"] = base64.b64encode(body).decode("ascii")
+            content["encoding"] = "base64"
+        content["size"] = response["bodySize"] = len(body)
+        return entry
+
+    def save(self, rows: List[dict]) -> Optional[str]:
+        """Scrub semua entry + data run, tulis HAR dan <har>.expected.json"""
+        self.flush()
+        if not self.entries:
+            logger.warning("⚠ HAR kosong, tidak ada yang disimpan")
+            return None
+
+        scrubber = Scrubber()
+        scrubber.learn_rows(rows)
+        for entry in self.entries:
+            if "json" in entry["response"]["content"]["mimeType"].lower():
+                try:
+                    scrubber.learn_json(json.loads(entry["response"]["content"]["_body"]))
+                except ValueError:
+                    pass
+        entries = [self._scrub_entry(entry, scrubber) for entry in self.entries]
+        start_url = scrubber.text(self.start_url or entries[0]["request"]["url"])
+        har = {"log": {
+            "version": HAR_VERSION,
+            "creator": {"name": "scrape_mitra", "version": "1"},
+            "pages": [{"startedDateTime": entries[0]["startedDateTime"], "id": "page_0", "title": start_url,
+                       "pageTimings": {}}],
+            "entries": entries,
+        }}
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+        with open(expected_path(self.path), "w", encoding="utf-8") as f:
+            json.dump([scrubber.row(row) for row in rows], f, ensure_ascii=False, indent=1)
+        logger.info(f"✓ HAR saved: {self.path} ({len(entries)} requests; scrubbed {len(scrubber.niks)} NIK, "
+                    f"{len(scrubber.rekening)} rekening, {len(scrubber.names)} nama)")
+        if self.dropped:
+            logger.warning(f"⚠ {self.dropped} request terakhir tidak terekam (batas {self.max_bytes / 2 ** 20:.0f} MB); "
+                           f"replay hanya sampai bagian yang terekam")
+        return self.path
+
+
+def expected_path(har_path: str) -> str:
+    return os.path.splitext(har_path)[0] + ".expected.json"
+
+
+class ReplayResponse(NamedTuple):
+    status_code: int
+    content: bytes
+    headers: CaseInsensitiveDict
+    url: str
+
+
+class HarReplay:
+    """Layani sesi dari HAR: tab lewat route_from_har, download dokumen lewat get()"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, encoding="utf-8") as f:
+            log = json.load(f)["log"]
+        self.entries = log["entries"]
+        self.responses = {entry["request"]["url"]: entry["response"] for entry in self.entries
+                          if entry["request"]["method"] == "GET"}
+        pages = log.get("pages") or []
+        self.start_url = pages[0]["title"] if pages else next(
+            entry["request"]["url"] for entry in self.entries if "html" in entry["response"]["content"]["mimeType"])
+        self.expected = None
+        if os.path.exists(expected_path(path)):
+            with open(expected_path(path), encoding="utf-8") as f:
+                self.expected = json.load(f)
+        self.misses = 0
+
+    def open(self, p):
+        """Chromium headless baru; request yang tidak ada di HAR di-abort (tidak pernah ke jaringan)"""
+        browser = p.chromium.launch()
+        context = browser.new_context()
+        context.route_from_har(self.path, not_found="abort")
+        page = context.new_page()
+        page.goto(self.start_url, wait_until="domcontentloaded")
+        logger.info(f"✓ Replaying HAR: {self.path} ({len(self.entries)} requests)")
+        return page
+
+    def get(self, url, timeout=None) -> ReplayResponse:
+        response = self.responses.get(url)
+        if response is None:
+            self.misses += 1
+            return ReplayResponse(404, b"", CaseInsensitiveDict(), url)
+        content = response["content"]
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = CaseInsensitiveDict({h["name"]: h["value"] for h in response["headers"]})
+        return ReplayResponse(response["status"], body, headers, url)
+
+    def check(self, rows: List[dict], output_folder: str) -> List[RegressionDiff]:
+        """Bandingkan hasil ekstraksi replay dengan expected rekaman; tulis har_regression.csv"""
+        if self.expected is None:
+            logger.warning(f"⚠ {expected_path(self.path)} tidak ada, hasil replay tidak dibandingkan")
+            return []
+        actual = {str(row.get("NIK")): row for row in rows}
+        diffs = []
+        for expected in self.expected:
+            row = actual.pop(expected["NIK"], None)
+            if row is None:
+                diffs.append(RegressionDiff(expected["NIK"], "*", "row", "missing"))
+                continue
+            for column in EXPECTED_COLUMNS:
+                if str(row.get(column, "")) != expected[column]:
+                    diffs.append(RegressionDiff(expected["NIK"], column, expected[column], str(row.get(column, ""))))
+        diffs.extend(RegressionDiff(nik, "*", "-", "unexpected row") for nik in actual)
+
+        if diffs:
+            path = os.path.join(output_folder, "har_regression.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["NIK", "Kolom", "Expected", "Actual"])
+                writer.writerows(diffs)
+            logger.warning(f"✗ Replay regression: {len(diffs)} differences in "
+                           f"{len({diff.nik for diff in diffs})} NIK -> {path}")
+        else:
+            logger.info(f"✓ Replay matches recording ({len(self.expected)} rows)")
+        if self.misses:
+            logger.warning(f"⚠ {self.misses} document downloads not found in HAR")
+        return diffs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    arg_parser = argparse.ArgumentParser(description="Ringkasan isi rekaman HAR sesi scraping")
+    arg_parser.add_argument("har", help="File HAR hasil --record-har")
+    args = arg_parser.parse_args()
+
+    replay = HarReplay(args.har)
+    counts: Dict[str, List[int]] = {}
+    for entry in replay.entries:
+        stats = counts.setdefault(entry.get("_resourceType", "other"), [0, 0])
+        stats[0] += 1
+        stats[1] += entry["response"]["content"].get("size", 0)
+    print(f"Start URL : {replay.start_url}")
+    print(f"Expected  : {len(replay.expected) if replay.expected is not None else '-'} rows")
+    for kind, (count, size) in sorted(counts.items()):
+        print(f"{kind:<12}{count:>7} requests {size / 1024:>10.1f} KB")
@@ -0,0 +1,203 @@
+"""
+Ekstraksi ijazah lokal (OCR Tesseract, tanpa network) sebelum memanggil vision API
+Teks hasil OCR dibaca dengan aturan regex: nama, gelar dalam kurung, NIM, program studi,
+fakultas, institusi dan tanggal. Hasil hanya dipakai kalau field wajib lengkap dan confidence
+OCR cukup tinggi; selain itu IjazahParser tetap memanggil gpt-4o-mini.
+Butuh pytesseract + Tesseract (opsional, bahasa 'ind' disarankan); tanpa itu semua ijazah ke API.
+"""
+
+import re
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import pytesseract
+except ImportError:  # pytesseract opsional
+    pytesseract = None
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsional
+    Image = None
+
+from gelar_normalizer import JENIS_PT, JENIS_SMA, normalize_gelar, split_name_gelar
+
+logger = logging.getLogger(__name__)
+
+MIN_CONFIDENCE = 75.0      # rata-rata confidence kata Tesseract (0-100)
+MAX_SIDE = 2400            # scan besar diperkecil dulu, OCR jauh lebih cepat tanpa kehilangan teks
+OCR_CONFIG = "--oem 1 --psm 4"
+
+MONTHS = ("Januari|Februari|Pebruari|Maret|April|Mei|Juni|Juli|Agustus|"
+          "September|Oktober|Nopember|November|Desember")
+DATE_RE = re.compile(rf"\b(\d{{1,2}})\s+({MONTHS})\s+(\d{{4}})\b", re.I)
+NIM_RE = re.compile(r"\b(?:N\.?\s?I\.?\s?M|N\.?\s?P\.?\s?M|Nomor\s+Induk\s+Mahasiswa|Nomor\s+Pokok\s+Mahasiswa)"
+                    r"\.?\s*[:.]?\s*((?=[A-Z./-]{0,4}\d)[0-9A-Z][0-9A-Z./-]{4,19})", re.I)
+PAREN_RE = re.compile(r"\(([^()]{1,25})\)")
+INSTITUTION_RE = re.compile(r"\b((?:UNIVERSITAS|INSTITUT|SEKOLAH\s+TINGGI|POLITEKNIK|AKADEMI)\b([A-Z0-9 .'&-]{3,80}))")
+SCHOOL_RE = re.compile(r"\b((?:SMA|SMK|MA|SLTA|SMU|MADRASAH\s+ALIYAH|SEKOLAH\s+MENENGAH\s+(?:ATAS|KEJURUAN))"
+                       r"\b([A-Z0-9 .'&-]{0,60}))")
+PRODI_RE = re.compile(r"Program\s+Studi\s*[:.]?\s*([A-Za-z .&'()-]{3,80}?)(?=\s+Fakultas\b|\s+Jurusan\b|[,\n]|$)", re.I)
+FAKULTAS_RE = re.compile(r"\bFakultas\s*[:.]?\s*([A-Za-z .&'-]{3,80}?)(?=\s+Program\b|\s+Universitas\b|[,\n]|$)", re.I)
+NAME_MARKER_RE = re.compile(r"(?:menyatakan\s+bahwa|\bkepada\b|^\s*nama(?:\s+lengkap)?)\s*[:.]?\s*",
+                            re.I | re.M)
+NAME_LINE_RE = re.compile(r"^[A-Za-z][A-Za-z .,'()-]{2,70}$")
+STOP_WORDS = ("LAHIR", "NOMOR", "TEMPAT", "TANGGAL", "TELAH", "PROGRAM", "FAKULTAS", "UNIVERSITAS", "IJAZAH",
+              "SEKOLAH", "NIM", "NPM", "DENGAN", "GELAR", "SARJANA")
+
+
+class OcrText(NamedTuple):
+    text: str
+    confidence: float          # rata-rata confidence kata (0-100)
+    words: int
+
+
+class LocalResult(NamedTuple):
+    result: Dict[str, Optional[str]]
+    confidence: float
+    missing: List[str]         # field wajib yang tidak ditemukan
+
+    @property
+    def acceptable(self) -> bool:
+        return not self.missing and self.confidence >= MIN_CONFIDENCE
+
+
+_available = None
+
+
+def ocr_available() -> bool:
+    """pytesseract terinstall dan binary tesseract bisa dipanggil (dicek sekali)"""
+    global _available
+    if _available is None:
+        _available = False
+        if pytesseract is not None and Image is not None:
+            try:
+                pytesseract.get_tesseract_version()
+                _available = True
+            except Exception as e:
+                logger.warning(f"⚠ Tesseract tidak tersedia, OCR lokal dimatikan: {e}")
+    return _available
+
+
+def _languages() -> str:
+    try:
+        return "ind+eng" if "ind" in pytesseract.get_languages() else "eng"
+    except Exception:
+        return "eng"
+
+
+def ocr_image(path: str, timeout: Optional[float] = None) -> OcrText:
+    """OCR satu gambar; teks per baris plus rata-rata confidence kata.
+    timeout: detik; proses tesseract dihentikan (RuntimeError) kalau lewat"""
+    with Image.open(path) as img:
+        img = img.convert("L")
+        if max(img.size) > MAX_SIDE:
+            img.thumbnail((MAX_SIDE, MAX_SIDE))
+        data = pytesseract.image_to_data(img, lang=_languages(), config=OCR_CONFIG,
+                                         output_type=pytesseract.Output.DICT, timeout=timeout or 0)
+
+    lines: Dict[tuple, List[str]] = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        confidences.append(conf)
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+
+    text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return OcrText(text, confidence, len(confidences))
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = re.sub(r"\s+", " ", value).strip(" .,:;-")
+    return value or None
+
+
+def _find_name(text: str) -> Optional[str]:
+    """Nama penerima: sisa baris setelah penanda ("menyatakan bahwa", "Nama :") atau baris berikutnya"""
+    for marker in NAME_MARKER_RE.finditer(text):
+        rest = text[marker.end():]
+        for line in rest.split("\n")[:3]:
+            line = line.strip()
+            if not line:
+                continue
+            if NAME_LINE_RE.match(line) and not any(word in line.upper().split() for word in STOP_WORDS):
+                return line
+            break
+    return None
+
+
+def _find_institution(pattern: re.Pattern, text: str) -> Optional[str]:
+    """Nama institusi lengkap ("SMA NEGERI 1 KENDARI") diutamakan dari judul generik ("SEKOLAH MENENGAH ATAS")"""
+    matches = list(pattern.finditer(text))
+    named = [match for match in matches if match.group(2).strip()]
+    return (named or matches)[0].group(1) if matches else None
+
+
+def _find_gelar(text: str) -> Optional[str]:
+    """Gelar dalam kurung, mis. "SARJANA SOSIAL (S.Sos.)" """
+    for candidate in PAREN_RE.findall(text):
+        info = normalize_gelar(candidate)
+        if info.gelar:
+            return info.gelar
+    return None
+
+
+def extract_fields(text: str) -> Dict[str, Optional[str]]:
+    """Field ijazah dari teks OCR dengan aturan regex (format sama dengan parse_ijazah)"""
+    name, name_info = split_name_gelar(_find_name(text))
+    gelar = _find_gelar(text) or name_info.gelar
+
+    institution = _find_institution(INSTITUTION_RE, text)
+    school = _find_institution(SCHOOL_RE, text)
+    if gelar or (institution and not school):
+        jenis, universitas = JENIS_PT, institution
+    elif school:
+        jenis, universitas = JENIS_SMA, school
+    else:
+        jenis, universitas = None, None
+
+    nim = NIM_RE.search(text)
+    prodi = PRODI_RE.search(text)
+    fakultas = FAKULTAS_RE.search(text)
+    dates = DATE_RE.findall(text)
+
+    return {
+        "jenis_ijazah": jenis,
+        "nama": _clean(name),
+        "gelar": gelar,
+        "nama_gelar": None,
+        "nim": nim.group(1).rstrip(".") if nim else None,
+        "program_studi": _clean(prodi.group(1)) if prodi else None,
+        "fakultas": _clean(f"Fakultas {fakultas.group(1)}") if fakultas else None,
+        "universitas": _clean(universitas),
+        # Tanggal ijazah biasanya tanggal terakhir (tanggal lahir muncul lebih dulu)
+        "tanggal_ijazah": " ".join(dates[-1]) if dates else None,
+    }
+
+
+def missing_fields(result: Dict[str, Optional[str]]) -> List[str]:
+    """Field wajib: nama, jenis dan institusi; ijazah perguruan tinggi juga wajib punya gelar"""
+    required = ["nama", "jenis_ijazah", "universitas"]
+    if result.get("jenis_ijazah") == JENIS_PT:
+        required.append("gelar")
+    return [field for field in required if not result.get(field)]
+
+
+def extract_local(path: str, timeout: Optional[float] = None) -> Optional[LocalResult]:
+    """OCR + regex untuk satu ijazah; None kalau OCR lokal tidak tersedia, gagal atau lewat timeout (detik)"""
+    if not ocr_available():
+        return None
+    try:
+        ocr = ocr_image(path, timeout)
+    except Exception as e:
+        logger.warning(f"⚠ OCR lokal gagal untuk {path}: {e}")
+        return None
+    result = extract_fields(ocr.text)
+    return LocalResult(result, ocr.confidence, missing_fields(result))
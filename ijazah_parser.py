@@ -6,40 +6,125 @@ import os
 import base64
 import json
 import logging
+import threading
+import time
 from typing import Dict, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from gelar_normalizer import normalize_ijazah_result
+from image_validation import validate_image_file
+from ijazah_ocr import extract_local, ocr_available
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Naikkan setiap kali prompt atau aturan ekstraksi berubah; row dengan versi lama bisa di-reparse
+PROMPT_VERSION = "2"
+
+# Kolom output (row_data) -> key hasil parse_ijazah
+ROW_FIELDS = {
+    "Ijazah_Jenis": "jenis_ijazah",
+    "Ijazah_Nama": "nama",
+    "Ijazah_Gelar": "gelar",
+    "Ijazah_Jenjang": "jenjang",
+    "Ijazah_Nama_Gelar": "nama_gelar",
+    "Ijazah_NIM": "nim",
+    "Ijazah_Program_Studi": "program_studi",
+    "Ijazah_Fakultas": "fakultas",
+    "Ijazah_Universitas": "universitas",
+    "Ijazah_Tanggal": "tanggal_ijazah",
+}
+
+
+def result_to_row(result: Optional[Dict[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+    """Kolom Ijazah_* untuk row output dari hasil parse (semua N/A kalau tidak ada hasil)"""
+    if not result:
+        return {column: "N/A" for column in ROW_FIELDS}
+    fields = {column: result.get(key, "N/A") for column, key in ROW_FIELDS.items()}
+    fields["Ijazah_Prompt_Version"] = PROMPT_VERSION
+    return fields
+
+
+# Jeda retry bawaan SDK openai (detik, eksponensial) untuk menghitung timeout per percobaan
+SDK_RETRY_DELAY = 0.5
+SDK_MAX_RETRY_DELAY = 8.0
+
 
 class IjazahParser:
     """Parser dengan prompt yang ditingkatkan untuk ijazah Indonesia"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, local_ocr: bool = True, client=None,
+                 base_url: Optional[str] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        if client is None and not self.api_key:
             raise ValueError("OpenAI API key tidak ditemukan")
-        self.client = OpenAI(api_key=self.api_key)
-        logger.info("IjazahParser initialized")
+        # Client bisa di-inject (mock_openai.py, proxy); base_url untuk endpoint OpenAI-compatible lain
+        self.client = client or OpenAI(api_key=self.api_key, base_url=base_url or os.getenv("OPENAI_BASE_URL"))
+        # OCR lokal dulu, API hanya untuk ijazah yang field wajibnya kurang / confidence rendah
+        self.local_ocr = local_ocr and ocr_available()
+        # Parser dipakai bersama oleh thread pool (reparse_ijazah, benchmark_parser)
+        self.counts = {"local": 0, "api": 0}
+        self._counts_lock = threading.Lock()
+        logger.info(f"IjazahParser initialized (local OCR: {'on' if self.local_ocr else 'off'})")
     
+    def _count(self, source: str):
+        with self._counts_lock:
+            self.counts[source] += 1
+
     def encode_image(self, image_path: str) -> str:
         with open(image_path, "rb") as f:
             return base64.b64encode(f.read()).decode("utf-8")
     
-    def parse_ijazah(self, image_path: str) -> Dict[str, Optional[str]]:
-        """Parse ijazah dengan prompt yang ditingkatkan"""
+    def parse_ijazah(self, image_path: str, timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Parse ijazah dengan prompt yang ditingkatkan
+        timeout: batas total detik termasuk OCR lokal dan retry SDK (mis. sisa budget row scraper)"""
         
         if not os.path.exists(image_path):
             logger.error(f"File tidak ditemukan: {image_path}")
             return self._empty_result()
         
+        # File bukan gambar (halaman login HTML, terpotong, dll) tidak dikirim ke API
+        check = validate_image_file(image_path)
+        if not check.valid:
+            logger.error(f"File bukan gambar ijazah yang valid ({check.reason}): {image_path}")
+            return self._empty_result()
+        
+        started = time.monotonic()
+        if self.local_ocr:
+            # OCR lokal dapat paling banyak separuh budget, sisanya untuk fallback ke API
+            local = extract_local(image_path, timeout / 2 if timeout is not None else None)
+            if local and local.acceptable:
+                result = normalize_ijazah_result(local.result)
+                self._count("local")
+                logger.info(f"✓ Parsed locally (OCR {local.confidence:.0f}%): {result.get('jenis_ijazah')} - "
+                            f"{result.get('nama')} - {result.get('gelar')}")
+                return result
+            if local:
+                logger.info(f"↻ Local OCR not sufficient (confidence {local.confidence:.0f}%, "
+                            f"missing: {', '.join(local.missing) or '-'}), falling back to API")
+        
+        if timeout is not None:
+            timeout -= time.monotonic() - started
+            if timeout <= 0:
+                logger.warning(f"⚠ Time budget habis sebelum panggilan API: {image_path}")
+                return self._empty_result()
+        
         try:
             logger.info(f"Parsing ijazah: {image_path}")
+            self._count("api")
             image_base64 = self.encode_image(image_path)
             
-            response = self.client.chat.completions.create(
+            client = self.client
+            if timeout is not None:
+                # Timeout SDK berlaku per percobaan; sisa setelah jeda backoff dibagi rata ke semua percobaan,
+                # retry dimatikan kalau batasnya terlalu pendek
+                retries = client.max_retries
+                backoff = sum(min(SDK_RETRY_DELAY * 2 ** attempt, SDK_MAX_RETRY_DELAY) for attempt in range(retries))
+                if timeout - backoff < retries + 1:
+                    retries, backoff = 0, 0.0
+                client = client.with_options(timeout=(timeout - backoff) / (retries + 1), max_retries=retries)
+            response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 temperature=0,
                 messages=[
@@ -89,7 +174,7 @@ class IjazahParser:
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_base64}"
+                                    "url": f"data:image/{check.format};base64,{image_base64}"
                                 }
                             }
                         ]
@@ -109,21 +194,8 @@ class IjazahParser:
                 
                 result = json.loads(content.strip())
                 
-                # FALLBACK 1: Auto-detect jenis_ijazah jika kosong
-                if not result.get("jenis_ijazah"):
-                    if result.get("gelar"):
-                        result["jenis_ijazah"] = "Perguruan Tinggi"
-                    else:
-                        result["jenis_ijazah"] = "SMA/SMK"
-                    logger.info(f"✓ Auto-detected jenis_ijazah: {result['jenis_ijazah']}")
-                
-                # FALLBACK 2: Gabungkan nama + gelar jika nama_gelar kosong
-                if not result.get("nama_gelar") and result.get("nama") and result.get("gelar"):
-                    result["nama_gelar"] = f"{result['nama']}, {result['gelar']}"
-                    logger.info(f"✓ Created nama_gelar: {result['nama_gelar']}")
-                elif not result.get("nama_gelar") and result.get("nama"):
-                    result["nama_gelar"] = result['nama']
-                    logger.info(f"✓ Using nama as nama_gelar: {result['nama_gelar']}")
+                # Gelar kanonik, jenjang, jenis_ijazah dan nama_gelar ditentukan secara deterministik
+                result = normalize_ijazah_result(result)
                 
                 logger.info(f"✓ Parsed: {result.get('jenis_ijazah', 'N/A')} - {result.get('nama', 'N/A')} - {result.get('gelar', 'N/A')}")
                 logger.debug(f"Full result: {result}")
@@ -143,6 +215,7 @@ class IjazahParser:
             "jenis_ijazah": None,
             "nama": None,
             "gelar": None,
+            "jenjang": None,
             "nama_gelar": None,
             "nim": None,
             "program_studi": None,
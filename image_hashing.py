@@ -0,0 +1,111 @@
+"""
+Hash file dan hash perseptual gambar, dipakai bersama oleh duplicate_detector, image_triage
+dan download_layout
+- file_sha256 : SHA-256 isi file (dibaca per chunk)
+- image_dhash / image_ahash : difference/average hash untuk gambar yang mirip (butuh Pillow)
+- BKTree : index hash integer untuk query radius Hamming tanpa perbandingan O(n^2)
+"""
+
+import hashlib
+import logging
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_dhash(path: str, size: int = 8) -> Optional[int]:
+    """Difference hash 64-bit; None kalau Pillow tidak ada atau file tidak bisa dibaca"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            # draft() membuat decoder JPEG langsung men-decode versi kecil (jauh lebih cepat)
+            img.draft("L", (size * 8, size * 8))
+            pixels = list(img.convert("L").resize((size + 1, size)).getdata())
+    except Exception as e:
+        logger.debug(f"dHash gagal untuk {path}: {e}")
+        return None
+
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def image_ahash(path: str, size: int = 8) -> Optional[int]:
+    """Average hash 64-bit (pixel > rata-rata); sinyal kedua untuk gambar mirip"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            img.draft("L", (size * 8, size * 8))
+            pixels = list(img.convert("L").resize((size, size)).getdata())
+    except Exception as e:
+        logger.debug(f"aHash gagal untuk {path}: {e}")
+        return None
+
+    average = sum(pixels) / len(pixels)
+    value = 0
+    for pixel in pixels:
+        value = (value << 1) | (pixel > average)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """BK-tree atas hash integer dengan jarak Hamming"""
+
+    def __init__(self):
+        self.root = None  # [value, {distance: child}]
+
+    def add(self, value: int):
+        if self.root is None:
+            self.root = [value, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [value, {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, int]]:
+        """Return [(hash, distance)] dengan distance <= radius"""
+        if self.root is None:
+            return []
+        result = []
+        stack = [self.root]
+        while stack:
+            node_value, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                result.append((node_value, distance))
+            low, high = distance - radius, distance + radius
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return result
@@ -0,0 +1,189 @@
+"""
+Triage lokal sebelum ijazah dikirim ke vision API (CPU, beberapa milidetik per gambar)
+- skip  : scan kosong, rasio aspek/warna bukan dokumen (selfie, foto, kartu KTP)
+- cache : file identik dengan ijazah yang sudah pernah di-parse, atau hampir identik (perceptual
+          hash) dengan ijazah NIK yang sama, mis. file yang di-encode ulang server antar run
+- parse : selain itu, kirim ke parse_ijazah
+Butuh Pillow (opsional); tanpa Pillow semua gambar di-route ke parse.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, NamedTuple, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsional
+    Image = None
+
+from image_hashing import BKTree, file_sha256, image_dhash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_FILE = "ijazah_cache.json"
+CACHE_HASH_SIZE = 16           # dHash 256-bit
+CACHE_MAX_DISTANCE = 2
+THUMB_SIZE = 64
+
+BLANK_STDDEV = 6.0             # hampir seragam = scan kosong / foto hitam
+MIN_ASPECT, MAX_ASPECT = 0.45, 2.2
+KTP_ASPECT = (1.50, 1.70)      # kartu ID-1 (85.6 x 54 mm)
+# Foto/selfie: sangat tersaturasi dan praktis tanpa latar kertas. Ijazah berwarna (guilloche hijau/biru)
+# atau scan gelap masih punya saturasi sedang / sedikit area terang, jadi batasnya sengaja ketat
+PHOTO_MIN_SATURATION = 110
+PHOTO_MAX_BRIGHT = 0.08
+
+
+class TriageDecision(NamedTuple):
+    route: str                 # skip | cache | parse
+    reason: Optional[str]
+    result: Optional[Dict[str, Optional[str]]] = None   # hasil parse dari cache
+
+
+class ImageStats(NamedTuple):
+    width: int
+    height: int
+    mean: float                # luminance rata-rata (0-255)
+    stddev: float
+    bright_fraction: float     # proporsi pixel terang (latar kertas)
+    saturation: float          # saturasi rata-rata (0-255)
+    blue_fraction: float       # proporsi pixel biru tersaturasi (latar KTP)
+
+
+def image_stats(path: str) -> Optional[ImageStats]:
+    """Statistik thumbnail kecil; JPEG di-decode langsung dalam resolusi rendah (draft)"""
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.draft("RGB", (THUMB_SIZE * 4, THUMB_SIZE * 4))
+            thumb = img.convert("RGB").resize((THUMB_SIZE, THUMB_SIZE))
+    except Exception as e:
+        logger.debug(f"Triage: gagal membaca {path}: {e}")
+        return None
+
+    luminance = list(thumb.convert("L").getdata())
+    hsv = list(thumb.convert("HSV").getdata())
+    count = len(luminance)
+    mean = sum(luminance) / count
+    stddev = (sum((value - mean) ** 2 for value in luminance) / count) ** 0.5
+    bright = sum(1 for value in luminance if value > 180) / count
+    saturation = sum(pixel[1] for pixel in hsv) / count
+    # Hue PIL 0-255: biru ~ 130-180
+    blue = sum(1 for h, s, v in hsv if 130 <= h <= 180 and s > 70 and v > 60) / count
+    return ImageStats(width, height, mean, stddev, bright, saturation, blue)
+
+
+def classify_stats(stats: ImageStats) -> Optional[str]:
+    """Alasan skip kalau gambar jelas bukan ijazah, None kalau perlu diproses"""
+    if stats.stddev < BLANK_STDDEV:
+        return "blank"
+    aspect = stats.width / stats.height if stats.height else 0
+    if not MIN_ASPECT <= aspect <= MAX_ASPECT:
+        return "aspect_ratio"
+    # Kartu KTP: rasio kartu dan latar biru dominan
+    if KTP_ASPECT[0] <= max(aspect, 1 / aspect) <= KTP_ASPECT[1] and stats.blue_fraction > 0.35:
+        return "ktp_like"
+    # Foto/selfie: warna tersaturasi dan hampir tidak ada latar kertas terang
+    if stats.saturation > PHOTO_MIN_SATURATION and stats.bright_fraction < PHOTO_MAX_BRIGHT:
+        return "photo"
+    return None
+
+
+class IjazahTriage:
+    """Route setiap ijazah ke skip / cache / parse dan simpan hasil parse untuk run berikutnya"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_FILE, max_distance: int = CACHE_MAX_DISTANCE,
+                 version: Optional[str] = None):
+        self.cache_path = cache_path
+        self.max_distance = max_distance
+        self.version = version       # versi prompt parser; hasil versi lain tidak dipakai ulang
+        self.entries = []
+        self.by_sha: Dict[str, dict] = {}
+        self.by_hash: Dict[int, list] = {}   # dhash -> [entry]
+        self.tree = BKTree()
+        self.counts = {"skip": 0, "cache": 0, "parse": 0}
+        self.skip_reasons: Dict[str, int] = {}
+        self._pending: Dict[str, tuple] = {}   # path -> (sha, dhash, nik) yang belum masuk cache
+        self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return Image is not None
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                entries = json.load(f)
+            entries = [entry for entry in entries if entry.get("version") == self.version]
+            for entry in entries:
+                self._add(entry["sha256"], int(entry["dhash"], 16) if entry.get("dhash") else None,
+                          entry.get("nik"), entry["result"])
+            logger.info(f"✓ Loaded {len(entries)} parsed ijazah from {self.cache_path}")
+        except Exception as e:
+            logger.warning(f"⚠ Could not load ijazah cache ({self.cache_path}): {e}")
+
+    def save(self):
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"⚠ Could not save ijazah cache ({self.cache_path}): {e}")
+
+    def _add(self, sha: str, dhash: Optional[int], nik: Optional[str], result: dict):
+        entry = {"sha256": sha, "dhash": f"{dhash:x}" if dhash is not None else None, "nik": nik,
+                 "version": self.version, "result": result}
+        self.entries.append(entry)
+        self.by_sha[sha] = entry
+        if dhash is not None:
+            self.by_hash.setdefault(dhash, []).append(entry)
+            self.tree.add(dhash)
+
+    def classify(self, path: str, nik: Optional[str] = None) -> TriageDecision:
+        """Tentukan route untuk satu file ijazah"""
+        if not self.enabled:
+            self.counts["parse"] += 1
+            return TriageDecision("parse", None)
+
+        sha = file_sha256(path)
+        if sha in self.by_sha:
+            self.counts["cache"] += 1
+            return TriageDecision("cache", "identical", dict(self.by_sha[sha]["result"]))
+
+        stats = image_stats(path)
+        if stats is not None:
+            reason = classify_stats(stats)
+            if reason:
+                self.counts["skip"] += 1
+                self.skip_reasons[reason] = self.skip_reasons.get(reason, 0) + 1
+                return TriageDecision("skip", reason)
+
+        # Hash perceptual tidak bisa membedakan nama di template ijazah yang sama,
+        # jadi hasil hanya dipakai ulang untuk NIK yang sama
+        dhash = image_dhash(path, CACHE_HASH_SIZE)
+        if dhash is not None and nik and self.max_distance > 0:
+            for value, distance in sorted(self.tree.search(dhash, self.max_distance), key=lambda item: item[1]):
+                for entry in self.by_hash[value]:
+                    if entry["nik"] == nik:
+                        self.counts["cache"] += 1
+                        return TriageDecision("cache", f"similar (distance {distance})", dict(entry["result"]))
+
+        self._pending[path] = (sha, dhash, nik)
+        self.counts["parse"] += 1
+        return TriageDecision("parse", None)
+
+    def remember(self, path: str, result: Optional[dict]):
+        """Simpan hasil parse yang berhasil supaya upload yang sama tidak di-parse lagi.
+        Panggil juga dengan result=None kalau parse gagal, supaya path dilepas dari _pending"""
+        hashes = self._pending.pop(path, None)
+        if hashes and result and result.get("nama"):
+            self._add(hashes[0], hashes[1], hashes[2], dict(result))
+
+    def log_summary(self):
+        saved = self.counts["skip"] + self.counts["cache"]
+        logger.info(f"🔎 Ijazah triage: {self.counts['parse']} parsed, {self.counts['cache']} from cache, "
+                    f"{self.counts['skip']} skipped -> {saved} API calls saved")
+        if self.skip_reasons:
+            logger.info("   Skip reasons: " + ", ".join(f"{k}={v}" for k, v in sorted(self.skip_reasons.items())))
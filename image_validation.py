@@ -0,0 +1,158 @@
+"""
+Validasi file hasil download KTP/ijazah sebelum disimpan dan dikirim ke parser
+Link fs-storage yang expired tetap mengembalikan HTTP 200 berisi halaman login (HTML);
+file seperti itu (atau gambar yang terpotong/terlalu kecil) ditolak di sini.
+"""
+
+import io
+import os
+import struct
+import logging
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    from PIL import Image, ImageFile
+except ImportError:  # Pillow opsional, tanpa Pillow dimensi dibaca dari header
+    Image = ImageFile = None
+
+logger = logging.getLogger(__name__)
+
+MIN_BYTES = 5 * 1024       # dokumen hasil scan/foto jarang di bawah 5 KB
+MIN_SIDE = 200             # sisi terpendek (px) yang masih bisa dibaca
+HEADER_BYTES = 256 * 1024  # cukup untuk menemukan marker SOF JPEG (setelah EXIF)
+
+# Format yang bisa dikirim ke vision API
+PARSEABLE_FORMATS = ("jpeg", "png", "webp", "gif")
+
+
+class ImageCheck(NamedTuple):
+    valid: bool
+    reason: Optional[str]       # html | too_small | unknown_format | unsupported | truncated | corrupt | low_resolution
+    format: Optional[str]
+    width: Optional[int]
+    height: Optional[int]
+    size_bytes: int
+
+
+def detect_format(data: bytes) -> Optional[str]:
+    """Format file dari magic bytes"""
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if data[:4] == b"%PDF":
+        return "pdf"
+    # Halaman login/error (HTML) atau body JSON error dari fs-storage
+    head = data[:512].lstrip().lower()
+    if head.startswith((b"<!doctype", b"<html", b"<?xml", b"<head", b"<body", b"{")):
+        return "html"
+    return None
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    position = 2
+    while position + 9 < len(data):
+        if data[position] != 0xFF:
+            position += 1
+            continue
+        marker = data[position + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            position += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", data[position + 2:position + 4])[0]
+        # SOF0..SOF15 kecuali DHT (C4), JPG (C8), DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[position + 5:position + 9])
+            return width, height
+        position += 2 + length
+    return None
+
+
+def read_dimensions(data: bytes, fmt: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Lebar x tinggi dari header file (tanpa decode penuh)"""
+    try:
+        if fmt == "jpeg":
+            return _jpeg_dimensions(data)
+        if fmt == "png" and len(data) >= 24:
+            return struct.unpack(">II", data[16:24])
+        if fmt == "gif" and len(data) >= 10:
+            return struct.unpack("<HH", data[6:10])
+        if fmt == "webp" and len(data) >= 30:
+            chunk = data[12:16]
+            if chunk == b"VP8X":
+                return (int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1)
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", data[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(data[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    except struct.error:
+        return None
+    return None
+
+
+def _jpeg_complete(data: bytes) -> bool:
+    """Ada marker EOI setelah SOS; data setelah EOI (motion photo, trailer kamera) tetap valid"""
+    sos = data.find(b"\xff\xda")
+    return sos != -1 and data.find(b"\xff\xd9", sos) != -1
+
+
+def _decode_error(data: bytes, fmt: str) -> Optional[str]:
+    """None kalau gambar bisa di-decode penuh, selain itu truncated | corrupt"""
+    if Image is None:
+        return "truncated" if fmt == "jpeg" and not _jpeg_complete(data) else None
+    if ImageFile.LOAD_TRUNCATED_IMAGES:
+        # Setting global ini membuat Pillow diam-diam mengisi sisa gambar yang terpotong
+        if fmt == "jpeg" and not _jpeg_complete(data):
+            return "truncated"
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+        return None
+    except Exception as e:
+        return "truncated" if "truncated" in str(e).lower() else "corrupt"
+
+
+def validate_image_bytes(data: bytes, content_type: Optional[str] = None, min_bytes: int = MIN_BYTES,
+                         min_side: int = MIN_SIDE, full_decode: bool = True) -> ImageCheck:
+    """Periksa isi file: magic bytes, content type, ukuran minimum, dimensi dan bisa di-decode"""
+    size = len(data)
+    fmt = detect_format(data)
+
+    if fmt == "html" or (content_type and "text/html" in content_type.lower()):
+        return ImageCheck(False, "html", "html", None, None, size)
+    if size < min_bytes:
+        return ImageCheck(False, "too_small", fmt, None, None, size)
+    if fmt is None:
+        return ImageCheck(False, "unknown_format", None, None, None, size)
+    if fmt not in PARSEABLE_FORMATS:
+        return ImageCheck(False, "unsupported", fmt, None, None, size)
+
+    dims = read_dimensions(data if full_decode else data[:HEADER_BYTES], fmt)
+    width, height = dims if dims else (None, None)
+    if full_decode:
+        # Terpotong (download putus) diputuskan dari decode penuh, bukan dari byte terakhir file
+        error = "corrupt" if dims is None else _decode_error(data, fmt)
+        if error:
+            return ImageCheck(False, error, fmt, width, height, size)
+    if width and height and min(width, height) < min_side:
+        return ImageCheck(False, "low_resolution", fmt, width, height, size)
+    return ImageCheck(True, None, fmt, width, height, size)
+
+
+def validate_image_file(path: str, full_decode: bool = True) -> ImageCheck:
+    """Validasi file yang sudah ada di disk (full_decode=False hanya membaca header)"""
+    with open(path, "rb") as f:
+        data = f.read() if full_decode else f.read(HEADER_BYTES)
+    if not full_decode:
+        check = validate_image_bytes(data, full_decode=False, min_bytes=0)
+        size = os.path.getsize(path)
+        if check.valid and size < MIN_BYTES:
+            return check._replace(valid=False, reason="too_small", size_bytes=size)
+        return check._replace(size_bytes=size)
+    return validate_image_bytes(data)
@@ -0,0 +1,167 @@
+"""
+Verifikasi integritas folder downloads lewat manifest (downloads/manifest.csv)
+- verify   : stat + hash ulang semua file di process pool (baca via mmap), laporkan file yang
+             hilang (missing), lebih kecil dari tercatat (truncated) atau isinya berubah (changed)
+- manifest : lengkapi Size/SHA256/Width/Height untuk entri yang belum punya checksum
+             (folder lama yang di-index tanpa hash)
+    python integrity.py verify output_20260107_080000 [--workers 8]
+    python integrity.py manifest output_20260107_080000
+"""
+
+import os
+import sys
+import csv
+import mmap
+import time
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from download_layout import MANIFEST_FILE, downloads_root, manifest_path, read_manifest, write_manifest
+from image_validation import validate_image_file
+
+logger = logging.getLogger(__name__)
+
+CHUNKSIZE = 64             # file per task; gambar kecil, overhead IPC per file jadi kecil
+
+
+class FileStatus(NamedTuple):
+    nik: str
+    document: str
+    path: str
+    status: str                # ok | missing | truncated | changed | unverified
+    detail: str
+
+
+def sha256_mmap(path: str) -> str:
+    """SHA-256 lewat memory map (tanpa copy buffer Python); file kosong tidak bisa di-mmap"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    return digest.hexdigest()
+
+
+def _hash_file(path: str) -> Tuple[str, Optional[str]]:
+    """Worker process: (path, sha256) atau (path, None) kalau file tidak bisa dibaca"""
+    try:
+        return path, sha256_mmap(path)
+    except OSError:
+        return path, None
+
+
+def hash_files(paths: List[str], workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """Hash paralel; path diurutkan supaya pembacaan disk berurutan per folder"""
+    paths = sorted(paths)
+    if len(paths) < CHUNKSIZE or workers == 1:
+        return dict(map(_hash_file, paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_hash_file, paths, chunksize=CHUNKSIZE))
+
+
+def _recorded_size(row: dict) -> Optional[int]:
+    try:
+        return int(row.get("Size") or "")
+    except ValueError:
+        return None
+
+
+def verify(folder: str, workers: Optional[int] = None) -> List[FileStatus]:
+    """Bandingkan isi folder dengan manifest; hanya file yang ukurannya cocok yang di-hash ulang"""
+    root = downloads_root(folder)
+    rows = read_manifest(root)
+    if rows is None:
+        raise FileNotFoundError(f"{MANIFEST_FILE} tidak ditemukan di {root} (jalankan download_layout.py dulu)")
+
+    statuses = {}
+    to_hash = {}
+    for row in rows:
+        path = manifest_path(root, row)
+        key = (row["NIK"], row["Dokumen"], row["Path"])
+        size = _recorded_size(row)
+        try:
+            actual = os.stat(path).st_size
+        except OSError:
+            statuses[key] = ("missing", "")
+            continue
+        if size is None or not row.get("SHA256"):
+            statuses[key] = ("unverified", "tidak ada checksum di manifest")
+        elif actual < size:
+            statuses[key] = ("truncated", f"{actual} dari {size} bytes")
+        elif actual != size:
+            statuses[key] = ("changed", f"ukuran {actual}, tercatat {size} bytes")
+        else:
+            to_hash[path] = (key, row["SHA256"])
+
+    for path, digest in hash_files(list(to_hash), workers).items():
+        key, expected = to_hash[path]
+        if digest is None:
+            statuses[key] = ("missing", "tidak bisa dibaca")
+        elif digest != expected:
+            statuses[key] = ("changed", "SHA-256 berbeda")
+        else:
+            statuses[key] = ("ok", "")
+    return [FileStatus(nik, document, path, *statuses[(nik, document, path)]) for nik, document, path in
+            sorted(statuses)]
+
+
+def fill_manifest(folder: str, workers: Optional[int] = None) -> int:
+    """Isi checksum + dimensi untuk entri manifest yang belum punya; return jumlah entri yang diisi"""
+    root = downloads_root(folder)
+    rows = read_manifest(root)
+    if rows is None:
+        raise FileNotFoundError(f"{MANIFEST_FILE} tidak ditemukan di {root}")
+
+    pending = {manifest_path(root, row): row for row in rows
+               if not row.get("SHA256") and os.path.isfile(manifest_path(root, row))}
+    for path, digest in hash_files(list(pending), workers).items():
+        if digest is None:
+            continue
+        check = validate_image_file(path, full_decode=False)
+        pending[path].update({"Size": os.path.getsize(path), "SHA256": digest,
+                              "Width": check.width or "", "Height": check.height or ""})
+    write_manifest(root, rows)
+    return len(pending)
+
+
+def write_report(folder: str, statuses: List[FileStatus]) -> str:
+    path = os.path.join(folder, f"integrity_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["NIK", "Dokumen", "Path", "Status", "Detail"])
+        writer.writerows(status for status in statuses if status.status != "ok")
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    arg_parser = argparse.ArgumentParser(description="Manifest checksum dan verifikasi folder downloads")
+    arg_parser.add_argument("command", choices=["verify", "manifest"])
+    arg_parser.add_argument("folder", help="Folder output run (atau folder downloads)")
+    arg_parser.add_argument("--workers", type=int, help="Jumlah proses hash (default: jumlah CPU)")
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "manifest":
+        filled = fill_manifest(args.folder, args.workers)
+        logger.info(f"✓ Checksum added for {filled} files in {time.perf_counter() - start:.1f}s")
+        sys.exit(0)
+
+    statuses = verify(args.folder, args.workers)
+    elapsed = time.perf_counter() - start
+    counts = {}
+    for status in statuses:
+        counts[status.status] = counts.get(status.status, 0) + 1
+    total_bytes = sum(_recorded_size(row) or 0 for row in read_manifest(downloads_root(args.folder)))
+    logger.info(f"✓ Verified {len(statuses)} files ({total_bytes / 1024 ** 2:.0f} MB) in {elapsed:.1f}s: "
+                + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    problems = [status for status in statuses if status.status not in ("ok", "unverified")]
+    for status in problems[:20]:
+        logger.warning(f"✗ {status.status:<9} {status.path} {status.detail}")
+    if problems or counts.get("unverified"):
+        logger.info(f"Report: {write_report(args.folder, statuses)}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,325 @@
+"""
+Penyimpanan SQLite untuk data mitra:
+- MitraStore: mirror lokal untuk mode sync (satu row per NIK, hanya delta yang ditulis)
+- ResultStore: database hasil per run (rows, metadata run, stats, path gambar) dengan index
+  pada NIK, Nomor Rekening, Nama Bank dan Ijazah_Jenis; Excel/CSV diexport dari sini
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Mapping key row_data (format data_list scraper) -> kolom SQLite
+FIELD_COLUMNS = [
+    ("NIK", "nik"),
+    ("Nama Bank", "nama_bank"),
+    ("Nomor Rekening", "nomor_rekening"),
+    ("Nama Pemilik", "nama_pemilik"),
+    ("Path KTP", "path_ktp"),
+    ("Path Ijazah", "path_ijazah"),
+    ("Ijazah_Jenis", "ijazah_jenis"),
+    ("Ijazah_Nama", "ijazah_nama"),
+    ("Ijazah_Gelar", "ijazah_gelar"),
+    ("Ijazah_Jenjang", "ijazah_jenjang"),
+    ("Ijazah_Nama_Gelar", "ijazah_nama_gelar"),
+    ("Ijazah_NIM", "ijazah_nim"),
+    ("Ijazah_Program_Studi", "ijazah_program_studi"),
+    ("Ijazah_Fakultas", "ijazah_fakultas"),
+    ("Ijazah_Universitas", "ijazah_universitas"),
+    ("Ijazah_Tanggal", "ijazah_tanggal"),
+    ("Ijazah_Prompt_Version", "ijazah_prompt_version"),
+    ("Status", "status"),
+]
+DATA_COLUMNS = [column for _, column in FIELD_COLUMNS]
+
+# Kolom yang di-index untuk lookup cepat (NIK di tabel mitra sudah PRIMARY KEY)
+INDEXED_COLUMNS = ["nik", "nomor_rekening", "nama_bank", "ijazah_jenis"]
+
+# Nilai Path KTP/Ijazah yang bukan path file
+NO_FILE_VALUES = ("Not Downloaded", "Failed")
+
+
+def _data_column_defs() -> str:
+    return ",\n".join(f"    {column} TEXT" for column in DATA_COLUMNS[1:])
+
+
+def _index_statements(table: str) -> str:
+    return "\n".join(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column});"
+                     for column in INDEXED_COLUMNS if not (table == "mitra" and column == "nik"))
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: List[tuple]):
+    """Migrasi database lama: tambahkan kolom yang belum ada (CREATE TABLE IF NOT EXISTS tidak mengubah tabel)"""
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    for column, column_type in columns:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            logger.info(f"↻ {table}: kolom {column} ditambahkan")
+
+
+def row_to_record(row_data: dict) -> Dict[str, object]:
+    """Konversi row_data scraper ke kolom SQLite; key lain disimpan di kolom JSON 'extra'"""
+    known = {key for key, _ in FIELD_COLUMNS} | {"_has_mismatch"}
+    record = {column: row_data.get(key) for key, column in FIELD_COLUMNS}
+    record["has_mismatch"] = 1 if row_data.get("_has_mismatch") else 0
+    extra = {k: v for k, v in row_data.items() if k not in known}
+    record["extra"] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return record
+
+
+def record_to_row(record: sqlite3.Row) -> dict:
+    """Kebalikan row_to_record: kolom SQLite -> row_data format data_list"""
+    row_data = {key: record[column] for key, column in FIELD_COLUMNS}
+    row_data["_has_mismatch"] = bool(record["has_mismatch"])
+    if record["extra"]:
+        row_data.update(json.loads(record["extra"]))
+    return row_data
+
+
+class MitraStore:
+    """Mirror lokal data mitra per NIK, dengan fingerprint baris tabel untuk deteksi perubahan"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        self.conn.executescript(f"""
+CREATE TABLE IF NOT EXISTS mitra (
+    nik TEXT PRIMARY KEY,
+{_data_column_defs()},
+    has_mismatch INTEGER DEFAULT 0,
+    extra TEXT,
+    fingerprint TEXT,
+    first_seen TEXT,
+    updated_at TEXT,
+    checked_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT,
+    finished_at TEXT,
+    rows_seen INTEGER,
+    inserted INTEGER,
+    updated INTEGER,
+    unchanged INTEGER,
+    failed INTEGER,
+    bank_rechecked INTEGER
+);
+""")
+        _add_missing_columns(self.conn, "mitra", [(column, "TEXT") for column in DATA_COLUMNS[1:]])
+        _add_missing_columns(self.conn, "sync_runs", [("bank_rechecked", "INTEGER")])
+        self.conn.executescript(_index_statements("mitra"))
+        self.conn.commit()
+
+    def fingerprints(self) -> Dict[str, str]:
+        return {r["nik"]: r["fingerprint"] for r in self.conn.execute("SELECT nik, fingerprint FROM mitra")}
+
+    def get(self, nik: str) -> Optional[dict]:
+        record = self.conn.execute("SELECT * FROM mitra WHERE nik = ?", (nik,)).fetchone()
+        return record_to_row(record) if record else None
+
+    def niks_without_ijazah(self) -> List[str]:
+        """NIK yang ijazahnya belum pernah terdownload (dicek ulang berkala untuk upload baru)"""
+        rows = self.conn.execute(
+            "SELECT nik FROM mitra WHERE path_ijazah IS NULL OR path_ijazah IN ('Not Downloaded', 'Failed')")
+        return [r["nik"] for r in rows]
+
+    def least_recently_checked(self, limit: int) -> List[str]:
+        """NIK yang modalnya paling lama tidak dibuka (checked_at hanya diperbarui saat upsert)"""
+        rows = self.conn.execute("SELECT nik FROM mitra ORDER BY checked_at, nik LIMIT ?", (limit,))
+        return [r["nik"] for r in rows]
+
+    def upsert(self, row_data: dict, fingerprint: Optional[str]) -> str:
+        """Tulis satu row; return 'inserted', 'updated' atau 'unchanged'"""
+        now = datetime.now().isoformat(timespec="seconds")
+        record = row_to_record(row_data)
+        existing = self.conn.execute("SELECT * FROM mitra WHERE nik = ?", (record["nik"],)).fetchone()
+
+        if existing is None:
+            record.update({"fingerprint": fingerprint, "first_seen": now, "updated_at": now, "checked_at": now})
+            columns = ", ".join(record)
+            placeholders = ", ".join("?" for _ in record)
+            self.conn.execute(f"INSERT INTO mitra ({columns}) VALUES ({placeholders})", list(record.values()))
+            self.conn.commit()
+            return "inserted"
+
+        changed = any(existing[column] != value for column, value in record.items())
+        if changed:
+            record.update({"fingerprint": fingerprint, "updated_at": now, "checked_at": now})
+        else:
+            record = {"fingerprint": fingerprint, "checked_at": now}
+        assignments = ", ".join(f"{column} = ?" for column in record)
+        self.conn.execute(f"UPDATE mitra SET {assignments} WHERE nik = ?", list(record.values()) + [existing["nik"]])
+        self.conn.commit()
+        return "updated" if changed else "unchanged"
+
+    def all_rows(self) -> List[dict]:
+        return [record_to_row(r) for r in self.conn.execute("SELECT * FROM mitra ORDER BY nik")]
+
+    def record_sync(self, started_at: str, stats: Dict[str, int]):
+        self.conn.execute(
+            "INSERT INTO sync_runs (started_at, finished_at, rows_seen, inserted, updated, unchanged, failed, "
+            "bank_rechecked) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (started_at, datetime.now().isoformat(timespec="seconds"), stats.get("rows_seen", 0),
+             stats.get("inserted", 0), stats.get("updated", 0), stats.get("unchanged", 0), stats.get("failed", 0),
+             stats.get("bank_rechecked", 0)))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class ResultStore:
+    """Database SQLite hasil satu run scraping (ditulis di folder output)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        self.conn.executescript(f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    output_folder TEXT,
+    mode TEXT,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS run_stats (
+    run_id INTEGER REFERENCES runs(id),
+    metric TEXT,
+    value INTEGER,
+    PRIMARY KEY (run_id, metric)
+);
+CREATE TABLE IF NOT EXISTS rows (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER REFERENCES runs(id),
+    nik TEXT,
+{_data_column_defs()},
+    has_mismatch INTEGER DEFAULT 0,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS images (
+    run_id INTEGER REFERENCES runs(id),
+    nik TEXT,
+    kind TEXT,
+    path TEXT,
+    size_bytes INTEGER,
+    format TEXT,
+    width INTEGER,
+    height INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_images_nik ON images(nik);
+""")
+        _add_missing_columns(self.conn, "rows", [(column, "TEXT") for column in DATA_COLUMNS[1:]])
+        self.conn.executescript(_index_statements("rows"))
+        self.conn.commit()
+
+    def write_run(self, output_folder: str, mode: str, started_at: str,
+                  data_list: List[dict], stats: Dict[str, int], image_checks: Optional[dict] = None) -> int:
+        """Tulis satu run lengkap (metadata, rows, stats, path gambar) dalam satu transaksi.
+        image_checks: {path: ImageCheck} dari validasi download (format dan dimensi)"""
+        image_checks = image_checks or {}
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (output_folder, mode, started_at, finished_at) VALUES (?, ?, ?, ?)",
+                (output_folder, mode, started_at, datetime.now().isoformat(timespec="seconds")))
+            run_id = cursor.lastrowid
+
+            records = [row_to_record(row_data) for row_data in data_list]
+            if records:
+                columns = list(records[0])
+                self.conn.executemany(
+                    f"INSERT INTO rows (run_id, {', '.join(columns)}) VALUES (?, {', '.join('?' for _ in columns)})",
+                    ([run_id] + [record[column] for column in columns] for record in records))
+
+            self.conn.executemany(
+                "INSERT INTO run_stats (run_id, metric, value) VALUES (?, ?, ?)",
+                ((run_id, metric, value) for metric, value in stats.items()))
+
+            images = []
+            for row_data in data_list:
+                for kind, key in (("ktp", "Path KTP"), ("ijazah", "Path Ijazah")):
+                    path = row_data.get(key)
+                    if path and path not in NO_FILE_VALUES and not path.startswith("Invalid"):
+                        size = os.path.getsize(path) if os.path.exists(path) else None
+                        check = image_checks.get(path)
+                        images.append((run_id, row_data.get("NIK"), kind, path, size,
+                                       check.format if check else None,
+                                       check.width if check else None,
+                                       check.height if check else None))
+            self.conn.executemany(
+                "INSERT INTO images (run_id, nik, kind, path, size_bytes, format, width, height) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", images)
+        return run_id
+
+    def rows(self, run_id: Optional[int] = None) -> List[dict]:
+        """Rows dalam urutan scraping (semua run, atau satu run)"""
+        if run_id is None:
+            records = self.conn.execute("SELECT * FROM rows ORDER BY row_id")
+        else:
+            records = self.conn.execute("SELECT * FROM rows WHERE run_id = ? ORDER BY row_id", (run_id,))
+        return [record_to_row(r) for r in records]
+
+    def latest_run_id(self) -> Optional[int]:
+        record = self.conn.execute("SELECT MAX(id) AS id FROM runs").fetchone()
+        return record["id"] if record else None
+
+    def find_by_nik(self, nik: str) -> List[dict]:
+        return [record_to_row(r) for r in self.conn.execute("SELECT * FROM rows WHERE nik = ?", (nik,))]
+
+    def find_by_rekening(self, nomor_rekening: str) -> List[dict]:
+        return [record_to_row(r) for r in
+                self.conn.execute("SELECT * FROM rows WHERE nomor_rekening = ?", (nomor_rekening,))]
+
+    def shared_accounts(self) -> Dict[str, List[str]]:
+        """Nomor rekening yang dipakai lebih dari satu NIK"""
+        result = {}
+        for r in self.conn.execute(
+                "SELECT nomor_rekening, GROUP_CONCAT(DISTINCT nik) AS niks FROM rows "
+                "WHERE nomor_rekening IS NOT NULL AND nomor_rekening NOT IN ('', 'N/A') "
+                "GROUP BY nomor_rekening HAVING COUNT(DISTINCT nik) > 1"):
+            result[r["nomor_rekening"]] = r["niks"].split(",")
+        return result
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    # Lookup cepat lintas run: python mitra_store.py nik|rekening|shared <nilai> output_*/mitra_data.db
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 3:
+        print("Usage: python mitra_store.py nik <NIK> <db...>")
+        print("       python mitra_store.py rekening <NOMOR> <db...>")
+        print("       python mitra_store.py shared <db...>")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    value = sys.argv[2] if command != "shared" else None
+    db_paths = sys.argv[3:] if command != "shared" else sys.argv[2:]
+
+    for db_path in db_paths:
+        store = ResultStore(db_path)
+        try:
+            if command == "shared":
+                for rekening, niks in store.shared_accounts().items():
+                    print(f"{db_path}\t{rekening}\t{', '.join(niks)}")
+            else:
+                found = store.find_by_nik(value) if command == "nik" else store.find_by_rekening(value)
+                for row_data in found:
+                    print(f"{db_path}\t{row_data['NIK']}\t{row_data['Nomor Rekening']}\t"
+                          f"{row_data['Nama Bank']}\t{row_data['Nama Pemilik']}\t{row_data['Status']}")
+        finally:
+            store.close()
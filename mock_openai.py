@@ -0,0 +1,190 @@
+"""
+Server lokal pengganti OpenAI (endpoint /v1/chat/completions) untuk test dan benchmark parser offline
+Mengembalikan JSON ijazah dari template (dipilih deterministik dari hash gambar, jadi gambar yang sama
+selalu menghasilkan ijazah yang sama) atau dari file JSON tetap, dengan latency, error 500 dan
+rate limit 429 (header retry-after-ms) yang bisa diatur.
+    python mock_openai.py --port 8766 --latency 0.8 --error-rate 0.02 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=mock python reparse_ijazah.py ...
+"""
+
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jawaban model seperti aslinya (sebelum normalize_ijazah_result)
+TEMPLATES: List[Dict[str, Optional[str]]] = [
+    {"jenis_ijazah": "Perguruan Tinggi", "nama": "Rahmat Hidayat", "gelar": "S.Sos.",
+     "nama_gelar": "RAHMAT HIDAYAT, S.Sos.", "nim": "B1A115023", "program_studi": "Ilmu Administrasi Negara",
+     "fakultas": "Fakultas Ilmu Sosial dan Ilmu Politik", "universitas": "Universitas Halu Oleo",
+     "tanggal_ijazah": "28 Oktober 2019"},
+    {"jenis_ijazah": "Perguruan Tinggi", "nama": "Wa Ode Sulastri", "gelar": "S.Pd",
+     "nama_gelar": "WA ODE SULASTRI, S.Pd", "nim": "A1D216045", "program_studi": "Pendidikan Matematika",
+     "fakultas": "Fakultas Keguruan dan Ilmu Pendidikan", "universitas": "Universitas Halu Oleo",
+     "tanggal_ijazah": "12 Desember 2020"},
+    {"jenis_ijazah": "Perguruan Tinggi", "nama": "Andi Saputra", "gelar": "A.Md.",
+     "nama_gelar": "ANDI SAPUTRA, A.Md.", "nim": "1803421", "program_studi": "Teknik Komputer",
+     "fakultas": None, "universitas": "Politeknik Negeri Ujung Pandang", "tanggal_ijazah": "5 September 2021"},
+    {"jenis_ijazah": "SMA/SMK", "nama": "Nur Anggraini", "gelar": None, "nama_gelar": "NUR ANGGRAINI",
+     "nim": None, "program_studi": None, "fakultas": None, "universitas": "SMA Negeri 1 Kendari",
+     "tanggal_ijazah": "2 Mei 2016"},
+]
+
+
+class MockBehavior(NamedTuple):
+    latency: float = 0.8             # detik per request sukses (rata-rata)
+    jitter: float = 0.3              # variasi acak +- (proporsi dari latency)
+    tail_rate: float = 0.02          # proporsi request lambat (tail latency)
+    tail_factor: float = 5.0         # request lambat = latency x faktor ini
+    error_rate: float = 0.0          # proporsi HTTP 500
+    rate_limit_rate: float = 0.0     # proporsi HTTP 429
+    retry_after_ms: int = 200        # header retry-after-ms pada 429
+    markdown: bool = False           # bungkus JSON dengan ```json seperti jawaban model kadang-kadang
+
+
+class MockOpenAI:
+    """Server HTTP di thread terpisah; base_url dipakai sebagai base_url client OpenAI"""
+
+    def __init__(self, behavior: MockBehavior = MockBehavior(), response: Optional[dict] = None, seed: int = 1):
+        self.behavior = behavior
+        self.response = response          # JSON tetap untuk semua request (None = pakai TEMPLATES)
+        self.random = random.Random(seed)
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"✓ Mock OpenAI: {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def outcome(self) -> str:
+        """ok | rate_limited | errors untuk satu request"""
+        with self._lock:
+            self.counts["requests"] += 1
+            roll = self.random.random()
+        if roll < self.behavior.rate_limit_rate:
+            return "rate_limited"
+        if roll < self.behavior.rate_limit_rate + self.behavior.error_rate:
+            return "errors"
+        return "ok"
+
+    def delay(self) -> float:
+        behavior = self.behavior
+        with self._lock:
+            seconds = behavior.latency * self.random.uniform(1 - behavior.jitter, 1 + behavior.jitter)
+            if self.random.random() < behavior.tail_rate:
+                seconds *= behavior.tail_factor
+        return max(0.0, seconds)
+
+    def content(self, body: bytes) -> str:
+        """JSON ijazah untuk request ini; template dipilih dari hash isi request (gambar)"""
+        result = self.response or TEMPLATES[int(hashlib.sha1(body).hexdigest(), 16) % len(TEMPLATES)]
+        text = json.dumps(result, ensure_ascii=False)
+        return f"```json\n{text}\n```" if self.behavior.markdown else text
+
+
+def _handler(mock: MockOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug("mock-openai: " + format % args)
+
+        def _json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                return self._json(200, mock.counts)
+            self._json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+            outcome = mock.outcome()
+            if outcome == "rate_limited":
+                mock._count("rate_limited")
+                return self._json(429, {"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                                  "code": "rate_limit_exceeded"}},
+                                  {"retry-after-ms": str(mock.behavior.retry_after_ms)})
+            time.sleep(mock.delay())
+            if outcome == "errors":
+                mock._count("errors")
+                return self._json(500, {"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+
+            mock._count("ok")
+            content = mock.content(body)
+            self._json(200, {
+                "id": f"chatcmpl-mock-{mock.counts['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(body) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(body) + len(content)) // 4},
+            })
+
+    return Handler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    defaults = MockBehavior()
+    arg_parser = argparse.ArgumentParser(description="Server pengganti OpenAI untuk test/benchmark parser ijazah")
+    arg_parser.add_argument("--port", type=int, default=8766)
+    arg_parser.add_argument("--latency", type=float, default=defaults.latency)
+    arg_parser.add_argument("--tail-rate", type=float, default=defaults.tail_rate)
+    arg_parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate)
+    arg_parser.add_argument("--retry-after-ms", type=int, default=defaults.retry_after_ms)
+    arg_parser.add_argument("--response", help="File JSON ijazah tetap untuk semua request (default: template)")
+    args = arg_parser.parse_args()
+
+    response = None
+    if args.response:
+        with open(args.response, encoding="utf-8") as f:
+            response = json.load(f)
+    mock = MockOpenAI(MockBehavior(latency=args.latency, tail_rate=args.tail_rate, error_rate=args.error_rate,
+                                   rate_limit_rate=args.rate_limit_rate, retry_after_ms=args.retry_after_ms),
+                      response)
+    mock.start(port=args.port)
+    print(f"Set OPENAI_BASE_URL={mock.base_url} dan OPENAI_API_KEY=mock; Ctrl+C untuk berhenti")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,270 @@
+"""
+Capture-then-extract: simpan HTML modal detail mitra per NIK, ekstrak dataset offline tanpa browser.
+- Arsip: <folder>/<NIK>.json.gz berisi outerHTML .v--modal-box tab File Administrasi dan Rekening
+- Ekstraksi memakai html.parser (stdlib) di ProcessPoolExecutor
+Aturan ekstraksi yang diperbaiki bisa dijalankan ulang atas seluruh arsip:
+    python modal_capture.py output_xxx/captures [mitra_data_offline.csv]
+"""
+
+import os
+import re
+import sys
+import csv
+import gzip
+import json
+import time
+import logging
+from datetime import datetime
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from bank_normalizer import looks_like_bank
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FOLDER = "captures"
+CAPTURE_SUFFIX = ".json.gz"
+
+# Field rekening -> teks label di tab Rekening
+BANK_LABELS = {
+    "Nama Bank": "Nama Bank",
+    "Nomor Rekening": "Nomor Rekening",
+    "Nama Pemilik": "Nama Pemilik Rekening",
+}
+KTP_LINK = "foto_ktp/"
+IJAZAH_LINK = "ijazah/"
+IJAZAH_COLUMNS = ("Ijazah_Jenis", "Ijazah_Nama", "Ijazah_Gelar", "Ijazah_Jenjang", "Ijazah_Nama_Gelar",
+                  "Ijazah_NIM", "Ijazah_Program_Studi", "Ijazah_Fakultas", "Ijazah_Universitas", "Ijazah_Tanggal")
+
+BLOCK_TAGS = {"div", "p", "label", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6",
+              "section", "header", "footer", "ul", "ol", "table", "form"}
+VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "source", "wbr", "col", "area"}
+SKIP_TAGS = {"script", "style", "template"}
+
+
+def capture_path(folder: str, nik: str) -> str:
+    return os.path.join(folder, f"{nik}{CAPTURE_SUFFIX}")
+
+
+def save_capture(folder: str, nik: str, file_administrasi: str, rekening: str) -> str:
+    """Tulis arsip satu NIK (tmp + replace supaya file tidak setengah jadi kalau run terhenti)"""
+    os.makedirs(folder, exist_ok=True)
+    path = capture_path(folder, nik)
+    payload = {
+        "nik": nik,
+        "captured_at": datetime.now().isoformat(timespec="seconds"),
+        "file_administrasi": file_administrasi,
+        "rekening": rekening,
+    }
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_capture(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def clean_rekening(value: str) -> str:
+    """Nomor rekening hanya angka (N/A tetap N/A)"""
+    return value if value == "N/A" else re.sub(r'[^0-9]', '', value)
+
+
+def fill_bank_from_text(modal_text: str, fields: Dict[str, str], verbose: bool = True):
+    """Strategy text dump: nilai ada di baris setelah label (dipakai live dan offline)"""
+    log = logger.info if verbose else logger.debug
+    lines = modal_text.split('\n')
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+
+        if fields["Nama Bank"] == "N/A" and "Nama Bank" in line and i + 1 < len(lines):
+            potential_bank = lines[i + 1].strip()
+            if potential_bank and looks_like_bank(potential_bank):
+                fields["Nama Bank"] = potential_bank
+                log(f"Fallback found Nama Bank: {potential_bank}")
+
+        if fields["Nomor Rekening"] == "N/A" and "Nomor Rekening" in line and i + 1 < len(lines):
+            potential_rek = lines[i + 1].strip()
+            if potential_rek and (potential_rek.replace(' ', '').isdigit() or len(potential_rek) > 8):
+                fields["Nomor Rekening"] = potential_rek
+                log(f"Fallback found Nomor Rekening: {potential_rek}")
+
+        if fields["Nama Pemilik"] == "N/A" and "Nama Pemilik" in line and i + 1 < len(lines):
+            potential_owner = lines[i + 1].strip()
+            if potential_owner and len(potential_owner) > 2 and not potential_owner.isdigit():
+                fields["Nama Pemilik"] = potential_owner
+                log(f"Fallback found Nama Pemilik: {potential_owner}")
+
+
+class ModalContent(NamedTuple):
+    links: List[str]                  # semua href <a>
+    labels: List[Tuple[str, str]]     # (teks label, teks div.form-control-plaintext tepat setelahnya)
+    text: str                         # perkiraan inner_text (satu baris per elemen blok)
+
+
+class _ModalParser(HTMLParser):
+    """Satu pass atas HTML modal: link, pasangan label + form-control-plaintext, dan text dump"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.labels = []
+        self.parts = []
+        self.depth = 0
+        self.skip_depth = None
+        self.label_text = None       # teks label yang sedang dibaca
+        self.pending = None          # (teks label, depth) menunggu sibling berikutnya
+        self.value = None            # [teks label, depth div, potongan teks]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS and self.skip_depth is None:
+            self.skip_depth = self.depth
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        attrs = dict(attrs)
+        if tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+
+        if self.pending and self.pending[1] == self.depth:
+            classes = (attrs.get("class") or "").split()
+            if tag == "div" and "form-control-plaintext" in classes:
+                self.value = [self.pending[0], self.depth, []]
+            self.pending = None
+        if tag == "label":
+            self.label_text = []
+
+        if tag not in VOID_TAGS:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        self.depth = max(self.depth - 1, 0)
+        if self.skip_depth is not None and self.depth <= self.skip_depth:
+            self.skip_depth = None
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+        if tag == "label" and self.label_text is not None:
+            self.pending = (" ".join("".join(self.label_text).split()), self.depth)
+            self.label_text = None
+        elif self.value and tag == "div" and self.depth == self.value[1]:
+            self.labels.append((self.value[0], " ".join("".join(self.value[2]).split())))
+            self.value = None
+        if self.pending and self.depth < self.pending[1]:
+            self.pending = None
+
+    def handle_data(self, data):
+        if self.skip_depth is not None:
+            return
+        if self.label_text is not None:
+            self.label_text.append(data)
+        if self.value is not None:
+            self.value[2].append(data)
+        text = " ".join(data.split())
+        if text:
+            self.parts.append(text + " ")
+
+
+def parse_modal(html: str) -> ModalContent:
+    parser = _ModalParser()
+    parser.feed(html or "")
+    parser.close()
+    lines = (line.strip() for line in "".join(parser.parts).split("\n"))
+    return ModalContent(parser.links, parser.labels, "\n".join(line for line in lines if line))
+
+
+def extract_bank_fields(content: ModalContent) -> Tuple[str, str, str]:
+    """Strategy label lalu text dump, sama dengan extract_bank_info versi live"""
+    fields = {field: "N/A" for field in BANK_LABELS}
+    for field, label in BANK_LABELS.items():
+        for label_text, value in content.labels:
+            if label in label_text and value:
+                fields[field] = value
+                break
+    if "N/A" in fields.values():
+        fill_bank_from_text(content.text, fields, verbose=False)
+    return fields["Nama Bank"], clean_rekening(fields["Nomor Rekening"]), fields["Nama Pemilik"]
+
+
+def extract_capture(path: str) -> dict:
+    """Row dataset dari satu arsip (dokumen tidak didownload; link disimpan di URL KTP/URL Ijazah)"""
+    nik = os.path.basename(path)[:-len(CAPTURE_SUFFIX)]
+    row = {"NIK": nik}
+    try:
+        capture = load_capture(path)
+        nik = row["NIK"] = capture.get("nik") or nik
+        documents = parse_modal(capture.get("file_administrasi"))
+        nama_bank, no_rekening, nama_pemilik = extract_bank_fields(parse_modal(capture.get("rekening")))
+    except Exception as e:
+        row.update({"Nama Bank": "N/A", "Nomor Rekening": "N/A", "Nama Pemilik": "N/A",
+                    "Path KTP": "Failed", "Path Ijazah": "Failed",
+                    "Status": f"Failed (capture): {str(e)[:100]}"})
+        row.update({column: "N/A" for column in IJAZAH_COLUMNS})
+        return row
+
+    ktp_url = next((href for href in documents.links if KTP_LINK in href), None)
+    ijazah_url = next((href for href in documents.links if IJAZAH_LINK in href), None)
+    row.update({
+        "Nama Bank": nama_bank,
+        "Nomor Rekening": no_rekening,
+        "Nama Pemilik": nama_pemilik,
+        "Path KTP": "Not Downloaded",
+        "Path Ijazah": "Not Downloaded",
+        "Status": "Success",
+    })
+    row.update({column: "N/A" for column in IJAZAH_COLUMNS})
+    row["URL KTP"] = ktp_url or "N/A"
+    row["URL Ijazah"] = ijazah_url or "N/A"
+    row["Captured At"] = capture.get("captured_at", "")
+    return row
+
+
+def list_captures(folder: str) -> List[str]:
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(CAPTURE_SUFFIX))
+
+
+def extract_archive(folder: str, workers: Optional[int] = None) -> List[dict]:
+    """Ekstrak semua arsip di folder secara paralel (proses terpisah, tanpa browser)"""
+    paths = list_captures(folder)
+    if len(paths) < 50 or workers == 1:
+        return [extract_capture(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_capture, paths, chunksize=32))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python modal_capture.py <captures folder> [output.csv]")
+        sys.exit(1)
+
+    folder = sys.argv[1]
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(folder)),
+                                                                 "mitra_data_offline.csv")
+    start = time.perf_counter()
+    rows = extract_archive(folder)
+    elapsed = time.perf_counter() - start
+    if not rows:
+        logger.warning(f"⚠ No captures found in {folder}")
+        sys.exit(1)
+
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    failed = sum(1 for row in rows if row["Status"] != "Success")
+    logger.info(f"✓ Extracted {len(rows)} captures in {elapsed:.2f}s ({failed} failed) -> {output}")
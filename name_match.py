@@ -0,0 +1,278 @@
+"""
+Rekonsiliasi nama: bandingkan Nama Pemilik (rekening) dengan Ijazah_Nama secara fuzzy
+Toleran terhadap gelar/title, singkatan nama Indonesia (M., MUH., ABD.) dan urutan kata.
+Index trigram dipakai untuk lookup lintas row: "rekening ini sebenarnya cocok dengan nama siapa?"
+"""
+
+import re
+import sys
+import csv
+import time
+import logging
+from collections import defaultdict
+from typing import List, NamedTuple, Optional, Tuple
+
+from gelar_normalizer import DEGREE_KEYS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.8
+
+# Title di depan nama
+PREFIX_TITLES = {
+    "H", "HJ", "HAJI", "HAJJAH", "DR", "DRS", "DRA", "IR", "PROF", "TN", "NY", "NN", "SDR", "SDRI", "BPK", "IBU",
+}
+
+# Gelar akademik dalam bentuk kompak (S.PD -> SPD, A.MD -> AMD, ...), dari tabel gelar_normalizer
+DEGREE_TOKENS = set(DEGREE_KEYS) | {"BSC", "BA", "MD"}
+
+# Variasi ejaan/singkatan nama yang umum -> bentuk kanonik
+NAME_ALIASES = {
+    "M": "MUHAMMAD", "MUH": "MUHAMMAD", "MUHD": "MUHAMMAD", "MHD": "MUHAMMAD", "MOH": "MUHAMMAD",
+    "MOHD": "MUHAMMAD", "MUHAMAD": "MUHAMMAD", "MUHAMMED": "MUHAMMAD", "MOHAMMAD": "MUHAMMAD",
+    "MOHAMAD": "MUHAMMAD", "MOHAMMED": "MUHAMMAD", "MOCHAMAD": "MUHAMMAD", "MOCHAMMAD": "MUHAMMAD",
+    "MUCHAMAD": "MUHAMMAD", "MUCHAMMAD": "MUHAMMAD", "MOCH": "MUHAMMAD", "MUCH": "MUHAMMAD",
+    "ABD": "ABDUL", "ABDL": "ABDUL", "ABDOEL": "ABDUL",
+    "NOER": "NUR", "NOOR": "NUR",
+    "SITTI": "SITI", "SYAIFUL": "SAIFUL", "SJAIFUL": "SAIFUL",
+}
+
+# Kata penghubung nama yang tidak ikut dihitung
+FILLER_TOKENS = {"BIN", "BINTI", "BT", "BN", "ALM", "ALMH"}
+
+PAREN_RE = re.compile(r"\([^)]*\)")
+NON_ALPHA_RE = re.compile(r"[^A-Z\s]")
+
+
+class NameScore(NamedTuple):
+    score: float               # 0..1
+    matched: bool
+
+
+def _strip_degrees(name: str) -> str:
+    # Gelar dalam kurung dan semua yang ada setelah koma ("BUDI SANTOSO, S.KOM")
+    name = PAREN_RE.sub(" ", name.upper())
+    return name.split(",")[0]
+
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Normalisasi nama menjadi token kanonik (tanpa title, gelar, tanda baca dan kata penghubung)"""
+    if not name:
+        return []
+    text = str(name).strip()
+    if text.upper() in ("", "N/A", "NONE", "NULL"):
+        return []
+
+    raw = _strip_degrees(text).split()
+    tokens = []
+    for position, word in enumerate(raw):
+        compact = NON_ALPHA_RE.sub("", word)
+        if not compact:
+            continue
+        # Title hanya dibuang kalau ditulis dengan titik atau berada di depan ("H. AHMAD", "DR ANI")
+        if compact in PREFIX_TITLES and (word.endswith(".") or position == 0) and len(raw) > 1:
+            continue
+        # Gelar tanpa titik ("MA", "SE", "ST") bisa jadi bagian nama; hanya dibuang kalau setelah koma
+        if compact in DEGREE_TOKENS and "." in word:
+            continue
+        if compact in FILLER_TOKENS:
+            continue
+        alias = NAME_ALIASES.get(compact)
+        tokens.append(alias or compact)
+    return tokens
+
+
+def _trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _token_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    # Inisial ("A" vs "AHMAD")
+    if len(a) == 1 or len(b) == 1:
+        return 0.8 if a[0] == b[0] else 0.0
+    ta, tb = _trigrams(a), _trigrams(b)
+    return 2 * len(ta & tb) / (len(ta) + len(tb))
+
+
+def token_set_similarity(tokens_a: List[str], tokens_b: List[str]) -> float:
+    """Skor kemiripan dua nama yang sudah dinormalisasi, tidak peduli urutan kata"""
+    if not tokens_a or not tokens_b:
+        return 0.0
+
+    # Greedy pairing token terbaik (nama orang paling banyak 5-6 kata, jadi murah)
+    pairs = sorted(
+        ((_token_similarity(a, b), i, j) for i, a in enumerate(tokens_a) for j, b in enumerate(tokens_b)),
+        reverse=True
+    )
+    used_a, used_b = set(), set()
+    total = 0.0
+    for sim, i, j in pairs:
+        if sim < 0.5:
+            break
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        total += sim
+
+    dice = 2 * total / (len(tokens_a) + len(tokens_b))
+    # Nama yang satu menjadi bagian dari nama lain ("SITI AMINAH" vs "SITI AMINAH ZAHRA")
+    coverage = total / min(len(tokens_a), len(tokens_b))
+    if min(len(tokens_a), len(tokens_b)) < 2:
+        coverage *= 0.75
+    return round(max(dice, 0.9 * coverage), 3)
+
+
+def name_similarity(name_a: Optional[str], name_b: Optional[str],
+                    threshold: float = DEFAULT_THRESHOLD) -> Optional[NameScore]:
+    """Bandingkan dua nama mentah; None kalau salah satu nama tidak tersedia"""
+    tokens_a, tokens_b = name_tokens(name_a), name_tokens(name_b)
+    if not tokens_a or not tokens_b:
+        return None
+    score = token_set_similarity(tokens_a, tokens_b)
+    return NameScore(score, score >= threshold)
+
+
+class NameIndex:
+    """Inverted index trigram atas nama (blocking) supaya lookup tidak O(n^2)"""
+
+    def __init__(self, max_postings: int = 2000):
+        self.max_postings = max_postings  # trigram yang terlalu umum tidak dipakai sebagai kandidat
+        self.postings = defaultdict(list)
+        self.token_postings = defaultdict(list)  # blocking per token utuh, untuk nama yang trigramnya terlalu umum
+        self.entries: List[Tuple[str, List[str]]] = []
+
+    def add(self, key: str, name: Optional[str]):
+        tokens = name_tokens(name)
+        if not tokens:
+            return
+        entry_id = len(self.entries)
+        self.entries.append((key, tokens))
+        for gram in {g for token in tokens if len(token) > 1 for g in _trigrams(token)}:
+            self.postings[gram].append(entry_id)
+        for token in set(tokens):
+            self.token_postings[token].append(entry_id)
+
+    def _token_block(self, tokens: List[str], candidates: int) -> List[int]:
+        """Kandidat dari posting token utuh paling kecil; entry yang memuat semua token didahulukan"""
+        postings = [self.token_postings[token] for token in set(tokens) if token in self.token_postings]
+        if not postings:
+            return []
+        wanted = set(tokens)
+        full, partial = [], []
+        # Scan dibatasi supaya nama yang sangat umum ("SITI NUR") tetap murah
+        for entry_id in min(postings, key=len)[:max(self.max_postings, candidates)]:
+            (full if wanted <= set(self.entries[entry_id][1]) else partial).append(entry_id)
+            if len(full) >= candidates:
+                break
+        return (full + partial)[:candidates]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, name: Optional[str], limit: int = 3, min_score: float = DEFAULT_THRESHOLD,
+               candidates: int = 20) -> List[Tuple[str, float]]:
+        """Return [(key, score)] nama yang paling mirip, urut dari skor tertinggi"""
+        tokens = name_tokens(name)
+        if not tokens:
+            return []
+
+        counts = defaultdict(int)
+        dropped = False
+        for gram in {g for token in tokens if len(token) > 1 for g in _trigrams(token)}:
+            posting = self.postings.get(gram)
+            if not posting:
+                continue
+            if len(posting) > self.max_postings:
+                dropped = True
+                continue
+            for entry_id in posting:
+                counts[entry_id] += 1
+
+        if counts or not dropped:
+            shortlist = sorted(counts, key=counts.get, reverse=True)[:candidates]
+        else:
+            # Semua trigram nama ini terlalu umum (mis. "SITI NUR"): blocking per token utuh
+            shortlist = self._token_block(tokens, candidates)
+        scored = []
+        for entry_id in shortlist:
+            key, entry_tokens = self.entries[entry_id]
+            score = token_set_similarity(tokens, entry_tokens)
+            if score >= min_score:
+                scored.append((key, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+
+class ReconcileResult(NamedTuple):
+    compared: int              # row yang punya Nama Pemilik dan Ijazah_Nama
+    matched: int
+    mismatched: int
+    cross_matched: int         # rekening yang namanya cocok dengan ijazah NIK lain
+
+
+def reconcile_names(rows: List[dict], threshold: float = DEFAULT_THRESHOLD) -> ReconcileResult:
+    """
+    Hitung skor Nama Pemilik vs Ijazah_Nama per row dan cari NIK lain yang namanya cocok
+    dengan pemilik rekening. Hasil ditulis ke row: _name_score, _name_match, _owner_match_nik
+    """
+    index = NameIndex()
+    for row in rows:
+        if str(row.get("Status", "")).startswith("Success"):
+            index.add(str(row.get("NIK", "")), row.get("Ijazah_Nama"))
+
+    compared = matched = cross_matched = 0
+    for row in rows:
+        row["_name_score"] = None
+        row["_name_match"] = None
+        row["_owner_match_nik"] = None
+        if not str(row.get("Status", "")).startswith("Success"):
+            continue
+
+        result = name_similarity(row.get("Nama Pemilik"), row.get("Ijazah_Nama"), threshold)
+        if result is None:
+            continue
+        compared += 1
+        row["_name_score"] = result.score
+        row["_name_match"] = result.matched
+        if result.matched:
+            matched += 1
+            continue
+
+        # Rekening milik orang lain: apakah pemiliknya juga mitra di dataset ini?
+        own_nik = str(row.get("NIK", ""))
+        for other_nik, _ in index.search(row.get("Nama Pemilik"), limit=2, min_score=threshold):
+            if other_nik != own_nik:
+                row["_owner_match_nik"] = other_nik
+                cross_matched += 1
+                break
+
+    return ReconcileResult(compared, matched, compared - matched, cross_matched)
+
+
+if __name__ == "__main__":
+    # Rekonsiliasi output lama: python name_match.py output_xxx/mitra_data.csv
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if len(sys.argv) < 2:
+        print("Usage: python name_match.py <mitra_data.csv>")
+        sys.exit(1)
+
+    with open(sys.argv[1], newline='', encoding='utf-8') as f:
+        dataset = list(csv.DictReader(f))
+
+    start = time.perf_counter()
+    summary = reconcile_names(dataset)
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Rows: {len(dataset)} (compared: {summary.compared}) in {elapsed * 1000:.1f} ms")
+    logger.info(f"  Nama cocok      : {summary.matched}")
+    logger.info(f"  Nama tidak cocok: {summary.mismatched}")
+    logger.info(f"  Cocok NIK lain  : {summary.cross_matched}")
+    for row in dataset:
+        if row["_name_match"] is False:
+            other = f" -> cocok dengan NIK {row['_owner_match_nik']}" if row["_owner_match_nik"] else ""
+            logger.info(f"  {row['NIK']}: '{row.get('Nama Pemilik')}' vs '{row.get('Ijazah_Nama')}' "
+                        f"({row['_name_score']:.2f}){other}")
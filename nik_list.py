@@ -0,0 +1,64 @@
+"""
+Baca daftar NIK target untuk mode refresh sebagian (tanpa crawl semua halaman)
+Sumber: file teks (satu NIK per baris) atau mitra_data.csv dari run sebelumnya
+"""
+
+import os
+import re
+import csv
+import logging
+from typing import List
+
+from data_quality import validate_rows
+
+logger = logging.getLogger(__name__)
+
+NIK_PATTERN = re.compile(r"\b\d{16}\b")
+
+
+def load_niks_from_csv(path: str, include_failed: bool = True, include_mismatch: bool = True) -> List[str]:
+    """Ambil NIK dari mitra_data.csv yang Status-nya gagal dan/atau ditandai mismatch"""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    # CSV lama tanpa kolom Mismatch: hitung ulang dengan rule validasi yang sama
+    if rows and "Mismatch" not in rows[0]:
+        recomputed = validate_rows(rows).mismatch
+    else:
+        recomputed = None
+
+    niks = []
+    for i, row in enumerate(rows):
+        nik = (row.get("NIK") or "").strip()
+        if not nik or nik == "Unknown":
+            continue
+        failed = not (row.get("Status") or "").startswith("Success")
+        if recomputed is None:
+            mismatch = (row.get("Mismatch") or "").strip().upper() in ("TRUE", "YES", "1")
+        else:
+            mismatch = recomputed[i]
+        if (include_failed and failed) or (include_mismatch and mismatch):
+            niks.append(nik)
+    return niks
+
+
+def load_niks_from_text(path: str) -> List[str]:
+    """Ambil semua NIK 16 digit dari file teks (satu per baris, boleh ada teks lain)"""
+    with open(path, encoding='utf-8') as f:
+        return NIK_PATTERN.findall(f.read())
+
+
+def load_nik_list(path: str) -> List[str]:
+    """Baca daftar NIK unik (urutan dipertahankan) dari file .txt atau .csv"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File NIK tidak ditemukan: {path}")
+
+    if path.lower().endswith(".csv"):
+        niks = load_niks_from_csv(path)
+        logger.info(f"✓ {len(niks)} NIK gagal/mismatch dibaca dari {path}")
+    else:
+        niks = load_niks_from_text(path)
+        logger.info(f"✓ {len(niks)} NIK dibaca dari {path}")
+
+    # Hapus duplikat tapi pertahankan urutan
+    return list(dict.fromkeys(niks))
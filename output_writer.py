@@ -0,0 +1,405 @@
+"""
+Tulis dataset mitra ke folder output: SQLite (sumber utama), lalu Excel, CSV dan Parquet
+diexport dari rows yang dibaca ulang dari database run tersebut.
+Tidak butuh browser/MitraScraper, jadi dipakai juga oleh reenrich_outputs dan reparse_ijazah
+untuk menulis ulang output lama; MitraScraper mewarisi OutputWriter.
+"""
+
+import os
+import csv
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+# Opsional: export Parquet hanya aktif jika pyarrow terinstall
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from bank_normalizer import apply_bank_normalization
+from data_quality import RULES, apply_validation, validate_rows
+from duplicate_detector import find_duplicates
+from gelar_normalizer import normalize_rows
+from mitra_store import ResultStore
+from name_match import DEFAULT_THRESHOLD as NAME_MATCH_THRESHOLD, reconcile_names
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_dataset(rows: List[dict], log: bool = True):
+    """Gelar/jenjang kanonik, bank, rule data quality dan rekonsiliasi nama (run, sync dan export store)"""
+    gelar_changed = normalize_rows(rows)
+    bank_counts = apply_bank_normalization(rows)
+    validation = apply_validation(rows)
+    names = reconcile_names(rows)
+    if log:
+        logger.info(f"✓ Gelar normalized ({gelar_changed} rows changed)")
+        logger.info(f"✓ Bank names normalized: {len(bank_counts)} banks"
+                    f" ({bank_counts.get('Tidak Dikenali', 0)} rows unrecognized)")
+        logger.info(f"✓ Data quality rules: " + ", ".join(f"{k}={v}" for k, v in validation.counts.items()))
+        logger.info(f"✓ Name reconciliation: {names.matched}/{names.compared} owner names match ijazah"
+                    f" ({names.cross_matched} match another NIK)")
+
+
+class OutputWriter:
+    """Dataset satu run (rows, stats, hasil validasi gambar) dan semua format output-nya"""
+
+    def __init__(self, output_folder: str, data_list: Optional[List[dict]] = None,
+                 stats: Optional[Dict[str, int]] = None, started_at: Optional[str] = None):
+        self.output_folder = output_folder
+        self.started_at = started_at or datetime.now().isoformat(timespec="seconds")
+        self.data_list = data_list if data_list is not None else []
+        self.stats = stats if stats is not None else {}
+        
+        # Format/dimensi file yang lolos validasi download (path -> ImageCheck)
+        self.image_checks = {}
+        
+        # Hasil deteksi rekening/dokumen duplikat (diisi saat save)
+        self.duplicate_report = None
+
+    def write_outputs(self, excel_filename="mitra_data.xlsx", csv_filename="mitra_data.csv", mode="full"):
+        """Normalisasi + cek duplikat seluruh dataset, lalu tulis .db, .xlsx, .csv dan .parquet"""
+        # Validasi ulang seluruh dataset (termasuk row yang dibawa dari run sebelumnya)
+        normalize_dataset(self.data_list)
+        self.duplicate_report = find_duplicates(self.data_list)
+        logger.info(f"✓ Duplicate check: {len(self.duplicate_report.clusters)} clusters "
+                    f"({self.duplicate_report.images_hashed} images in {self.duplicate_report.elapsed:.1f}s)")
+        
+        # SQLite adalah sumber utama; Excel dan CSV diexport dari database run ini
+        db_filename = os.path.splitext(excel_filename)[0] + ".db"
+        self.data_list = self.save_to_sqlite(db_filename, mode)
+        self.save_to_excel(excel_filename)
+        self.save_to_csv(csv_filename)
+        self.save_to_parquet(os.path.splitext(excel_filename)[0] + ".parquet")
+
+    def save_to_excel(self, filename="mitra_data.xlsx"):
+        """Save data to Excel with formatting"""
+        filepath = os.path.join(self.output_folder, filename)
+        logger.info(f"\nSaving data to Excel: {filepath}")
+        
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Data Mitra"
+        
+        # Headers - Kolom utama di depan
+        headers = [
+            "NIK", 
+            "Nama Lengkap (dengan Gelar)",
+            "Nomor Rekening",
+            "Nama Bank",
+            "Nama Pemilik Rekening",
+            "Jenis Ijazah",
+            "Gelar",
+            "Jenjang",
+            "NIM",
+            "Program Studi",
+            "Fakultas",
+            "Universitas",
+            "Tanggal Ijazah",
+            "Path KTP",
+            "Path Ijazah",
+            "Status",
+            "Validasi",
+            "Skor Nama",
+            "Nama Cocok",
+            "Rekening Cocok NIK",
+            "Kode Bank",
+            "Bank Normalisasi"
+        ]
+        ws.append(headers)
+        
+        # Header formatting
+        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        
+        for cell in ws[1]:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+        
+        # Add data rows with conditional formatting
+        mismatch_count = 0
+        for row_idx, row_data in enumerate(self.data_list, start=2):  # Start at row 2 (after header)
+            ws.append([
+                row_data.get("NIK", ""),
+                row_data.get("Ijazah_Nama_Gelar", "N/A"),
+                row_data.get("Nomor Rekening", ""),
+                row_data.get("Nama Bank", ""),
+                row_data.get("Nama Pemilik", ""),
+                row_data.get("Ijazah_Jenis", ""),
+                row_data.get("Ijazah_Gelar", ""),
+                row_data.get("Ijazah_Jenjang", "N/A"),
+                row_data.get("Ijazah_NIM", ""),
+                row_data.get("Ijazah_Program_Studi", ""),
+                row_data.get("Ijazah_Fakultas", ""),
+                row_data.get("Ijazah_Universitas", ""),
+                row_data.get("Ijazah_Tanggal", ""),
+                row_data.get("Path KTP", ""),
+                row_data.get("Path Ijazah", ""),
+                row_data.get("Status", ""),
+                ", ".join(row_data.get("_issues") or []),
+                row_data.get("_name_score"),
+                {True: "Ya", False: "Tidak"}.get(row_data.get("_name_match"), "N/A"),
+                row_data.get("_owner_match_nik") or "",
+                row_data.get("Kode Bank", "N/A"),
+                row_data.get("Bank Normalisasi", "N/A")
+            ])
+            
+            # Highlight rows with potential mismatch
+            if row_data.get("_has_mismatch", False):
+                mismatch_count += 1
+                # Red/orange fill for mismatch rows
+                mismatch_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+                mismatch_font = Font(color="9C0006", bold=True)
+                
+                for cell in ws[row_idx]:
+                    cell.fill = mismatch_fill
+                    # Highlight Nomor Rekening column specifically
+                    if cell.column == 3:  # Column C (Nomor Rekening)
+                        cell.font = mismatch_font
+            
+            # Nama Pemilik tidak cocok dengan nama di ijazah
+            if row_data.get("_name_match") is False:
+                name_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+                for column in (5, 18, 19):  # Nama Pemilik, Skor Nama, Nama Cocok
+                    ws.cell(row=row_idx, column=column).fill = name_fill
+        
+        logger.info(f"✓ Highlighted {mismatch_count} rows with potential mismatch")
+        
+        # Auto-adjust column widths
+        for column in ws.columns:
+            max_length = 0
+            column_letter = column[0].column_letter
+            
+            for cell in column:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except Exception:
+                    pass
+            
+            adjusted_width = min(max_length + 2, 50)
+            ws.column_dimensions[column_letter].width = adjusted_width
+        
+        # Add borders
+        thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
+            for cell in row:
+                cell.border = thin_border
+        
+        # Create Summary Sheet
+        ws_summary = wb.create_sheet("Summary", 0)  # Insert at beginning
+        ws_summary.append(["SCRAPING SUMMARY & DATA QUALITY REPORT"])
+        ws_summary.append([])
+        ws_summary.append(["Metric", "Value"])
+        ws_summary.append(["Total Rows Scraped", len(self.data_list)])
+        ws_summary.append(["Rows with Potential Mismatch", mismatch_count])
+        ws_summary.append(["Data Quality Rate", f"{((len(self.data_list) - mismatch_count) / len(self.data_list) * 100):.1f}%" if self.data_list else "N/A"])
+        ws_summary.append([])
+        ws_summary.append(["LEGEND:"])
+        ws_summary.append(["🔴 Red/Pink Rows", "= Potential mismatch detected (Nomor Rekening non-numeric, or bank/rekening/owner swapped)"])
+        ws_summary.append(["⚠️ Action Required", "= Please verify these rows manually"])
+        ws_summary.append([])
+        ws_summary.append(["Note:", "Mismatch detection helps identify data quality issues where account number may have been incorrectly scraped."])
+        
+        # Jumlah pelanggaran per rule validasi
+        validation = validate_rows(self.data_list)
+        ws_summary.append([])
+        ws_summary.append(["DATA QUALITY RULES", f"Rows validated: {validation.rows_checked}"])
+        rules_header_row = ws_summary.max_row
+        for rule in RULES:
+            ws_summary.append([rule.name, validation.counts[rule.name], rule.description])
+            if validation.counts[rule.name] > 0 and rule.flags_mismatch:
+                ws_summary.cell(row=ws_summary.max_row, column=2).font = Font(bold=True, color="9C0006")
+        
+        # Rekonsiliasi Nama Pemilik vs nama di ijazah
+        scores = [row["_name_score"] for row in self.data_list if row.get("_name_score") is not None]
+        name_mismatch = sum(1 for row in self.data_list if row.get("_name_match") is False)
+        ws_summary.append([])
+        ws_summary.append(["NAME RECONCILIATION", f"Threshold: {NAME_MATCH_THRESHOLD:.2f}"])
+        names_header_row = ws_summary.max_row
+        ws_summary.append(["Rows Compared", len(scores)])
+        ws_summary.append(["Owner Name Matches Ijazah", len(scores) - name_mismatch])
+        ws_summary.append(["Owner Name Differs from Ijazah", name_mismatch, "🟡 Kuning di sheet Data Mitra - kemungkinan rekening pasangan/orang tua"])
+        ws_summary.append(["Owner Matches Another NIK", sum(1 for row in self.data_list if row.get("_owner_match_nik")), "Lihat kolom 'Rekening Cocok NIK'"])
+        ws_summary.append(["Average Name Score", f"{sum(scores) / len(scores):.2f}" if scores else "N/A"])
+        
+        # Jumlah mitra per bank (nama bank yang sudah dinormalisasi)
+        bank_counts = Counter(row.get("Bank Normalisasi", "N/A") for row in self.data_list)
+        ws_summary.append([])
+        ws_summary.append(["BANK BREAKDOWN", "Rows"])
+        banks_header_row = ws_summary.max_row
+        for bank, count in bank_counts.most_common():
+            ws_summary.append([bank, count])
+        
+        # Rekening dipakai beberapa NIK dan dokumen yang diupload ulang untuk NIK lain
+        if self.duplicate_report is not None:
+            report = self.duplicate_report
+            ws_summary.append([])
+            ws_summary.append(["DUPLICATES", f"Images hashed: {report.images_hashed}"])
+            duplicates_header_row = ws_summary.max_row
+            ws_summary.append(["Shared Nomor Rekening", report.count("rekening"), "Lihat sheet 'Duplikat'"])
+            ws_summary.append(["Identical KTP/Ijazah Files", report.count("ktp_identik") + report.count("ijazah_identik")])
+            ws_summary.append(["Similar KTP/Ijazah Images", report.count("ktp_mirip") + report.count("ijazah_mirip"),
+                               "" if report.perceptual else "Pillow tidak terinstall - hanya file identik yang dicek"])
+            if report.clusters:
+                self._write_duplicates_sheet(wb, report)
+        else:
+            duplicates_header_row = None
+        
+        # Format summary sheet
+        ws_summary['A1'].font = Font(bold=True, size=14, color="FFFFFF")
+        ws_summary['A1'].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        ws_summary['A1'].alignment = Alignment(horizontal='center')
+        ws_summary.merge_cells('A1:B1')
+        
+        # Format metric headers
+        for header_row in filter(None, (3, rules_header_row, names_header_row, banks_header_row, duplicates_header_row)):
+            for cell in ws_summary[header_row]:
+                cell.font = Font(bold=True)
+                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        
+        # Highlight mismatch count if > 0
+        if mismatch_count > 0:
+            ws_summary['B5'].font = Font(bold=True, color="9C0006")
+            ws_summary['B5'].fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+        
+        # Auto-adjust summary column widths
+        ws_summary.column_dimensions['A'].width = 30
+        ws_summary.column_dimensions['B'].width = 60
+        ws_summary.column_dimensions['C'].width = 60
+        
+        wb.save(filepath)
+        logger.info(f"✓ Excel file saved: {filepath}")
+        if mismatch_count > 0:
+            logger.info(f"⚠ {mismatch_count} rows highlighted in red - please verify manually!")
+
+    def _write_duplicates_sheet(self, wb, report):
+        """Sheet 'Duplikat': satu baris per anggota cluster duplikat"""
+        ws = wb.create_sheet("Duplikat")
+        ws.append(["Cluster", "Jenis", "Kunci", "NIK", "Detail", "Jarak Maks"])
+        for cell in ws[1]:
+            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+            cell.font = Font(bold=True, color="FFFFFF", size=12)
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+        
+        # Warna selang-seling per cluster supaya batas cluster terlihat
+        fills = [PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid"), None]
+        number = 0
+        for section, clusters in ((None, report.exact),
+                                  ("MIRIP - perlu dicek manual (bisa jadi template dokumen yang sama)", report.similar)):
+            if section and clusters:
+                ws.append([])
+                ws.append([section])
+                ws[ws.max_row][0].font = Font(bold=True)
+            for cluster in clusters:
+                number += 1
+                for nik, detail in cluster.members:
+                    ws.append([number, cluster.kind, cluster.key, nik, detail, cluster.max_distance])
+                    if fills[number % 2]:
+                        for cell in ws[ws.max_row]:
+                            cell.fill = fills[number % 2]
+        
+        for column, width in zip("ABCDEF", (10, 16, 40, 20, 60, 12)):
+            ws.column_dimensions[column].width = width
+        logger.info(f"✓ Duplikat sheet: {len(report.exact)} exact + {len(report.similar)} similar clusters")
+
+    def save_to_sqlite(self, filename="mitra_data.db", mode="full"):
+        """Save rows, run metadata, stats and image paths to an indexed SQLite database"""
+        filepath = os.path.join(self.output_folder, filename)
+        logger.info(f"Saving SQLite database: {filepath}")
+        
+        store = ResultStore(filepath)
+        try:
+            run_id = store.write_run(self.output_folder, mode, self.started_at, self.data_list, self.stats,
+                                     self.image_checks)
+            rows = store.rows(run_id)
+        finally:
+            store.close()
+        
+        logger.info(f"✓ SQLite database saved: {filepath} (run #{run_id}, {len(rows)} rows)")
+        return rows
+
+    def save_to_parquet(self, filename="mitra_data.parquet"):
+        """Save data to typed, dictionary-encoded Parquet for analytics (requires pyarrow)"""
+        if pa is None:
+            logger.info("pyarrow not installed - skipping Parquet export (pip install pyarrow)")
+            return None
+        
+        filepath = os.path.join(self.output_folder, filename)
+        logger.info(f"Saving Parquet: {filepath}")
+        
+        # NIK dan rekening tetap string (leading zero), kolom berulang jadi categorical
+        columns = [
+            ("NIK", False), ("Nomor Rekening", False), ("Nama Bank", True), ("Nama Pemilik", False),
+            ("Ijazah_Jenis", True), ("Ijazah_Nama", False), ("Ijazah_Gelar", True), ("Ijazah_Jenjang", True),
+            ("Ijazah_Nama_Gelar", False),
+            ("Ijazah_NIM", False), ("Ijazah_Program_Studi", True), ("Ijazah_Fakultas", True),
+            ("Ijazah_Universitas", True), ("Ijazah_Tanggal", False),
+            ("Path KTP", False), ("Path Ijazah", False), ("Status", False),
+            ("Kode Bank", True), ("Bank Normalisasi", True),
+            ("URL KTP", False), ("URL Ijazah", False), ("Captured At", False)
+        ]
+        
+        def clean(value):
+            if value is None:
+                return None
+            value = str(value).strip()
+            return None if value in ("", "N/A") else value
+        
+        arrays = {}
+        fields = []
+        for column, categorical in columns:
+            values = pa.array([clean(row.get(column)) for row in self.data_list], type=pa.string())
+            if categorical:
+                arrays[column] = values.dictionary_encode()
+                fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                arrays[column] = values
+                fields.append(pa.field(column, pa.string()))
+        arrays["Mismatch"] = pa.array([bool(row.get("_has_mismatch")) for row in self.data_list], type=pa.bool_())
+        fields.append(pa.field("Mismatch", pa.bool_()))
+        # Nama folder run supaya beberapa bulan output bisa digabung dan difilter
+        arrays["Run"] = pa.array([self.output_folder] * len(self.data_list), type=pa.string()).dictionary_encode()
+        fields.append(pa.field("Run", pa.dictionary(pa.int32(), pa.string())))
+        
+        table = pa.table([arrays[f.name] for f in fields], schema=pa.schema(fields))
+        pq.write_table(table, filepath, compression="zstd")
+        logger.info(f"✓ Parquet saved: {filepath}")
+        return filepath
+
+    def save_to_csv(self, filename="mitra_data.csv"):
+        """Save data to CSV"""
+        filepath = os.path.join(self.output_folder, filename)
+        logger.info(f"Saving CSV backup: {filepath}")
+        
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            fieldnames = [
+                "NIK", "Ijazah_Nama_Gelar", "Nomor Rekening",
+                "Nama Bank", "Nama Pemilik", 
+                "Ijazah_Jenis", "Ijazah_Nama", "Ijazah_Gelar", "Ijazah_Jenjang", "Ijazah_NIM",
+                "Ijazah_Program_Studi", "Ijazah_Fakultas", "Ijazah_Universitas", "Ijazah_Tanggal",
+                "Path KTP", "Path Ijazah", "Status", "Mismatch",
+                "Kode Bank", "Bank Normalisasi", "Ijazah_Prompt_Version",
+                "URL KTP", "URL Ijazah", "Captured At"
+            ]
+            # Kolom internal (prefix "_") tidak ditulis; flag mismatch ditulis sebagai kolom Mismatch
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            for row_data in self.data_list:
+                writer.writerow({**row_data, "Mismatch": "TRUE" if row_data.get("_has_mismatch") else "FALSE"})
+        
+        logger.info(f"✓ CSV backup saved: {filepath}")
@@ -0,0 +1,206 @@
+"""
+Re-enrichment: parse ulang ijazah terpilih dari folder output lama lalu tulis ulang output di tempat,
+tanpa scraping ulang. Row dipilih lewat index NIK:
+- missing  : nama/nama_gelar kosong atau gelar ijazah PT belum dikenali
+- failed   : status gagal / hasil parse kosong padahal file ijazah ada
+- outdated : di-parse dengan PROMPT_VERSION lama (hanya dengan --outdated)
+Output (xlsx/csv/db/parquet) ditulis ulang lewat OutputWriter (pipeline save scraper); perubahan per kolom
+dicatat di reenrich_<timestamp>.csv.
+    python reenrich_outputs.py output_20260107_080000 [--outdated] [--workers 4] [--dry-run]
+"""
+
+import os
+import csv
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from differential import load_dataset_csv
+from download_layout import find_document
+from gelar_normalizer import needs_reparse
+from ijazah_parser import PROMPT_VERSION, IjazahParser, result_to_row
+from mitra_store import ResultStore
+from output_writer import OutputWriter
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_BASENAMES = ("mitra_data", "mitra_data_partial")
+EMPTY_VALUES = ("", "N/A", "NONE", "NULL", "-")
+
+
+class Change(NamedTuple):
+    nik: str
+    reason: str
+    column: str
+    old: Optional[str]
+    new: Optional[str]
+
+
+def _empty(value) -> bool:
+    return str(value if value is not None else "").strip().upper() in EMPTY_VALUES
+
+
+def find_output_base(folder: str) -> Optional[str]:
+    """Nama dasar output di folder (mitra_data atau mitra_data_partial)"""
+    for base in OUTPUT_BASENAMES:
+        if any(os.path.exists(os.path.join(folder, base + ext)) for ext in (".db", ".csv")):
+            return base
+    return None
+
+
+def load_output_rows(folder: str, base: str) -> List[dict]:
+    """Rows run terakhir dari SQLite (sumber utama), atau dari CSV untuk output lama"""
+    db_path = os.path.join(folder, base + ".db")
+    if os.path.exists(db_path):
+        store = ResultStore(db_path)
+        try:
+            run_id = store.latest_run_id()
+            if run_id is not None:
+                return store.rows(run_id)
+        finally:
+            store.close()
+    return list(load_dataset_csv(os.path.join(folder, base + ".csv")).values())
+
+
+def build_index(rows: List[dict]) -> Dict[str, dict]:
+    """{NIK: row}; urutan row dipertahankan, NIK dobel memakai row terakhir"""
+    return {str(row.get("NIK")): row for row in rows if row.get("NIK") and row.get("NIK") != "Unknown"}
+
+
+def ijazah_file(folder: str, row: dict) -> Optional[str]:
+    """File ijazah row: path tercatat, atau lewat manifest/layout downloads kalau folder output dipindah"""
+    path = str(row.get("Path Ijazah") or "")
+    if os.path.isfile(path):
+        return path
+    return find_document(os.path.join(folder, "downloads"), str(row.get("NIK")), "ijazah")
+
+
+def reparse_reason(row: dict, include_outdated: bool = False) -> Optional[str]:
+    """Alasan row perlu di-parse ulang, None kalau hasil sekarang sudah cukup"""
+    if str(row.get("Status", "")).startswith("Failed") or _empty(row.get("Ijazah_Jenis")):
+        return "failed"
+    if _empty(row.get("Ijazah_Nama_Gelar")) or needs_reparse(row):
+        return "missing"
+    if include_outdated and str(row.get("Ijazah_Prompt_Version") or "") != PROMPT_VERSION:
+        return "outdated"
+    return None
+
+
+def select_rows(folder: str, index: Dict[str, dict], include_outdated: bool = False) -> List[Tuple[str, str, str]]:
+    """[(NIK, alasan, path ijazah)] untuk row yang perlu dan bisa di-parse ulang"""
+    selected = []
+    for nik, row in index.items():
+        reason = reparse_reason(row, include_outdated)
+        if not reason or str(row.get("Ijazah_Jenis", "")).startswith("Bukan Ijazah"):
+            continue
+        path = ijazah_file(folder, row)
+        if path:
+            selected.append((nik, reason, path))
+    return selected
+
+
+def reparse_rows(parser, selected: List[Tuple[str, str, str]], workers: int = 4) -> Dict[str, dict]:
+    """Parse ulang paralel (I/O ke API); return {NIK: hasil parse}"""
+    results = {}
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parser.parse_ijazah, path): nik for nik, _, path in selected}
+        for done, future in enumerate(as_completed(futures), 1):
+            nik = futures[future]
+            try:
+                results[nik] = future.result()
+            except Exception as e:
+                logger.error(f"✗ Reparse failed for NIK {nik}: {e}")
+            if done % 10 == 0 or done == len(futures):
+                logger.info(f"↻ Reparsed {done}/{len(futures)} ({done / max(time.time() - start, 0.001):.1f}/s)")
+    return results
+
+
+def apply_results(index: Dict[str, dict], selected: List[Tuple[str, str, str]],
+                  results: Dict[str, dict]) -> Tuple[List[Change], int]:
+    """Patch kolom Ijazah_* row yang hasil barunya berisi nama; return (perubahan, jumlah row dipatch)"""
+    changes = []
+    patched = 0
+    for nik, reason, path in selected:
+        result = results.get(nik)
+        if not result or _empty(result.get("nama")):
+            continue
+        row = index[nik]
+        fields = result_to_row(result)
+        row_changes = [Change(nik, reason, column, row.get(column), value) for column, value in fields.items()
+                       if str(row.get(column)) != str(value) and not (_empty(row.get(column)) and _empty(value))]
+        row.update(fields)
+        if not os.path.isfile(str(row.get("Path Ijazah") or "")):
+            row["Path Ijazah"] = path
+        changes.extend(row_changes)
+        patched += 1
+    return changes, patched
+
+
+def write_diff_report(folder: str, changes: List[Change]) -> str:
+    path = os.path.join(folder, f"reenrich_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["NIK", "Alasan", "Kolom", "Lama", "Baru"])
+        writer.writerows(changes)
+    return path
+
+
+def rewrite_outputs(folder: str, base: str, rows: List[dict], stats: Dict[str, int], mode: str) -> List[dict]:
+    """Tulis ulang .db (run baru), .xlsx, .csv dan .parquet folder output; return rows yang tersimpan"""
+    writer = OutputWriter(folder, rows, stats)
+    writer.write_outputs(base + ".xlsx", base + ".csv", mode=mode)
+    return writer.data_list
+
+
+def reenrich(folder: str, include_outdated: bool = False, workers: int = 4, dry_run: bool = False):
+    """Pipeline lengkap: index -> pilih -> reparse paralel -> patch -> tulis ulang output + diff"""
+    base = find_output_base(folder)
+    if not base:
+        logger.error(f"✗ Tidak ada mitra_data.db/.csv di {folder}")
+        return None
+
+    index = build_index(load_output_rows(folder, base))
+    selected = select_rows(folder, index, include_outdated)
+    reasons = {}
+    for _, reason, _ in selected:
+        reasons[reason] = reasons.get(reason, 0) + 1
+    logger.info(f"✓ {len(index)} rows indexed from {folder}/{base}; {len(selected)} selected for reparse "
+                f"({', '.join(f'{k}={v}' for k, v in sorted(reasons.items())) or '-'}), prompt v{PROMPT_VERSION}")
+    if dry_run or not selected:
+        for nik, reason, path in selected:
+            logger.info(f"  {nik}  {reason:<9} {path}")
+        return None
+
+    try:
+        parser = IjazahParser()
+    except ValueError as e:
+        logger.error(f"✗ IjazahParser tidak aktif: {e} - setup OPENAI_API_KEY dulu")
+        return None
+
+    results = reparse_rows(parser, selected, workers)
+    changes, patched = apply_results(index, selected, results)
+    logger.info(f"✓ Patched {patched}/{len(selected)} rows ({len(changes)} column changes)")
+
+    # Tulis ulang semua output lewat pipeline save yang sama dengan scraping (run baru di .db)
+    rows = list(index.values())
+    rewrite_outputs(folder, base, rows, {"total": len(rows), "ijazah_parsed": len(results)}, "reenrich")
+
+    report = write_diff_report(folder, changes)
+    logger.info(f"✓ Diff report saved: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    arg_parser = argparse.ArgumentParser(description="Parse ulang ijazah di folder output lama dan tulis ulang output")
+    arg_parser.add_argument("folder", help="Folder output run (mis. output_20260107_080000)")
+    arg_parser.add_argument("--outdated", action="store_true",
+                            help=f"Ikutkan row yang di-parse dengan versi prompt lama (sekarang v{PROMPT_VERSION})")
+    arg_parser.add_argument("--workers", type=int, default=4, help="Jumlah parse paralel (default: 4)")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Hanya tampilkan row yang akan di-parse ulang")
+    args = arg_parser.parse_args()
+    reenrich(args.folder, args.outdated, args.workers, args.dry_run)
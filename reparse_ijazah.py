@@ -1,12 +1,34 @@
 """
 Script untuk re-parse ijazah yang sudah didownload
 Berguna untuk testing parsing tanpa perlu download ulang
+
+Job runner untuk backfill besar:
+- Prioritas: ijazah yang field-nya kosong/gagal dulu, lalu versi prompt paling lama
+- Progress disimpan ke reparse_progress.json; run yang terhenti dilanjutkan (NIK yang sudah
+  di-parse dengan PROMPT_VERSION sekarang tidak diulang)
+- Worker paralel, throughput dan ETA dilaporkan selama berjalan
+- Di folder output, hasil yang selesai ditulis balik ke mitra_data.db/.xlsx/.csv/.parquet di akhir run
+  (sama seperti reenrich_outputs, perubahan per kolom di reenrich_<timestamp>.csv)
+    python reparse_ijazah.py [folder] [--nik-file daftar.txt] [--workers 4] [--restart]
+folder bisa folder downloads atau folder output (mitra_data.db/.csv dipakai untuk prioritas)
 """
 
 import os
 import sys
+import json
+import time
 import logging
-from ijazah_parser import IjazahParser
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional
+
+from download_layout import find_documents
+from gelar_normalizer import normalize_ijazah_result
+from ijazah_parser import PROMPT_VERSION, IjazahParser
+from nik_list import load_nik_list
+from reenrich_outputs import (apply_results, build_index, find_output_base, load_output_rows, reparse_reason,
+                              rewrite_outputs, write_diff_report)
 
 # Setup logging
 logging.basicConfig(
@@ -16,13 +38,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def reparse_ijazah(folder="downloads"):
-    """Re-parse semua ijazah yang sudah didownload"""
-    
+PROGRESS_FILE = "reparse_progress.json"
+SAVE_EVERY = 10            # tulis progress file setiap N ijazah selesai
+REPORT_EVERY = 10
+
+
+class ReparseJob(NamedTuple):
+    priority: tuple            # makin kecil makin dulu
+    nik: str
+    path: str
+    reason: str
+
+
+def _version_key(version) -> int:
+    """Versi prompt sebagai angka; tidak diketahui = paling lama"""
+    try:
+        return int(version)
+    except (TypeError, ValueError):
+        return -1
+
+
+def load_progress(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠ Progress file tidak bisa dibaca ({path}): {e} - mulai dari awal")
+        return {}
+
+
+def save_progress(path: str, progress: Dict[str, dict]):
+    """Tulis atomik (tmp + replace) supaya progress tidak rusak kalau proses dihentikan"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(progress, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def build_jobs(folder: str, progress: Dict[str, dict], niks: Optional[List[str]] = None,
+               include_current: bool = False) -> List[ReparseJob]:
+    """Antrian prioritas: hasil kosong/gagal dulu, lalu versi prompt tertua; NIK yang sudah selesai dilewati
+    Row output yang sudah lengkap dengan versi prompt sekarang ("current") hanya ikut kalau include_current"""
+    files = find_documents(folder, "ijazah")
+    base = find_output_base(folder)
+    rows = build_index(load_output_rows(folder, base)) if base else {}
+    if niks is not None:
+        wanted = set(niks)
+        missing = wanted - set(files)
+        if missing:
+            logger.warning(f"⚠ {len(missing)} NIK dari daftar tidak punya file ijazah di {folder}")
+        files = {nik: path for nik, path in files.items() if nik in wanted}
+
+    jobs = []
+    skipped_current = 0
+    for nik, path in files.items():
+        done = progress.get(nik)
+        if done and done.get("status") == "done" and done.get("prompt_version") == PROMPT_VERSION:
+            continue
+        row = rows.get(nik)
+        if done:
+            # Hasil runner sebelumnya (versi lama atau gagal) lebih baru daripada isi output
+            reason = "failed" if done.get("status") != "done" else "outdated"
+            version = done.get("prompt_version")
+        elif row:
+            reason = reparse_reason(row, include_outdated=True) or "current"
+            version = row.get("Ijazah_Prompt_Version")
+            if reason == "current" and not include_current:
+                skipped_current += 1
+                continue
+        else:
+            reason, version = "unknown", None
+        rank = {"failed": 0, "missing": 0, "unknown": 1, "outdated": 2, "current": 3}[reason]
+        jobs.append(ReparseJob((rank, _version_key(version), nik), nik, path, reason))
+    if skipped_current:
+        logger.info(f"↻ {skipped_current} ijazah sudah lengkap di output (prompt v{PROMPT_VERSION}) dilewati "
+                    f"(pakai --restart atau --nik-file untuk memaksa)")
+    return sorted(jobs)
+
+
+def write_back(folder: str, progress: Dict[str, dict]) -> Optional[str]:
+    """Patch hasil yang selesai dengan prompt sekarang ke output di folder (run baru di .db);
+    return path diff report, None kalau bukan folder output atau output sudah memuat semua hasil"""
+    base = find_output_base(folder)
+    if not base:
+        logger.info(f"↻ {folder} bukan folder output (tidak ada mitra_data.db/.csv): hasil hanya di progress file")
+        return None
+    index = build_index(load_output_rows(folder, base))
+    finished = {nik: entry for nik, entry in progress.items() if nik in index and entry.get("status") == "done"
+                and entry.get("prompt_version") == PROMPT_VERSION}
+    selected = [(nik, entry.get("reason") or "reparse", entry.get("path")) for nik, entry in finished.items()]
+    # Dinormalisasi seperti di pipeline save, supaya output yang sudah ditulis tidak terhitung berubah lagi
+    results = {nik: normalize_ijazah_result(entry["result"]) for nik, entry in finished.items() if entry.get("result")}
+    changes, patched = apply_results(index, selected, results)
+    if not changes:
+        logger.info(f"✓ Output {base} sudah memuat semua hasil parse")
+        return None
+
+    rows = list(index.values())
+    rewrite_outputs(folder, base, rows, {"total": len(rows), "ijazah_parsed": patched}, "reparse")
+    report = write_diff_report(folder, changes)
+    logger.info(f"✓ {patched} row di {base} diperbarui ({len(changes)} perubahan kolom), diff: {report}")
+    return report
+
+
+def _format_eta(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def reparse_ijazah(folder="downloads", niks=None, workers=4, progress_path=None, restart=False):
+    """Re-parse ijazah yang sudah didownload (prioritas, paralel, bisa dilanjutkan)"""
+
     logger.info("="*60)
     logger.info("RE-PARSING IJAZAH YANG SUDAH DIDOWNLOAD")
     logger.info("="*60)
-    
+
     # Initialize parser
     try:
         parser = IjazahParser()
@@ -31,64 +164,102 @@ def reparse_ijazah(folder="downloads"):
         logger.error(f"✗ {e}")
         logger.info("\nSetup .env file dengan OpenAI API key terlebih dahulu")
         return
-    
-    # Cari semua file ijazah
-    ijazah_files = []
-    for root, dirs, files in os.walk(folder):
-        for file in files:
-            if file.lower() in ["ijazah.jpg", "ijazah.jpeg", "ijazah.png"]:
-                ijazah_files.append(os.path.join(root, file))
-    
-    if not ijazah_files:
-        logger.warning(f"Tidak ada file ijazah ditemukan di folder {folder}")
+
+    progress_path = progress_path or os.path.join(folder, PROGRESS_FILE)
+    progress = {} if restart else load_progress(progress_path)
+    # Row yang sudah lengkap hanya di-parse ulang kalau diminta: --restart atau NIK disebut di --nik-file
+    jobs = build_jobs(folder, progress, niks, include_current=restart or niks is not None)
+
+    if not jobs:
+        logger.warning(f"Tidak ada ijazah yang perlu di-parse di folder {folder}"
+                       f"{' (semua sudah selesai, lihat ' + progress_path + ')' if progress else ''}")
+        # Run sebelumnya bisa terhenti setelah parse terakhir tapi sebelum output ditulis
+        write_back(folder, progress)
         return
-    
-    logger.info(f"Ditemukan {len(ijazah_files)} file ijazah\n")
-    
-    # Parse semua
+
+    reasons = {}
+    for job in jobs:
+        reasons[job.reason] = reasons.get(job.reason, 0) + 1
+    logger.info(f"Ditemukan {len(jobs)} ijazah untuk di-parse "
+                f"({', '.join(f'{k}={v}' for k, v in sorted(reasons.items()))}), "
+                f"{len(progress)} sudah ada di progress, {workers} worker\n")
+
     success_count = 0
     failed_count = 0
-    
-    for i, ijazah_path in enumerate(ijazah_files, 1):
-        nik = os.path.basename(os.path.dirname(ijazah_path))
-        logger.info(f"\n[{i}/{len(ijazah_files)}] NIK: {nik}")
-        logger.info(f"File: {ijazah_path}")
-        
+    start = time.time()
+
+    def parse(job):
+        return parser.parse_ijazah(job.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Job disubmit berurutan sesuai prioritas; worker mengambilnya dengan urutan yang sama
+        futures = {pool.submit(parse, job): job for job in jobs}
         try:
-            result = parser.parse_ijazah(ijazah_path)
-            
-            # Print hasil
-            logger.info("--- HASIL PARSING ---")
-            logger.info(f"  Nama          : {result.get('nama', 'N/A')}")
-            logger.info(f"  Gelar         : {result.get('gelar', 'N/A')}")
-            logger.info(f"  Nama + Gelar  : {result.get('nama_gelar', 'N/A')}")
-            logger.info(f"  NIM           : {result.get('nim', 'N/A')}")
-            logger.info(f"  Program Studi : {result.get('program_studi', 'N/A')}")
-            logger.info(f"  Fakultas      : {result.get('fakultas', 'N/A')}")
-            logger.info(f"  Universitas   : {result.get('universitas', 'N/A')}")
-            logger.info(f"  Tanggal       : {result.get('tanggal_ijazah', 'N/A')}")
-            
-            if result.get('nama_gelar'):
-                success_count += 1
-                logger.info("✓ Parsing berhasil")
-            else:
-                failed_count += 1
-                logger.warning("⚠ nama_gelar kosong")
-            
-        except Exception as e:
-            failed_count += 1
-            logger.error(f"✗ Error: {e}")
-    
+            for done, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = None
+                    logger.error(f"✗ NIK {job.nik}: {e}")
+
+                ok = bool(result and result.get('nama_gelar'))
+                progress[job.nik] = {
+                    "path": job.path,
+                    "status": "done" if ok else "failed",
+                    "prompt_version": PROMPT_VERSION,
+                    "reason": job.reason,
+                    "result": result,
+                    "finished_at": datetime.now().isoformat(timespec="seconds"),
+                }
+                if ok:
+                    success_count += 1
+                    logger.info(f"✓ [{done}/{len(jobs)}] {job.nik} ({job.reason}): {result.get('nama_gelar')}")
+                else:
+                    failed_count += 1
+                    logger.warning(f"⚠ [{done}/{len(jobs)}] {job.nik} ({job.reason}): nama_gelar kosong")
+
+                if done % SAVE_EVERY == 0:
+                    save_progress(progress_path, progress)
+                if done % REPORT_EVERY == 0 or done == len(jobs):
+                    elapsed = time.time() - start
+                    rate = done / elapsed if elapsed else 0
+                    eta = (len(jobs) - done) / rate if rate else 0
+                    logger.info(f"⏱ {done}/{len(jobs)} - {rate * 60:.1f} ijazah/menit - ETA {_format_eta(eta)}")
+        except KeyboardInterrupt:
+            logger.warning("\n⚠ Dihentikan - progress disimpan, jalankan ulang untuk melanjutkan")
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            save_progress(progress_path, progress)
+
     # Summary
     logger.info("\n" + "="*60)
     logger.info("SUMMARY")
     logger.info("="*60)
-    logger.info(f"Total ijazah      : {len(ijazah_files)}")
+    logger.info(f"Total ijazah      : {len(jobs)}")
     logger.info(f"✓ Berhasil parsed : {success_count}")
     logger.info(f"✗ Gagal/kosong    : {failed_count}")
+    logger.info(f"Waktu             : {_format_eta(time.time() - start)}")
+    logger.info(f"Progress file     : {progress_path}")
     logger.info("="*60)
 
+    write_back(folder, progress)
+
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Re-parse ijazah yang sudah didownload")
     # Bisa specify folder lain jika perlu
-    folder = sys.argv[1] if len(sys.argv) > 1 else "downloads"
-    reparse_ijazah(folder)
+    arg_parser.add_argument("folder", nargs="?", default="downloads",
+                            help="Folder downloads atau folder output run (default: downloads)")
+    arg_parser.add_argument("--nik-file", help="Hanya NIK dari file ini (.txt atau mitra_data.csv: NIK gagal/mismatch)")
+    arg_parser.add_argument("--workers", type=int, default=4, help="Jumlah parse paralel (default: 4)")
+    arg_parser.add_argument("--progress", help=f"Lokasi progress file (default: <folder>/{PROGRESS_FILE})")
+    arg_parser.add_argument("--restart", action="store_true", help="Abaikan progress lama dan mulai dari awal")
+    args = arg_parser.parse_args()
+
+    try:
+        reparse_ijazah(args.folder, load_nik_list(args.nik_file) if args.nik_file else None,
+                       args.workers, args.progress, args.restart)
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -1,12 +1,16 @@
 """
 Script untuk re-parse ijazah spesifik yang gagal
+    python reparse_single.py <NIK> [folder]
+File dicari di folder yang diberikan, downloads/, folder output_* terbaru, lalu downloads_test/
 """
 
 import os
 import sys
+import glob
 import json
 import logging
 from ijazah_parser import IjazahParser
+from download_layout import find_document
 
 # Setup logging
 logging.basicConfig(
@@ -15,14 +19,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def reparse_single_ijazah(nik):
+def find_ijazah(nik, folder=None):
+    """Path ijazah NIK di folder download yang dikenal (output terbaru dulu), None kalau tidak ada"""
+    folders = [folder] if folder else []
+    folders.append("downloads")
+    folders += [os.path.join(path, "downloads") for path in sorted(glob.glob("output_*"), reverse=True)]
+    folders.append("downloads_test")
+    for base in folders:
+        path = find_document(base, nik, "ijazah")
+        if path:
+            return path
+    return None
+
+def reparse_single_ijazah(nik, folder=None):
     """Re-parse ijazah untuk NIK tertentu"""
     
     # Cari file ijazah
-    ijazah_path = f"downloads_test/{nik}/ijazah.jpg"
+    ijazah_path = find_ijazah(nik, folder)
     
-    if not os.path.exists(ijazah_path):
-        logger.error(f"File tidak ditemukan: {ijazah_path}")
+    if not ijazah_path:
+        logger.error(f"File ijazah untuk NIK {nik} tidak ditemukan"
+                     f"{' di ' + folder if folder else ' (downloads/, output_*/downloads/, downloads_test/)'}")
         return
     
     logger.info(f"Re-parsing ijazah untuk NIK: {nik}")
@@ -64,4 +81,4 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         nik = sys.argv[1]
     
-    reparse_single_ijazah(nik)
+    reparse_single_ijazah(nik, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,106 @@
+"""
+Routing policy untuk memblokir resource yang tidak dibutuhkan saat scraping
+(gambar, font, media, dan domain pihak ketiga seperti analytics)
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Resource type Playwright yang aman diblokir - scraper hanya butuh href, bukan isi gambar
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+
+# Domain pihak ketiga yang tidak dibutuhkan aplikasi Seleksi Mitra
+BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+)
+
+# Perkiraan ukuran rata-rata per resource type (bytes), dipakai untuk estimasi bytes saved
+# karena request yang di-abort tidak pernah mengirim response
+ESTIMATED_SIZES = {
+    "image": 150 * 1024,
+    "font": 40 * 1024,
+    "media": 500 * 1024,
+    "script": 60 * 1024,
+    "stylesheet": 20 * 1024,
+}
+DEFAULT_ESTIMATED_SIZE = 10 * 1024
+
+
+class ResourceBlocker:
+    """Abort request image/font/media dan domain pihak ketiga via page.route"""
+
+    def __init__(self,
+                 blocked_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+                 blocked_domains: Iterable[str] = BLOCKED_DOMAINS):
+        self.blocked_types = set(blocked_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.stats = {
+            'blocked_requests': 0,
+            'allowed_requests': 0,
+            'estimated_bytes_saved': 0,
+        }
+        self.blocked_by_type: Dict[str, int] = {}
+        self._page = None
+
+    def _is_blocked_domain(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """True jika request boleh di-abort (XHR/fetch dan script aplikasi tidak pernah diblokir)"""
+        if resource_type in ("xhr", "fetch", "document"):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return self._is_blocked_domain(url)
+
+    def _handle_route(self, route, request):
+        resource_type = request.resource_type
+        if self.should_block(request.url, resource_type):
+            self.stats['blocked_requests'] += 1
+            self.stats['estimated_bytes_saved'] += ESTIMATED_SIZES.get(resource_type, DEFAULT_ESTIMATED_SIZE)
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            route.abort()
+        else:
+            self.stats['allowed_requests'] += 1
+            # fallback (bukan continue_) supaya route lain di context, mis. replay HAR, tetap dipakai
+            route.fallback()
+
+    def install(self, page):
+        """Pasang routing policy pada tab scraping"""
+        page.route("**/*", self._handle_route)
+        self._page = page
+        logger.info(f"✓ Resource blocking aktif ({', '.join(sorted(self.blocked_types))} + {len(self.blocked_domains)} domain pihak ketiga)")
+
+    def uninstall(self, page: Optional[object] = None):
+        """Lepas routing policy agar tab Chrome kembali normal setelah scraping"""
+        page = page or self._page
+        if page is None:
+            return
+        try:
+            page.unroute("**/*", self._handle_route)
+            logger.info("✓ Resource blocking dilepas")
+        except Exception as e:
+            logger.debug(f"Error removing resource route: {e}")
+        self._page = None
+
+    def log_summary(self):
+        """Log jumlah request dan perkiraan bytes yang dihemat selama run"""
+        saved_mb = self.stats['estimated_bytes_saved'] / (1024 * 1024)
+        logger.info(f"🚫 Requests blocked: {self.stats['blocked_requests']} "
+                    f"(allowed: {self.stats['allowed_requests']})")
+        if self.blocked_by_type:
+            breakdown = ", ".join(f"{k}={v}" for k, v in sorted(self.blocked_by_type.items()))
+            logger.info(f"🚫 Blocked by type: {breakdown}")
+        logger.info(f"🚫 Estimated bytes saved: {saved_mb:.2f} MB")
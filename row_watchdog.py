@@ -0,0 +1,66 @@
+"""
+Batas waktu per row (deadline) dan klasifikasi alasan gagal untuk retry queue
+"""
+
+import time
+from typing import Optional
+
+
+class RowTimeoutError(Exception):
+    """Row melewati time budget - dihentikan lebih awal supaya tidak menahan run"""
+
+    def __init__(self, stage: str, budget: float):
+        self.stage = stage
+        super().__init__(f"Row time budget {budget:.0f}s exceeded at stage: {stage}")
+
+
+class RowDeadline:
+    """Time budget satu row; semua timeout Playwright dipotong ke sisa budget"""
+
+    # Timeout minimum supaya Playwright tidak langsung gagal di detik terakhir
+    MIN_TIMEOUT_MS = 500
+
+    def __init__(self, budget_seconds: float):
+        self.budget = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+    def check(self, stage: str):
+        """Raise RowTimeoutError jika budget sudah habis"""
+        if self.remaining_ms() <= 0:
+            raise RowTimeoutError(stage, self.budget)
+
+    def timeout(self, default_ms: float, stage: Optional[str] = None) -> float:
+        """Timeout (ms) yang dipotong ke sisa budget; raise jika budget sudah habis"""
+        self.check(stage or "wait")
+        return max(self.MIN_TIMEOUT_MS, min(default_ms, self.remaining_ms()))
+
+    def pause(self, default_ms: float) -> float:
+        """Jeda tetap (wait_for_timeout) dipotong ke sisa budget; 0 kalau budget sudah habis"""
+        return min(default_ms, self.remaining_ms())
+
+    def grace(self, default_ms: float) -> float:
+        """Timeout untuk cleanup (tutup modal) yang tetap jalan setelah budget habis: dipotong ke sisa
+        budget tanpa raise, minimal MIN_TIMEOUT_MS supaya modal masih sempat dicoba ditutup"""
+        return max(self.MIN_TIMEOUT_MS, min(default_ms, self.remaining_ms()))
+
+    def seconds(self, default_seconds: float, stage: Optional[str] = None) -> float:
+        """Sama seperti timeout() tapi dalam detik (untuk requests)"""
+        return self.timeout(default_seconds * 1000, stage) / 1000
+
+
+def classify_failure(error: Exception) -> str:
+    """Klasifikasi exception process_row menjadi alasan singkat untuk retry queue"""
+    if isinstance(error, RowTimeoutError):
+        return "row_timeout"
+
+    message = str(error).lower()
+    if "timeout" in type(error).__name__.lower() or "timeout" in message:
+        return "timeout"
+    if "detached" in message or "not attached" in message or "has been closed" in message or "target closed" in message:
+        return "detached"
+    if "net::" in message or "connection" in message:
+        return "network"
+    return "other"
@@ -2,13 +2,29 @@ import os
 import sys
 import logging
 import requests
-import csv
-import re
+import math
+import time
+import argparse
 from datetime import datetime
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from ijazah_parser import IjazahParser
+from ijazah_parser import PROMPT_VERSION, IjazahParser, result_to_row
+
+from resource_blocker import ResourceBlocker
+from tab_health import TabHealthMonitor
+from row_watchdog import RowDeadline, RowTimeoutError, classify_failure
+from selector_cache import SelectorRegistry
+from nik_list import load_nik_list
+from differential import fingerprint_row, save_fingerprints, load_previous_run
+from mitra_store import MitraStore
+from data_quality import apply_validation
+from duplicate_detector import find_duplicates
+from output_writer import OutputWriter, normalize_dataset
+from image_validation import validate_image_bytes
+from image_triage import IjazahTriage
+from download_layout import LAYOUTS, DownloadLayout
+from har_session import HarRecorder, HarReplay
+from modal_capture import (BANK_LABELS, CAPTURE_FOLDER, clean_rekening, extract_archive, fill_bank_from_text,
+                           save_capture)
 
 # Setup logging
 log_filename = f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -22,14 +38,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MitraScraper:
-    def __init__(self):
-        # Create output folder with timestamp for versioning
+FILE_ADMIN_TAB_SELECTORS = [
+    '.nav-link:has-text("File Administrasi")',
+    '[role="tab"]:has-text("File Administrasi")',
+    'a:has-text("File Administrasi")'
+]
+PARSE_TIMEOUT_SECONDS = 60    # batas panggilan vision API per ijazah, dipotong lagi ke sisa budget row
+REKENING_TAB_SELECTORS = [
+    '.nav-link:has-text("Rekening")',
+    '[role="tab"]:has-text("Rekening")',
+    'a:has-text("Rekening")'
+]
+SEARCH_INPUT_SELECTORS = [
+    '.vgt-global-search__input input',
+    'input.vgt-input[placeholder*="Cari"]',
+    'input[placeholder*="Cari"]',
+    'input[placeholder*="Search"]',
+    'input[type="search"]'
+]
+
+class MitraScraper(OutputWriter):
+    def __init__(self, block_resources=False, tab_recycle=True, heap_limit_mb=600, row_budget=60,
+                 previous_folder=None, output_folder=None, triage=True, local_ocr=True,
+                 capture_only=False, download_layout="flat", cdp_url="http://localhost:9222",
+                 record_har=None, replay_har=None):
+        # Create output folder with timestamp for versioning (mode sync memakai folder mirror tetap)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.output_folder = f"output_{timestamp}"
+        super().__init__(output_folder or f"output_{timestamp}")
+        self.cdp_url = cdp_url
         self.base_download_dir = os.path.join(self.output_folder, "downloads")
         
-        self.data_list = []
         self.stats = {
             'total': 0,
             'success': 0,
@@ -37,9 +75,41 @@ class MitraScraper:
             'ktp_downloaded': 0,
             'ijazah_downloaded': 0,
             'ijazah_parsed': 0,
-            'pages_processed': 0
+            'pages_processed': 0,
+            'tab_recycles': 0,
+            'retried': 0,
+            'retry_recovered': 0,
+            'carried_forward': 0,
+            'invalid_downloads': 0,
+            'refetch_recovered': 0,
+            'ijazah_skipped': 0,
+            'ijazah_cached': 0,
+            'captured': 0
         }
         
+        # Time budget per row (detik) dan antrian NIK gagal untuk second pass
+        self.row_budget = row_budget
+        self.retry_queue = []
+        self.current_page = 1
+        
+        # Ranking selector yang dipelajari dari run-run sebelumnya
+        self.selector_registry = SelectorRegistry()
+        
+        # Differential scraping: fingerprint baris tabel run ini dan data run sebelumnya
+        self.fingerprints = {}
+        self.previous_rows, self.previous_fingerprints = {}, {}
+        if previous_folder:
+            self.previous_rows, self.previous_fingerprints = load_previous_run(previous_folder)
+        
+        # Download terakhir yang ditolak validasi (format/dimensi yang lolos ada di self.image_checks)
+        self.last_invalid_download = None
+        
+        # Triage lokal sebelum vision API: skip non-ijazah, pakai ulang hasil parse file yang sama
+        self.triage = IjazahTriage(version=PROMPT_VERSION) if triage else None
+        
+        # Mode capture: hanya simpan HTML modal per NIK, dataset diekstrak offline saat save
+        self.capture_folder = os.path.join(self.output_folder, CAPTURE_FOLDER) if capture_only else None
+        
         # Create output and downloads directory
         if not os.path.exists(self.output_folder):
             os.makedirs(self.output_folder)
@@ -49,10 +119,19 @@ class MitraScraper:
             os.makedirs(self.base_download_dir)
             logger.info(f"Created downloads directory: {self.base_download_dir}")
         
+        # Folder per NIK (flat atau di-shard per prefix/hash NIK) + manifest NIK -> file
+        self.download_layout = DownloadLayout(self.base_download_dir, download_layout)
+        
+        # HAR: rekam sesi (di-scrub saat disimpan) atau putar ulang rekaman tanpa jaringan;
+        # download dokumen ikut lewat self.http supaya terekam / dilayani dari HAR
+        self.har_recorder = HarRecorder(record_har) if record_har else None
+        self.har_replay = HarReplay(replay_har) if replay_har else None
+        self.http = self.har_replay or self.har_recorder or requests
+        
         # Initialize Ijazah Parser (optional, akan skip jika API key tidak ada)
         self.ijazah_parser = None
         try:
-            self.ijazah_parser = IjazahParser()
+            self.ijazah_parser = IjazahParser(local_ocr=local_ocr)
             logger.info("✓ IjazahParser initialized - Ijazah akan di-parse otomatis")
         except ValueError as e:
             logger.warning(f"⚠ IjazahParser tidak aktif: {e}")
@@ -60,8 +139,18 @@ class MitraScraper:
         except Exception as e:
             logger.warning(f"⚠ Error initializing IjazahParser: {e}")
             logger.warning("⚠ Ijazah akan didownload tapi tidak di-parse")
+        if self.har_replay and self.ijazah_parser:
+            # Replay tidak boleh ke jaringan, dan ijazah di HAR hanya gambar sintetis
+            self.ijazah_parser = None
+            logger.info("⚠ Replay HAR: parse ijazah dimatikan")
+        
+        # Opsional: blokir gambar/font/media dan analytics di tab scraping
+        self.resource_blocker = ResourceBlocker() if block_resources else None
+        
+        # Reload tab otomatis saat run panjang mulai melambat (SPA memory growth)
+        self.tab_monitor = TabHealthMonitor(heap_limit_mb=heap_limit_mb) if tab_recycle else None
 
-    def download_image(self, url, folder, filename):
+    def download_image(self, url, folder, filename, timeout=15):
         """Download image from URL with detailed logging"""
         if not url:
             logger.warning(f"No URL provided for {filename}")
@@ -69,15 +158,26 @@ class MitraScraper:
         
         try:
             logger.info(f"Downloading {filename} from {url[:100]}...")
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=timeout)
             
             if response.status_code == 200:
+                # HTTP 200 belum tentu gambar (link expired mengembalikan halaman login)
+                check = validate_image_bytes(response.content, response.headers.get("Content-Type"))
+                if not check.valid:
+                    self.stats['invalid_downloads'] += 1
+                    self.last_invalid_download = check.reason
+                    logger.warning(f"⚠ Invalid {filename}: {check.reason} "
+                                   f"({check.size_bytes / 1024:.2f} KB, format: {check.format}) - not saved")
+                    return None
+                
                 path = os.path.join(folder, filename)
                 with open(path, 'wb') as f:
                     f.write(response.content)
+                self.image_checks[path] = check
                 
                 file_size = len(response.content) / 1024  # KB
-                logger.info(f"✓ Downloaded {filename} ({file_size:.2f} KB) -> {path}")
+                logger.info(f"✓ Downloaded {filename} ({file_size:.2f} KB, {check.format} "
+                            f"{check.width}x{check.height}) -> {path}")
                 return path
             else:
                 logger.error(f"✗ Failed to download {filename}: HTTP {response.status_code}")
@@ -87,78 +187,94 @@ class MitraScraper:
             logger.error(f"✗ Error downloading {filename}: {str(e)}")
             return None
 
+    def _download_document(self, page, link_selector, href, folder, filename, deadline, stage):
+        """Download + validasi; file tidak valid di-fetch ulang sekali dengan href terbaru dari modal.
+        Return (path, invalid_reason)"""
+        self.last_invalid_download = None
+        path = self.download_image(href, folder, filename, timeout=deadline.seconds(15, stage))
+        if path or not self.last_invalid_download:
+            return path, None
+        
+        page.wait_for_timeout(deadline.pause(1000))
+        try:
+            fresh_href = page.locator(link_selector).first.get_attribute("href", timeout=deadline.timeout(3000, stage))
+        except PlaywrightTimeoutError:
+            fresh_href = None
+        logger.info(f"↻ Re-fetching {filename}{' (new link)' if fresh_href and fresh_href != href else ''}...")
+        self.last_invalid_download = None
+        path = self.download_image(fresh_href or href, folder, filename, timeout=deadline.seconds(15, stage))
+        if path:
+            self.stats['refetch_recovered'] += 1
+            return path, None
+        return None, self.last_invalid_download
+
+    def _extract_bank_from_labels(self, page, fields):
+        """Strategy: direct extraction from form-control-plaintext next to each label"""
+        for field, label in BANK_LABELS.items():
+            if fields[field] != "N/A":
+                continue
+            try:
+                container = page.locator(f'label:has-text("{label}") + div.form-control-plaintext')
+                if container.count() > 0:
+                    fields[field] = container.inner_text().strip()
+                    logger.info(f"Found {field}: {fields[field]}")
+            except Exception as e:
+                logger.debug(f"Label strategy failed for {field}: {e}")
+
+    def _extract_bank_from_text(self, page, fields):
+        """Strategy: parse from modal text dump"""
+        logger.info("Using text dump parsing...")
+        fill_bank_from_text(page.locator(".v--modal-box").inner_text(), fields)
+
     def extract_bank_info(self, page):
         """Extract bank information from Rekening tab"""
         logger.info("Extracting bank information...")
         
-        nama_bank = "N/A"
-        no_rekening = "N/A"
-        nama_pemilik = "N/A"
-
+        fields = {"Nama Bank": "N/A", "Nomor Rekening": "N/A", "Nama Pemilik": "N/A"}
+        
+        # Label selalu lebih dulu (presisi, tanpa timeout); text dump hanya mengisi field yang masih kosong.
+        # Field yang memang kosong di modal bukan kegagalan selector, jadi urutan ini tidak dipelajari.
         try:
-            # Strategy 1: Direct extraction from form-control-plaintext
-            try:
-                bank_container = page.locator('label:has-text("Nama Bank") + div.form-control-plaintext')
-                if bank_container.count() > 0:
-                    nama_bank = bank_container.inner_text().strip()
-                    logger.info(f"Found Nama Bank: {nama_bank}")
-            except Exception as e:
-                logger.debug(f"Strategy 1 failed for Nama Bank: {e}")
-            
-            try:
-                rek_container = page.locator('label:has-text("Nomor Rekening") + div.form-control-plaintext')
-                if rek_container.count() > 0:
-                    no_rekening = rek_container.inner_text().strip()
-                    logger.info(f"Found Nomor Rekening: {no_rekening}")
-            except Exception as e:
-                logger.debug(f"Strategy 1 failed for Nomor Rekening: {e}")
-            
+            self._extract_bank_from_labels(page, fields)
+        except Exception as e:
+            logger.error(f"Error extracting bank info (label): {str(e)}")
+        if "N/A" in fields.values():
             try:
-                owner_container = page.locator('label:has-text("Nama Pemilik Rekening") + div.form-control-plaintext')
-                if owner_container.count() > 0:
-                    nama_pemilik = owner_container.inner_text().strip()
-                    logger.info(f"Found Nama Pemilik: {nama_pemilik}")
+                self._extract_bank_from_text(page, fields)
             except Exception as e:
-                logger.debug(f"Strategy 1 failed for Nama Pemilik: {e}")
-            
-            # Fallback: Parse from text dump if any field is still N/A
-            if nama_bank == "N/A" or no_rekening == "N/A" or nama_pemilik == "N/A":
-                logger.info("Using fallback text parsing...")
-                modal_text = page.locator(".v--modal-box").inner_text()
-                lines = modal_text.split('\n')
-                
-                for i, line in enumerate(lines):
-                    line = line.strip()
-                    
-                    if nama_bank == "N/A" and "Nama Bank" in line and i + 1 < len(lines):
-                        potential_bank = lines[i + 1].strip()
-                        if potential_bank and ("BANK" in potential_bank.upper() or potential_bank.startswith("(")):
-                            nama_bank = potential_bank
-                            logger.info(f"Fallback found Nama Bank: {nama_bank}")
-                    
-                    if no_rekening == "N/A" and "Nomor Rekening" in line and i + 1 < len(lines):
-                        potential_rek = lines[i + 1].strip()
-                        if potential_rek and (potential_rek.replace(' ', '').isdigit() or len(potential_rek) > 8):
-                            no_rekening = potential_rek
-                            logger.info(f"Fallback found Nomor Rekening: {no_rekening}")
-                    
-                    if nama_pemilik == "N/A" and "Nama Pemilik" in line and i + 1 < len(lines):
-                        potential_owner = lines[i + 1].strip()
-                        if potential_owner and len(potential_owner) > 2 and not potential_owner.isdigit():
-                            nama_pemilik = potential_owner
-                            logger.info(f"Fallback found Nama Pemilik: {nama_pemilik}")
+                logger.error(f"Error extracting bank info (text_dump): {str(e)}")
         
-        except Exception as e:
-            logger.error(f"Error extracting bank info: {str(e)}")
+        nama_bank = fields["Nama Bank"]
+        no_rekening = fields["Nomor Rekening"]
+        nama_pemilik = fields["Nama Pemilik"]
         
         # Clean Nomor Rekening (Keep only numbers)
-        if no_rekening != "N/A":
-            no_rekening = re.sub(r'[^0-9]', '', no_rekening)
+        no_rekening = clean_rekening(no_rekening)
         
         return nama_bank, no_rekening, nama_pemilik
 
-    def process_row(self, row, index, page):
+    def _click_tab(self, page, tab_name, selectors, timeout_ms, deadline):
+        """Click a modal tab, trying the historically fastest working selector first"""
+        key = f"tab:{tab_name}"
+        stage = tab_name.lower().replace(' ', '_') + "_tab"
+        for selector in self.selector_registry.ordered(key, selectors):
+            timeout = deadline.timeout(timeout_ms, stage)
+            start = time.time()
+            try:
+                page.locator(selector).first.click(timeout=timeout)
+            except Exception:
+                self.selector_registry.record_failure(key, selector)
+                continue
+            self.selector_registry.record_success(key, selector, (time.time() - start) * 1000)
+            logger.info(f"✓ Clicked {tab_name} tab using: {selector}")
+            return True
+        return False
+
+    def process_row(self, row, index, page, is_retry=False):
         """Process a single table row"""
+        if self.capture_folder:
+            return self.capture_row(row, index, page, is_retry)
+        deadline = RowDeadline(self.row_budget)
         try:
             # Find NIK link
             nik_link = row.locator('span[title="Lihat Detail Mitra"]')
@@ -172,54 +288,42 @@ class MitraScraper:
             logger.info(f"{'='*60}")
             
             # Create user directory
-            user_download_dir = os.path.join(self.base_download_dir, nik_text)
-            if not os.path.exists(user_download_dir):
-                os.makedirs(user_download_dir)
-                logger.info(f"Created directory: {user_download_dir}")
+            user_download_dir = self.download_layout.nik_dir(nik_text)
+            logger.info(f"Download directory: {user_download_dir}")
             
             # Click NIK to open popup
             logger.info("Opening detail popup...")
-            nik_link.click()
+            nik_link.click(timeout=deadline.timeout(10000, "open_popup"))
             
             # Wait for modal with better error handling
             try:
-                page.wait_for_selector("text=Detail Informasi Mitra", timeout=10000)
+                page.wait_for_selector("text=Detail Informasi Mitra", timeout=deadline.timeout(10000, "popup"))
                 logger.info("✓ Popup opened")
             except PlaywrightTimeoutError:
                 logger.error("Timeout waiting for popup - trying to continue anyway")
-                page.wait_for_timeout(2000)
+                page.wait_for_timeout(deadline.pause(2000))
             
             # === Tab 1: File Administrasi ===
             logger.info("\n--- Processing File Administrasi ---")
             try:
                 # Try multiple selectors for File Administrasi tab
-                file_admin_clicked = False
-                selectors = [
-                    '.nav-link:has-text("File Administrasi")',
-                    '[role="tab"]:has-text("File Administrasi")',
-                    'a:has-text("File Administrasi")'
-                ]
-                
-                for selector in selectors:
-                    try:
-                        page.locator(selector).first.click(timeout=5000)
-                        logger.info(f"✓ Clicked File Administrasi tab using: {selector}")
-                        file_admin_clicked = True
-                        break
-                    except Exception:
-                        continue
+                file_admin_clicked = self._click_tab(page, "File Administrasi", FILE_ADMIN_TAB_SELECTORS, 5000, deadline)
                 
                 if not file_admin_clicked:
                     logger.warning("Could not click File Administrasi tab - may already be active")
                     
+            except RowTimeoutError:
+                raise
             except Exception as e:
                 logger.warning(f"Error clicking File Administrasi tab: {e}")
             
-            page.wait_for_timeout(1500)
+            page.wait_for_timeout(deadline.pause(1500))
             
             ktp_path = None
             ijazah_path = None
             ijazah_data = None
+            ktp_invalid = None
+            ijazah_invalid = None
             
             # Find images - gunakan selector berdasarkan label dan URL
             try:
@@ -228,11 +332,16 @@ class MitraScraper:
                 if ktp_links:
                     ktp_href = ktp_links[0].get_attribute("href")
                     logger.info(f"Found KTP link: {ktp_href[:100]}...")
-                    ktp_path = self.download_image(ktp_href, user_download_dir, "ktp.jpg")
+                    ktp_path, ktp_invalid = self._download_document(page, 'a[href*="foto_ktp/"]', ktp_href,
+                                                                    user_download_dir, "ktp.jpg", deadline, "download_ktp")
                     if ktp_path:
                         self.stats['ktp_downloaded'] += 1
+                        self.download_layout.record(nik_text, "ktp", ktp_path, ktp_href,
+                                                    self.image_checks.get(ktp_path))
                 else:
                     logger.warning("No KTP link found")
+            except RowTimeoutError:
+                raise
             except Exception as e:
                 logger.error(f"Error finding KTP link: {e}")
             
@@ -242,25 +351,49 @@ class MitraScraper:
                 if ijazah_links:
                     ijazah_href = ijazah_links[0].get_attribute("href")
                     logger.info(f"Found Ijazah link: {ijazah_href[:100]}...")
-                    ijazah_path = self.download_image(ijazah_href, user_download_dir, "ijazah.jpg")
+                    ijazah_path, ijazah_invalid = self._download_document(page, 'a[href*="ijazah/"]', ijazah_href,
+                                                                          user_download_dir, "ijazah.jpg", deadline,
+                                                                          "download_ijazah")
                     if ijazah_path:
                         self.stats['ijazah_downloaded'] += 1
+                        self.download_layout.record(nik_text, "ijazah", ijazah_path, ijazah_href,
+                                                    self.image_checks.get(ijazah_path))
                         
-                        # Parse ijazah jika parser tersedia
-                        if self.ijazah_parser:
+                        # Parse ijazah jika parser tersedia (triage hanya berguna kalau ada yang di-parse)
+                        use_triage = self.triage is not None and self.ijazah_parser is not None
+                        decision = self.triage.classify(ijazah_path, nik_text) if use_triage else None
+                        if self.ijazah_parser and decision and decision.route == "skip":
+                            logger.warning(f"⏭ Ijazah skipped by triage ({decision.reason}), not sent to API "
+                                           f"- flagged as ijazah_skipped for manual review")
+                            ijazah_data = self.ijazah_parser._empty_result()
+                            ijazah_data["jenis_ijazah"] = f"Bukan Ijazah ({decision.reason})"
+                            self.stats['ijazah_skipped'] += 1
+                        elif self.ijazah_parser and decision and decision.route == "cache":
+                            logger.info(f"✓ Ijazah reused from cache ({decision.reason})")
+                            ijazah_data = decision.result
+                            self.stats['ijazah_cached'] += 1
+                        elif self.ijazah_parser:
                             logger.info("Parsing ijazah dengan OpenAI Vision API...")
+                            # Timeout client dari sisa budget row (default SDK 600 detik + retry)
+                            parse_timeout = deadline.seconds(PARSE_TIMEOUT_SECONDS, "parse_ijazah")
                             try:
-                                ijazah_data = self.ijazah_parser.parse_ijazah(ijazah_path)
+                                ijazah_data = self.ijazah_parser.parse_ijazah(ijazah_path, timeout=parse_timeout)
                                 self.stats['ijazah_parsed'] += 1
                                 logger.info(f"✓ Ijazah parsed successfully")
                             except Exception as e:
                                 logger.error(f"✗ Error parsing ijazah: {e}")
+                                ijazah_data = None
+                            if use_triage:
+                                self.triage.remember(ijazah_path, ijazah_data)
+                            if ijazah_data is None:
                                 ijazah_data = self.ijazah_parser._empty_result()
                         else:
                             ijazah_data = None
                 else:
                     logger.warning("No Ijazah link found")
                     ijazah_data = None
+            except RowTimeoutError:
+                raise
             except Exception as e:
                 logger.error(f"Error finding Ijazah link: {e}")
                 ijazah_data = None
@@ -269,85 +402,51 @@ class MitraScraper:
             logger.info("\n--- Processing Rekening ---")
             try:
                 # Try multiple selectors for Rekening tab
-                rekening_clicked = False
-                selectors = [
-                    '.nav-link:has-text("Rekening")',
-                    '[role="tab"]:has-text("Rekening")',
-                    'a:has-text("Rekening")'
-                ]
-                
-                for selector in selectors:
-                    try:
-                        page.locator(selector).first.click(timeout=10000)
-                        logger.info(f"✓ Clicked Rekening tab using: {selector}")
-                        rekening_clicked = True
-                        break
-                    except Exception:
-                        continue
+                rekening_clicked = self._click_tab(page, "Rekening", REKENING_TAB_SELECTORS, 10000, deadline)
                 
                 if not rekening_clicked:
                     logger.error("Failed to click Rekening tab with all selectors")
                     
+            except RowTimeoutError:
+                raise
             except Exception as e:
                 logger.error(f"Error clicking Rekening tab: {e}")
             
             # Wait for Rekening tab content to fully load (prevent race condition)
             try:
-                page.wait_for_selector('label:has-text("Nama Bank")', state="visible", timeout=8000)
+                page.wait_for_selector('label:has-text("Nama Bank")', state="visible",
+                                       timeout=deadline.timeout(8000, "rekening_content"))
                 logger.info("✓ Rekening tab content loaded")
-                page.wait_for_timeout(800)  # Extra buffer for dynamic content
+                page.wait_for_timeout(deadline.pause(800))  # Extra buffer for dynamic content
             except PlaywrightTimeoutError:
                 logger.warning("⚠ Rekening content load timeout - continuing anyway")
-                page.wait_for_timeout(2000)
+                page.wait_for_timeout(deadline.pause(2000))
             
             nama_bank, no_rekening, nama_pemilik = self.extract_bank_info(page)
             
-            # Validate scraped data to detect potential mismatch
-            has_mismatch = False
-            if no_rekening != "N/A" and not no_rekening.replace('-', '').replace(' ', '').isdigit():
-                has_mismatch = True
-                logger.error(f"⚠ POTENTIAL MISMATCH DETECTED for NIK {nik_text}!")
-                logger.error(f"  Nomor Rekening contains non-numeric: '{no_rekening}'")
-                logger.error(f"  Nama Pemilik: '{nama_pemilik}'")
-                logger.error(f"  This data may be incorrect - please verify manually!")
-            
             # Store data
             row_data = {
                 "NIK": nik_text,
                 "Nama Bank": nama_bank,
                 "Nomor Rekening": no_rekening,
                 "Nama Pemilik": nama_pemilik,
-                "Path KTP": ktp_path if ktp_path else "Not Downloaded",
-                "Path Ijazah": ijazah_path if ijazah_path else "Not Downloaded",
-                "Status": "Success",
-                "_has_mismatch": has_mismatch  # Internal flag for Excel highlighting
+                "Path KTP": ktp_path or (f"Invalid ({ktp_invalid})" if ktp_invalid else "Not Downloaded"),
+                "Path Ijazah": ijazah_path or (f"Invalid ({ijazah_invalid})" if ijazah_invalid else "Not Downloaded"),
+                "Status": "Success"
             }
             
-            # Tambahkan data parsing ijazah jika tersedia
-            if ijazah_data:
-                row_data.update({
-                    "Ijazah_Jenis": ijazah_data.get("jenis_ijazah", "N/A"),
-                    "Ijazah_Nama": ijazah_data.get("nama", "N/A"),
-                    "Ijazah_Gelar": ijazah_data.get("gelar", "N/A"),
-                    "Ijazah_Nama_Gelar": ijazah_data.get("nama_gelar", "N/A"),
-                    "Ijazah_NIM": ijazah_data.get("nim", "N/A"),
-                    "Ijazah_Program_Studi": ijazah_data.get("program_studi", "N/A"),
-                    "Ijazah_Fakultas": ijazah_data.get("fakultas", "N/A"),
-                    "Ijazah_Universitas": ijazah_data.get("universitas", "N/A"),
-                    "Ijazah_Tanggal": ijazah_data.get("tanggal_ijazah", "N/A")
-                })
-            else:
-                row_data.update({
-                    "Ijazah_Jenis": "N/A",
-                    "Ijazah_Nama": "N/A",
-                    "Ijazah_Gelar": "N/A",
-                    "Ijazah_Nama_Gelar": "N/A",
-                    "Ijazah_NIM": "N/A",
-                    "Ijazah_Program_Studi": "N/A",
-                    "Ijazah_Fakultas": "N/A",
-                    "Ijazah_Universitas": "N/A",
-                    "Ijazah_Tanggal": "N/A"
-                })
+            # Validate scraped data to detect potential mismatch (rule yang sama dengan batch validation)
+            apply_validation([row_data])
+            if row_data["_has_mismatch"]:
+                logger.error(f"⚠ POTENTIAL MISMATCH DETECTED for NIK {nik_text}!")
+                logger.error(f"  Rules: {', '.join(row_data['_issues'])}")
+                logger.error(f"  Nomor Rekening: '{no_rekening}' | Nama Pemilik: '{nama_pemilik}'")
+                logger.error(f"  This data may be incorrect - please verify manually!")
+            elif row_data["_issues"]:
+                logger.warning(f"⚠ Data quality notes: {', '.join(row_data['_issues'])}")
+            
+            # Tambahkan data parsing ijazah jika tersedia (versi prompt dicatat untuk reparse)
+            row_data.update(result_to_row(ijazah_data))
             
             self.data_list.append(row_data)
             
@@ -360,226 +459,136 @@ class MitraScraper:
                 logger.info(f"  Ijazah Gelar: {ijazah_data.get('gelar', 'N/A')}")
                 logger.info(f"  Universitas: {ijazah_data.get('universitas', 'N/A')}")
             
-            # Close modal with multiple attempts and verification
-            try:
-                page.keyboard.press("Escape")
-                page.wait_for_timeout(500)
-                # Verify modal is actually closed
-                try:
-                    page.wait_for_selector(".v--modal-box", state="hidden", timeout=3000)
-                    logger.info("✓ Modal closed successfully")
-                except PlaywrightTimeoutError:
-                    logger.warning("⚠ Modal may still be visible after Escape")
-            except Exception as e:
-                logger.warning(f"Error closing modal with Escape: {e}")
-                # Try clicking close button
-                try:
-                    page.locator('button.close, .modal-close, [aria-label="Close"]').first.click(timeout=2000)
-                    page.wait_for_timeout(500)
-                    page.wait_for_selector(".v--modal-box", state="hidden", timeout=3000)
-                    logger.info("✓ Modal closed via button")
-                except Exception:
-                    logger.warning("⚠ Could not verify modal closure - continuing anyway")
+            self._close_modal(page, deadline)
             
             self.stats['success'] += 1
             return True
             
         except Exception as e:
-            logger.error(f"✗ Error processing row {index}: {str(e)}", exc_info=True)
-            self.stats['failed'] += 1
+            return self._row_failed(e, index, page, nik_text if 'nik_text' in locals() else None, is_retry,
+                                    deadline)
+
+    def capture_row(self, row, index, page, is_retry=False):
+        """Mode capture: simpan HTML modal kedua tab tanpa download, parse, atau ekstraksi"""
+        deadline = RowDeadline(self.row_budget)
+        nik_text = None
+        try:
+            nik_link = row.locator('span[title="Lihat Detail Mitra"]')
+            if not nik_link.count():
+                logger.debug(f"Row {index}: No NIK link found, skipping")
+                return False
             
-            # Try to close modal and recover
+            nik_text = nik_link.inner_text().strip()
+            logger.info(f"📸 Capturing Row {index + 1}: NIK {nik_text}")
+            nik_link.click(timeout=deadline.timeout(10000, "open_popup"))
+            page.wait_for_selector("text=Detail Informasi Mitra", timeout=deadline.timeout(10000, "popup"))
+            
+            if not self._click_tab(page, "File Administrasi", FILE_ADMIN_TAB_SELECTORS, 5000, deadline):
+                logger.warning("Could not click File Administrasi tab - may already be active")
             try:
-                page.keyboard.press("Escape")
-                page.wait_for_timeout(500)
-            except Exception:
-                try:
-                    page.locator('button.close, .modal-close, [aria-label="Close"]').first.click(timeout=2000)
-                    page.wait_for_timeout(500)
-                except Exception:
-                    pass
-            
-            # Store failed entry
-            self.data_list.append({
-                "NIK": nik_text if 'nik_text' in locals() else "Unknown",
-                "Nama Bank": "N/A",
-                "Nomor Rekening": "N/A",
-                "Nama Pemilik": "N/A",
-                "Path KTP": "Failed",
-                "Path Ijazah": "Failed",
-                "Ijazah_Jenis": "N/A",
-                "Ijazah_Nama": "N/A",
-                "Ijazah_Gelar": "N/A",
-                "Ijazah_Nama_Gelar": "N/A",
-                "Ijazah_NIM": "N/A",
-                "Ijazah_Program_Studi": "N/A",
-                "Ijazah_Fakultas": "N/A",
-                "Ijazah_Universitas": "N/A",
-                "Ijazah_Tanggal": "N/A",
-                "Status": f"Failed: {str(e)[:100]}"
-            })
+                page.wait_for_selector('a[href*="foto_ktp/"], a[href*="ijazah/"]',
+                                       timeout=deadline.timeout(3000, "file_administrasi_content"))
+            except PlaywrightTimeoutError:
+                logger.warning("⚠ No document links rendered - capturing tab anyway")
+            file_admin_html = page.locator(".v--modal-box").first.evaluate("el => el.outerHTML")
             
-            return False
+            if not self._click_tab(page, "Rekening", REKENING_TAB_SELECTORS, 10000, deadline):
+                logger.error("Failed to click Rekening tab with all selectors")
+            page.wait_for_selector('label:has-text("Nama Bank") + div.form-control-plaintext', state="visible",
+                                   timeout=deadline.timeout(8000, "rekening_content"))
+            rekening_html = page.locator(".v--modal-box").first.evaluate("el => el.outerHTML")
+            
+            save_capture(self.capture_folder, nik_text, file_admin_html, rekening_html)
+            self.stats['captured'] += 1
+            logger.info(f"✓ Captured NIK {nik_text} ({(len(file_admin_html) + len(rekening_html)) / 1024:.1f} KB HTML)")
+            
+            self._close_modal(page, deadline)
+            self.stats['success'] += 1
+            return True
+            
+        except Exception as e:
+            return self._row_failed(e, index, page, nik_text, is_retry, deadline)
 
-    def save_to_excel(self, filename="mitra_data.xlsx"):
-        """Save data to Excel with formatting"""
-        filepath = os.path.join(self.output_folder, filename)
-        logger.info(f"\nSaving data to Excel: {filepath}")
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Data Mitra"
-        
-        # Headers - Kolom utama di depan
-        headers = [
-            "NIK", 
-            "Nama Lengkap (dengan Gelar)",
-            "Nomor Rekening",
-            "Nama Bank",
-            "Nama Pemilik Rekening",
-            "Jenis Ijazah",
-            "Gelar",
-            "NIM",
-            "Program Studi",
-            "Fakultas",
-            "Universitas",
-            "Tanggal Ijazah",
-            "Path KTP",
-            "Path Ijazah",
-            "Status"
-        ]
-        ws.append(headers)
-        
-        # Header formatting
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Add data rows with conditional formatting
-        mismatch_count = 0
-        for row_idx, row_data in enumerate(self.data_list, start=2):  # Start at row 2 (after header)
-            ws.append([
-                row_data.get("NIK", ""),
-                row_data.get("Ijazah_Nama_Gelar", "N/A"),
-                row_data.get("Nomor Rekening", ""),
-                row_data.get("Nama Bank", ""),
-                row_data.get("Nama Pemilik", ""),
-                row_data.get("Ijazah_Jenis", ""),
-                row_data.get("Ijazah_Gelar", ""),
-                row_data.get("Ijazah_NIM", ""),
-                row_data.get("Ijazah_Program_Studi", ""),
-                row_data.get("Ijazah_Fakultas", ""),
-                row_data.get("Ijazah_Universitas", ""),
-                row_data.get("Ijazah_Tanggal", ""),
-                row_data.get("Path KTP", ""),
-                row_data.get("Path Ijazah", ""),
-                row_data.get("Status", "")
-            ])
-            
-            # Highlight rows with potential mismatch
-            if row_data.get("_has_mismatch", False):
-                mismatch_count += 1
-                # Red/orange fill for mismatch rows
-                mismatch_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                mismatch_font = Font(color="9C0006", bold=True)
-                
-                for cell in ws[row_idx]:
-                    cell.fill = mismatch_fill
-                    # Highlight Nomor Rekening column specifically
-                    if cell.column == 3:  # Column C (Nomor Rekening)
-                        cell.font = mismatch_font
+    def _close_modal(self, page, deadline):
+        """Close modal with multiple attempts and verification"""
+        try:
+            page.keyboard.press("Escape")
+            page.wait_for_timeout(deadline.pause(500))
+            # Verify modal is actually closed
+            try:
+                page.wait_for_selector(".v--modal-box", state="hidden", timeout=deadline.grace(3000))
+                logger.info("✓ Modal closed successfully")
+            except PlaywrightTimeoutError:
+                logger.warning("⚠ Modal may still be visible after Escape")
+        except Exception as e:
+            logger.warning(f"Error closing modal with Escape: {e}")
+            # Try clicking close button
+            try:
+                page.locator('button.close, .modal-close, [aria-label="Close"]').first.click(
+                    timeout=deadline.grace(2000))
+                page.wait_for_timeout(deadline.pause(500))
+                page.wait_for_selector(".v--modal-box", state="hidden", timeout=deadline.grace(3000))
+                logger.info("✓ Modal closed via button")
+            except Exception:
+                logger.warning("⚠ Could not verify modal closure - continuing anyway")
+
+    def _row_failed(self, e, index, page, nik_text, is_retry, deadline):
+        """Catat row gagal: tutup modal, simpan failed entry, masukkan ke retry queue.
+        Waktu cleanup ikut dipotong ke sisa budget row (minimal RowDeadline.MIN_TIMEOUT_MS)"""
+        reason = classify_failure(e)
+        if isinstance(e, RowTimeoutError):
+            logger.error(f"✗ Row {index} aborted: {e}")
+        else:
+            logger.error(f"✗ Error processing row {index}: {str(e)}", exc_info=True)
+        self.stats['failed'] += 1
         
-        logger.info(f"✓ Highlighted {mismatch_count} rows with potential mismatch")
+        # Try to close modal and recover
+        try:
+            page.keyboard.press("Escape")
+            page.wait_for_timeout(deadline.pause(500))
+        except Exception:
+            try:
+                page.locator('button.close, .modal-close, [aria-label="Close"]').first.click(
+                    timeout=deadline.grace(2000))
+                page.wait_for_timeout(deadline.pause(500))
+            except Exception:
+                pass
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Add borders
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-            for cell in row:
-                cell.border = thin_border
-        
-        # Create Summary Sheet
-        ws_summary = wb.create_sheet("Summary", 0)  # Insert at beginning
-        ws_summary.append(["SCRAPING SUMMARY & DATA QUALITY REPORT"])
-        ws_summary.append([])
-        ws_summary.append(["Metric", "Value"])
-        ws_summary.append(["Total Rows Scraped", len(self.data_list)])
-        ws_summary.append(["Rows with Potential Mismatch", mismatch_count])
-        ws_summary.append(["Data Quality Rate", f"{((len(self.data_list) - mismatch_count) / len(self.data_list) * 100):.1f}%" if self.data_list else "N/A"])
-        ws_summary.append([])
-        ws_summary.append(["LEGEND:"])
-        ws_summary.append(["🔴 Red/Pink Rows", "= Potential mismatch detected (Nomor Rekening contains non-numeric characters)"])
-        ws_summary.append(["⚠️ Action Required", "= Please verify these rows manually"])
-        ws_summary.append([])
-        ws_summary.append(["Note:", "Mismatch detection helps identify data quality issues where account number may have been incorrectly scraped."])
-        
-        # Format summary sheet
-        ws_summary['A1'].font = Font(bold=True, size=14, color="FFFFFF")
-        ws_summary['A1'].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        ws_summary['A1'].alignment = Alignment(horizontal='center')
-        ws_summary.merge_cells('A1:B1')
-        
-        # Format metric headers
-        for cell in ws_summary[3]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        
-        # Highlight mismatch count if > 0
-        if mismatch_count > 0:
-            ws_summary['B5'].font = Font(bold=True, color="9C0006")
-            ws_summary['B5'].fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        
-        # Auto-adjust summary column widths
-        ws_summary.column_dimensions['A'].width = 30
-        ws_summary.column_dimensions['B'].width = 60
-        
-        wb.save(filepath)
-        logger.info(f"✓ Excel file saved: {filepath}")
-        if mismatch_count > 0:
-            logger.info(f"⚠ {mismatch_count} rows highlighted in red - please verify manually!")
-
-    def save_to_csv(self, filename="mitra_data.csv"):
-        """Save data to CSV"""
-        filepath = os.path.join(self.output_folder, filename)
-        logger.info(f"Saving CSV backup: {filepath}")
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = [
-                "NIK", "Ijazah_Nama_Gelar", "Nomor Rekening",
-                "Nama Bank", "Nama Pemilik", 
-                "Ijazah_Jenis", "Ijazah_Nama", "Ijazah_Gelar", "Ijazah_NIM",
-                "Ijazah_Program_Studi", "Ijazah_Fakultas", "Ijazah_Universitas", "Ijazah_Tanggal",
-                "Path KTP", "Path Ijazah", "Status"
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.data_list)
-        
-        logger.info(f"✓ CSV backup saved: {filepath}")
+        # Store failed entry
+        self.data_list.append(self._failed_entry(nik_text or "Unknown", f"Failed ({reason}): {str(e)[:100]}"))
+        
+        # Masukkan ke retry queue untuk second pass setelah crawl utama
+        if not is_retry and nik_text:
+            self.retry_queue.append({
+                "nik": nik_text,
+                "page": self.current_page,
+                "index": index,
+                "reason": reason
+            })
+        
+        return False
+
+    def _failed_entry(self, nik, status):
+        """Row data for a NIK that could not be processed"""
+        return {
+            "NIK": nik,
+            "Nama Bank": "N/A",
+            "Nomor Rekening": "N/A",
+            "Nama Pemilik": "N/A",
+            "Path KTP": "Failed",
+            "Path Ijazah": "Failed",
+            "Ijazah_Jenis": "N/A",
+            "Ijazah_Nama": "N/A",
+            "Ijazah_Gelar": "N/A",
+            "Ijazah_Jenjang": "N/A",
+            "Ijazah_Nama_Gelar": "N/A",
+            "Ijazah_NIM": "N/A",
+            "Ijazah_Program_Studi": "N/A",
+            "Ijazah_Fakultas": "N/A",
+            "Ijazah_Universitas": "N/A",
+            "Ijazah_Tanggal": "N/A",
+            "Status": status
+        }
 
     def print_summary(self):
         """Print scraping summary"""
@@ -590,77 +599,615 @@ class MitraScraper:
         logger.info(f"Total rows processed: {self.stats['total']}")
         logger.info(f"✓ Successful: {self.stats['success']}")
         logger.info(f"✗ Failed: {self.stats['failed']}")
+        if self.capture_folder:
+            logger.info(f"📸 Modals captured: {self.stats['captured']} -> {self.capture_folder}")
         logger.info(f"📷 KTP downloaded: {self.stats['ktp_downloaded']}")
         logger.info(f"📷 Ijazah downloaded: {self.stats['ijazah_downloaded']}")
         logger.info(f"📝 Ijazah parsed: {self.stats['ijazah_parsed']}")
+        if self.ijazah_parser and self.ijazah_parser.local_ocr:
+            logger.info(f"   Local OCR: {self.ijazah_parser.counts['local']}, "
+                        f"OpenAI API: {self.ijazah_parser.counts['api']}")
+        if self.triage and self.ijazah_parser:
+            self.triage.log_summary()
+        if self.previous_rows:
+            logger.info(f"= Carried forward (unchanged): {self.stats['carried_forward']}")
+        if self.stats['invalid_downloads']:
+            logger.info(f"⚠ Invalid downloads (HTML/corrupt): {self.stats['invalid_downloads']} "
+                        f"(recovered by re-fetch: {self.stats['refetch_recovered']})")
+        if self.stats['retried']:
+            logger.info(f"↻ Retried: {self.stats['retried']} (recovered: {self.stats['retry_recovered']})")
+        if self.tab_monitor:
+            logger.info(f"♻ Tab recycles: {self.stats['tab_recycles']}")
+        if self.resource_blocker:
+            self.resource_blocker.log_summary()
         logger.info(f"{'='*60}")
 
-    def run(self):
-        """Main scraping process"""
+    def _wait_for_table(self, page):
+        """Wait for vue-good-table rows and loading overlay"""
+        # Strategy 1: Wait for table to exist
+        try:
+            page.wait_for_selector("table#vgt-table tbody tr", state="attached", timeout=5000)
+            logger.info("✓ Table found (attached)")
+        except Exception:
+            logger.warning("Table not found with 'attached' state, trying alternative...")
+        
+        # Strategy 2: Wait for loading overlay to disappear
+        try:
+            overlay = page.locator(".velmld-overlay")
+            if overlay.count() > 0:
+                logger.info("Waiting for loading overlay to disappear...")
+                page.wait_for_selector(".velmld-overlay", state="hidden", timeout=15000)
+                logger.info("✓ Loading overlay hidden")
+        except Exception:
+            logger.info("No loading overlay found or already hidden")
+        
+        # Strategy 3: Just wait a bit for any animations
+        page.wait_for_timeout(2000)
+
+    def _wait_for_overlay(self, page):
+        """Wait for loading overlay to disappear after page change"""
+        try:
+            overlay = page.locator(".velmld-overlay")
+            if overlay.count() > 0:
+                page.wait_for_selector(".velmld-overlay", state="hidden", timeout=15000)
+        except Exception:
+            pass
+
+    def _get_data_rows(self, page):
+        """Return (all_rows, data_rows) - data_rows hanya baris yang punya link NIK"""
+        all_rows = page.locator("table#vgt-table tbody tr").all()
+        data_rows = []
+        for row in all_rows:
+            nik_link = row.locator('span[title="Lihat Detail Mitra"]')
+            if nik_link.count() > 0:
+                data_rows.append(row)
+        return all_rows, data_rows
+
+    def _go_to_next_page(self, page, current_page):
+        """Click "Selanjutnya"; return False when there is no next page"""
+        try:
+            # Look for "Selanjutnya" button that's NOT disabled
+            next_button = page.locator('button.footer__navigation__page-btn:has-text("Selanjutnya"):not(.disabled)')
+            
+            if next_button.count() > 0 and next_button.is_visible():
+                logger.info(f"\n✓ Page {current_page} completed. Moving to next page...")
+                next_button.click()
+                page.wait_for_timeout(3000)  # Wait for page to load
+                
+                # Wait for loading overlay to disappear
+                self._wait_for_overlay(page)
+                return True
+            
+            logger.info(f"\n✓ No more pages. Completed {current_page} page(s).")
+            return False
+        except Exception as e:
+            logger.info(f"\n✓ Reached last page or pagination error: {str(e)}")
+            return False
+
+    def _get_current_page_number(self, page):
+        """Baca nomor halaman aktif dari footer vue-good-table (None jika tidak terbaca)"""
+        try:
+            value = page.locator('.footer__navigation__page-info__current-entry').first.input_value(timeout=2000)
+            return int(value.strip())
+        except Exception:
+            return None
+
+    def _go_to_page(self, page, target_page):
+        """Navigasi tabel ke halaman tertentu (dipakai setelah tab di-reload)"""
+        if self._get_current_page_number(page) == target_page:
+            return True
+        
+        # Cara cepat: ketik nomor halaman di input page-info lalu Enter
+        try:
+            page_input = page.locator('.footer__navigation__page-info__current-entry').first
+            page_input.fill(str(target_page), timeout=3000)
+            page_input.press("Enter")
+            page.wait_for_timeout(1500)
+            self._wait_for_overlay(page)
+            if self._get_current_page_number(page) == target_page:
+                logger.info(f"✓ Restored table position to page {target_page}")
+                return True
+        except Exception as e:
+            logger.debug(f"Page input navigation failed: {e}")
+        
+        # Fallback: klik "Sebelumnya" / "Selanjutnya" sampai halaman target
+        current = self._get_current_page_number(page) or 1
+        while current > target_page:
+            prev_button = page.locator('button.footer__navigation__page-btn:has-text("Sebelumnya"):not(.disabled)')
+            if prev_button.count() == 0 or not prev_button.is_visible():
+                logger.error(f"✗ Could not reach page {target_page} (stuck at page {current})")
+                return False
+            prev_button.click()
+            page.wait_for_timeout(1500)
+            self._wait_for_overlay(page)
+            current -= 1
+        while current < target_page:
+            next_button = page.locator('button.footer__navigation__page-btn:has-text("Selanjutnya"):not(.disabled)')
+            if next_button.count() == 0 or not next_button.is_visible():
+                logger.error(f"✗ Could not reach page {target_page} (stuck at page {current})")
+                return False
+            next_button.click()
+            page.wait_for_timeout(1500)
+            self._wait_for_overlay(page)
+            current += 1
+        logger.info(f"✓ Restored table position to page {target_page} via pagination buttons")
+        return True
+
+    def _recycle_tab(self, page, current_page, reason):
+        """Reload (atau buka ulang) tab untuk membuang memory growth SPA, lalu kembali ke halaman aktif"""
+        logger.warning(f"♻ Recycling tab: {reason}")
+        url = page.url
+        try:
+            page.reload(wait_until="domcontentloaded", timeout=30000)
+        except Exception as e:
+            logger.warning(f"⚠ Reload failed ({e}) - reopening tab")
+            context = page.context
+            if self.resource_blocker:
+                self.resource_blocker.uninstall(page)
+            new_page = context.new_page()
+            new_page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            try:
+                page.close()
+            except Exception:
+                pass
+            page = new_page
+            if self.resource_blocker:
+                self.resource_blocker.install(page)
+        
+        self._wait_for_table(page)
+        self._go_to_page(page, current_page)
+        self.tab_monitor.reset_after_recycle(page)
+        self.stats['tab_recycles'] += 1
+        return page
+
+    def _find_row_by_nik(self, page, nik):
+        """Cari row dengan NIK tertentu di halaman tabel yang sedang aktif"""
+        _, data_rows = self._get_data_rows(page)
+        for i, row in enumerate(data_rows):
+            try:
+                if row.locator('span[title="Lihat Detail Mitra"]').inner_text().strip() == nik:
+                    return i, row
+            except Exception:
+                continue
+        return None, None
+
+    def _carry_forward_if_unchanged(self, row):
+        """Fingerprint baris tabel; jika sama dengan run sebelumnya, bawa data lama tanpa buka modal"""
+        try:
+            nik = row.locator('span[title="Lihat Detail Mitra"]').inner_text().strip()
+            cells = row.locator("td").all_inner_texts()
+        except Exception as e:
+            logger.debug(f"Could not fingerprint row: {e}")
+            return False
+        
+        fingerprint = fingerprint_row(nik, cells)
+        self.fingerprints[nik] = fingerprint
+        
+        previous = self.previous_rows.get(nik)
+        if (previous and self.previous_fingerprints.get(nik) == fingerprint
+                and str(previous.get("Status", "")).startswith("Success")):
+            self.data_list.append(dict(previous))
+            self.stats['carried_forward'] += 1
+            logger.info(f"= NIK {nik} unchanged - carried forward from previous run")
+            return True
+        return False
+
+    def _search_nik(self, page, nik):
+        """Ketik NIK di kotak pencarian tabel dan return (index, row) jika ditemukan"""
+        if not self._fill_search(page, nik, 3000):
+            raise RuntimeError("Search box not found in table")
+        
+        # Tunggu hasil filter (server-side search menampilkan loading overlay)
+        page.wait_for_timeout(800)
+        self._wait_for_overlay(page)
+        try:
+            page.wait_for_selector(f'table#vgt-table span[title="Lihat Detail Mitra"]:text-is("{nik}")',
+                                   timeout=10000)
+        except PlaywrightTimeoutError:
+            return None, None
+        return self._find_row_by_nik(page, nik)
+
+    def _fill_search(self, page, text, timeout_ms):
+        """Isi kotak pencarian tabel + Enter, mulai dari selector yang terakhir berhasil"""
+        for selector in self.selector_registry.ordered("table_search", SEARCH_INPUT_SELECTORS):
+            start = time.time()
+            try:
+                search_input = page.locator(selector).first
+                search_input.fill(text, timeout=timeout_ms)
+                search_input.press("Enter")
+            except Exception:
+                self.selector_registry.record_failure("table_search", selector)
+                continue
+            self.selector_registry.record_success("table_search", selector, (time.time() - start) * 1000)
+            return True
+        return False
+
+    def _clear_search(self, page):
+        """Kosongkan kotak pencarian supaya tabel kembali normal"""
+        if not self._fill_search(page, "", 2000):
+            logger.warning("⚠ Could not clear table search - table may still be filtered")
+
+    def _locate_retry_row(self, page, item):
+        """Cari ulang row untuk retry: lewat pencarian (mode NIK list) atau halaman asal"""
+        if item["page"] is None:
+            return self._search_nik(page, item["nik"])
+        if not self._go_to_page(page, item["page"]):
+            logger.error(f"✗ Could not reach page {item['page']}")
+            return None, None
+        self.current_page = item["page"]
+        return self._find_row_by_nik(page, item["nik"])
+
+    def _retry_failed_rows(self, page):
+        """Second pass: proses ulang NIK yang gagal di crawl utama"""
+        queue = sorted(self.retry_queue, key=lambda item: (item["page"] or 0, item["index"]))
+        self.retry_queue = []
+        
+        reasons = {}
+        for item in queue:
+            reasons[item["reason"]] = reasons.get(item["reason"], 0) + 1
+        logger.info(f"\n{'='*60}")
+        logger.info(f"RETRY PASS - {len(queue)} failed row(s)")
+        logger.info(f"Failure reasons: {', '.join(f'{k}={v}' for k, v in sorted(reasons.items()))}")
+        logger.info(f"{'='*60}\n")
+        
+        for item in queue:
+            nik = item["nik"]
+            try:
+                index, row = self._locate_retry_row(page, item)
+                if row is None:
+                    logger.error(f"✗ Retry skipped for NIK {nik}: row not found")
+                    continue
+            except Exception as e:
+                logger.error(f"✗ Retry skipped for NIK {nik}: {e}")
+                continue
+            
+            logger.info(f"↻ Retrying NIK {nik} (previous failure: {item['reason']})")
+            self.stats['retried'] += 1
+            
+            # Hapus entry gagal sebelumnya - process_row akan menambahkan hasil baru
+            # (dan menghitung ulang success/failed)
+            self.data_list = [d for d in self.data_list
+                              if not (d.get("NIK") == nik and str(d.get("Status", "")).startswith("Failed"))]
+            self.stats['failed'] -= 1
+            if self.process_row(row, index, page, is_retry=True):
+                self.stats['retry_recovered'] += 1
+            page.wait_for_timeout(500)
+
+    def _connect(self, p):
+        """Connect to Chrome over CDP and return the Seleksi Mitra tab (None if not found)"""
+        if self.har_replay:
+            logger.info(f"\nReplaying session from {self.har_replay.path}...")
+            page = self.har_replay.open(p)
+        else:
+            logger.info(f"\nConnecting to Chrome ({self.cdp_url})...")
+            browser = p.chromium.connect_over_cdp(self.cdp_url)
+            context = browser.contexts[0]
+            
+            # Cari tab yang benar (skip DevTools dan fs-storage)
+            page = None
+            for p_page in context.pages:
+                url = p_page.url
+                
+                # Skip DevTools dan foto tabs
+                if "devtools://" in url or "fs-storage" in url:
+                    continue
+                
+                # Gunakan tab pertama yang valid
+                page = p_page
+                break
+            
+            if not page:
+                logger.error("✗ No suitable tab found! Please open Seleksi Mitra page in Chrome.")
+                return None
+            if self.har_recorder:
+                self.har_recorder.attach(page)
+        
+        logger.info(f"✓ Connected to: {page.title()}")
+        logger.info(f"✓ URL: {page.url}")
+        
+        if self.resource_blocker:
+            self.resource_blocker.install(page)
+        if self.tab_monitor:
+            self.tab_monitor.attach(page)
+        return page
+
+    def _after_row(self, page, row_start, current_page):
+        """Catat latency row dan reload tab jika sudah melambat; return (page, recycled)"""
+        if self.har_recorder:
+            self.har_recorder.flush()
+        if not self.tab_monitor:
+            return page, False
+        self.tab_monitor.record_row(time.time() - row_start)
+        recycle, reason = self.tab_monitor.needs_recycle()
+        if not recycle:
+            return page, False
+        return self._recycle_tab(page, current_page, reason), True
+
+    def _save_results(self, excel_filename="mitra_data.xlsx", csv_filename="mitra_data.csv", mode="full"):
+        """Save collected rows and print the summary"""
+        if self.capture_folder:
+            self._extract_captures()
+        if self.data_list:
+            self.write_outputs(excel_filename, csv_filename, mode)
+            if self.fingerprints:
+                save_fingerprints(self.output_folder, self.fingerprints)
+        else:
+            logger.warning("⚠ No data collected - skipping file save")
+        
+        # Print summary
+        self.print_summary()
+        logger.info(f"\n✓ Scraping completed! Check {log_filename} for details.")
+
+    def _extract_captures(self):
+        """Mode capture: bangun dataset dari arsip HTML (offline, process pool)"""
+        start = time.time()
+        rows = extract_archive(self.capture_folder)
+        captured = {row["NIK"] for row in rows}
+        # Failed entry NIK yang akhirnya ter-capture (retry) diganti hasil ekstraksi
+        self.data_list = rows + [row for row in self.data_list if row.get("NIK") not in captured]
+        logger.info(f"✓ Extracted {len(rows)} captured modals offline in {time.time() - start:.1f}s")
+
+    def run_nik_list(self, niks):
+        """Refresh only the given NIKs by searching each one in the table (no full crawl)"""
         logger.info("="*60)
-        logger.info("MITRA BPS SCRAPER - STARTING")
+        logger.info(f"MITRA BPS SCRAPER - NIK LIST MODE ({len(niks)} NIK)")
         logger.info("="*60)
         logger.info(f"Log file: {log_filename}")
         
+        self.stats['total'] = len(niks)
+        # Retry di mode ini mencari ulang lewat kotak pencarian, bukan halaman tabel
+        self.current_page = None
+        
         with sync_playwright() as p:
+            page = None
             try:
-                logger.info("\nConnecting to Chrome (port 9222)...")
-                browser = p.chromium.connect_over_cdp("http://localhost:9222")
-                context = browser.contexts[0]
+                page = self._connect(p)
+                if not page:
+                    return
                 
-                # Cari tab yang benar (skip DevTools dan fs-storage)
-                page = None
-                for p_page in context.pages:
-                    url = p_page.url
+                logger.info("\nWaiting for table to load...")
+                self._wait_for_table(page)
+                
+                for i, nik in enumerate(niks):
+                    row_start = time.time()
+                    logger.info(f"\n[{i + 1}/{len(niks)}] Searching NIK {nik}...")
+                    try:
+                        index, row = self._search_nik(page, nik)
+                    except Exception as e:
+                        logger.error(f"✗ Search failed for NIK {nik}: {e}")
+                        index, row = None, None
                     
-                    # Skip DevTools dan foto tabs
-                    if "devtools://" in url or "fs-storage" in url:
+                    if row is None:
+                        logger.error(f"✗ NIK {nik} not found in table")
+                        self.stats['failed'] += 1
+                        self.data_list.append(self._failed_entry(nik, "Failed (not_found): NIK not found in table search"))
                         continue
                     
-                    # Gunakan tab pertama yang valid
-                    page = p_page
-                    break
+                    self.process_row(row, i, page)
+                    page.wait_for_timeout(500)
+                    page, _ = self._after_row(page, row_start, 1)
                 
+                if self.retry_queue:
+                    self._retry_failed_rows(page)
+                
+                self._clear_search(page)
+                logger.info("\n✓ All NIKs processed")
+                
+            except Exception as e:
+                logger.error(f"✗ Fatal error: {str(e)}", exc_info=True)
+                return
+            finally:
+                if self.resource_blocker:
+                    self.resource_blocker.uninstall()
+                self.selector_registry.save()
+                if self.triage:
+                    self.triage.save()
+        
+        self._save_results("mitra_data_partial.xlsx", "mitra_data_partial.csv", mode="nik_list")
+
+    def _sync_row(self, row, index, page, store, known_fingerprints, recheck_niks, bank_niks, cycle_stats):
+        """Sync satu baris tabel ke store: proses ulang hanya jika baru, berubah, atau ijazah belum ada;
+        data rekening hanya ada di modal, jadi NIK di bank_niks dicek ulang lewat tab Rekening saja"""
+        nik = row.locator('span[title="Lihat Detail Mitra"]').inner_text().strip()
+        fingerprint = fingerprint_row(nik, row.locator("td").all_inner_texts())
+        cycle_stats['rows_seen'] += 1
+        
+        if known_fingerprints.get(nik) == fingerprint and nik not in recheck_niks:
+            if nik not in bank_niks:
+                return False
+            return self._sync_bank(row, page, store, nik, fingerprint, cycle_stats)
+        
+        # is_retry=True: row gagal tidak masuk retry queue, fingerprint tidak disimpan
+        # sehingga otomatis dicoba lagi di cycle berikutnya
+        if not self.process_row(row, index, page, is_retry=True):
+            cycle_stats['failed'] += 1
+            return True
+        
+        row_data = self.data_list[-1]
+        normalize_dataset([row_data], log=False)
+        result = store.upsert(row_data, fingerprint)
+        cycle_stats[result] += 1
+        logger.info(f"⇄ NIK {nik}: {result}")
+        return True
+
+    def read_bank_details(self, row, page):
+        """Buka modal dan baca tab Rekening saja (tanpa download/parse dokumen)"""
+        deadline = RowDeadline(self.row_budget)
+        try:
+            row.locator('span[title="Lihat Detail Mitra"]').click(timeout=deadline.timeout(10000, "open_popup"))
+            page.wait_for_selector("text=Detail Informasi Mitra", timeout=deadline.timeout(10000, "popup"))
+            if not self._click_tab(page, "Rekening", REKENING_TAB_SELECTORS, 10000, deadline):
+                logger.error("Failed to click Rekening tab with all selectors")
+            page.wait_for_selector('label:has-text("Nama Bank") + div.form-control-plaintext', state="visible",
+                                   timeout=deadline.timeout(8000, "rekening_content"))
+            fields = self.extract_bank_info(page)
+        finally:
+            self._close_modal(page, deadline)
+        return dict(zip(("Nama Bank", "Nomor Rekening", "Nama Pemilik"), fields))
+
+    def _sync_bank(self, row, page, store, nik, fingerprint, cycle_stats):
+        """Cek ulang rekening NIK yang barisnya tidak berubah; simpan kalau bank/rekening/pemilik berubah"""
+        try:
+            fields = self.read_bank_details(row, page)
+        except Exception as e:
+            logger.error(f"✗ Bank recheck failed for NIK {nik}: {e}")
+            cycle_stats['failed'] += 1
+            return True
+        row_data = store.get(nik)
+        if "N/A" in fields.values() and "N/A" not in (row_data.get(key) for key in fields):
+            # Ekstraksi gagal sebagian: jangan timpa data rekening lengkap yang sudah ada
+            logger.warning(f"⚠ Bank recheck incomplete for NIK {nik} - keeping stored values")
+            cycle_stats['failed'] += 1
+            return True
+        row_data.update(fields)
+        normalize_dataset([row_data], log=False)
+        result = store.upsert(row_data, fingerprint)
+        cycle_stats['bank_rechecked'] += 1
+        cycle_stats[result] += 1
+        logger.info(f"⇄ NIK {nik}: bank recheck {result}")
+        return True
+
+    def _sync_cycle(self, page, store, recheck_ijazah, bank_recheck_cycles=6):
+        """Satu putaran sync: jalani semua halaman tabel dan tulis delta ke store"""
+        started_at = datetime.now().isoformat(timespec="seconds")
+        cycle_stats = {'rows_seen': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': 0,
+                       'bank_rechecked': 0}
+        known_fingerprints = store.fingerprints()
+        recheck_niks = set(store.niks_without_ijazah()) if recheck_ijazah else set()
+        # Irisan bergilir: NIK yang paling lama tidak dibuka, semua NIK kebagian dalam bank_recheck_cycles cycle
+        bank_niks = set()
+        if bank_recheck_cycles:
+            bank_niks = set(store.least_recently_checked(math.ceil(len(known_fingerprints) / bank_recheck_cycles)))
+        self.data_list = []
+        
+        page.reload(wait_until="domcontentloaded", timeout=30000)
+        self._wait_for_table(page)
+        
+        current_page = 1
+        while True:
+            self.current_page = current_page
+            _, data_rows = self._get_data_rows(page)
+            i = 0
+            while i < len(data_rows):
+                row_start = time.time()
+                try:
+                    opened = self._sync_row(data_rows[i], i, page, store, known_fingerprints,
+                                            recheck_niks, bank_niks, cycle_stats)
+                except Exception as e:
+                    logger.error(f"✗ Sync error on row {i}: {e}")
+                    opened = False
+                if opened:
+                    page.wait_for_timeout(500)
+                    page, recycled = self._after_row(page, row_start, current_page)
+                    if recycled:
+                        _, data_rows = self._get_data_rows(page)
+                i += 1
+            
+            if not self._go_to_next_page(page, current_page):
+                break
+            current_page += 1
+        
+        store.record_sync(started_at, cycle_stats)
+        logger.info(f"✓ Sync cycle done: {cycle_stats['rows_seen']} rows seen, "
+                    f"{cycle_stats['inserted']} inserted, {cycle_stats['updated']} updated, "
+                    f"{cycle_stats['unchanged']} unchanged, {cycle_stats['failed']} failed, "
+                    f"{cycle_stats['bank_rechecked']} bank rechecked")
+        return page
+
+    def run_sync(self, interval_minutes=60, ijazah_recheck_cycles=6, max_cycles=None, bank_recheck_cycles=6):
+        """Long-running sync: re-check tabel secara berkala dan terapkan delta ke store lokal"""
+        store_path = os.path.join(self.output_folder, "mitra_store.db")
+        logger.info("="*60)
+        logger.info(f"MITRA BPS SCRAPER - SYNC MODE (every {interval_minutes} min)")
+        logger.info("="*60)
+        logger.info(f"Store: {store_path}")
+        logger.info(f"Log file: {log_filename}")
+        
+        store = MitraStore(store_path)
+        with sync_playwright() as p:
+            page = None
+            try:
+                page = self._connect(p)
                 if not page:
-                    logger.error("✗ No suitable tab found! Please open Seleksi Mitra page in Chrome.")
                     return
                 
-                logger.info(f"✓ Connected to: {page.title()}")
-                logger.info(f"✓ URL: {page.url}")
+                cycle = 0
+                while max_cycles is None or cycle < max_cycles:
+                    cycle += 1
+                    logger.info(f"\n{'='*60}")
+                    logger.info(f"SYNC CYCLE {cycle}")
+                    logger.info(f"{'='*60}")
+                    # Ijazah yang belum ada dicek ulang setiap beberapa cycle (upload baru)
+                    recheck_ijazah = (cycle - 1) % ijazah_recheck_cycles == 0
+                    try:
+                        page = self._sync_cycle(page, store, recheck_ijazah, bank_recheck_cycles)
+                    except Exception as e:
+                        logger.error(f"✗ Sync cycle {cycle} failed: {e}", exc_info=True)
+                    self.selector_registry.save()
+                    if self.triage:
+                        self.triage.save()
+                    
+                    if max_cycles is not None and cycle >= max_cycles:
+                        break
+                    logger.info(f"💤 Next sync in {interval_minutes} min (Ctrl+C to stop)")
+                    time.sleep(interval_minutes * 60)
+                    
+            except KeyboardInterrupt:
+                logger.info("\n✓ Sync stopped by user")
+            except Exception as e:
+                logger.error(f"✗ Fatal error: {str(e)}", exc_info=True)
+            finally:
+                if self.resource_blocker:
+                    self.resource_blocker.uninstall()
+                self.selector_registry.save()
+                if self.triage:
+                    self.triage.save()
+                store.close()
+
+    def export_store(self):
+        """Export isi store lokal (mode sync) ke Excel/CSV bertimestamp di folder mirror"""
+        store_path = os.path.join(self.output_folder, "mitra_store.db")
+        if not os.path.exists(store_path):
+            logger.error(f"✗ Store tidak ditemukan: {store_path}")
+            return
+        store = MitraStore(store_path)
+        try:
+            self.data_list = store.all_rows()
+        finally:
+            store.close()
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        logger.info(f"Exporting {len(self.data_list)} rows from {store_path}")
+        if self.data_list:
+            # Pipeline yang sama dengan write_outputs supaya export setara dengan output run biasa
+            normalize_dataset(self.data_list)
+            self.duplicate_report = find_duplicates(self.data_list)
+            self.save_to_excel(f"mitra_export_{timestamp}.xlsx")
+            self.save_to_csv(f"mitra_export_{timestamp}.csv")
+        else:
+            logger.warning("⚠ Store is empty - nothing to export")
+
+    def run(self):
+        """Main scraping process"""
+        logger.info("="*60)
+        logger.info("MITRA BPS SCRAPER - STARTING")
+        logger.info("="*60)
+        logger.info(f"Log file: {log_filename}")
+        
+        with sync_playwright() as p:
+            page = None
+            try:
+                page = self._connect(p)
+                if not page:
+                    return
                 
                 # Wait for table with multiple strategies
                 logger.info("\nWaiting for table to load...")
-                
-                # Strategy 1: Wait for table to exist
-                try:
-                    page.wait_for_selector("table#vgt-table tbody tr", state="attached", timeout=5000)
-                    logger.info("✓ Table found (attached)")
-                except Exception:
-                    logger.warning("Table not found with 'attached' state, trying alternative...")
-                
-                # Strategy 2: Wait for loading overlay to disappear
-                try:
-                    overlay = page.locator(".velmld-overlay")
-                    if overlay.count() > 0:
-                        logger.info("Waiting for loading overlay to disappear...")
-                        page.wait_for_selector(".velmld-overlay", state="hidden", timeout=15000)
-                        logger.info("✓ Loading overlay hidden")
-                except Exception:
-                    logger.info("No loading overlay found or already hidden")
-                
-                # Strategy 3: Just wait a bit for any animations
-                page.wait_for_timeout(2000)
+                self._wait_for_table(page)
                 
                 # Get all rows
                 logger.info("Finding data rows with NIK links...")
-                all_rows = page.locator("table#vgt-table tbody tr").all()
-                
-                # Filter rows with NIK link
-                data_rows = []
-                for row in all_rows:
-                    nik_link = row.locator('span[title="Lihat Detail Mitra"]')
-                    if nik_link.count() > 0:
-                        data_rows.append(row)
+                all_rows, data_rows = self._get_data_rows(page)
                 
                 self.stats['total'] = len(data_rows)
                 
@@ -695,69 +1242,135 @@ class MitraScraper:
                     logger.info(f"\n{'='*60}")
                     logger.info(f"PROCESSING PAGE {current_page}")
                     logger.info(f"{'='*60}\n")
+                    self.current_page = current_page
                     
                     # Process each data row on current page
-                    for i, row in enumerate(data_rows):
-                        self.process_row(row, i, page)
+                    i = 0
+                    while i < len(data_rows):
+                        # Baris yang tidak berubah sejak run sebelumnya tidak perlu dibuka lagi
+                        if self._carry_forward_if_unchanged(data_rows[i]):
+                            i += 1
+                            continue
+                        
+                        row_start = time.time()
+                        self.process_row(data_rows[i], i, page)
                         
                         # Small delay between rows
                         page.wait_for_timeout(500)
+                        
+                        # Reload tab jika sudah melambat (latency / JS heap), lalu lanjut dari row berikutnya
+                        page, recycled = self._after_row(page, row_start, current_page)
+                        if recycled:
+                            _, data_rows = self._get_data_rows(page)
+                        i += 1
                     
                     # Increment pages counter
                     self.stats['pages_processed'] = current_page
                     
                     # Check if there's a next page button
-                    try:
-                        # Look for "Selanjutnya" button that's NOT disabled
-                        next_button = page.locator('button.footer__navigation__page-btn:has-text("Selanjutnya"):not(.disabled)')
+                    if self._go_to_next_page(page, current_page):
+                        # Re-fetch rows for new page
+                        _, data_rows = self._get_data_rows(page)
                         
-                        if next_button.count() > 0 and next_button.is_visible():
-                            logger.info(f"\n✓ Page {current_page} completed. Moving to next page...")
-                            next_button.click()
-                            page.wait_for_timeout(3000)  # Wait for page to load
-                            
-                            # Wait for loading overlay to disappear
-                            try:
-                                overlay = page.locator(".velmld-overlay")
-                                if overlay.count() > 0:
-                                    page.wait_for_selector(".velmld-overlay", state="hidden", timeout=15000)
-                            except Exception:
-                                pass
-                            
-                            # Re-fetch rows for new page
-                            all_rows = page.locator("table#vgt-table tbody tr").all()
-                            data_rows = []
-                            for row in all_rows:
-                                nik_link = row.locator('span[title="Lihat Detail Mitra"]')
-                                if nik_link.count() > 0:
-                                    data_rows.append(row)
-                            
-                            current_page += 1
-                            logger.info(f"✓ Found {len(data_rows)} rows on page {current_page}")
-                        else:
-                            logger.info(f"\n✓ No more pages. Completed {current_page} page(s).")
-                            has_next_page = False
-                    except Exception as e:
-                        logger.info(f"\n✓ Reached last page or pagination error: {str(e)}")
+                        current_page += 1
+                        logger.info(f"✓ Found {len(data_rows)} rows on page {current_page}")
+                    else:
                         has_next_page = False
                 
                 logger.info("\n✓ All rows processed")
                 
+                if self.retry_queue:
+                    self._retry_failed_rows(page)
+                
             except Exception as e:
                 logger.error(f"✗ Fatal error: {str(e)}", exc_info=True)
                 return
+            finally:
+                if self.resource_blocker:
+                    self.resource_blocker.uninstall()
+                if self.har_recorder:
+                    self.har_recorder.flush()
+                self.selector_registry.save()
+                if self.triage:
+                    self.triage.save()
         
-        # Save results
-        if self.data_list:
-            self.save_to_excel()
-            self.save_to_csv()
-        else:
-            logger.warning("⚠ No data collected - skipping file save")
+        self._save_results()
         
-        # Print summary
-        self.print_summary()
-        logger.info(f"\n✓ Scraping completed! Check {log_filename} for details.")
+        # Expected HAR dari data yang sudah dinormalisasi, sama seperti hasil replay yang dibandingkan
+        if self.har_recorder:
+            self.har_recorder.save(self.data_list)
+        elif self.har_replay:
+            self.har_replay.check(self.data_list, self.output_folder)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper data mitra dari halaman Seleksi Mitra BPS")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="Blokir gambar, font, media dan analytics di tab scraping (hemat memori & waktu render modal)")
+    parser.add_argument("--no-tab-recycle", action="store_true",
+                        help="Jangan reload tab otomatis saat latency per row / JS heap naik")
+    parser.add_argument("--heap-limit-mb", type=float, default=600,
+                        help="Batas JS heap tab (MB) sebelum tab di-reload (default: 600)")
+    parser.add_argument("--row-budget", type=float, default=60,
+                        help="Batas waktu per row dalam detik sebelum row dihentikan dan masuk retry queue (default: 60)")
+    parser.add_argument("--nik-file",
+                        help="Hanya proses NIK dari file ini (.txt satu NIK per baris, atau mitra_data.csv lama: "
+                             "NIK yang gagal/mismatch) lewat kotak pencarian tabel")
+    parser.add_argument("--previous",
+                        help="Folder output run sebelumnya (mis. output_20260107_080000). Mitra yang barisnya "
+                             "tidak berubah dibawa dari run tersebut tanpa membuka modal detail")
+    parser.add_argument("--sync", metavar="FOLDER",
+                        help="Mode sync: cek tabel berkala dan simpan perubahan ke FOLDER/mitra_store.db")
+    parser.add_argument("--sync-interval", type=float, default=60,
+                        help="Jeda antar sync dalam menit (default: 60)")
+    parser.add_argument("--bank-recheck-cycles", type=int, default=6,
+                        help="Mode sync: data rekening hanya ada di modal, jadi tab Rekening setiap NIK dibuka ulang "
+                             "bergiliran sehingga semua NIK dicek dalam N cycle (default: 6, 0 = tidak dicek)")
+    parser.add_argument("--export-store", metavar="FOLDER",
+                        help="Export isi FOLDER/mitra_store.db ke Excel/CSV lalu keluar")
+    parser.add_argument("--no-triage", action="store_true",
+                        help="Kirim semua ijazah ke vision API (tanpa skip gambar kosong/bukan ijazah dan tanpa cache "
+                             "hasil parse di ijazah_cache.json)")
+    parser.add_argument("--no-local-ocr", action="store_true",
+                        help="Jangan coba OCR lokal (Tesseract) dulu; semua ijazah langsung di-parse oleh OpenAI")
+    parser.add_argument("--capture-only", action="store_true",
+                        help="Hanya simpan HTML modal (File Administrasi + Rekening) per NIK ke <output>/captures; "
+                             "data rekening diekstrak offline setelah crawl (tanpa download/parse dokumen)")
+    parser.add_argument("--download-layout", choices=LAYOUTS, default="flat",
+                        help="Struktur folder downloads: flat (downloads/<NIK>), prefix (downloads/74/10/<NIK>) "
+                             "atau hash (downloads/3f/a2/<NIK>); disarankan prefix/hash untuk run besar")
+    parser.add_argument("--cdp-url", default="http://localhost:9222",
+                        help="Alamat remote debugging Chrome (default: http://localhost:9222)")
+    parser.add_argument("--record-har", metavar="FILE",
+                        help="Rekam sesi (tabel, XHR detail, gambar) ke HAR; NIK/rekening/nama di-scrub sebelum "
+                             "disimpan, semua gambar diganti sintetis, body dibatasi 256 MB; data hasil run disimpan sebagai <FILE>.expected.json")
+    parser.add_argument("--replay-har", metavar="FILE",
+                        help="Jalankan ulang dari HAR di Chromium baru tanpa jaringan dan bandingkan hasil "
+                             "ekstraksi dengan expected (har_regression.csv)")
+    args = parser.parse_args(argv)
+    if args.record_har and args.replay_har:
+        parser.error("--record-har dan --replay-har tidak bisa dipakai bersamaan")
+    return args
 
 if __name__ == "__main__":
-    scraper = MitraScraper()
-    scraper.run()
\ No newline at end of file
+    args = parse_args()
+    scraper = MitraScraper(block_resources=args.block_resources,
+                           tab_recycle=not args.no_tab_recycle,
+                           heap_limit_mb=args.heap_limit_mb,
+                           row_budget=args.row_budget,
+                           previous_folder=args.previous,
+                           output_folder=args.sync or args.export_store,
+                           triage=not args.no_triage,
+                           local_ocr=not args.no_local_ocr,
+                           capture_only=args.capture_only,
+                           download_layout=args.download_layout,
+                           cdp_url=args.cdp_url,
+                           record_har=args.record_har,
+                           replay_har=args.replay_har)
+    if args.export_store:
+        scraper.export_store()
+    elif args.sync:
+        scraper.run_sync(interval_minutes=args.sync_interval, bank_recheck_cycles=args.bank_recheck_cycles)
+    elif args.nik_file:
+        scraper.run_nik_list(load_nik_list(args.nik_file))
+    else:
+        scraper.run()
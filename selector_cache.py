@@ -0,0 +1,85 @@
+"""
+Registry strategi selector yang "belajar" selector mana yang berhasil dan seberapa cepat
+Ranking disimpan ke file JSON supaya dipakai lagi di run berikutnya
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_FILE = "selector_stats.json"
+
+# Bobot exponential moving average untuk success rate dan durasi
+EMA_ALPHA = 0.3
+
+
+class SelectorRegistry:
+    """Urutkan kandidat selector berdasarkan riwayat sukses/gagal dan kecepatan"""
+
+    def __init__(self, path: str = DEFAULT_STATS_FILE):
+        self.path = path
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # Selector yang sudah gagal di run ini langsung diturunkan ke urutan terakhir,
+        # jadi selector basi hanya memakan satu timeout per run
+        self._failed_this_run = set()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+            logger.info(f"✓ Loaded selector ranking from {self.path}")
+        except Exception as e:
+            logger.warning(f"⚠ Could not load selector ranking ({self.path}): {e}")
+            self.stats = {}
+
+    def save(self):
+        """Simpan ranking selector ke file JSON"""
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.stats, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"⚠ Could not save selector ranking ({self.path}): {e}")
+
+    def _entry(self, key: str, selector: str) -> Dict[str, float]:
+        return self.stats.setdefault(key, {}).setdefault(
+            selector, {"success_rate": 0.5, "avg_ms": 0.0, "success": 0, "failure": 0})
+
+    def ordered(self, key: str, candidates: List[str]) -> List[str]:
+        """Kandidat diurutkan: belum gagal di run ini, success rate tinggi, lalu paling cepat"""
+        known = self.stats.get(key, {})
+
+        def sort_key(item):
+            position, selector = item
+            entry = known.get(selector, {})
+            return (
+                (key, selector) in self._failed_this_run,
+                -entry.get("success_rate", 0.5),
+                entry.get("avg_ms", 0.0),
+                position,
+            )
+
+        return [selector for _, selector in sorted(enumerate(candidates), key=sort_key)]
+
+    def record_success(self, key: str, selector: str, elapsed_ms: float):
+        entry = self._entry(key, selector)
+        entry["success"] += 1
+        entry["success_rate"] = (1 - EMA_ALPHA) * entry["success_rate"] + EMA_ALPHA
+        if entry["avg_ms"]:
+            entry["avg_ms"] = (1 - EMA_ALPHA) * entry["avg_ms"] + EMA_ALPHA * elapsed_ms
+        else:
+            entry["avg_ms"] = elapsed_ms
+        self._failed_this_run.discard((key, selector))
+
+    def record_failure(self, key: str, selector: str):
+        entry = self._entry(key, selector)
+        entry["failure"] += 1
+        entry["success_rate"] = (1 - EMA_ALPHA) * entry["success_rate"]
+        if (key, selector) not in self._failed_this_run:
+            self._failed_this_run.add((key, selector))
+            logger.info(f"↓ Demoted selector for {key}: {selector}")
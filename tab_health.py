@@ -0,0 +1,90 @@
+"""
+Monitor kesehatan tab Chrome selama scraping panjang (latency per row + JS heap via CDP)
+Dipakai untuk memutuskan kapan tab perlu di-reload supaya throughput tidak turun
+"""
+
+import logging
+from collections import deque
+from statistics import median
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TabHealthMonitor:
+    """Deteksi perlambatan tab berdasarkan latency per row dan JS heap (Performance.getMetrics)"""
+
+    def __init__(self,
+                 latency_factor: float = 1.8,
+                 heap_limit_mb: float = 600,
+                 window: int = 20,
+                 min_rows_between: int = 50):
+        self.latency_factor = latency_factor
+        self.heap_limit_mb = heap_limit_mb
+        self.window = window
+        self.min_rows_between = min_rows_between
+
+        self.baseline_latency: Optional[float] = None
+        self._baseline_samples = []
+        self._recent = deque(maxlen=window)
+        self._rows_since_recycle = 0
+        self._cdp = None
+        self.recycle_count = 0
+
+    def attach(self, page):
+        """Buka CDP session ke tab untuk membaca Performance metrics"""
+        self._cdp = None
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.send("Performance.enable")
+            self._cdp = cdp
+            logger.info("✓ Tab health monitor aktif (latency + JS heap)")
+        except Exception as e:
+            logger.warning(f"⚠ CDP Performance metrics tidak tersedia, hanya pakai latency: {e}")
+
+    def heap_mb(self) -> Optional[float]:
+        """JS heap yang sedang dipakai tab (MB), None jika CDP tidak tersedia"""
+        if not self._cdp:
+            return None
+        try:
+            metrics = self._cdp.send("Performance.getMetrics")["metrics"]
+            for metric in metrics:
+                if metric["name"] == "JSHeapUsedSize":
+                    return metric["value"] / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"Error reading Performance.getMetrics: {e}")
+        return None
+
+    def record_row(self, seconds: float):
+        """Catat durasi satu row; baseline diambil dari row-row pertama setelah start/recycle"""
+        self._rows_since_recycle += 1
+        if self.baseline_latency is None:
+            self._baseline_samples.append(seconds)
+            if len(self._baseline_samples) >= self.window:
+                self.baseline_latency = median(self._baseline_samples)
+                logger.info(f"✓ Baseline latency per row: {self.baseline_latency:.2f}s")
+            return
+        self._recent.append(seconds)
+
+    def needs_recycle(self) -> Tuple[bool, str]:
+        """Return (True, alasan) jika latency atau heap sudah melewati threshold"""
+        if self._rows_since_recycle < self.min_rows_between:
+            return False, ""
+
+        heap = self.heap_mb()
+        if heap is not None and heap > self.heap_limit_mb:
+            return True, f"JS heap {heap:.0f} MB > {self.heap_limit_mb:.0f} MB"
+
+        if self.baseline_latency and len(self._recent) >= self.window:
+            current = median(self._recent)
+            if current > self.baseline_latency * self.latency_factor:
+                return True, f"latency {current:.2f}s > {self.latency_factor}x baseline {self.baseline_latency:.2f}s"
+
+        return False, ""
+
+    def reset_after_recycle(self, page):
+        """Reset window latency (baseline tetap) dan sambungkan ulang CDP ke tab baru"""
+        self.recycle_count += 1
+        self._recent.clear()
+        self._rows_since_recycle = 0
+        self.attach(page)
@@ -0,0 +1,47 @@
+"""
+Test normalisasi Nama Bank (bank_normalizer.py)
+    python -m pytest test_bank_normalizer.py -q
+"""
+
+import pytest
+
+from bank_normalizer import DEFAULT_ACCOUNT_LENGTH, account_length_range, apply_bank_normalization, normalize_bank
+
+
+@pytest.mark.parametrize("raw, code", [
+    ("BRI", "002"),
+    ("PT. BANK RAKYAT INDONESIA (PERSERO) TBK", "002"),
+    ("(002) BANK BRI", "002"),
+    ("014 - BCA", "014"),
+    ("bank mandiri", "008"),
+    ("BNI 46", "009"),
+    ("BANK SYARIAH MANDIRI", "451"),   # merger ke BSI
+    ("BRI SYARIAH", "451"),            # alias terpanjang menang atas "BRI"
+    ("BANK SULSELBAR", "126"),
+    ("PT BPD JAWA BARAT DAN BANTEN", "110"),
+])
+def test_known_banks(raw, code):
+    assert normalize_bank(raw).code == code
+
+
+@pytest.mark.parametrize("raw", [None, "", "N/A", "KOPERASI SIMPAN PINJAM", "012301045678501"])
+def test_unknown_banks(raw):
+    assert normalize_bank(raw) is None
+
+
+def test_code_prefix_wins_over_name():
+    assert normalize_bank("(014) BANK BRI").code == "014"
+
+
+def test_account_length_range():
+    assert account_length_range("BRI") == (15, 15)
+    assert account_length_range("BANK DANAMON") == DEFAULT_ACCOUNT_LENGTH
+    assert account_length_range("TIDAK ADA") == DEFAULT_ACCOUNT_LENGTH
+
+
+def test_apply_bank_normalization_fills_columns():
+    rows = [{"Nama Bank": "BRI"}, {"Nama Bank": "Bank BRI"}, {"Nama Bank": "N/A"}, {"Nama Bank": "BANK ANTAH"}]
+    breakdown = apply_bank_normalization(rows)
+    assert [(row["Kode Bank"], row["Bank Normalisasi"]) for row in rows] == [
+        ("002", "BANK RAKYAT INDONESIA"), ("002", "BANK RAKYAT INDONESIA"), ("N/A", "N/A"), ("N/A", "Tidak Dikenali")]
+    assert breakdown == {"BANK RAKYAT INDONESIA": 2, "Tidak Dikenali": 1}
@@ -0,0 +1,73 @@
+"""
+Test rule validasi kualitas data (data_quality.py)
+    python -m pytest test_data_quality.py -q
+"""
+
+import pytest
+
+from data_quality import apply_validation, validate_rows
+
+
+def _row(**overrides):
+    row = {"NIK": "7401230101900001", "Nama Bank": "BRI", "Nomor Rekening": "012301045678501",
+           "Nama Pemilik": "BUDI SANTOSO", "Path KTP": "downloads/1/ktp.jpg", "Path Ijazah": "downloads/1/ijazah.jpg",
+           "Status": "Success"}
+    row.update(overrides)
+    return row
+
+
+def _issues(**overrides):
+    rows = [_row(**overrides)]
+    apply_validation(rows)
+    return rows[0]["_issues"]
+
+
+def test_clean_row_has_no_issues():
+    rows = [_row()]
+    result = apply_validation(rows)
+    assert rows[0]["_issues"] == [] and rows[0]["_has_mismatch"] is False
+    assert result.rows_checked == 1 and sum(result.counts.values()) == 0
+
+
+@pytest.mark.parametrize("nik, invalid", [
+    ("7401230101900001", False),
+    ("7401234101900001", False),   # perempuan: tanggal lahir 01 + 40
+    ("7401237101900001", False),   # 71 - 40 = 31
+    ("7401237201900001", True),    # 72 - 40 = 32
+    ("9901230101900001", True),    # kode provinsi 99 tidak ada
+    ("7401230113900001", True),    # bulan 13
+    ("7401230001900001", True),    # tanggal 00
+    ("740123010190001", True),     # 15 digit
+])
+def test_nik_format(nik, invalid):
+    assert ("nik_format" in _issues(NIK=nik)) is invalid
+
+
+def test_rekening_length_follows_bank():
+    assert "rekening_length" in _issues(**{"Nomor Rekening": "0123456789"})            # BRI: 15 digit
+    assert "rekening_length" not in _issues(**{"Nama Bank": "BCA", "Nomor Rekening": "0123456789"})
+
+
+def test_swapped_fields_flag_mismatch():
+    rows = [_row(**{"Nama Bank": "012301045678501", "Nomor Rekening": "BUDI SANTOSO", "Nama Pemilik": "BRI"})]
+    apply_validation(rows)
+    assert "bank_owner_swap" in rows[0]["_issues"] and rows[0]["_has_mismatch"] is True
+
+
+def test_missing_documents_and_failed_rows():
+    assert _issues(**{"Path KTP": "Not Downloaded", "Path Ijazah": "Invalid (html)"}) == ["ktp_missing",
+                                                                                          "ijazah_missing"]
+    rows = [_row(Status="Failed: timeout", NIK="x")]
+    result = validate_rows(rows)
+    assert result.issues == [[]] and result.rows_checked == 0
+
+
+def test_captured_rows_are_checked_by_link():
+    captured = {"Path KTP": "Not Downloaded", "Path Ijazah": "Not Downloaded", "Captured At": "2026-01-01T08:00:00"}
+    assert _issues(**captured, **{"URL KTP": "https://mitra/ktp", "URL Ijazah": "https://mitra/ijazah"}) == []
+    assert _issues(**captured, **{"URL KTP": "https://mitra/ktp", "URL Ijazah": "N/A"}) == ["ijazah_missing"]
+
+
+def test_rows_skipped_by_triage_are_flagged_for_review():
+    assert _issues(Ijazah_Jenis="Bukan Ijazah (photo)") == ["ijazah_skipped"]
+    assert _issues(Ijazah_Jenis="S1") == []
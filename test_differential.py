@@ -0,0 +1,79 @@
+"""
+Test differential scraping (differential.py + carry forward di MitraScraper)
+    python -m pytest test_differential.py -q
+"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from differential import FINGERPRINT_FILE, fingerprint_row, load_previous_run, save_fingerprints
+
+NIK = "7401230101900001"
+CELLS = [NIK, "BUDI SANTOSO", "Kendari Barat", "S1", "Diterima"]
+
+
+class TableRow:
+    """Baris tabel vgt-table seperti yang dibaca scraper lewat locator"""
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def locator(self, selector):
+        return self
+
+    def inner_text(self):
+        return self.cells[0]
+
+    def all_inner_texts(self):
+        return self.cells
+
+
+def test_fingerprint_ignores_whitespace_but_not_content():
+    assert fingerprint_row(NIK, CELLS) == fingerprint_row(NIK, [f" {CELLS[0]}", "BUDI \n SANTOSO"] + CELLS[2:])
+    assert fingerprint_row(NIK, CELLS) != fingerprint_row(NIK, CELLS[:-1] + ["Ditolak"])
+    assert fingerprint_row(NIK, ["a", "b c"]) != fingerprint_row(NIK, ["a b", "c"])
+
+
+def _previous_run(folder, status="Success"):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "mitra_data.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["NIK", "Nama Lengkap", "Status", "Mismatch"])
+        writer.writeheader()
+        writer.writerow({"NIK": NIK, "Nama Lengkap": "BUDI SANTOSO", "Status": status, "Mismatch": "TRUE"})
+        writer.writerow({"NIK": "Unknown", "Nama Lengkap": "", "Status": "Failed: timeout", "Mismatch": ""})
+    save_fingerprints(folder, {NIK: fingerprint_row(NIK, CELLS)})
+    return str(folder)
+
+
+def test_load_previous_run(tmp_path):
+    rows, fingerprints = load_previous_run(_previous_run(tmp_path / "prev"))
+    assert list(rows) == [NIK] and rows[NIK]["_has_mismatch"] is True and "Mismatch" not in rows[NIK]
+    assert fingerprints == {NIK: fingerprint_row(NIK, CELLS)}
+
+    os.remove(tmp_path / "prev" / FINGERPRINT_FILE)
+    assert load_previous_run(str(tmp_path / "prev"))[1] == {}
+    with pytest.raises(FileNotFoundError):
+        load_previous_run(str(tmp_path))
+
+
+def test_unchanged_successful_row_is_carried_forward(scrape_mitra, tmp_path):
+    scraper = scrape_mitra.MitraScraper(previous_folder=_previous_run(tmp_path / "prev"))
+    assert scraper._carry_forward_if_unchanged(TableRow(CELLS))
+    assert scraper.data_list == [dict(scraper.previous_rows[NIK])] and scraper.stats["carried_forward"] == 1
+
+    save_fingerprints(scraper.output_folder, scraper.fingerprints)
+    with open(os.path.join(scraper.output_folder, FINGERPRINT_FILE), encoding="utf-8") as f:
+        assert json.load(f) == {NIK: fingerprint_row(NIK, CELLS)}
+
+
+@pytest.mark.parametrize("status, cells", [
+    ("Success", CELLS[:-1] + ["Ditolak"]),     # status seleksi berubah di tabel
+    ("Failed: timeout", CELLS),                # run lalu gagal, proses ulang
+])
+def test_changed_or_failed_rows_are_processed_again(scrape_mitra, tmp_path, status, cells):
+    scraper = scrape_mitra.MitraScraper(previous_folder=_previous_run(tmp_path / "prev", status))
+    assert not scraper._carry_forward_if_unchanged(TableRow(cells))
+    assert scraper.data_list == [] and scraper.fingerprints == {NIK: fingerprint_row(NIK, cells)}
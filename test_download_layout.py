@@ -0,0 +1,70 @@
+"""
+Test layout folder download dan manifest (download_layout.py)
+    python -m pytest test_download_layout.py -q
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from download_layout import (MANIFEST_FILE, DownloadLayout, find_document, find_documents, read_manifest,
+                             shard_parts)
+
+NIK = "7410036005020001"
+
+
+def test_shard_parts_per_scheme():
+    assert shard_parts(NIK, "flat") == []
+    assert shard_parts(NIK, "prefix") == ["74", "10"]
+    digest = hashlib.sha1(NIK.encode("utf-8")).hexdigest()
+    assert shard_parts(NIK, "hash") == [digest[:2], digest[2:4]]
+
+
+def test_shard_parts_short_nik_never_yields_empty_folder():
+    assert shard_parts("7", "prefix") == ["7", "_"]
+    assert shard_parts("", "prefix") == ["_", "_"]
+
+
+def test_unknown_scheme_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DownloadLayout(str(tmp_path), "nested")
+
+
+def _save(layout, nik, document, content=b"\xff\xd8 scan"):
+    path = os.path.join(layout.nik_dir(nik), f"{document}.jpg")
+    with open(path, "wb") as f:
+        f.write(content)
+    layout.record(nik, document, path, url=f"https://mitra/{document}/{nik}")
+    return path
+
+
+def test_record_writes_manifest_with_checksum(tmp_path):
+    layout = DownloadLayout(str(tmp_path), "prefix")
+    path = _save(layout, NIK, "ijazah")
+    assert path == os.path.join(str(tmp_path), "74", "10", NIK, "ijazah.jpg")
+
+    [entry] = read_manifest(str(tmp_path))
+    assert entry["Path"] == f"74/10/{NIK}/ijazah.jpg"
+    assert entry["SHA256"] == hashlib.sha256(b"\xff\xd8 scan").hexdigest() and entry["Size"] == "7"
+    assert find_documents(str(tmp_path)) == {NIK: path}
+
+
+def test_latest_manifest_entry_wins(tmp_path):
+    layout = DownloadLayout(str(tmp_path), "flat")
+    _save(layout, NIK, "ktp", b"first")
+    _save(layout, NIK, "ktp", b"second")
+    [entry] = read_manifest(str(tmp_path))
+    assert entry["SHA256"] == hashlib.sha256(b"second").hexdigest()
+
+
+def test_legacy_folder_is_indexed_and_found(tmp_path):
+    legacy = tmp_path / "downloads" / NIK
+    legacy.mkdir(parents=True)
+    (legacy / "ijazah.png").write_bytes(b"png")
+    assert find_documents(str(tmp_path)) == {NIK: str(legacy / "ijazah.png")}
+
+    DownloadLayout(str(tmp_path / "downloads"), "hash")
+    assert (tmp_path / "downloads" / MANIFEST_FILE).exists()
+    assert find_document(str(tmp_path), NIK) == str(legacy / "ijazah.png")
+    assert find_document(str(tmp_path), NIK, "ktp") is None
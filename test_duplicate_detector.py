@@ -0,0 +1,53 @@
+"""
+Test deteksi duplikat (duplicate_detector.py) tanpa file gambar: hash disuntikkan langsung
+    python -m pytest test_duplicate_detector.py -q
+"""
+
+from duplicate_detector import BKTree, ImageHashes, _cluster_images, find_shared_accounts
+
+
+def _entry(nik, dhash, ahash=0, sha=None):
+    return (nik, f"downloads/{nik}/ijazah.jpg", ImageHashes(sha or f"sha-{nik}", dhash, ahash))
+
+
+def test_near_duplicates_do_not_chain():
+    # A~B (3 bit) dan B~C (3 bit), tapi A dan C berjarak 6 bit
+    entries = [_entry("A", 0b000000), _entry("B", 0b000111), _entry("C", 0b111111)]
+    clusters = _cluster_images("ijazah", entries, 3)
+    assert len(clusters) == 1
+    members = {nik for nik, _ in clusters[0].members}
+    assert len(members) == 2 and members != {"A", "C"}
+    assert clusters[0].kind == "ijazah_mirip" and clusters[0].max_distance <= 3
+
+
+def test_ahash_is_required_as_second_signal():
+    entries = [_entry("A", 0, ahash=0), _entry("B", 1, ahash=0xFFFF)]
+    assert _cluster_images("ktp", entries, 3) == []
+    entries = [_entry("A", 0, ahash=0), _entry("B", 1, ahash=1)]
+    assert [c.kind for c in _cluster_images("ktp", entries, 3)] == ["ktp_mirip"]
+
+
+def test_identical_files_are_reported_separately():
+    entries = [_entry("A", 5, sha="same"), _entry("B", 5, sha="same"), _entry("A", 5, sha="same")]
+    clusters = _cluster_images("ktp", entries, 3)
+    assert [(c.kind, c.key) for c in clusters] == [("ktp_identik", "same")]
+
+
+def test_identical_file_for_one_nik_is_not_a_duplicate():
+    entries = [_entry("A", 5, sha="same"), _entry("A", 5, sha="same")]
+    assert _cluster_images("ktp", entries, 3) == []
+
+
+def test_shared_accounts_normalize_formatting():
+    rows = [{"NIK": "1", "Nomor Rekening": "0123-01-045678-50-1", "Nama Pemilik": "A"},
+            {"NIK": "2", "Nomor Rekening": "012301045678501", "Nama Pemilik": "B"},
+            {"NIK": "3", "Nomor Rekening": "N/A", "Nama Pemilik": "C"}]
+    clusters = find_shared_accounts(rows)
+    assert [(c.key, [nik for nik, _ in c.members]) for c in clusters] == [("012301045678501", ["1", "2"])]
+
+
+def test_bk_tree_radius_search():
+    tree = BKTree()
+    for value in (0, 1, 3, 0xFF, 0xFFFF):
+        tree.add(value)
+    assert sorted(value for value, _ in tree.search(0, 2)) == [0, 1, 3]
@@ -0,0 +1,76 @@
+"""
+Test situs tiruan Seleksi Mitra (fixture_site.py) lewat HTTP sungguhan, latency 0
+    python -m pytest test_fixture_site.py -q
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from data_quality import validate_rows
+from fixture_site import FixtureSite, Latency, document_image, synthetic_mitra
+
+NO_LATENCY = Latency(table=0, detail=0, image=0)
+
+
+def test_synthetic_mitra_is_deterministic_with_unique_valid_niks():
+    rows = synthetic_mitra(300)
+    assert rows == synthetic_mitra(300) and rows != synthetic_mitra(300, seed=2)
+    assert len({row["nik"] for row in rows}) == 300
+    result = validate_rows([{"NIK": row["nik"], "Status": "Success"} for row in rows])
+    assert result.counts.get("nik_format", 0) == 0
+
+
+def test_document_images_are_png_and_stable():
+    ktp = document_image("foto_ktp", "7410010101900001")
+    assert ktp.startswith(b"\x89PNG\r\n\x1a\n") and ktp == document_image("foto_ktp", "7410010101900001")
+    assert ktp != document_image("ijazah", "7410010101900001")
+
+
+def test_table_page_search_and_bounds():
+    site = FixtureSite(rows=25, per_page=10, latency=NO_LATENCY)
+    assert [page["total"] for page in (site.table_page(1, 10, ""), site.table_page(9, 10, ""))] == [25, 25]
+    assert site.table_page(9, 10, "")["page"] == 3 and len(site.table_page(3, 10, "")["rows"]) == 5
+
+    target = site.mitra[7]
+    found = site.table_page(1, 10, target["nik"])
+    assert found["total"] == 1 and found["rows"][0]["nik"] == target["nik"]
+    assert "rekening" not in found["rows"][0]          # data rekening hanya ada di modal detail
+
+
+@pytest.fixture
+def site():
+    site = FixtureSite(rows=12, per_page=5, latency=NO_LATENCY)
+    site.start()
+    yield site
+    site.stop()
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.headers["Content-Type"], response.read()
+
+
+def test_http_endpoints(site):
+    content_type, html = _get(site.url)
+    assert content_type.startswith("text/html") and b"vgt-table" in html
+
+    _, body = _get(site.url + "api/mitra?page=2&per_page=5")
+    page = json.loads(body)
+    assert (page["page"], page["pages"], len(page["rows"])) == (2, 3, 5)
+
+    nik = page["rows"][0]["nik"]
+    detail = json.loads(_get(f"{site.url}api/mitra/{nik}")[1])
+    rekening = json.loads(_get(f"{site.url}api/mitra/{nik}/rekening")[1])
+    assert rekening["rekening"] == site.by_nik[nik]["rekening"]
+    content_type, image = _get(detail["ijazah_url"])
+    assert content_type == "image/png" and image == document_image("ijazah", nik)
+    assert site.requests == {"table": 1, "detail": 2, "image": 1}
+
+
+def test_unknown_nik_is_404(site):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _get(site.url + "api/mitra/0000000000000000")
+    assert error.value.code == 404
@@ -0,0 +1,62 @@
+"""
+Test normalisasi gelar hasil parsing ijazah (gelar_normalizer.py)
+    python -m pytest test_gelar_normalizer.py -q
+"""
+
+import pytest
+
+from gelar_normalizer import normalize_gelar, normalize_ijazah_result, split_name_gelar
+
+
+@pytest.mark.parametrize("raw, gelar, jenjang", [
+    ("S. Sos", "S.Sos.", "S1"),
+    ("AMd.", "A.Md.", "D3"),
+    ("S.Sos, M.Si", "S.Sos., M.Si.", "S2"),
+    ("dr.", "dr.", "Profesi"),
+    ("Dr.", "Dr.", "S3"),
+    ("Drs.", "Drs.", "S1"),
+    ("Dra", "Dra.", "S1"),
+    ("Sarjana Ekonomi", "S.E.", "S1"),
+    ("Ahli Madya Statistika", "A.Md.Stat.", "D3"),
+])
+def test_normalize_gelar(raw, gelar, jenjang):
+    info = normalize_gelar(raw)
+    assert (info.gelar, info.jenjang) == (gelar, jenjang)
+
+
+@pytest.mark.parametrize("raw, jenjang", [("D-III", "D3"), ("D.IV", "D4"), ("S1", "S1"), ("Strata 1", "S1")])
+def test_written_jenjang_sets_level_without_gelar(raw, jenjang):
+    info = normalize_gelar(raw)
+    assert (info.gelar, info.jenjang, info.unresolved) == (None, jenjang, [])
+
+
+@pytest.mark.parametrize("text, name, gelar", [
+    ("BUDI SANTOSO, S.Kom", "BUDI SANTOSO", "S.Kom."),
+    ("BUDI (S.Sos.)", "BUDI", "S.Sos."),
+    ("AHMAD SE", "AHMAD", "S.E."),
+    ("dr. SITI AMINAH", "SITI AMINAH", "dr."),
+    ("Drs. AHMAD", "AHMAD", "Drs."),
+    ("SITI MA", "SITI MA", None),
+])
+def test_split_name_gelar(text, name, gelar):
+    split_name, info = split_name_gelar(text)
+    assert (split_name, info.gelar) == (name, gelar)
+
+
+def test_ijazah_result_uses_gelar_from_name():
+    result = normalize_ijazah_result({"nama": "AHMAD SE", "gelar": None, "nama_gelar": None, "jenis_ijazah": None})
+    assert result["nama"] == "AHMAD" and result["gelar"] == "S.E."
+    assert result["nama_gelar"] == "AHMAD, S.E." and result["jenjang"] == "S1"
+    assert result["jenis_ijazah"] == "Perguruan Tinggi"
+
+
+def test_ijazah_result_with_only_jenjang():
+    result = normalize_ijazah_result({"nama": "RINA", "gelar": "D-III", "nama_gelar": "RINA, D-III",
+                                      "jenis_ijazah": None})
+    assert (result["gelar"], result["jenjang"], result["nama_gelar"]) == (None, "D3", "RINA")
+    assert result["jenis_ijazah"] == "Perguruan Tinggi"
+
+
+def test_ijazah_result_without_gelar_is_sma():
+    result = normalize_ijazah_result({"nama": "RINA", "gelar": "N/A", "nama_gelar": None, "jenis_ijazah": None})
+    assert (result["gelar"], result["jenis_ijazah"], result["jenjang"]) == (None, "SMA/SMK", "SMA")
@@ -0,0 +1,88 @@
+"""
+Test scrubbing HAR (har_session.py): NIK, rekening dan nama tidak boleh tersimpan di rekaman
+    python -m pytest test_har_session.py -q
+"""
+
+import json
+
+from har_session import HarRecorder, Scrubber, _entry
+
+NIK = "7401234567890123"
+REKENING = "0123-01-045678-50-1"
+NAMA = "Wa Ode Sulastri"
+
+
+def _scrubbed(tmp_path, body: dict, rows=()):
+    scrubber = Scrubber(salt=b"test")
+    scrubber.learn_rows(list(rows))
+    scrubber.learn_json(body)
+    html = (f"<td>{NIK}</td><td>WA ODE\n   SULASTRI</td>"
+            f"<div class=\"form-control-plaintext\">{REKENING}</div><li>Rekening</li>").encode()
+    recorder = HarRecorder(str(tmp_path / "mitra.har"))
+    page = recorder._scrub_entry(_entry("GET", f"https://mitra.test/seleksi?nik={NIK}", {"Cookie": "sid=1"}, 200,
+                                        "OK", {"Content-Type": "text/html"}, html), scrubber)
+    detail = recorder._scrub_entry(_entry("GET", f"https://mitra.test/api/mitra/{NIK}", {}, 200, "OK",
+                                          {"Content-Type": "application/json"}, json.dumps(body).encode()), scrubber)
+    return scrubber, page, detail
+
+
+def test_formatted_rekening_and_multi_token_name_are_scrubbed(tmp_path):
+    body = {"nik": NIK, "nama_lengkap": NAMA, "no_rekening": REKENING, "nama_bank": "BRI"}
+    scrubber, page, detail = _scrubbed(tmp_path, body)
+    for entry in (page, detail):
+        text = entry["response"]["content"]["text"] + entry["request"]["url"]
+        assert NIK not in text
+        assert REKENING not in text and "012301045678501" not in text
+        assert "sulastri" not in text.lower()
+
+    fake = scrubber.rekening["012301045678501"]
+    html = page["response"]["content"]["text"]
+    # Format pemisah dipertahankan, digit diganti nilai palsu yang sama dengan expected
+    assert f"{fake[:4]}-{fake[4:6]}-{fake[6:12]}-{fake[12:14]}-{fake[14:]}" in html
+    assert "<li>Rekening</li>" in html
+    assert all(h["name"].lower() != "cookie" for h in page["request"]["headers"])
+
+
+def test_expected_row_matches_scrubbed_body(tmp_path):
+    rows = [{"NIK": NIK, "Nama Bank": "BRI", "Nomor Rekening": "012301045678501", "Nama Pemilik": NAMA.upper(),
+             "Status": "Success"}]
+    scrubber, page, detail = _scrubbed(tmp_path, {"nik": NIK, "no_rekening": REKENING}, rows)
+    expected = scrubber.row(rows[0])
+    html = page["response"]["content"]["text"]
+    assert expected["NIK"] in html
+    assert expected["Nama Pemilik"] in html
+    # Scraper membuang pemisah rekening, jadi hasil replay == expected
+    assert "".join(c for c in html.split('plaintext">')[1] if c.isdigit())[:15] == expected["Nomor Rekening"]
+
+
+def test_text_without_known_rekening_only_replaces_nik():
+    scrubber = Scrubber(salt=b"test")
+    assert scrubber.text("kode 123456 nik " + NIK).startswith("kode 123456 nik 7401")
+    assert NIK not in scrubber.text(NIK)
+
+
+def test_every_image_body_is_dropped_at_capture_and_synthesized_on_save(tmp_path):
+    recorder = HarRecorder(str(tmp_path / "mitra.har"))
+    logo = b"\x89PNG asli logo"
+    recorder._add(_entry("GET", "https://mitra.test/static/logo.png", {}, 200, "OK",
+                         {"Content-Type": "image/png"}, logo, resource_type="image"))
+    recorder._add(_entry("GET", f"https://mitra.test/storage/foto_ktp/{NIK}.jpg", {}, 200, "OK",
+                         {"Content-Type": "application/octet-stream"}, b"\xff\xd8 scan asli"))
+    assert [entry["response"]["content"]["_body"] for entry in recorder.entries] == [b"", b""]
+    assert recorder.body_bytes == 0
+
+    scrubber = Scrubber(salt=b"test")
+    for entry in recorder.entries:
+        scrubbed = recorder._scrub_entry(entry, scrubber)
+        content = scrubbed["response"]["content"]
+        assert content["mimeType"] == "image/png" and content["encoding"] == "base64"
+        assert {"name": "Content-Type", "value": "image/png"} in scrubbed["response"]["headers"]
+        assert NIK not in scrubbed["request"]["url"]
+
+
+def test_recording_stops_at_body_limit(tmp_path):
+    recorder = HarRecorder(str(tmp_path / "mitra.har"), max_bytes=100)
+    for i in range(4):
+        recorder._add(_entry("GET", f"https://mitra.test/api/page/{i}", {}, 200, "OK",
+                             {"Content-Type": "application/json"}, b"x" * 40))
+    assert len(recorder.entries) == 2 and recorder.body_bytes == 80 and recorder.dropped == 2
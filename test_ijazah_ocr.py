@@ -0,0 +1,102 @@
+"""
+Test ekstraksi ijazah lokal (ijazah_ocr.py). Aturan regex diuji dari teks OCR jadi;
+Tesseract sendiri diganti objek palsu sehingga test jalan tanpa pytesseract
+    python -m pytest test_ijazah_ocr.py -q
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import ijazah_ocr
+from ijazah_ocr import LocalResult, extract_fields, extract_local, missing_fields
+
+SARJANA = """UNIVERSITAS HALU OLEO
+IJAZAH
+Nomor: 1234/UN29/2019
+Rektor Universitas Halu Oleo menyatakan bahwa
+RAHMAT HIDAYAT
+NIM: B1A115023
+lahir di Kendari, tanggal 3 Maret 1997
+telah menyelesaikan Program Studi Ilmu Administrasi Negara
+Fakultas Ilmu Sosial dan Ilmu Politik
+dan kepadanya diberikan gelar SARJANA SOSIAL (S.Sos.)
+Kendari, 28 Oktober 2019"""
+
+SMA = """IJAZAH
+SEKOLAH MENENGAH ATAS
+Yang bertanda tangan di bawah ini menyatakan bahwa
+Nama : NUR ANGGRAINI
+Tempat dan Tanggal Lahir : Kendari, 12 Januari 1999
+LULUS dari SMA NEGERI 1 KENDARI
+Kendari, 2 Mei 2016"""
+
+
+def test_university_diploma_fields():
+    result = extract_fields(SARJANA)
+    assert result == {
+        "jenis_ijazah": "Perguruan Tinggi",
+        "nama": "RAHMAT HIDAYAT",
+        "gelar": "S.Sos.",
+        "nama_gelar": None,
+        "nim": "B1A115023",
+        "program_studi": "Ilmu Administrasi Negara",
+        "fakultas": "Fakultas Ilmu Sosial dan Ilmu Politik",
+        "universitas": "UNIVERSITAS HALU OLEO",
+        "tanggal_ijazah": "28 Oktober 2019",
+    }
+    assert missing_fields(result) == []
+
+
+def test_school_diploma_prefers_named_school_and_last_date():
+    result = extract_fields(SMA)
+    assert (result["jenis_ijazah"], result["nama"], result["universitas"]) == ("SMA/SMK", "NUR ANGGRAINI",
+                                                                              "SMA NEGERI 1 KENDARI")
+    assert result["tanggal_ijazah"] == "2 Mei 2016" and result["nim"] is None
+    assert missing_fields(result) == []
+
+
+def test_university_diploma_without_gelar_goes_to_api():
+    result = extract_fields(SARJANA.replace(" (S.Sos.)", ""))
+    assert missing_fields(result) == ["gelar"]
+    assert not LocalResult(result, 95.0, missing_fields(result)).acceptable
+    assert not LocalResult(extract_fields(SARJANA), 60.0, []).acceptable      # confidence OCR terlalu rendah
+
+
+def test_ocr_words_are_joined_per_line(monkeypatch, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "ijazah.png"
+    Image.new("L", (300, 200), 255).save(path)
+    words = [("UNIVERSITAS", 1, 90), ("HALU", 1, 80), ("OLEO", 1, 85), ("", 1, -1), ("RAHMAT", 2, 70)]
+    timeouts = []
+
+    def image_to_data(img, lang, config, output_type, timeout):
+        timeouts.append(timeout)
+        return {"text": [word for word, _, _ in words], "conf": [conf for _, _, conf in words],
+                "block_num": [1] * len(words), "par_num": [1] * len(words),
+                "line_num": [line for _, line, _ in words]}
+
+    fake = SimpleNamespace(Output=SimpleNamespace(DICT="dict"), get_languages=lambda: ["eng", "ind"],
+                           image_to_data=image_to_data)
+    monkeypatch.setattr(ijazah_ocr, "pytesseract", fake)
+
+    ocr = ijazah_ocr.ocr_image(str(path))
+    assert ocr.text == "UNIVERSITAS HALU OLEO\nRAHMAT" and ocr.words == 4
+    assert ocr.confidence == pytest.approx(81.25)
+    ijazah_ocr.ocr_image(str(path), timeout=4.5)
+    assert timeouts == [0, 4.5]                            # 0 = tanpa batas (pytesseract)
+
+
+def test_extract_local_without_tesseract(monkeypatch, tmp_path):
+    monkeypatch.setattr(ijazah_ocr, "_available", False)
+    assert extract_local(str(tmp_path / "ijazah.jpg")) is None
+
+
+def test_extract_local_gives_up_when_tesseract_times_out(monkeypatch, tmp_path):
+    def slow_ocr(path, timeout):
+        assert timeout == 2.0
+        raise RuntimeError("Tesseract process timeout")
+
+    monkeypatch.setattr(ijazah_ocr, "_available", True)
+    monkeypatch.setattr(ijazah_ocr, "ocr_image", slow_ocr)
+    assert extract_local(str(tmp_path / "ijazah.jpg"), timeout=2.0) is None
@@ -0,0 +1,114 @@
+"""
+Test triage ijazah sebelum vision API (image_triage.py)
+Aturan classify_stats diuji dengan ImageStats langsung; routing IjazahTriage butuh Pillow
+    python -m pytest test_image_triage.py -q
+"""
+
+import random
+
+import pytest
+
+from image_triage import ImageStats, IjazahTriage, classify_stats
+
+SCAN = ImageStats(width=1654, height=2339, mean=205.0, stddev=48.0, bright_fraction=0.82, saturation=12.0,
+                  blue_fraction=0.0)
+
+
+@pytest.mark.parametrize("changes, reason", [
+    ({}, None),
+    ({"width": 2339, "height": 1654}, None),                     # ijazah landscape
+    ({"stddev": 2.5}, "blank"),
+    ({"width": 4000, "height": 900}, "aspect_ratio"),
+    ({"width": 1011, "height": 638, "blue_fraction": 0.6}, "ktp_like"),
+    ({"width": 1011, "height": 638, "blue_fraction": 0.1}, None),  # rasio kartu tapi latar putih
+    ({"saturation": 140.0, "bright_fraction": 0.05}, "photo"),
+    ({"saturation": 105.0, "bright_fraction": 0.0}, None),       # ijazah kertas hijau
+    ({"saturation": 140.0, "bright_fraction": 0.12}, None),      # foto berwarna dari ijazah, sebagian kertas
+    ({"mean": 70.0, "saturation": 40.0, "bright_fraction": 0.0}, None),  # scan gelap
+])
+def test_classify_stats(changes, reason):
+    assert classify_stats(SCAN._replace(**changes)) == reason
+
+
+@pytest.fixture
+def Image():
+    return pytest.importorskip("PIL.Image")
+
+
+def _scan(Image, path, quality=90):
+    """Kertas dengan bayangan scan (gradien) dan baris 'teks' gelap, cukup mirip ijazah hasil scan"""
+    rnd = random.Random(1)
+    img = Image.linear_gradient("L").rotate(90).resize((600, 840)).point(lambda value: 255 - value // 4)
+    for top in range(120, 760, 40):
+        img.paste(40, (60, top, 60 + rnd.randint(200, 480), top + 14))
+    img.convert("RGB").save(path, "JPEG", quality=quality)
+    return str(path)
+
+
+def test_colored_diploma_is_sent_to_parser(Image, tmp_path):
+    ImageOps = pytest.importorskip("PIL.ImageOps")
+    path = tmp_path / "ijazah.jpg"
+    ImageOps.colorize(Image.open(_scan(Image, path)).convert("L"), black=(20, 50, 30),
+                      white=(120, 190, 110)).save(path, "JPEG", quality=90)
+    decision = IjazahTriage(str(tmp_path / "cache.json")).classify(str(path), "1")
+    assert decision.route == "parse"
+
+
+def test_blank_upload_is_skipped(Image, tmp_path):
+    path = tmp_path / "ijazah.jpg"
+    Image.new("RGB", (600, 840), (250, 250, 250)).save(path)
+    triage = IjazahTriage(str(tmp_path / "cache.json"))
+    decision = triage.classify(str(path), "1")
+    assert (decision.route, decision.reason) == ("skip", "blank")
+    assert triage.skip_reasons == {"blank": 1}
+
+
+def test_parsed_result_is_reused_for_identical_file(Image, tmp_path):
+    cache = str(tmp_path / "cache.json")
+    path = _scan(Image, tmp_path / "ijazah.jpg")
+    triage = IjazahTriage(cache)
+    assert triage.classify(path, "1").route == "parse"
+    triage.remember(path, {"nama": "BUDI SANTOSO", "gelar": "S.Pd"})
+    triage.save()
+
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes(open(path, "rb").read())
+    decision = IjazahTriage(cache).classify(str(copy), "2")
+    assert (decision.route, decision.reason, decision.result) == ("cache", "identical",
+                                                                  {"nama": "BUDI SANTOSO", "gelar": "S.Pd"})
+
+
+def test_results_from_another_prompt_version_are_dropped(Image, tmp_path):
+    cache = str(tmp_path / "cache.json")
+    path = _scan(Image, tmp_path / "ijazah.jpg")
+    old = IjazahTriage(cache, version="v1")
+    old.classify(path, "1")
+    old.remember(path, {"nama": "BUDI SANTOSO"})
+    old.save()
+
+    assert IjazahTriage(cache, version="v1").classify(path, "1").route == "cache"
+    current = IjazahTriage(cache, version="v2")
+    assert current.entries == [] and current.classify(path, "1").route == "parse"
+
+
+def test_reencoded_file_is_reused_only_for_same_nik(Image, tmp_path):
+    triage = IjazahTriage(str(tmp_path / "cache.json"))
+    path = _scan(Image, tmp_path / "run1.jpg")
+    triage.classify(path, "1")
+    triage.remember(path, {"nama": "BUDI SANTOSO"})
+
+    reencoded = _scan(Image, tmp_path / "run2.jpg", quality=60)
+    assert triage.classify(reencoded, "2").route == "parse"      # template sama, NIK lain
+    decision = triage.classify(reencoded, "1")
+    assert decision.route == "cache" and decision.reason.startswith("similar")
+    assert triage.counts == {"skip": 0, "cache": 1, "parse": 2}
+
+
+def test_failed_parse_is_not_cached(Image, tmp_path):
+    triage = IjazahTriage(str(tmp_path / "cache.json"))
+    path = _scan(Image, tmp_path / "ijazah.jpg")
+    triage.classify(path, "1")
+    triage.remember(path, {"nama": None})
+    assert triage.entries == [] and triage.classify(path, "1").route == "parse"
+    triage.remember(path, None)                                  # parse error: path dilepas dari _pending
+    assert triage._pending == {}
@@ -0,0 +1,73 @@
+"""
+Test validasi dokumen hasil download (image_validation.py)
+    python -m pytest test_image_validation.py -q
+"""
+
+import io
+import random
+
+import pytest
+
+import image_validation
+from image_validation import validate_image_bytes
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(width=800, height=600) -> bytes:
+    noise = random.Random(1).randbytes(width * height)
+    buffer = io.BytesIO()
+    Image.frombytes("L", (width, height), noise).convert("RGB").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _png(width, height) -> bytes:
+    buffer = io.BytesIO()
+    Image.frombytes("L", (width, height), random.Random(2).randbytes(width * height)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_valid_jpeg_reports_format_and_dimensions():
+    check = validate_image_bytes(_jpeg(), "image/jpeg")
+    assert check.valid and check.format == "jpeg" and (check.width, check.height) == (800, 600)
+
+
+def test_jpeg_with_trailer_after_eoi_is_valid():
+    # Motion photo / trailer kamera: data tambahan setelah marker EOI
+    check = validate_image_bytes(_jpeg() + b"\x00MotionPhoto" * 200)
+    assert check.valid, check
+
+
+def test_truncated_jpeg_is_rejected():
+    data = _jpeg()
+    assert validate_image_bytes(data[:len(data) // 2]).reason == "truncated"
+
+
+def test_truncated_jpeg_without_pillow(monkeypatch):
+    monkeypatch.setattr(image_validation, "Image", None)
+    data = _jpeg()
+    assert validate_image_bytes(data + b"x" * 2048).valid
+    assert validate_image_bytes(data[:len(data) // 2]).reason == "truncated"
+
+
+def test_login_page_is_rejected_as_html():
+    html = b"<!DOCTYPE html><html><body>Login SSO BPS</body></html>" * 200
+    assert validate_image_bytes(html, "text/html; charset=utf-8").reason == "html"
+    assert validate_image_bytes(_jpeg(), "text/html").reason == "html"
+
+
+def test_small_and_low_resolution_files():
+    assert validate_image_bytes(b"\xff\xd8\xff" + b"\x00" * 100).reason == "too_small"
+    assert validate_image_bytes(_png(640, 120)).reason == "low_resolution"
+    assert validate_image_bytes(_png(640, 480)).valid
+
+
+def test_unknown_and_unsupported_formats():
+    assert validate_image_bytes(b"\x01\x02" * 4096).reason == "unknown_format"
+    assert validate_image_bytes(b"%PDF-1.4" + b"\x00" * 8192).reason == "unsupported"
+
+
+def test_corrupt_png_is_rejected():
+    data = bytearray(_png(640, 480))
+    data[200:400] = b"\x00" * 200
+    assert validate_image_bytes(bytes(data)).reason in ("corrupt", "truncated")
@@ -0,0 +1,78 @@
+"""
+Test verifikasi folder downloads lewat manifest (integrity.py)
+    python -m pytest test_integrity.py -q
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from download_layout import DownloadLayout, index_existing, read_manifest
+from integrity import fill_manifest, hash_files, sha256_mmap, verify
+
+
+def _layout(tmp_path, files):
+    """Folder output dengan downloads/<NIK>/<dokumen>.jpg yang tercatat di manifest"""
+    layout = DownloadLayout(str(tmp_path / "downloads"))
+    paths = {}
+    for (nik, document), content in files.items():
+        path = os.path.join(layout.nik_dir(nik), f"{document}.jpg")
+        with open(path, "wb") as f:
+            f.write(content)
+        layout.record(nik, document, path)
+        paths[(nik, document)] = path
+    return paths
+
+
+def _statuses(tmp_path, workers=1):
+    return {(status.nik, status.document): status.status for status in verify(str(tmp_path), workers)}
+
+
+def test_untouched_folder_is_ok(tmp_path):
+    _layout(tmp_path, {("1", "ktp"): b"ktp-1", ("1", "ijazah"): b"ijazah-1"})
+    assert _statuses(tmp_path) == {("1", "ijazah"): "ok", ("1", "ktp"): "ok"}
+
+
+def test_missing_truncated_and_changed_files(tmp_path):
+    paths = _layout(tmp_path, {("1", "ktp"): b"a" * 100, ("2", "ktp"): b"b" * 100, ("3", "ktp"): b"c" * 100,
+                               ("4", "ktp"): b"d" * 100, ("5", "ktp"): b"e" * 100})
+    os.remove(paths[("1", "ktp")])
+    with open(paths[("2", "ktp")], "r+b") as f:
+        f.truncate(40)
+    with open(paths[("3", "ktp")], "r+b") as f:
+        f.write(b"X")                      # ukuran sama, isi berbeda
+    with open(paths[("4", "ktp")], "ab") as f:
+        f.write(b"tambahan")
+
+    assert _statuses(tmp_path) == {("1", "ktp"): "missing", ("2", "ktp"): "truncated", ("3", "ktp"): "changed",
+                                   ("4", "ktp"): "changed", ("5", "ktp"): "ok"}
+
+
+def test_legacy_entries_are_unverified_until_manifest_is_filled(tmp_path):
+    legacy = tmp_path / "downloads" / "7"
+    legacy.mkdir(parents=True)
+    (legacy / "ktp.jpg").write_bytes(b"legacy scan")
+    assert index_existing(str(tmp_path / "downloads")) == 1
+    assert _statuses(tmp_path) == {("7", "ktp"): "unverified"}
+
+    assert fill_manifest(str(tmp_path), workers=1) == 1
+    [entry] = read_manifest(str(tmp_path / "downloads"))
+    assert entry["SHA256"] == hashlib.sha256(b"legacy scan").hexdigest()
+    assert _statuses(tmp_path) == {("7", "ktp"): "ok"}
+
+
+def test_verify_without_manifest_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        verify(str(tmp_path))
+
+
+def test_sha256_mmap_and_pool_hashing(tmp_path):
+    empty, data = tmp_path / "empty.jpg", tmp_path / "data.jpg"
+    empty.write_bytes(b"")
+    data.write_bytes(b"x" * 5000)
+    assert sha256_mmap(str(empty)) == hashlib.sha256(b"").hexdigest()
+    paths = [str(empty), str(data), str(tmp_path / "gone.jpg")]
+    assert hash_files(paths, workers=1) == {str(empty): hashlib.sha256(b"").hexdigest(),
+                                             str(data): hashlib.sha256(b"x" * 5000).hexdigest(),
+                                             str(tmp_path / "gone.jpg"): None}
@@ -0,0 +1,202 @@
+"""
+Test penyimpanan SQLite (mitra_store.py): mirror mode sync dan database hasil per run
+    python -m pytest test_mitra_store.py -q
+"""
+
+import sqlite3
+
+import pytest
+
+from image_validation import ImageCheck
+from mitra_store import MitraStore, ResultStore, row_to_record
+
+BUDI = {"NIK": "7401230101900001", "Nama Bank": "BRI", "Nomor Rekening": "012301045678501",
+        "Nama Pemilik": "BUDI SANTOSO", "Path KTP": "downloads/7401230101900001/ktp.jpg",
+        "Path Ijazah": "Not Downloaded", "Status": "Success", "_has_mismatch": False}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MitraStore(str(tmp_path / "mitra_store.db"))
+    yield store
+    store.close()
+
+
+def test_record_round_trip_keeps_unknown_keys_in_extra():
+    row = dict(BUDI, **{"Kecamatan": "Kendari Barat", "_has_mismatch": True})
+    record = row_to_record(row)
+    assert record["nik"] == BUDI["NIK"] and record["has_mismatch"] == 1
+    assert record["extra"] == '{"Kecamatan": "Kendari Barat"}'
+
+
+def test_upsert_reports_insert_update_and_unchanged(store):
+    assert store.upsert(dict(BUDI), "fp-1") == "inserted"
+    assert store.upsert(dict(BUDI), "fp-2") == "unchanged"
+    assert store.fingerprints() == {BUDI["NIK"]: "fp-2"}
+
+    assert store.upsert(dict(BUDI, **{"Nomor Rekening": "012301045678502"}), "fp-2") == "updated"
+    assert store.get(BUDI["NIK"])["Nomor Rekening"] == "012301045678502"
+    assert store.get("7401230101900099") is None
+
+
+def test_get_returns_scraper_row_format(store):
+    store.upsert(dict(BUDI, Kecamatan="Kendari Barat"), None)
+    row = store.get(BUDI["NIK"])
+    assert row["Kecamatan"] == "Kendari Barat" and row["_has_mismatch"] is False
+    assert row["Ijazah_Nama"] is None
+    assert store.all_rows() == [row]
+
+
+def test_least_recently_checked_rotates_through_store(store):
+    for nik in ("7401230101900001", "7401230101900002", "7401230101900003"):
+        store.upsert(dict(BUDI, NIK=nik), "fp")
+    store.conn.execute("UPDATE mitra SET checked_at = '2026-01-01T00:00:00' WHERE nik = '7401230101900003'")
+    assert store.least_recently_checked(2) == ["7401230101900003", "7401230101900001"]
+
+    store.upsert(dict(BUDI, NIK="7401230101900003"), "fp")        # unchanged tetap memperbarui checked_at
+    assert store.least_recently_checked(1) == ["7401230101900001"]
+
+
+def test_niks_without_ijazah(store):
+    store.upsert(dict(BUDI), "fp")
+    store.upsert(dict(BUDI, NIK="7401230101900002", **{"Path Ijazah": "downloads/2/ijazah.jpg"}), "fp")
+    store.upsert(dict(BUDI, NIK="7401230101900003", **{"Path Ijazah": "Failed"}), "fp")
+    store.upsert({"NIK": "7401230101900004", "Status": "Failed: timeout"}, "fp")
+    assert sorted(store.niks_without_ijazah()) == ["7401230101900001", "7401230101900003", "7401230101900004"]
+
+
+def test_record_sync_writes_one_row_per_cycle(store):
+    store.record_sync("2026-01-05T08:00:00", {"rows_seen": 120, "inserted": 3, "updated": 1, "failed": 2,
+                                              "bank_rechecked": 4})
+    run = store.conn.execute("SELECT * FROM sync_runs").fetchone()
+    assert (run["rows_seen"], run["inserted"], run["updated"], run["unchanged"], run["failed"]) == (120, 3, 1, 0, 2)
+    assert run["bank_rechecked"] == 4
+    assert run["started_at"] == "2026-01-05T08:00:00" and run["finished_at"]
+
+
+def test_jenjang_and_prompt_version_have_their_own_columns(store):
+    store.upsert(dict(BUDI, Ijazah_Jenjang="S1", Ijazah_Prompt_Version="3"), "fp")
+    record = store.conn.execute("SELECT ijazah_jenjang, ijazah_prompt_version, extra FROM mitra").fetchone()
+    assert (record["ijazah_jenjang"], record["ijazah_prompt_version"], record["extra"]) == ("S1", "3", None)
+
+
+def test_old_database_gets_new_columns(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+CREATE TABLE mitra (nik TEXT PRIMARY KEY, nama_bank TEXT, status TEXT, has_mismatch INTEGER DEFAULT 0,
+                    extra TEXT, fingerprint TEXT, first_seen TEXT, updated_at TEXT, checked_at TEXT);
+CREATE TABLE sync_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT, finished_at TEXT, rows_seen INTEGER,
+                        inserted INTEGER, updated INTEGER, unchanged INTEGER, failed INTEGER);
+CREATE TABLE rows (row_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER, nik TEXT, status TEXT,
+                   has_mismatch INTEGER DEFAULT 0, extra TEXT);
+INSERT INTO mitra (nik, status, extra) VALUES ('7401230101900001', 'Success', '{"Ijazah_Jenjang": "D3"}');
+""")
+    conn.close()
+
+    store = MitraStore(path)
+    assert store.get("7401230101900001")["Ijazah_Jenjang"] == "D3"        # nilai lama di extra tetap terbaca
+    store.upsert(dict(BUDI, Ijazah_Jenjang="S1"), "fp")
+    store.record_sync("2026-01-05T08:00:00", {"bank_rechecked": 1})
+    assert store.get(BUDI["NIK"])["Ijazah_Jenjang"] == "S1"
+    store.close()
+
+    results = ResultStore(path)
+    results.write_run("out", "full", "2026-01-05T08:00:00", [dict(BUDI, Ijazah_Prompt_Version="3")], {})
+    assert results.rows()[0]["Ijazah_Prompt_Version"] == "3"
+    results.close()
+
+
+def test_store_is_reopened_with_existing_rows(tmp_path):
+    path = str(tmp_path / "mitra_store.db")
+    first = MitraStore(path)
+    first.upsert(dict(BUDI), "fp")
+    first.close()
+    reopened = MitraStore(path)
+    assert reopened.fingerprints() == {BUDI["NIK"]: "fp"}
+    reopened.close()
+
+
+def _bank_recheck(scraper, store, fields):
+    scraper.read_bank_details = lambda row, page: fields
+    cycle_stats = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "bank_rechecked": 0}
+    scraper._sync_bank(None, None, store, BUDI["NIK"], "fp", cycle_stats)
+    return cycle_stats
+
+
+def test_bank_recheck_updates_changed_account(scrape_mitra, store):
+    store.upsert(dict(BUDI), "fp")
+    scraper = scrape_mitra.MitraScraper()
+    cycle_stats = _bank_recheck(scraper, store, {"Nama Bank": "BNI", "Nomor Rekening": "0123456789",
+                                                 "Nama Pemilik": "BUDI SANTOSO"})
+    assert (cycle_stats["bank_rechecked"], cycle_stats["updated"]) == (1, 1)
+    row = store.get(BUDI["NIK"])
+    assert (row["Nomor Rekening"], row["Kode Bank"]) == ("0123456789", "009")
+
+
+def test_incomplete_bank_recheck_keeps_stored_values(scrape_mitra, store):
+    store.upsert(dict(BUDI), "fp")
+    scraper = scrape_mitra.MitraScraper()
+    cycle_stats = _bank_recheck(scraper, store, {"Nama Bank": "N/A", "Nomor Rekening": "N/A",
+                                                 "Nama Pemilik": "BUDI SANTOSO"})
+    assert (cycle_stats["bank_rechecked"], cycle_stats["failed"]) == (0, 1)
+    assert store.get(BUDI["NIK"])["Nomor Rekening"] == BUDI["Nomor Rekening"]
+
+
+def _write_runs(tmp_path):
+    results = ResultStore(str(tmp_path / "mitra_data.db"))
+    ktp = tmp_path / "ktp.jpg"
+    ktp.write_bytes(b"\xff\xd8" + b"0" * 98)
+    first = results.write_run("output_1", "full", "2026-01-05T08:00:00",
+                              [dict(BUDI, **{"Path KTP": str(ktp)}),
+                               dict(BUDI, NIK="7401230101900002", **{"Nama Pemilik": "SITI AMINAH"})],
+                              {"total": 2, "success": 2})
+    second = results.write_run("output_2", "nik_list", "2026-01-06T08:00:00",
+                               [dict(BUDI, **{"Nomor Rekening": "N/A", "Status": "Failed: timeout"})],
+                               {"total": 1, "failed": 1})
+    return results, first, second, str(ktp)
+
+
+def test_result_store_keeps_runs_separate(tmp_path):
+    results, first, second, _ = _write_runs(tmp_path)
+    assert [row["NIK"] for row in results.rows(first)] == ["7401230101900001", "7401230101900002"]
+    assert [row["Status"] for row in results.rows(second)] == ["Failed: timeout"]
+    assert len(results.rows()) == 3 and results.latest_run_id() == second
+    stats = dict(results.conn.execute("SELECT metric, value FROM run_stats WHERE run_id = ?", (second,)).fetchall())
+    assert stats == {"total": 1, "failed": 1}
+    results.close()
+
+
+def test_result_store_lookups(tmp_path):
+    results, *_ = _write_runs(tmp_path)
+    assert [row["Status"] for row in results.find_by_nik("7401230101900001")] == ["Success", "Failed: timeout"]
+    assert {row["NIK"] for row in results.find_by_rekening("012301045678501")} == {"7401230101900001",
+                                                                                   "7401230101900002"}
+    # "N/A" bukan nomor rekening bersama
+    assert {rekening: sorted(niks) for rekening, niks in results.shared_accounts().items()} == {
+        "012301045678501": ["7401230101900001", "7401230101900002"]}
+    results.close()
+
+
+def test_result_store_records_downloaded_images_only(tmp_path):
+    results, first, _, ktp = _write_runs(tmp_path)
+    images = results.conn.execute("SELECT nik, kind, path, size_bytes FROM images WHERE run_id = ?",
+                                  (first,)).fetchall()
+    assert [tuple(image) for image in images] == [
+        ("7401230101900001", "ktp", ktp, 100),
+        ("7401230101900002", "ktp", BUDI["Path KTP"], None)]     # file tidak ada di disk
+    indexes = {r["name"] for r in results.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_rows_nik", "idx_rows_nomor_rekening", "idx_rows_nama_bank", "idx_rows_ijazah_jenis"} <= indexes
+    results.close()
+
+
+def test_result_store_keeps_image_format_and_skips_invalid_downloads(tmp_path):
+    results = ResultStore(str(tmp_path / "mitra_data.db"))
+    path = "downloads/7401230101900001/ijazah.jpg"
+    run_id = results.write_run("output_1", "full", "2026-01-05T08:00:00",
+                               [dict(BUDI, **{"Path KTP": "Invalid (html)", "Path Ijazah": path})], {},
+                               image_checks={path: ImageCheck(True, None, "JPEG", 1654, 2339, 412000)})
+    images = results.conn.execute("SELECT kind, format, width, height FROM images WHERE run_id = ?",
+                                  (run_id,)).fetchall()
+    assert [tuple(image) for image in images] == [("ijazah", "JPEG", 1654, 2339)]
+    results.close()
@@ -0,0 +1,88 @@
+"""
+IjazahParser terhadap mock_openai.py lewat client OpenAI sungguhan (HTTP lokal, tanpa API key asli)
+    python -m pytest test_mock_openai.py -q
+"""
+
+import pytest
+from openai import OpenAI
+
+import ijazah_parser
+from fixture_site import document_image
+from ijazah_parser import IjazahParser
+from mock_openai import TEMPLATES, MockBehavior, MockOpenAI
+
+FAST = MockBehavior(latency=0, tail_rate=0, retry_after_ms=10)
+
+
+@pytest.fixture
+def ijazah(tmp_path):
+    path = tmp_path / "ijazah.png"
+    path.write_bytes(document_image("ijazah", "7410010101900001"))
+    return str(path)
+
+
+def _parser(mock, max_retries=2):
+    client = OpenAI(api_key="mock", base_url=mock.start(), max_retries=max_retries)
+    return IjazahParser(client=client, local_ocr=False)
+
+
+def test_markdown_wrapped_answer_is_parsed_and_normalized(ijazah):
+    mock = MockOpenAI(FAST._replace(markdown=True), response=dict(TEMPLATES[0], gelar="S.Sos", nama_gelar=None))
+    try:
+        result = _parser(mock).parse_ijazah(ijazah)
+    finally:
+        mock.stop()
+    assert (result["nama"], result["gelar"], result["nama_gelar"]) == ("Rahmat Hidayat", "S.Sos.",
+                                                                       "Rahmat Hidayat, S.Sos.")
+    assert mock.counts == {"requests": 1, "ok": 1, "rate_limited": 0, "errors": 0}
+
+
+def test_rate_limit_is_retried_by_client_then_gives_empty_result(ijazah):
+    mock = MockOpenAI(FAST._replace(rate_limit_rate=1.0))
+    parser = _parser(mock, max_retries=1)
+    try:
+        result = parser.parse_ijazah(ijazah)
+    finally:
+        mock.stop()
+    assert result["nama"] is None and parser.counts["api"] == 1
+    assert mock.counts["rate_limited"] == 2                # percobaan pertama + satu retry SDK
+
+
+def test_local_ocr_gets_half_the_budget_and_api_is_skipped_when_none_is_left(ijazah, monkeypatch):
+    now = [100.0]
+    budgets = []
+
+    def slow_ocr(path, timeout):
+        budgets.append(timeout)
+        now[0] += timeout or 0                             # OCR memakai seluruh jatahnya lalu gagal
+        return None
+
+    monkeypatch.setattr(ijazah_parser.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ijazah_parser, "extract_local", slow_ocr)
+    mock = MockOpenAI(FAST)
+    parser = _parser(mock)
+    parser.local_ocr = True
+    try:
+        assert parser.parse_ijazah(ijazah, timeout=20)["nama"]
+        now[0] += 100                                      # tanpa timeout: tidak ada batas
+        assert parser.parse_ijazah(ijazah, timeout=None)["nama"]
+        monkeypatch.setattr(ijazah_parser, "extract_local", lambda path, timeout: now.__setitem__(0, now[0] + 30))
+        assert parser.parse_ijazah(ijazah, timeout=20)["nama"] is None
+    finally:
+        mock.stop()
+    assert budgets == [10.0, None]
+    assert mock.counts["requests"] == 2
+
+
+def test_template_choice_depends_only_on_request_body():
+    mock = MockOpenAI(FAST)
+    assert mock.content(b"gambar-a") == mock.content(b"gambar-a")
+    assert len({mock.content(str(i).encode()) for i in range(40)}) == len(TEMPLATES)
+
+
+def test_outcome_rates_follow_behavior():
+    mock = MockOpenAI(FAST._replace(rate_limit_rate=0.2, error_rate=0.1), seed=3)
+    outcomes = [mock.outcome() for _ in range(2000)]
+    assert 0.17 < outcomes.count("rate_limited") / 2000 < 0.23
+    assert 0.08 < outcomes.count("errors") / 2000 < 0.12
+    assert mock.counts["requests"] == 2000
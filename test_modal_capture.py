@@ -0,0 +1,70 @@
+"""
+Test capture-then-extract (modal_capture.py): HTML modal di bawah ini meniru
+.v--modal-box aplikasi Seleksi Mitra (tab File Administrasi dan Rekening)
+"""
+
+import gzip
+
+from modal_capture import (extract_archive, extract_bank_fields, extract_capture, load_capture, parse_modal,
+                           save_capture)
+
+NIK = "7401230101900001"
+
+FILE_ADMINISTRASI = f"""
+<div class="v--modal-box"><h5>Detail Informasi Mitra</h5>
+  <ul class="nav"><li><a class="nav-link" href="#">File Administrasi</a></li></ul>
+  <div class="row"><label>Foto KTP</label>
+    <a href="https://mitra.bps.go.id/fs-storage/foto_ktp/{NIK}.jpg" target="_blank">Lihat</a></div>
+  <div class="row"><label>Ijazah</label>
+    <a href="https://mitra.bps.go.id/fs-storage/ijazah/{NIK}.pdf" target="_blank">Lihat</a></div>
+</div>"""
+
+REKENING = """
+<div class="v--modal-box">
+  <script>window.__state = {"bank": "BUKAN INI"}</script>
+  <div class="form-group"><label>Nama Bank</label><div class="form-control-plaintext"> BRI </div></div>
+  <div class="form-group"><label>Nomor Rekening</label>
+    <div class="form-control-plaintext">0123-01-045678-50-1</div></div>
+  <div class="form-group"><label>Nama Pemilik Rekening</label>
+    <div class="form-control-plaintext">BUDI <b>SANTOSO</b></div></div>
+</div>"""
+
+
+def test_parse_modal_pairs_labels_with_next_value_div():
+    content = parse_modal(REKENING)
+    assert content.labels == [("Nama Bank", "BRI"), ("Nomor Rekening", "0123-01-045678-50-1"),
+                              ("Nama Pemilik Rekening", "BUDI SANTOSO")]
+    assert "BUKAN INI" not in content.text
+    assert extract_bank_fields(content) == ("BRI", "012301045678501", "BUDI SANTOSO")
+
+
+def test_label_without_value_div_falls_back_to_text_dump():
+    html = """<div><p>Nama Bank</p><p>BANK MANDIRI</p>
+              <p>Nomor Rekening</p><p>1370012345678</p>
+              <label>Nama Pemilik Rekening</label><span>SITI AMINAH</span></div>"""
+    content = parse_modal(html)
+    assert content.labels == []
+    assert extract_bank_fields(content) == ("BANK MANDIRI", "1370012345678", "SITI AMINAH")
+
+
+def test_capture_round_trip_and_offline_row(tmp_path):
+    path = save_capture(str(tmp_path), NIK, FILE_ADMINISTRASI, REKENING)
+    assert load_capture(path)["rekening"] == REKENING
+
+    row = extract_capture(path)
+    assert row["Status"] == "Success"
+    assert (row["Nama Bank"], row["Nomor Rekening"], row["Nama Pemilik"]) == ("BRI", "012301045678501",
+                                                                               "BUDI SANTOSO")
+    assert row["URL KTP"].endswith(f"/foto_ktp/{NIK}.jpg") and row["URL Ijazah"].endswith(f"/ijazah/{NIK}.pdf")
+    assert row["Path Ijazah"] == "Not Downloaded" and row["Ijazah_Nama"] == "N/A" and row["Captured At"]
+
+
+def test_broken_archive_becomes_failed_row(tmp_path):
+    save_capture(str(tmp_path), NIK, FILE_ADMINISTRASI, REKENING)
+    with gzip.open(tmp_path / "7401230101900002.json.gz", "wb") as f:
+        f.write(b"{tidak lengkap")
+    (tmp_path / "catatan.txt").write_text("bukan arsip", encoding="utf-8")
+
+    rows = extract_archive(str(tmp_path), workers=1)
+    assert [row["NIK"] for row in rows] == [NIK, "7401230101900002"]
+    assert rows[1]["Status"].startswith("Failed (capture):") and rows[1]["Path KTP"] == "Failed"
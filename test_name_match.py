@@ -0,0 +1,61 @@
+"""
+Test rekonsiliasi nama rekening vs ijazah (name_match.py)
+    python -m pytest test_name_match.py -q
+"""
+
+from name_match import NameIndex, name_similarity, name_tokens, reconcile_names
+
+
+def test_tokens_drop_titles_degrees_and_aliases():
+    assert name_tokens("H. MUH. ABD RAHMAN, S.Pd") == ["MUHAMMAD", "ABDUL", "RAHMAN"]
+    assert name_tokens("Dr. SITI AMINAH (S.E.)") == ["SITI", "AMINAH"]
+    assert name_tokens("AHMAD BIN YUSUF S.Kom.") == ["AHMAD", "YUSUF"]
+
+
+def test_dotless_degree_like_tokens_are_kept_before_comma():
+    assert name_tokens("ADE MA") == ["ADE", "MA"]
+    assert name_tokens("MD SAIFUL ST") == ["MD", "SAIFUL", "ST"]
+    assert name_tokens("ADE MA, SE") == ["ADE", "MA"]
+
+
+def test_name_similarity_handles_order_and_abbreviations():
+    assert name_similarity("M. RIZAL EFENDI", "MUHAMMAD RIZAL EFENDI").matched
+    assert name_similarity("EFENDI RIZAL", "RIZAL EFENDI").score == 1.0
+    assert not name_similarity("BUDI SANTOSO", "SITI AMINAH").matched
+    assert name_similarity("N/A", "BUDI") is None
+
+
+def test_search_blocks_on_whole_tokens_when_all_trigrams_are_too_common():
+    index = NameIndex(max_postings=2)
+    for i, name in enumerate(["SITI NUR", "SITI NUR", "SITI NUR", "BUDI SANTOSO"]):
+        index.add(str(i), name)
+    # Semua trigram "SITI NUR" punya > 2 posting: tanpa fallback tidak ada kandidat sama sekali
+    assert [key for key, _ in index.search("SITI NUR", limit=5)] == ["0", "1", "2"]
+    assert index.search("BUDI SANTOSO") == [("3", 1.0)]
+    # Fallback tetap dibatasi jumlah kandidat, bukan scan semua entry
+    assert len(index.search("SITI NUR", limit=5, candidates=2)) == 2
+
+
+def test_fallback_prefers_entries_with_every_token():
+    index = NameIndex(max_postings=2)
+    for i, name in enumerate(["SITI AMINAH", "SITI NUR", "SITI RAHMA", "NUR HAYATI", "SITI NUR"]):
+        index.add(str(i), name)
+    # Posting token "NUR" paling kecil: [1, 3, 4]; "NUR HAYATI" tidak memuat "SITI"
+    assert index._token_block(["SITI", "NUR"], candidates=3) == [1, 4, 3]
+    assert [key for key, _ in index.search("SITI NUR", limit=5, candidates=3)] == ["1", "4"]
+
+
+def test_nurul_is_not_folded_into_nur():
+    assert name_tokens("NURUL HIDAYAH") == ["NURUL", "HIDAYAH"]
+    assert name_similarity("NURUL HIDAYAH", "NUR HIDAYAH").score < 1.0
+
+
+def test_reconcile_names_finds_owner_in_other_row():
+    rows = [
+        {"NIK": "1", "Status": "Success", "Nama Pemilik": "RINA WATI", "Ijazah_Nama": "RINA WATI"},
+        {"NIK": "2", "Status": "Success", "Nama Pemilik": "RINA WATI", "Ijazah_Nama": "JOKO SUSILO"},
+        {"NIK": "3", "Status": "Failed", "Nama Pemilik": "X", "Ijazah_Nama": "Y"},
+    ]
+    result = reconcile_names(rows)
+    assert (result.compared, result.matched, result.mismatched, result.cross_matched) == (2, 1, 1, 1)
+    assert rows[1]["_owner_match_nik"] == "1" and rows[2]["_name_score"] is None
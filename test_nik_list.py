@@ -0,0 +1,53 @@
+"""Test pembacaan daftar NIK untuk mode --nik-file (nik_list.py)"""
+
+import csv
+
+import pytest
+
+from nik_list import load_nik_list, load_niks_from_csv
+
+NIK_OK = "7401230101900001"
+NIK_FAILED = "7401230101900002"
+NIK_MISMATCH = "7401230101900003"
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_text_file_keeps_order_and_drops_duplicates(tmp_path):
+    path = tmp_path / "nik.txt"
+    path.write_text(f"{NIK_FAILED}\n# dari laporan lapangan: {NIK_OK}\n{NIK_FAILED}\n12345\n"
+                    f"{NIK_OK}9\n", encoding="utf-8")
+    assert load_nik_list(str(path)) == [NIK_FAILED, NIK_OK]
+
+
+def test_csv_with_mismatch_column(tmp_path):
+    path = _write_csv(tmp_path / "mitra_data.csv", [
+        {"NIK": NIK_OK, "Status": "Success", "Nomor Rekening": "012301045678501", "Mismatch": "FALSE"},
+        {"NIK": NIK_FAILED, "Status": "Failed: timeout", "Nomor Rekening": "N/A", "Mismatch": ""},
+        {"NIK": NIK_MISMATCH, "Status": "Success", "Nomor Rekening": "012301045678501", "Mismatch": "TRUE"},
+        {"NIK": "Unknown", "Status": "Failed: detached", "Nomor Rekening": "N/A", "Mismatch": ""},
+    ])
+    assert load_nik_list(path) == [NIK_FAILED, NIK_MISMATCH]
+    assert load_niks_from_csv(path, include_mismatch=False) == [NIK_FAILED]
+    assert load_niks_from_csv(path, include_failed=False) == [NIK_MISMATCH]
+
+
+def test_legacy_csv_without_mismatch_column_is_rechecked(tmp_path):
+    path = _write_csv(tmp_path / "mitra_data.csv", [
+        {"NIK": NIK_OK, "Status": "Success", "Nama Bank": "BRI", "Nomor Rekening": "012301045678501",
+         "Nama Pemilik": "BUDI SANTOSO"},
+        {"NIK": NIK_MISMATCH, "Status": "Success", "Nama Bank": "012301045678501", "Nomor Rekening": "BUDI SANTOSO",
+         "Nama Pemilik": "BRI"},
+    ])
+    assert load_niks_from_csv(path, include_failed=False) == [NIK_MISMATCH]
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_nik_list(str(tmp_path / "tidak_ada.txt"))
@@ -0,0 +1,36 @@
+"""Export Parquet bertipe dari MitraScraper.save_to_parquet (dilewati jika pyarrow tidak ada)"""
+
+import importlib
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parquet_types_and_values(scrape_mitra):
+    scraper = scrape_mitra.MitraScraper()
+    scraper.data_list = [
+        {"NIK": "0401230101900001", "Nomor Rekening": "0012301045678501", "Nama Bank": "BRI",
+         "Nama Pemilik": "BUDI SANTOSO", "Ijazah_Universitas": "Universitas Halu Oleo", "Status": "Success",
+         "_has_mismatch": False},
+        {"NIK": "7401230101900002", "Nomor Rekening": "N/A", "Nama Bank": "BRI", "Nama Pemilik": " ",
+         "Ijazah_Universitas": "Universitas Halu Oleo", "Status": "Success", "_has_mismatch": True},
+    ]
+    table = pq.read_table(scraper.save_to_parquet())
+
+    assert table.schema.field("NIK").type == pa.string()
+    assert table.schema.field("Nama Bank").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("Mismatch").type == pa.bool_()
+    data = table.to_pydict()
+    assert data["NIK"] == ["0401230101900001", "7401230101900002"]           # leading zero tetap
+    assert data["Nomor Rekening"] == ["0012301045678501", None]
+    assert data["Nama Pemilik"] == ["BUDI SANTOSO", None]
+    assert data["Ijazah_Gelar"] == [None, None]                              # kolom tetap ada walau kosong
+    assert data["Mismatch"] == [False, True]
+    assert data["Run"] == [scraper.output_folder] * 2
+
+
+def test_parquet_is_skipped_without_pyarrow(scrape_mitra, monkeypatch):
+    monkeypatch.setattr(importlib.import_module("output_writer"), "pa", None)
+    assert scrape_mitra.MitraScraper().save_to_parquet() is None
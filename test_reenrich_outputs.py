@@ -0,0 +1,138 @@
+"""
+Test re-enrichment folder output lama (reenrich_outputs.py); parse_ijazah diganti parser palsu
+    python -m pytest test_reenrich_outputs.py -q
+"""
+
+import csv
+import os
+
+import pytest
+
+import reenrich_outputs
+from ijazah_parser import PROMPT_VERSION
+from mitra_store import ResultStore
+from reenrich_outputs import (apply_results, build_index, find_output_base, load_output_rows, reenrich,
+                              reparse_reason, reparse_rows, select_rows, write_diff_report)
+
+PARSED = {"Status": "Success", "Ijazah_Jenis": "Perguruan Tinggi", "Ijazah_Nama": "RAHMAT HIDAYAT",
+          "Ijazah_Gelar": "S.Sos.", "Ijazah_Nama_Gelar": "RAHMAT HIDAYAT, S.Sos.",
+          "Ijazah_Prompt_Version": PROMPT_VERSION}
+
+
+class FakeParser:
+    def __init__(self, results):
+        self.results = results
+        self.paths = []
+
+    def parse_ijazah(self, path):
+        self.paths.append(path)
+        result = self.results[os.path.basename(os.path.dirname(path))]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.mark.parametrize("changes, outdated, reason", [
+    ({}, True, None),
+    ({"Status": "Failed: timeout"}, False, "failed"),
+    ({"Ijazah_Jenis": "N/A"}, False, "failed"),
+    ({"Ijazah_Nama_Gelar": "-"}, False, "missing"),
+    ({"Ijazah_Gelar": "S.Ngawur", "Ijazah_Nama_Gelar": "RAHMAT HIDAYAT"}, False, "missing"),
+    ({"Ijazah_Prompt_Version": "1"}, False, None),
+    ({"Ijazah_Prompt_Version": "1"}, True, "outdated"),
+])
+def test_reparse_reason(changes, outdated, reason):
+    assert reparse_reason(dict(PARSED, **changes), outdated) == reason
+
+
+def _downloads(folder, *niks):
+    for nik in niks:
+        os.makedirs(os.path.join(folder, "downloads", nik))
+        with open(os.path.join(folder, "downloads", nik, "ijazah.jpg"), "wb") as f:
+            f.write(b"\xff\xd8 scan")
+
+
+def test_select_rows_finds_files_after_output_folder_moved(tmp_path):
+    folder = str(tmp_path)
+    _downloads(folder, "1", "2")
+    index = build_index([
+        dict(PARSED, NIK="1", **{"Ijazah_Nama": "N/A", "Path Ijazah": "C:/lama/downloads/1/ijazah.jpg"}),
+        dict(PARSED, NIK="2"),
+        dict(PARSED, NIK="3", Status="Failed: detached"),                 # tidak ada file ijazah
+        dict(PARSED, NIK="4", **{"Ijazah_Jenis": "Bukan Ijazah (foto)", "Ijazah_Nama_Gelar": "N/A"}),
+        {"NIK": "Unknown", "Status": "Failed: timeout"},
+    ])
+    assert list(index) == ["1", "2", "3", "4"]
+    assert select_rows(folder, index) == [("1", "missing", os.path.join(folder, "downloads", "1", "ijazah.jpg"))]
+
+
+def test_reparse_and_apply_results(tmp_path):
+    folder = str(tmp_path)
+    _downloads(folder, "1", "2", "3")
+    index = build_index([dict(PARSED, NIK=nik, **{"Ijazah_Nama_Gelar": "N/A"}) for nik in ("1", "2", "3")])
+    selected = select_rows(folder, index)
+    parser = FakeParser({
+        "1": {"jenis_ijazah": "Perguruan Tinggi", "nama": "RAHMAT HIDAYAT", "gelar": "S.Sos.",
+              "nama_gelar": "RAHMAT HIDAYAT, S.Sos."},
+        "2": {"jenis_ijazah": None, "nama": None},
+        "3": RuntimeError("Rate limit"),
+    })
+
+    results = reparse_rows(parser, selected, workers=2)
+    assert sorted(results) == ["1", "2"] and len(parser.paths) == 3
+    changes, patched = apply_results(index, selected, results)
+    assert patched == 1
+    assert [(change.nik, change.column, change.old, change.new) for change in changes] == [
+        ("1", "Ijazah_Nama_Gelar", "N/A", "RAHMAT HIDAYAT, S.Sos.")]
+    assert index["1"]["Path Ijazah"] == selected[0][2] and index["2"]["Ijazah_Nama_Gelar"] == "N/A"
+
+    with open(write_diff_report(folder, changes), newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["NIK", "Alasan", "Kolom", "Lama", "Baru"],
+                                       ["1", "missing", "Ijazah_Nama_Gelar", "N/A", "RAHMAT HIDAYAT, S.Sos."]]
+
+
+def test_latest_run_in_database_is_the_source(tmp_path):
+    folder = str(tmp_path)
+    assert find_output_base(folder) is None
+    store = ResultStore(os.path.join(folder, "mitra_data_partial.db"))
+    store.write_run(folder, "nik_list", "2026-01-05T08:00:00", [dict(PARSED, NIK="1")], {})
+    store.write_run(folder, "reenrich", "2026-01-06T08:00:00", [dict(PARSED, NIK="1", Status="Failed: x")], {})
+    store.close()
+
+    base = find_output_base(folder)
+    assert base == "mitra_data_partial"
+    assert [row["Status"] for row in load_output_rows(folder, base)] == ["Failed: x"]
+
+
+def test_legacy_output_without_database_reads_csv(tmp_path):
+    with open(tmp_path / "mitra_data.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["NIK", "Status", "Mismatch"])
+        writer.writeheader()
+        writer.writerow({"NIK": "1", "Status": "Success", "Mismatch": "FALSE"})
+    rows = load_output_rows(str(tmp_path), find_output_base(str(tmp_path)))
+    assert rows == [{"NIK": "1", "Status": "Success", "_has_mismatch": False}]
+
+
+def test_reenrich_rewrites_outputs_without_a_scraper(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    _downloads(folder, "1", "2")
+    with open(tmp_path / "mitra_data.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["NIK", "Status", "Ijazah_Jenis", "Ijazah_Nama", "Ijazah_Gelar",
+                                               "Ijazah_Nama_Gelar", "Ijazah_Prompt_Version", "Mismatch"])
+        writer.writeheader()
+        writer.writerow(dict(PARSED, NIK="1", Ijazah_Nama_Gelar="N/A", Mismatch="FALSE"))
+        writer.writerow(dict(PARSED, NIK="2", Mismatch="FALSE"))
+    parser = FakeParser({"1": {"jenis_ijazah": "Perguruan Tinggi", "nama": "RAHMAT HIDAYAT", "gelar": "S.Sos.",
+                               "nama_gelar": "RAHMAT HIDAYAT, S.Sos."}})
+    monkeypatch.setattr(reenrich_outputs, "IjazahParser", lambda: parser)
+
+    report = reenrich(folder, workers=1)
+    assert os.path.dirname(report) == folder and len(parser.paths) == 1
+    assert {"mitra_data.csv", "mitra_data.db", "mitra_data.xlsx"} <= set(os.listdir(folder))
+    assert [row["Ijazah_Nama_Gelar"] for row in load_output_rows(folder, "mitra_data")] == [
+        "RAHMAT HIDAYAT, S.Sos.", "RAHMAT HIDAYAT, S.Sos."]
+    store = ResultStore(os.path.join(folder, "mitra_data.db"))
+    run = store.conn.execute("SELECT mode FROM runs").fetchone()
+    stats = dict(store.conn.execute("SELECT metric, value FROM run_stats").fetchall())
+    store.close()
+    assert run["mode"] == "reenrich" and stats == {"total": 2, "ijazah_parsed": 1}
@@ -0,0 +1,131 @@
+"""
+Test job runner reparse_ijazah.py: urutan prioritas dan melanjutkan dari reparse_progress.json
+IjazahParser diganti parser palsu, jadi tidak ada panggilan ke OpenAI
+"""
+
+import csv
+import json
+import os
+
+import pytest
+
+import reparse_ijazah
+from ijazah_parser import PROMPT_VERSION
+from mitra_store import ResultStore
+from reenrich_outputs import load_output_rows
+from reparse_ijazah import PROGRESS_FILE, build_jobs, load_progress, save_progress, write_back
+
+COLUMNS = ["NIK", "Status", "Ijazah_Jenis", "Ijazah_Nama", "Ijazah_Gelar", "Ijazah_Nama_Gelar",
+           "Ijazah_Prompt_Version"]
+OUTPUT_ROWS = [
+    ["1", "Success", "Perguruan Tinggi", "RAHMAT HIDAYAT", "S.Sos.", "RAHMAT HIDAYAT, S.Sos.", PROMPT_VERSION],
+    ["2", "Success", "Perguruan Tinggi", "WA ODE SULASTRI", "S.Pd", "WA ODE SULASTRI, S.Pd", "0"],
+    ["3", "Success", "Perguruan Tinggi", "ANDI SAPUTRA", "S.Kom", "ANDI SAPUTRA, S.Kom", ""],
+    ["4", "Failed: timeout", "N/A", "N/A", "N/A", "N/A", ""],
+]
+
+
+@pytest.fixture
+def output_folder(tmp_path):
+    """Folder output run: mitra_data.csv + downloads/<NIK>/ijazah.jpg untuk NIK 1-5 (NIK 5 tidak ada di CSV)"""
+    with open(tmp_path / "mitra_data.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(OUTPUT_ROWS)
+    for nik in ("1", "2", "3", "4", "5"):
+        (tmp_path / "downloads" / nik).mkdir(parents=True)
+        (tmp_path / "downloads" / nik / "ijazah.jpg").write_bytes(b"\xff\xd8 scan " + nik.encode())
+    return str(tmp_path)
+
+
+def test_jobs_are_ordered_failed_unknown_then_oldest_prompt(output_folder):
+    jobs = build_jobs(output_folder, {})
+    assert [(job.nik, job.reason) for job in jobs] == [("4", "failed"), ("5", "unknown"), ("3", "outdated"),
+                                                       ("2", "outdated")]
+    # Row yang sudah lengkap dengan prompt sekarang hanya ikut kalau diminta (--restart / --nik-file)
+    current = build_jobs(output_folder, {}, include_current=True)[-1]
+    assert (current.nik, current.reason) == ("1", "current")
+
+
+def test_progress_overrides_output_and_skips_finished(output_folder):
+    progress = {"4": {"status": "done", "prompt_version": PROMPT_VERSION},
+                "2": {"status": "failed", "prompt_version": PROMPT_VERSION}}
+    jobs = build_jobs(output_folder, progress, niks=["2", "3", "4", "9"])
+    assert [(job.nik, job.reason) for job in jobs] == [("2", "failed"), ("3", "outdated")]
+
+
+def test_progress_file_round_trip(tmp_path):
+    path = str(tmp_path / PROGRESS_FILE)
+    assert load_progress(path) == {}
+    save_progress(path, {"1": {"status": "done"}})
+    assert load_progress(path) == {"1": {"status": "done"}} and not os.path.exists(path + ".tmp")
+    (tmp_path / PROGRESS_FILE).write_text("{rusak", encoding="utf-8")
+    assert load_progress(path) == {}
+
+
+class FakeParser:
+    calls = []
+
+    def parse_ijazah(self, path):
+        nik = os.path.basename(os.path.dirname(path))
+        FakeParser.calls.append(nik)
+        if nik == "5":
+            raise RuntimeError("Rate limit")
+        return {"nama": f"MITRA {nik}", "nama_gelar": f"MITRA {nik}, S.Pd"}
+
+
+def test_interrupted_run_resumes_from_progress_file(output_folder, monkeypatch):
+    monkeypatch.setattr(reparse_ijazah, "IjazahParser", FakeParser)
+    progress_path = os.path.join(output_folder, PROGRESS_FILE)
+    # Run sebelumnya terhenti setelah NIK 4 dan 3 selesai
+    save_progress(progress_path, {nik: {"status": "done", "prompt_version": PROMPT_VERSION} for nik in ("4", "3")})
+
+    FakeParser.calls = []
+    reparse_ijazah.reparse_ijazah(output_folder, workers=1)
+    assert FakeParser.calls == ["5", "2"]
+    with open(progress_path, encoding="utf-8") as f:
+        progress = json.load(f)
+    assert {nik: entry["status"] for nik, entry in progress.items()} == {"2": "done", "3": "done", "4": "done",
+                                                                         "5": "failed"}
+    assert progress["2"]["result"]["nama_gelar"] == "MITRA 2, S.Pd" and progress["5"]["result"] is None
+
+    FakeParser.calls = []
+    reparse_ijazah.reparse_ijazah(output_folder, workers=1)
+    assert FakeParser.calls == ["5"]                 # hanya yang gagal di run sebelumnya
+
+    FakeParser.calls = []
+    reparse_ijazah.reparse_ijazah(output_folder, niks=["1"], workers=1)
+    assert FakeParser.calls == ["1"]
+
+
+def _runs(folder):
+    store = ResultStore(os.path.join(folder, "mitra_data.db"))
+    try:
+        return [r["mode"] for r in store.conn.execute("SELECT mode FROM runs ORDER BY id")]
+    finally:
+        store.close()
+
+
+def test_finished_results_are_written_back_to_outputs(output_folder, monkeypatch):
+    monkeypatch.setattr(reparse_ijazah, "IjazahParser", FakeParser)
+    FakeParser.calls = []
+    reparse_ijazah.reparse_ijazah(output_folder, workers=1)
+
+    rows = {row["NIK"]: row for row in load_output_rows(output_folder, "mitra_data")}
+    assert [rows[nik]["Ijazah_Nama_Gelar"] for nik in ("1", "2", "3", "4")] == [
+        "RAHMAT HIDAYAT, S.Sos.", "MITRA 2, S.Pd.", "MITRA 3, S.Pd.", "MITRA 4, S.Pd."]
+    assert rows["2"]["Ijazah_Prompt_Version"] == PROMPT_VERSION and "5" not in rows
+    with open(os.path.join(output_folder, "mitra_data.csv"), newline="", encoding="utf-8") as f:
+        assert {row["NIK"]: row["Ijazah_Nama"] for row in csv.DictReader(f)}["3"] == "MITRA 3"
+    assert _runs(output_folder) == ["reparse"]
+
+    # Tidak ada yang perlu di-parse dan output sudah lengkap: tidak ada run baru
+    reparse_ijazah.reparse_ijazah(output_folder, workers=1)
+    assert write_back(output_folder, load_progress(os.path.join(output_folder, PROGRESS_FILE))) is None
+    assert _runs(output_folder) == ["reparse"]
+
+
+def test_downloads_folder_only_keeps_progress(tmp_path):
+    (tmp_path / "7").mkdir()
+    assert write_back(str(tmp_path), {"7": {"status": "done", "prompt_version": PROMPT_VERSION}}) is None
+    assert os.listdir(tmp_path) == ["7"]
@@ -0,0 +1,60 @@
+"""Routing policy resource blocking (resource_blocker.py)"""
+
+from types import SimpleNamespace
+
+from resource_blocker import ESTIMATED_SIZES, ResourceBlocker
+
+
+class RecordingRoute:
+    """Pengganti Route Playwright: hanya mencatat keputusan yang diambil"""
+
+    def __init__(self):
+        self.calls = []
+
+    def abort(self):
+        self.calls.append("abort")
+
+    def continue_(self):
+        self.calls.append("continue")
+
+    def fallback(self):
+        self.calls.append("fallback")
+
+
+def test_application_requests_are_never_blocked():
+    blocker = ResourceBlocker()
+    for resource_type in ("xhr", "fetch", "document"):
+        assert not blocker.should_block("https://www.google-analytics.com/collect", resource_type)
+
+
+def test_blocked_types_and_third_party_domains():
+    blocker = ResourceBlocker()
+    assert blocker.should_block("https://mitra.bps.go.id/logo.png", "image")
+    assert blocker.should_block("https://fonts.gstatic.com/s/roboto.woff2", "font")
+    assert blocker.should_block("https://www.googletagmanager.com/gtm.js", "script")
+    assert not blocker.should_block("https://mitra.bps.go.id/app.js", "script")
+    # "notclarity.ms" bukan subdomain clarity.ms
+    assert not blocker.should_block("https://notclarity.ms/tag.js", "script")
+
+
+def test_custom_policy_replaces_defaults():
+    blocker = ResourceBlocker(blocked_types=("media",), blocked_domains=("cdn.example",))
+    assert not blocker.should_block("https://mitra.bps.go.id/logo.png", "image")
+    assert blocker.should_block("https://img.cdn.example/a.js", "script")
+
+
+def test_route_handler_counts_and_estimates_saved_bytes():
+    blocker = ResourceBlocker()
+    routes = []
+    for url, resource_type in [("https://mitra.bps.go.id/a.png", "image"),
+                               ("https://mitra.bps.go.id/b.png", "image"),
+                               ("https://hotjar.com/t.js", "script"),
+                               ("https://mitra.bps.go.id/api/mitra", "xhr")]:
+        route = RecordingRoute()
+        blocker._handle_route(route, SimpleNamespace(url=url, resource_type=resource_type))
+        routes.append(route.calls)
+
+    assert routes == [["abort"], ["abort"], ["abort"], ["fallback"]]
+    assert blocker.stats == {"blocked_requests": 3, "allowed_requests": 1,
+                             "estimated_bytes_saved": 2 * ESTIMATED_SIZES["image"] + ESTIMATED_SIZES["script"]}
+    assert blocker.blocked_by_type == {"image": 2, "script": 1}
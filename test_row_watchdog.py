@@ -0,0 +1,112 @@
+"""
+Test deadline per row dan klasifikasi gagal (row_watchdog.py); jam monotonic
+diganti supaya budget bisa "dihabiskan" tanpa sleep
+"""
+
+import pytest
+
+import row_watchdog
+from row_watchdog import RowDeadline, RowTimeoutError, classify_failure
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(row_watchdog.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_timeouts_are_capped_by_remaining_budget(clock):
+    deadline = RowDeadline(10)
+    assert deadline.timeout(5000) == 5000
+    clock[0] += 8
+    assert deadline.remaining_ms() == pytest.approx(2000)
+    assert deadline.timeout(5000) == pytest.approx(2000)
+    assert deadline.seconds(30) == pytest.approx(2.0)
+
+
+def test_last_moments_still_get_minimum_timeout(clock):
+    deadline = RowDeadline(10)
+    clock[0] += 9.9
+    assert deadline.timeout(5000) == RowDeadline.MIN_TIMEOUT_MS
+
+
+def test_exhausted_budget_raises_with_stage(clock):
+    deadline = RowDeadline(10)
+    clock[0] += 10
+    with pytest.raises(RowTimeoutError) as error:
+        deadline.timeout(5000, "bank_modal")
+    assert error.value.stage == "bank_modal"
+    assert str(error.value) == "Row time budget 10s exceeded at stage: bank_modal"
+    with pytest.raises(RowTimeoutError):
+        deadline.check("download")
+
+
+def test_fixed_pause_shrinks_to_zero_without_raising(clock):
+    deadline = RowDeadline(10)
+    assert deadline.pause(1500) == 1500
+    clock[0] += 9.5
+    assert deadline.pause(1500) == pytest.approx(500)
+    clock[0] += 5
+    assert deadline.pause(1500) == 0
+
+
+def test_cleanup_timeouts_never_raise_and_stay_short(clock):
+    deadline = RowDeadline(10)
+    assert deadline.grace(3000) == 3000
+    clock[0] += 60
+    assert deadline.grace(3000) == RowDeadline.MIN_TIMEOUT_MS
+
+
+class FakePage:
+    """Page Playwright minimal: catat semua timeout; Escape bisa dibuat gagal untuk jalur tombol close"""
+
+    def __init__(self, escape_fails=False):
+        self.timeouts = []
+        self.keyboard = self
+        self.escape_fails = escape_fails
+
+    def press(self, key):
+        if self.escape_fails:
+            raise RuntimeError("Target closed")
+
+    def locator(self, selector):
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    def click(self, timeout):
+        self.timeouts.append(timeout)
+
+    def wait_for_timeout(self, ms):
+        self.timeouts.append(ms)
+
+    def wait_for_selector(self, selector, state, timeout):
+        self.timeouts.append(timeout)
+
+
+@pytest.mark.parametrize("escape_fails", [False, True])
+def test_modal_cleanup_after_timeout_uses_remaining_budget(scrape_mitra, clock, escape_fails):
+    scraper = scrape_mitra.MitraScraper(triage=False)
+    deadline = RowDeadline(10)
+    clock[0] += 10
+
+    page = FakePage(escape_fails)
+    scraper._close_modal(page, deadline)
+    scraper._row_failed(RowTimeoutError("rekening_content", 10), 3, page, "7401230101900001", False, deadline)
+    assert page.timeouts and max(page.timeouts) <= RowDeadline.MIN_TIMEOUT_MS
+    assert scraper.retry_queue[0]["reason"] == "row_timeout"
+
+
+@pytest.mark.parametrize("error, reason", [
+    (RowTimeoutError("ijazah_parse", 90), "row_timeout"),
+    (TimeoutError("Timeout 30000ms exceeded."), "timeout"),
+    (RuntimeError("Element is not attached to the DOM"), "detached"),
+    (RuntimeError("Target closed"), "detached"),
+    (RuntimeError("net::ERR_CONNECTION_RESET at https://mitra"), "network"),
+    (KeyError("Nama Bank"), "other"),
+])
+def test_classify_failure(error, reason):
+    assert classify_failure(error) == reason
@@ -0,0 +1,68 @@
+"""
+Test ranking selector (selector_cache.py)
+    python -m pytest test_selector_cache.py -q
+"""
+
+import json
+
+import pytest
+
+from selector_cache import EMA_ALPHA, SelectorRegistry
+
+TAB = "tab_rekening"
+CANDIDATES = ["text=Rekening", "a:has-text('Rekening')", "#tab-rekening"]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return SelectorRegistry(str(tmp_path / "selector_stats.json"))
+
+
+def test_unknown_selectors_keep_candidate_order(registry):
+    assert registry.ordered(TAB, CANDIDATES) == CANDIDATES
+
+
+def test_success_rate_is_an_ema(registry):
+    registry.record_success(TAB, "#tab-rekening", 120)
+    registry.record_success(TAB, "#tab-rekening", 220)
+    entry = registry.stats[TAB]["#tab-rekening"]
+    assert entry["success_rate"] == pytest.approx(1 - 0.5 * (1 - EMA_ALPHA) ** 2)
+    assert entry["avg_ms"] == pytest.approx(120 + EMA_ALPHA * 100)
+    assert registry.ordered(TAB, CANDIDATES)[0] == "#tab-rekening"
+
+
+def test_faster_selector_wins_at_equal_success_rate(registry):
+    registry.record_success(TAB, "text=Rekening", 900)
+    registry.record_success(TAB, "#tab-rekening", 80)
+    assert registry.ordered(TAB, CANDIDATES)[:2] == ["#tab-rekening", "text=Rekening"]
+
+
+def test_failed_selector_goes_last_for_the_rest_of_the_run(registry):
+    for _ in range(5):
+        registry.record_success(TAB, "text=Rekening", 100)
+    registry.record_failure(TAB, "text=Rekening")
+    # success rate masih paling tinggi, tapi sudah gagal sekali di run ini
+    assert registry.ordered(TAB, CANDIDATES)[-1] == "text=Rekening"
+
+    registry.record_success(TAB, "text=Rekening", 100)
+    assert registry.ordered(TAB, CANDIDATES)[0] == "text=Rekening"
+
+
+def test_ranking_survives_a_new_run_but_demotion_does_not(registry):
+    registry.record_success(TAB, "#tab-rekening", 50)
+    registry.record_failure(TAB, "text=Rekening")
+    registry.save()
+
+    reloaded = SelectorRegistry(registry.path)
+    assert reloaded.stats == registry.stats
+    assert reloaded.ordered(TAB, CANDIDATES) == ["#tab-rekening", "a:has-text('Rekening')", "text=Rekening"]
+    assert reloaded.ordered("bank_label", ["dt", "th"]) == ["dt", "th"]
+
+
+def test_corrupt_stats_file_starts_empty(tmp_path):
+    path = tmp_path / "selector_stats.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert SelectorRegistry(str(path)).stats == {}
+
+    path.write_text(json.dumps({TAB: {}}), encoding="utf-8")
+    assert SelectorRegistry(str(path)).stats == {TAB: {}}
@@ -0,0 +1,73 @@
+"""
+Monitor kesehatan tab (tab_health.py); CDP session diganti objek palsu yang
+mengembalikan JSHeapUsedSize tetap
+"""
+
+from tab_health import TabHealthMonitor
+
+MB = 1024 * 1024
+
+
+class FakeCdp:
+    def __init__(self, heap_mb):
+        self.heap_mb = heap_mb
+
+    def send(self, method):
+        if method == "Performance.getMetrics":
+            return {"metrics": [{"name": "Nodes", "value": 10}, {"name": "JSHeapUsedSize", "value": self.heap_mb * MB}]}
+        return {}
+
+
+class FakePage:
+    def __init__(self, cdp):
+        self.context = self
+        self._cdp = cdp
+
+    def new_cdp_session(self, page):
+        return self._cdp
+
+
+def test_baseline_is_median_of_first_window():
+    monitor = TabHealthMonitor(window=5, min_rows_between=0)
+    for seconds in (1.0, 9.0, 2.0, 1.5, 1.2):
+        monitor.record_row(seconds)
+    assert monitor.baseline_latency == 1.5
+
+
+def test_slow_window_triggers_recycle_only_after_min_rows():
+    monitor = TabHealthMonitor(latency_factor=2.0, window=3, min_rows_between=8)
+    for seconds in [1.0] * 3 + [3.5] * 3:
+        monitor.record_row(seconds)
+    assert monitor.needs_recycle() == (False, "")       # baru 6 row sejak start
+
+    for _ in range(2):
+        monitor.record_row(3.5)
+    recycle, reason = monitor.needs_recycle()
+    assert recycle and reason.startswith("latency 3.50s > 2.0x baseline 1.00s")
+
+
+def test_heap_limit_and_reset_after_recycle():
+    monitor = TabHealthMonitor(heap_limit_mb=500, window=2, min_rows_between=2)
+    monitor.attach(FakePage(FakeCdp(heap_mb=650)))
+    for seconds in (1.0, 1.0, 1.0, 1.0):
+        monitor.record_row(seconds)
+    assert monitor.heap_mb() == 650
+    assert monitor.needs_recycle() == (True, "JS heap 650 MB > 500 MB")
+
+    monitor.reset_after_recycle(FakePage(FakeCdp(heap_mb=120)))
+    assert monitor.recycle_count == 1 and monitor.baseline_latency == 1.0
+    assert monitor.needs_recycle() == (False, "")       # hitungan row mulai lagi dari nol
+    for seconds in (1.0, 1.0):
+        monitor.record_row(seconds)
+    assert monitor.needs_recycle() == (False, "")
+
+
+def test_without_cdp_only_latency_is_used():
+    class BrokenPage:
+        @property
+        def context(self):
+            raise RuntimeError("CDP tidak tersedia")
+
+    monitor = TabHealthMonitor()
+    monitor.attach(BrokenPage())
+    assert monitor.heap_mb() is None